@@ -64,7 +64,9 @@ from .services.hdhive_openapi import HDHiveOpenApiService
 from .services.hdhive_browser import HDHiveBrowserService
 from .services.p115_transfer import P115TransferService
 from .services.quark_transfer import QuarkTransferService
+from .services.upstream_executor import UpstreamExecutor
 from .feishu_channel import FeishuChannel
+from .session_store import SessionStore
 from .agenttool import (
     AssistantCapabilitiesTool,
     AssistantExecuteActionTool,
@@ -128,7 +130,7 @@ class AgentResourceOfficer(_PluginBase):
     plugin_name = "Agent影视助手"
     plugin_desc = "龙虾agent稳定控制 MP：飞书入口、盘搜/影巢搜索、115/夸克转存、智能评分推荐。"
     plugin_icon = "https://raw.githubusercontent.com/liuyuexi1987/MoviePilot-Plugins/main/icons/agentresourceofficer.png"
-    plugin_version = "0.3.2"
+    plugin_version = "0.3.4"
     moviepilot_tested_version = "v2.11.4"
     moviepilot_tested_release_url = "https://github.com/jxxghp/MoviePilot/releases/tag/v2.11.4"
     request_templates_schema_version = "request_templates.v1"
@@ -195,13 +197,18 @@ class AgentResourceOfficer(_PluginBase):
     _hdhive_service: Optional[HDHiveOpenApiService] = None
     _p115_service: Optional[P115TransferService] = None
     _feishu_channel: Optional[FeishuChannel] = None
-    _session_cache: Dict[str, Dict[str, Any]] = {}
-    _session_lock = threading.RLock()
+    # 影巢 / 夸克 / 115 同步调用的执行层，每个上游独立限流，避免阻塞事件循环
+    _upstream_executor = UpstreamExecutor()
+    _session_store: Optional[SessionStore] = None
     _agent_tools_reloaded = False
     _candidate_actor_cache: Dict[str, List[str]] = {}
     _candidate_actor_cache_lock = threading.Lock()
+    # 旧版整表存储的键，仅用于迁移
     _session_store_key = "assistant_session_cache"
+    _session_data_prefix = "assistant_session"
     _session_retention_seconds = 7 * 24 * 60 * 60
+    _session_memory_limit = 2000
+    _session_flush_delay = 3.0
     _execution_history_store_key = "assistant_execution_history"
     _execution_history_limit = 100
     _execution_history: List[Dict[str, Any]] = []
@@ -1760,17 +1767,17 @@ class AgentResourceOfficer(_PluginBase):
             params["apikey"] = token
         return f"/api/v1/plugin/AgentResourceOfficer/p115/qrcode/page?{urlencode(params)}"
 
-    @staticmethod
-    def _run_p115_with_timeout(func, *, timeout: int = 8):
-        executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
-        future = executor.submit(func)
+    async def _run_blocking(self, upstream: str, func, *args, **kwargs):
+        return await self._upstream_executor.run(upstream, func, *args, **kwargs)
+
+    async def _run_p115_with_timeout(self, func, *, timeout: int = 8):
         try:
-            return future.result(timeout=max(3, timeout))
-        except concurrent.futures.TimeoutError:
-            future.cancel()
+            return await self._upstream_executor.run_with_timeout("p115", func, timeout=max(3, timeout))
+        except asyncio.TimeoutError:
             return False, {}, f"115 请求超过 {max(3, timeout)} 秒未返回，请稍后重试"
-        finally:
-            executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _async_format_p115_status_summary(self, *, title: str = "115 当前状态") -> str:
+        return await self._run_blocking("p115", self._format_p115_status_summary, title=title)
 
     async def _request_payload(self, request: Request) -> Dict[str, Any]:
         if str(getattr(request, "method", "") or "").upper() == "GET":
@@ -1870,6 +1877,7 @@ class AgentResourceOfficer(_PluginBase):
             self._hdhive_service.timeout = self._hdhive_timeout
             self._hdhive_service.openapi_user_token = self._hdhive_openapi_user_token
             self._hdhive_service.openapi_refresh_token = self._hdhive_openapi_refresh_token
+        self._hdhive_service.executor = self._upstream_executor.executor("hdhive")
         return self._hdhive_service
 
     def _ensure_hdhive_browser(self) -> HDHiveBrowserService:
@@ -1929,7 +1937,9 @@ class AgentResourceOfficer(_PluginBase):
         merged: List[Dict[str, Any]] = []
         seen: set = set()
         for c in candidates:
-            cok, payload, _ = provider.search_resources(
+            cok, payload, _ = await self._run_blocking(
+                "hdhive",
+                provider.search_resources,
                 media_type=c.get("media_type") or media_type,
                 tmdb_id=str(c.get("tmdb_id")),
             )
@@ -2004,6 +2014,9 @@ class AgentResourceOfficer(_PluginBase):
     def stop_service(self):
         if self._feishu_channel is not None:
             self._feishu_channel.stop()
+        self._upstream_executor.shutdown()
+        if self._session_store is not None:
+            self._session_store.flush()
         return
 
     def _ensure_feishu_channel(self) -> FeishuChannel:
@@ -3490,7 +3503,7 @@ class AgentResourceOfficer(_PluginBase):
             return {"success": False, "message": message}
 
         service = self._ensure_quark_service()
-        cookie_ok, cookie_message = service.check_cookie()
+        cookie_ok, cookie_message = await self._run_blocking("quark", service.check_cookie)
         return {
             "success": True,
             "data": {
@@ -3518,7 +3531,9 @@ class AgentResourceOfficer(_PluginBase):
         trigger = self._clean_text(body.get("trigger") or "Agent影视助手 API")
 
         service = self._ensure_quark_service()
-        transfer_ok, result, transfer_message = service.transfer_share(
+        transfer_ok, result, transfer_message = await self._run_blocking(
+            "quark",
+            service.transfer_share,
             share_text,
             access_code=access_code,
             target_path=target_path,
@@ -3527,7 +3542,9 @@ class AgentResourceOfficer(_PluginBase):
         if not transfer_ok:
             return {
                 "success": False,
-                "message": self._format_quark_transfer_failure(
+                "message": await self._run_blocking(
+                    "quark",
+                    self._format_quark_transfer_failure,
                     detail=transfer_message,
                     target_path=target_path or self._quark_default_path,
                 ),
@@ -3541,7 +3558,7 @@ class AgentResourceOfficer(_PluginBase):
             return {"success": False, "message": message}
 
         service = self._ensure_hdhive_service()
-        ping_ok, result, ping_message, _status_code = service.request("GET", "/api/open/ping")
+        ping_ok, result, ping_message, _status_code = await self._run_blocking("hdhive", service.request, "GET", "/api/open/ping")
         return {
             "success": True,
             "data": {
@@ -3574,7 +3591,7 @@ class AgentResourceOfficer(_PluginBase):
             return {"success": False, "message": "插件未启用"}
 
         service = self._ensure_hdhive_service()
-        account_ok, result, account_message = service.fetch_me()
+        account_ok, result, account_message = await self._run_blocking("hdhive", service.fetch_me)
         self._sync_hdhive_refreshed_tokens()
         if not account_ok:
             if self._is_hdhive_premium_limited(account_message):
@@ -3597,7 +3614,12 @@ class AgentResourceOfficer(_PluginBase):
             return {"success": False, "message": "插件未启用"}
 
         is_gambler = self._parse_bool_value(body.get("is_gambler"), self._hdhive_checkin_gambler_mode)
-        return self._run_hdhive_checkin(is_gambler=is_gambler, trigger="Agent影视助手 API")
+        return await self._run_blocking(
+            "hdhive",
+            self._run_hdhive_checkin,
+            is_gambler=is_gambler,
+            trigger="Agent影视助手 API",
+        )
 
     async def api_hdhive_checkin_history(self, request: Request):
         ok, message = self._check_api_access(request)
@@ -3619,7 +3641,7 @@ class AgentResourceOfficer(_PluginBase):
             return {"success": False, "message": "插件未启用"}
 
         service = self._ensure_hdhive_service()
-        quota_ok, result, quota_message = service.fetch_quota()
+        quota_ok, result, quota_message = await self._run_blocking("hdhive", service.fetch_quota)
         self._sync_hdhive_refreshed_tokens()
         if not quota_ok:
             return {"success": False, "message": self._friendly_hdhive_error(quota_message, "配额"), "data": result}
@@ -3633,7 +3655,7 @@ class AgentResourceOfficer(_PluginBase):
             return {"success": False, "message": "插件未启用"}
 
         service = self._ensure_hdhive_service()
-        usage_ok, result, usage_message = service.fetch_usage_today()
+        usage_ok, result, usage_message = await self._run_blocking("hdhive", service.fetch_usage_today)
         self._sync_hdhive_refreshed_tokens()
         if not usage_ok:
             return {"success": False, "message": self._friendly_hdhive_error(usage_message, "今日用量"), "data": result}
@@ -3647,7 +3669,7 @@ class AgentResourceOfficer(_PluginBase):
             return {"success": False, "message": "插件未启用"}
 
         service = self._ensure_hdhive_service()
-        weekly_ok, result, weekly_message = service.fetch_weekly_free_quota()
+        weekly_ok, result, weekly_message = await self._run_blocking("hdhive", service.fetch_weekly_free_quota)
         self._sync_hdhive_refreshed_tokens()
         if not weekly_ok:
             return {"success": False, "message": self._friendly_hdhive_error(weekly_message, "每周免费额度"), "data": result}
@@ -3667,7 +3689,12 @@ class AgentResourceOfficer(_PluginBase):
         media_type = self._clean_text(body.get("media_type") or body.get("type") or "movie").lower()
         tmdb_id = self._clean_text(body.get("tmdb_id"))
         service = self._ensure_hdhive_service()
-        search_ok, result, search_message = self._ensure_hdhive_resource_service().search_resources(media_type=media_type, tmdb_id=tmdb_id)
+        search_ok, result, search_message = await self._run_blocking(
+            "hdhive",
+            self._ensure_hdhive_resource_service().search_resources,
+            media_type=media_type,
+            tmdb_id=tmdb_id,
+        )
         self._sync_hdhive_refreshed_tokens()
         if not search_ok:
             return {"success": False, "message": search_message, "data": result}
@@ -3718,7 +3745,11 @@ class AgentResourceOfficer(_PluginBase):
         if not points_ok:
             return {"success": False, "message": points_message, "data": {"resource_guard": points_data}}
         service = self._ensure_hdhive_service()
-        unlock_ok, result, unlock_message = self._ensure_hdhive_resource_service().unlock_resource(slug)
+        unlock_ok, result, unlock_message = await self._run_blocking(
+            "hdhive",
+            self._ensure_hdhive_resource_service().unlock_resource,
+            slug,
+        )
         self._sync_hdhive_refreshed_tokens()
         if not unlock_ok:
             return {"success": False, "message": unlock_message, "data": result}
@@ -3731,39 +3762,37 @@ class AgentResourceOfficer(_PluginBase):
     def _save_session(self, session_id: str, payload: Dict[str, Any]) -> None:
         payload = dict(payload)
         payload["updated_at"] = int(time.time())
-        with self._session_lock:
-            self._session_cache[session_id] = payload
-        self._persist_relevant_sessions()
+        self._ensure_session_store().set(session_id, payload)
 
     def _load_session(self, session_id: str) -> Optional[Dict[str, Any]]:
-        with self._session_lock:
-            session = self._session_cache.get(session_id)
-        if not session:
-            return None
-        return dict(session)
+        return self._ensure_session_store().get(session_id)
 
-    def _persist_relevant_sessions(self) -> None:
-        try:
-            data: Dict[str, Dict[str, Any]] = {}
-            with self._session_lock:
-                for session_id, payload in (self._session_cache or {}).items():
-                    session = dict(payload or {})
-                    if self._is_session_expired(session):
-                        continue
-                    if str(session_id).startswith("assistant::") or session.get("pending_p115") or str(session.get("kind") or "").strip() == "assistant_p115_login":
-                        data[session_id] = session
-            self.save_data(key=self._session_store_key, value=data)
-        except Exception:
-            pass
+    @staticmethod
+    def _is_persistent_session(session_id: str, session: Dict[str, Any]) -> bool:
+        return (
+            str(session_id).startswith("assistant::")
+            or bool(session.get("pending_p115"))
+            or str(session.get("kind") or "").strip() == "assistant_p115_login"
+        )
+
+    def _ensure_session_store(self) -> SessionStore:
+        if self._session_store is None:
+            AgentResourceOfficer._session_store = SessionStore(
+                key_prefix=self._session_data_prefix,
+                retention_seconds=self._session_retention_seconds,
+                should_persist=self._is_persistent_session,
+                max_items=self._session_memory_limit,
+                flush_delay=self._session_flush_delay,
+            )
+        return self._session_store
 
     def _restore_persisted_sessions(self) -> None:
+        store = self._ensure_session_store()
+        store.bind(save=self.save_data, load=self.get_data, delete=self.del_data)
+        if store.loaded:
+            return
         try:
-            restored = self.get_data(self._session_store_key) or {}
-            if isinstance(restored, dict):
-                with self._session_lock:
-                    for session_id, payload in restored.items():
-                        if isinstance(payload, dict) and not self._is_session_expired(payload):
-                            self._session_cache[str(session_id)] = dict(payload)
+            store.restore(legacy_key=self._session_store_key)
         except Exception:
             pass
 
@@ -7192,7 +7221,9 @@ class AgentResourceOfficer(_PluginBase):
         selected_preview: List[Dict[str, Any]] = []
         selected_summary: Dict[str, Any] = {}
         for candidate in candidates[:3]:
-            resource_ok, resource_result, resource_message = self._ensure_hdhive_resource_service().search_resources(
+            resource_ok, resource_result, resource_message = await self._run_blocking(
+                "hdhive",
+                self._ensure_hdhive_resource_service().search_resources,
                 media_type=candidate.get("media_type") or media_type or "movie",
                 tmdb_id=str(candidate.get("tmdb_id") or ""),
             )
@@ -14159,7 +14190,7 @@ class AgentResourceOfficer(_PluginBase):
         kind_filter = self._clean_text(kind)
         max_limit = min(max(1, self._safe_int(limit, 20)), 100)
         items_by_session: Dict[str, Dict[str, Any]] = {}
-        for session_id, payload in (self._session_cache or {}).items():
+        for session_id, payload in self._ensure_session_store().items():
             if not str(session_id).startswith("assistant::"):
                 continue
             session = dict(payload or {})
@@ -15562,10 +15593,8 @@ class AgentResourceOfficer(_PluginBase):
         cleared_ids: List[str] = []
         if self._clean_text(session_id) or self._clean_text(session):
             _, cache_key = self._normalize_assistant_session_ref(session=session, session_id=session_id)
-            if cache_key in self._session_cache:
-                self._session_cache.pop(cache_key, None)
+            if self._ensure_session_store().pop(cache_key) is not None:
                 cleared_ids.append(cache_key)
-            self._persist_relevant_sessions()
             return {
                 "cleared_count": len(cleared_ids),
                 "cleared_session_ids": cleared_ids,
@@ -15573,7 +15602,7 @@ class AgentResourceOfficer(_PluginBase):
             }
 
         kind_filter = self._clean_text(kind)
-        for current_session_id, payload in list((self._session_cache or {}).items()):
+        for current_session_id, payload in self._ensure_session_store().items():
             if len(cleared_ids) >= max_limit:
                 break
             if not str(current_session_id).startswith("assistant::"):
@@ -15593,10 +15622,9 @@ class AgentResourceOfficer(_PluginBase):
                         continue
                 if not kind_filter and has_pending_p115 is None and not stale_only:
                     continue
-            self._session_cache.pop(current_session_id, None)
+            self._ensure_session_store().pop(current_session_id)
             cleared_ids.append(str(current_session_id))
 
-        self._persist_relevant_sessions()
         return {
             "cleared_count": len(cleared_ids),
             "cleared_session_ids": cleared_ids,
@@ -15714,7 +15742,9 @@ class AgentResourceOfficer(_PluginBase):
         session_id: str,
         state: Dict[str, Any],
     ) -> Tuple[bool, str, Dict[str, Any]]:
-        return self._execute_pending_p115_share(
+        return await self._run_blocking(
+            "p115",
+            self._execute_pending_p115_share,
             session_id=session_id,
             state=state,
             trigger="Agent影视助手 115 登录后自动继续",
@@ -16475,7 +16505,7 @@ class AgentResourceOfficer(_PluginBase):
         )
         stale_session_count = sum(
             1
-            for item in (self._session_cache or {}).values()
+            for item in self._ensure_session_store().values()
             if isinstance(item, dict) and self._is_session_expired(item)
         )
         action_templates = [
@@ -16503,7 +16533,8 @@ class AgentResourceOfficer(_PluginBase):
             )
         ]
         return {
-            "active_sessions": len(self._session_cache or {}),
+            "active_sessions": len(self._ensure_session_store()),
+            "session_store": self._ensure_session_store().stats(),
             "stale_sessions": stale_session_count,
             "saved_plans_total": len(self._workflow_plans or {}),
             "saved_plans_pending": pending_plan_count,
@@ -20494,7 +20525,11 @@ class AgentResourceOfficer(_PluginBase):
         if not points_ok:
             return False, {"resource_guard": points_data, "resource": resource or {}}, points_message
         service = self._ensure_hdhive_service()
-        unlock_ok, result, unlock_message = self._ensure_hdhive_resource_service().unlock_resource(slug)
+        unlock_ok, result, unlock_message = await self._run_blocking(
+            "hdhive",
+            self._ensure_hdhive_resource_service().unlock_resource,
+            slug,
+        )
         if not unlock_ok:
             return False, result, unlock_message
 
@@ -20516,7 +20551,9 @@ class AgentResourceOfficer(_PluginBase):
 
         if share_url and (pan_type == "quark" or self._is_quark_url(share_url)):
             quark_service = self._ensure_quark_service()
-            transfer_ok, transfer_result, transfer_message = quark_service.transfer_share(
+            transfer_ok, transfer_result, transfer_message = await self._run_blocking(
+                "quark",
+                quark_service.transfer_share,
                 share_url,
                 access_code=access_code,
                 target_path=target_path or self._quark_default_path,
@@ -20534,7 +20571,9 @@ class AgentResourceOfficer(_PluginBase):
             if not transfer_ok:
                 return False, route_result, (
                     "影巢解锁成功，但"
-                    + self._format_quark_transfer_failure(
+                    + await self._run_blocking(
+                        "quark",
+                        self._format_quark_transfer_failure,
                         detail=transfer_message,
                         target_path=target_path or self._quark_default_path,
                     )
@@ -20543,7 +20582,9 @@ class AgentResourceOfficer(_PluginBase):
 
         if share_url and (pan_type == "115" or self._is_115_url(share_url)):
             p115_service = self._ensure_p115_service()
-            transfer_ok, transfer_result, transfer_message = p115_service.transfer_share(
+            transfer_ok, transfer_result, transfer_message = await self._run_blocking(
+                "p115",
+                p115_service.transfer_share,
                 url=share_url,
                 access_code=access_code,
                 path=target_path or self._p115_default_path,
@@ -20559,7 +20600,9 @@ class AgentResourceOfficer(_PluginBase):
                 }
             )
             if not transfer_ok:
-                return False, route_result, self._format_p115_transfer_failure(
+                return False, route_result, await self._run_blocking(
+                    "p115",
+                    self._format_p115_transfer_failure,
                     detail=transfer_message,
                     target_path=target_path or self._p115_default_path,
                     title="影巢解锁成功，但 115 转存失败",
@@ -20705,7 +20748,9 @@ class AgentResourceOfficer(_PluginBase):
             if index <= 0 or index > len(candidates):
                 return "候选编号超出范围"
             candidate = dict(candidates[index - 1])
-            resource_ok, resource_result, resource_message = self._ensure_hdhive_resource_service().search_resources(
+            resource_ok, resource_result, resource_message = await self._run_blocking(
+                "hdhive",
+                self._ensure_hdhive_resource_service().search_resources,
                 media_type=candidate.get("media_type") or session.get("media_type") or "movie",
                 tmdb_id=str(candidate.get("tmdb_id") or ""),
             )
@@ -20766,28 +20811,36 @@ class AgentResourceOfficer(_PluginBase):
 
         if self._is_quark_url(share_url):
             service = self._ensure_quark_service()
-            ok, result, message = service.transfer_share(
+            ok, result, message = await self._run_blocking(
+                "quark",
+                service.transfer_share,
                 share_url,
                 access_code=self._clean_text(access_code),
                 target_path=self._clean_text(target_path) or self._quark_default_path,
                 trigger="Agent影视助手 Agent Tool",
             )
             if not ok:
-                return self._format_quark_transfer_failure(
+                return await self._run_blocking(
+                    "quark",
+                    self._format_quark_transfer_failure,
                     detail=message,
                     target_path=self._clean_text(target_path) or self._quark_default_path,
                 )
             return f"夸克转存成功\n目录：{result.get('target_path') or self._quark_default_path}"
 
         if self._is_115_url(share_url):
-            ok, result, message = self._ensure_p115_service().transfer_share(
+            ok, result, message = await self._run_blocking(
+                "p115",
+                self._ensure_p115_service().transfer_share,
                 url=share_url,
                 access_code=self._clean_text(access_code),
                 path=self._clean_text(target_path) or self._p115_default_path,
                 trigger="Agent影视助手 Agent Tool",
             )
             if not ok:
-                return self._format_p115_transfer_failure(
+                return await self._run_blocking(
+                    "p115",
+                    self._format_p115_transfer_failure,
                     detail=message,
                     target_path=self._clean_text(target_path) or self._p115_default_path,
                 )
@@ -21289,8 +21342,7 @@ class AgentResourceOfficer(_PluginBase):
         existing = self._load_session(cache_key)
         if not existing:
             return "当前没有需要清理的会话。"
-        self._session_cache.pop(cache_key, None)
-        self._persist_relevant_sessions()
+        self._ensure_session_store().pop(cache_key)
         return f"已清理会话：{session_name}"
 
     async def tool_assistant_sessions_clear(
@@ -21325,7 +21377,10 @@ class AgentResourceOfficer(_PluginBase):
         if not self._enabled:
             return "Agent影视助手 插件未启用"
         final_client_type = P115TransferService.normalize_qrcode_client_type(client_type or self._p115_client_type)
-        qr_ok, data, qr_message = self._ensure_p115_service().create_qrcode_login(client_type=final_client_type)
+        qr_ok, data, qr_message = await self._run_p115_with_timeout(
+            lambda: self._ensure_p115_service().create_qrcode_login(client_type=final_client_type),
+            timeout=8,
+        )
         if not qr_ok:
             return f"115 扫码二维码生成失败：{qr_message}"
         return (
@@ -21347,7 +21402,9 @@ class AgentResourceOfficer(_PluginBase):
     ) -> str:
         if not self._enabled:
             return "Agent影视助手 插件未启用"
-        qr_ok, data, qr_message = self._ensure_p115_service().check_qrcode_login(
+        qr_ok, data, qr_message = await self._run_blocking(
+            "p115",
+            self._ensure_p115_service().check_qrcode_login,
             uid=self._clean_text(uid),
             time_value=self._clean_text(time_value),
             sign=self._clean_text(sign),
@@ -21371,7 +21428,7 @@ class AgentResourceOfficer(_PluginBase):
         ]
         if data.get("cookie_saved"):
             lines.append("cookie_saved: true")
-            lines.append(self._format_p115_status_summary(title="115 登录完成"))
+            lines.append(await self._async_format_p115_status_summary(title="115 登录完成"))
         if data.get("cookie_keys"):
             lines.append(f"cookie_keys: {', '.join(data.get('cookie_keys') or [])}")
         return "\n".join(lines)
@@ -21379,7 +21436,7 @@ class AgentResourceOfficer(_PluginBase):
     async def tool_p115_status(self) -> str:
         if not self._enabled:
             return "Agent影视助手 插件未启用"
-        return self._format_p115_status_summary()
+        return await self._async_format_p115_status_summary()
 
     async def tool_p115_pending(self, session: str = "default") -> str:
         if not self._enabled:
@@ -21395,9 +21452,11 @@ class AgentResourceOfficer(_PluginBase):
         state = self._load_session(session_id) or {}
         if not self._pending_p115_summary(state):
             return "当前没有待继续的 115 任务。"
-        if not self._p115_status_snapshot().get("ready"):
+        if not (await self._run_blocking("p115", self._p115_status_snapshot)).get("ready"):
             return f"{self._pending_p115_summary(state)}\n当前 115 还不可用，请先完成 115 登录。"
-        resume_ok, resume_message, _ = self._execute_pending_p115_share(
+        resume_ok, resume_message, _ = await self._run_blocking(
+            "p115",
+            self._execute_pending_p115_share,
             session_id=session_id,
             state=state,
             trigger="Agent影视助手 Agent Tool 手动继续 115 任务",
@@ -21422,10 +21481,10 @@ class AgentResourceOfficer(_PluginBase):
         if not ok:
             return {"success": False, "message": message}
 
-        return self._p115_health_payload()
+        return await self._run_blocking("p115", self._p115_health_payload)
 
     async def api_p115_ui_health(self, request: Request):
-        return self._p115_health_payload()
+        return await self._run_blocking("p115", self._p115_health_payload)
 
     def _p115_health_payload(self) -> Dict[str, Any]:
         service = self._ensure_p115_service()
@@ -21458,19 +21517,19 @@ class AgentResourceOfficer(_PluginBase):
         if not self._enabled:
             return {"success": False, "message": "插件未启用"}
 
-        return self._p115_qrcode_payload(request)
+        return await self._p115_qrcode_payload(request)
 
     async def api_p115_ui_qrcode(self, request: Request):
         if not self._enabled:
             return {"success": False, "message": "插件未启用"}
-        return self._p115_qrcode_payload(request)
+        return await self._p115_qrcode_payload(request)
 
-    def _p115_qrcode_payload(self, request: Request) -> Dict[str, Any]:
+    async def _p115_qrcode_payload(self, request: Request) -> Dict[str, Any]:
         client_type = P115TransferService.normalize_qrcode_client_type(
             request.query_params.get("client_type") or self._p115_client_type
         )
         service = self._ensure_p115_service()
-        qr_ok, data, qr_message = self._run_p115_with_timeout(
+        qr_ok, data, qr_message = await self._run_p115_with_timeout(
             lambda: service.create_qrcode_login(client_type=client_type),
             timeout=8,
         )
@@ -21485,14 +21544,14 @@ class AgentResourceOfficer(_PluginBase):
         if not self._enabled:
             return {"success": False, "message": "插件未启用"}
 
-        return self._p115_qrcode_check_payload(request)
+        return await self._p115_qrcode_check_payload(request)
 
     async def api_p115_ui_qrcode_check(self, request: Request):
         if not self._enabled:
             return {"success": False, "message": "插件未启用"}
-        return self._p115_qrcode_check_payload(request)
+        return await self._p115_qrcode_check_payload(request)
 
-    def _p115_qrcode_check_payload(self, request: Request) -> Dict[str, Any]:
+    async def _p115_qrcode_check_payload(self, request: Request) -> Dict[str, Any]:
         uid = self._clean_text(request.query_params.get("uid"))
         time_value = self._clean_text(request.query_params.get("time"))
         sign = self._clean_text(request.query_params.get("sign"))
@@ -21502,7 +21561,7 @@ class AgentResourceOfficer(_PluginBase):
             request.query_params.get("client_type") or self._p115_client_type
         )
         service = self._ensure_p115_service()
-        qr_ok, data, qr_message = self._run_p115_with_timeout(
+        qr_ok, data, qr_message = await self._run_p115_with_timeout(
             lambda: service.check_qrcode_login(
                 uid=uid,
                 time_value=time_value,
@@ -21522,7 +21581,7 @@ class AgentResourceOfficer(_PluginBase):
                 })
                 data["cookie_saved"] = True
                 data["cookie_mode"] = "client_cookie"
-                data["status_summary"] = self._format_p115_status_summary(title="115 登录完成")
+                data["status_summary"] = await self._async_format_p115_status_summary(title="115 登录完成")
         if not qr_ok:
             return {"success": False, "message": qr_message, "data": data}
         return {"success": True, "message": qr_message, "data": data}
@@ -21699,7 +21758,7 @@ class AgentResourceOfficer(_PluginBase):
             request.query_params.get("client_type") or (session or {}).get("client_type") or self._p115_client_type
         )
         service = self._ensure_p115_service()
-        qr_ok, data, qr_message = self._run_p115_with_timeout(
+        qr_ok, data, qr_message = await self._run_p115_with_timeout(
             lambda: service.check_qrcode_login(
                 uid=uid,
                 time_value=time_value,
@@ -21719,7 +21778,7 @@ class AgentResourceOfficer(_PluginBase):
                 })
                 data["cookie_saved"] = True
                 data["cookie_mode"] = "client_cookie"
-                data["status_summary"] = self._format_p115_status_summary(title="115 登录完成")
+                data["status_summary"] = await self._async_format_p115_status_summary(title="115 登录完成")
         if not qr_ok:
             if self._clean_text(data.get("status")) == "expired" or "过期" in self._clean_text(qr_message):
                 return {"success": True, "message": qr_message, "data": {"status": "expired"}}
@@ -21732,7 +21791,7 @@ class AgentResourceOfficer(_PluginBase):
             or self._p115_client_type
         )
         service = self._ensure_p115_service()
-        qr_ok, data, qr_message = self._run_p115_with_timeout(
+        qr_ok, data, qr_message = await self._run_p115_with_timeout(
             lambda: service.create_qrcode_login(client_type=client_type),
             timeout=8,
         )
@@ -21766,7 +21825,9 @@ class AgentResourceOfficer(_PluginBase):
         trigger = self._clean_text(body.get("trigger") or "Agent影视助手 API")
 
         service = self._ensure_p115_service()
-        transfer_ok, result, transfer_message = service.transfer_share(
+        transfer_ok, result, transfer_message = await self._run_blocking(
+            "p115",
+            service.transfer_share,
             url=url,
             access_code=access_code,
             path=target_path or self._p115_default_path,
@@ -21775,7 +21836,9 @@ class AgentResourceOfficer(_PluginBase):
         if not transfer_ok:
             return {
                 "success": False,
-                "message": self._format_p115_transfer_failure(
+                "message": await self._run_blocking(
+                    "p115",
+                    self._format_p115_transfer_failure,
                     detail=transfer_message,
                     target_path=target_path or self._p115_default_path,
                 ),
@@ -21832,13 +21895,15 @@ class AgentResourceOfficer(_PluginBase):
                 "message": "当前没有待继续的 115 任务。",
                 "data": {"session_id": session_id, "has_pending": False},
             }
-        if not self._p115_status_snapshot().get("ready"):
+        if not (await self._run_blocking("p115", self._p115_status_snapshot)).get("ready"):
             return {
                 "success": False,
                 "message": f"{self._pending_p115_summary(state)}\n当前 115 还不可用，请先完成 115 登录。",
                 "data": {"session_id": session_id, **self._pending_p115_public_data(state)},
             }
-        resume_ok, resume_message, resume_data = self._execute_pending_p115_share(
+        resume_ok, resume_message, resume_data = await self._run_blocking(
+            "p115",
+            self._execute_pending_p115_share,
             session_id=session_id,
             state=state,
             trigger="Agent影视助手 API 手动继续 115 任务",
@@ -21923,7 +21988,9 @@ class AgentResourceOfficer(_PluginBase):
 
         if self._is_quark_url(share_url):
             quark_service = self._ensure_quark_service()
-            transfer_ok, result, transfer_message = quark_service.transfer_share(
+            transfer_ok, result, transfer_message = await self._run_blocking(
+                "quark",
+                quark_service.transfer_share,
                 share_url,
                 access_code=access_code,
                 target_path=target_path or self._quark_default_path,
@@ -21932,7 +21999,9 @@ class AgentResourceOfficer(_PluginBase):
             if not transfer_ok:
                 return {
                     "success": False,
-                    "message": self._format_quark_transfer_failure(
+                    "message": await self._run_blocking(
+                        "quark",
+                        self._format_quark_transfer_failure,
                         detail=transfer_message,
                         target_path=target_path or self._quark_default_path,
                     ),
@@ -21952,7 +22021,9 @@ class AgentResourceOfficer(_PluginBase):
 
         if self._is_115_url(share_url):
             p115_service = self._ensure_p115_service()
-            transfer_ok, result, transfer_message = p115_service.transfer_share(
+            transfer_ok, result, transfer_message = await self._run_blocking(
+                "p115",
+                p115_service.transfer_share,
                 url=share_url,
                 access_code=access_code,
                 path=target_path or self._p115_default_path,
@@ -21961,7 +22032,9 @@ class AgentResourceOfficer(_PluginBase):
             if not transfer_ok:
                 return {
                     "success": False,
-                    "message": self._format_p115_transfer_failure(
+                    "message": await self._run_blocking(
+                        "p115",
+                        self._format_p115_transfer_failure,
                         detail=transfer_message,
                         target_path=target_path or self._p115_default_path,
                     ),
@@ -22599,7 +22672,12 @@ class AgentResourceOfficer(_PluginBase):
             })
         if assistant_action == "hdhive_checkin":
             is_gambler = self._parse_bool_value(parsed.get("is_gambler"), self._hdhive_checkin_gambler_mode)
-            result = self._run_hdhive_checkin(is_gambler=is_gambler, trigger="Agent影视助手 智能入口")
+            result = await self._run_blocking(
+                "hdhive",
+                self._run_hdhive_checkin,
+                is_gambler=is_gambler,
+                trigger="Agent影视助手 智能入口",
+            )
             data = result.get("data") if isinstance(result.get("data"), dict) else {}
             status = data.get("status") or ("签到成功" if result.get("success") else "签到失败")
             mode_text = "赌狗签到" if is_gambler else "普通签到"
@@ -23024,11 +23102,11 @@ class AgentResourceOfficer(_PluginBase):
                     "action": "p115_help",
                     "ok": True,
                     "status_summary": summary,
-                    "status": self._p115_status_snapshot(),
+                    "status": await self._run_blocking("p115", self._p115_status_snapshot),
                 }),
             }
         if assistant_action == "p115_status":
-            summary = self._format_p115_status_summary()
+            summary = await self._async_format_p115_status_summary()
             pending_summary = self._pending_p115_summary(state)
             if pending_summary:
                 summary = f"{summary}\n{pending_summary}"
@@ -23039,7 +23117,7 @@ class AgentResourceOfficer(_PluginBase):
                     "action": "p115_status",
                     "ok": True,
                     "status_summary": summary,
-                    "status": self._p115_status_snapshot(),
+                    "status": await self._run_blocking("p115", self._p115_status_snapshot),
                 }),
             })
         if assistant_action == "p115_pending":
@@ -23175,13 +23253,13 @@ class AgentResourceOfficer(_PluginBase):
         if assistant_action == "p115_resume":
             pending_summary = self._pending_p115_summary(state)
             if not pending_summary:
-                summary = self._format_p115_status_summary()
+                summary = await self._async_format_p115_status_summary()
                 return {
                     "success": False,
                     "message": f"当前没有待继续的 115 任务。\n{summary}",
                     "data": self._assistant_response_data(session=session, data={"action": "p115_resume", "ok": False}),
                 }
-            if not self._p115_status_snapshot().get("ready"):
+            if not (await self._run_blocking("p115", self._p115_status_snapshot)).get("ready"):
                 return {
                     "success": False,
                     "message": f"{pending_summary}\n当前 115 还不可用，请先回复：115登录",
@@ -23222,7 +23300,10 @@ class AgentResourceOfficer(_PluginBase):
             client_type = P115TransferService.normalize_qrcode_client_type(
                 parsed.get("client_type") or self._p115_client_type
             )
-            qr_ok, data, qr_message = self._ensure_p115_service().create_qrcode_login(client_type=client_type)
+            qr_ok, data, qr_message = await self._run_p115_with_timeout(
+                lambda: self._ensure_p115_service().create_qrcode_login(client_type=client_type),
+                timeout=8,
+            )
             if not qr_ok:
                 return {"success": False, "message": f"115 扫码二维码生成失败：{qr_message}"}
             self._save_session(
@@ -23261,7 +23342,7 @@ class AgentResourceOfficer(_PluginBase):
         if assistant_action == "p115_qrcode_check":
             if not state or str(state.get("kind") or "").strip() != "assistant_p115_login":
                 pending_summary = self._pending_p115_summary(state)
-                if pending_summary and self._p115_status_snapshot().get("ready"):
+                if pending_summary and (await self._run_blocking("p115", self._p115_status_snapshot)).get("ready"):
                     resume_ok, resume_message, resume_data = await self._resume_pending_p115_share(
                         request,
                         body,
@@ -23278,7 +23359,7 @@ class AgentResourceOfficer(_PluginBase):
                         "message": message_text,
                         "data": self._assistant_response_data(session=session, data={"action": "p115_qrcode_check", "ok": resume_ok, "result": resume_data}),
                     }
-                summary = self._format_p115_status_summary()
+                summary = await self._async_format_p115_status_summary()
                 if pending_summary:
                     summary = f"{summary}\n{pending_summary}"
                 return {
@@ -23293,18 +23374,22 @@ class AgentResourceOfficer(_PluginBase):
                             "action": "p115_qrcode_check",
                             "ok": True,
                             "status_summary": summary,
-                            "status": self._p115_status_snapshot(),
+                            "status": await self._run_blocking("p115", self._p115_status_snapshot),
                         }),
                     },
                 }
             client_type = P115TransferService.normalize_qrcode_client_type(
                 state.get("client_type") or parsed.get("client_type") or self._p115_client_type
             )
-            qr_ok, data, qr_message = self._ensure_p115_service().check_qrcode_login(
-                uid=self._clean_text(state.get("uid")),
-                time_value=self._clean_text(state.get("time")),
-                sign=self._clean_text(state.get("sign")),
-                client_type=client_type,
+            service = self._ensure_p115_service()
+            qr_ok, data, qr_message = await self._run_p115_with_timeout(
+                lambda: service.check_qrcode_login(
+                    uid=self._clean_text(state.get("uid")),
+                    time_value=self._clean_text(state.get("time")),
+                    sign=self._clean_text(state.get("sign")),
+                    client_type=client_type,
+                ),
+                timeout=6,
             )
             if qr_ok and data.get("status") == "success":
                 cookie = self._clean_text(data.pop("cookie"))
@@ -23331,7 +23416,7 @@ class AgentResourceOfficer(_PluginBase):
                 f"结果：{qr_message}",
             ]
             if data.get("cookie_saved"):
-                lines.append(self._format_p115_status_summary(title="115 登录完成"))
+                lines.append(await self._async_format_p115_status_summary(title="115 登录完成"))
                 resume_ok, resume_message, resume_data = await self._resume_pending_p115_share(
                     request,
                     body,
@@ -23956,7 +24041,9 @@ class AgentResourceOfficer(_PluginBase):
                     hdhive_candidates = (hdhive_result or {}).get("candidates") or []
                     chosen_candidate = self._pick_cloud_hdhive_candidate(keyword, hdhive_candidates, year=year)
                     if hdhive_ok and chosen_candidate:
-                        resource_ok, resource_result, _resource_message = self._ensure_hdhive_resource_service().search_resources(
+                        resource_ok, resource_result, _resource_message = await self._run_blocking(
+                            "hdhive",
+                            self._ensure_hdhive_resource_service().search_resources,
                             media_type=chosen_candidate.get("media_type") or media_type or "auto",
                             tmdb_id=str(chosen_candidate.get("tmdb_id") or ""),
                         )
@@ -24037,7 +24124,9 @@ class AgentResourceOfficer(_PluginBase):
                     hdhive_candidates = (hdhive_result or {}).get("candidates") or []
                     chosen_candidate = self._pick_cloud_hdhive_candidate(keyword, hdhive_candidates, year=year)
                     if hdhive_ok and chosen_candidate:
-                        resource_ok, resource_result, _resource_message = self._ensure_hdhive_resource_service().search_resources(
+                        resource_ok, resource_result, _resource_message = await self._run_blocking(
+                            "hdhive",
+                            self._ensure_hdhive_resource_service().search_resources,
                             media_type=chosen_candidate.get("media_type") or media_type or "auto",
                             tmdb_id=str(chosen_candidate.get("tmdb_id") or ""),
                         )
@@ -26823,7 +26912,9 @@ class AgentResourceOfficer(_PluginBase):
                 if index > len(candidates):
                     return {"success": False, "message": f"序号超出范围，请输入 1 到 {len(candidates)} 之间的数字。"}
                 candidate = dict(candidates[index - 1])
-                resource_ok, resource_result, resource_message = self._ensure_hdhive_resource_service().search_resources(
+                resource_ok, resource_result, resource_message = await self._run_blocking(
+                    "hdhive",
+                    self._ensure_hdhive_resource_service().search_resources,
                     media_type=candidate.get("media_type") or state.get("media_type") or "movie",
                     tmdb_id=str(candidate.get("tmdb_id") or ""),
                 )
@@ -27563,8 +27654,7 @@ class AgentResourceOfficer(_PluginBase):
                 "message": "当前没有需要清理的会话。",
                 "data": self._assistant_response_data(session=session, data={"cleared": False}),
             }
-        self._session_cache.pop(cache_key, None)
-        self._persist_relevant_sessions()
+        self._ensure_session_store().pop(cache_key)
         return {
             "success": True,
             "message": f"已清理会话：{session}",
@@ -27768,7 +27858,9 @@ class AgentResourceOfficer(_PluginBase):
             if index > len(candidates):
                 return {"success": False, "message": "候选编号超出范围"}
             candidate = dict(candidates[index - 1])
-            resource_ok, resource_result, resource_message = self._ensure_hdhive_resource_service().search_resources(
+            resource_ok, resource_result, resource_message = await self._run_blocking(
+                "hdhive",
+                self._ensure_hdhive_resource_service().search_resources,
                 media_type=candidate.get("media_type") or session.get("media_type") or "movie",
                 tmdb_id=str(candidate.get("tmdb_id") or ""),
             )
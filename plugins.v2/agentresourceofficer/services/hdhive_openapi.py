@@ -1,5 +1,8 @@
 from datetime import datetime
+import asyncio
 import base64
+import concurrent.futures
+import functools
 import json
 import re
 from typing import Any, Dict, List, Optional, Tuple
@@ -63,6 +66,12 @@ class HDHiveOpenApiService:
         self.openapi_refresh_token = self.normalize_text(openapi_refresh_token)
         self._login_action_id = ""
         self._in_refresh_retry = False
+        # 异步方法内部的同步请求提交到该线程池；为空时使用事件循环默认线程池
+        self.executor: Optional[concurrent.futures.Executor] = None
+
+    async def run_blocking(self, func: Any, *args: Any, **kwargs: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(func, *args, **kwargs))
 
     def _is_meta_endpoint(self, path: str) -> bool:
         return any(path.startswith(prefix) for prefix in self._META_ENDPOINT_PREFIXES)
@@ -392,7 +401,8 @@ class HDHiveOpenApiService:
         fallback_used = False
         fallback_message = ""
         if not candidates:
-            web_candidates, web_error = self.tmdb_web_search_candidates(
+            web_candidates, web_error = await self.run_blocking(
+                self.tmdb_web_search_candidates,
                 keyword=keyword,
                 media_type=media_type,
                 year=year,
@@ -474,7 +484,8 @@ class HDHiveOpenApiService:
         last_status = 200
 
         for candidate in candidates:
-            ok, payload, message = self.search_resources(
+            ok, payload, message = await self.run_blocking(
+                self.search_resources,
                 media_type=candidate["media_type"] or media_type,
                 tmdb_id=str(candidate["tmdb_id"]),
             )
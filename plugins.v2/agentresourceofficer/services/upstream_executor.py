@@ -0,0 +1,111 @@
+"""
+按上游划分的阻塞调用执行层。
+
+影巢 / 夸克 / 115 的服务类都是同步 requests 实现，直接在 async 接口里调用会把
+MoviePilot 的事件循环阻塞整个网络往返。这里为每个上游维护独立的线程池：
+线程数即该上游的并发上限，某个上游变慢只会让它自己的请求排队，不会拖住其他接口。
+"""
+import asyncio
+import concurrent.futures
+import contextvars
+import functools
+import threading
+from typing import Any, Callable, Dict, Optional
+
+
+class UpstreamExecutor:
+    """Per-upstream bounded executors for blocking service calls."""
+
+    DEFAULT_LIMITS: Dict[str, int] = {
+        "hdhive": 4,
+        "quark": 3,
+        "p115": 2,
+        "default": 4,
+    }
+
+    def __init__(self, limits: Optional[Dict[str, int]] = None) -> None:
+        self._limits = {**self.DEFAULT_LIMITS, **(limits or {})}
+        self._executors: Dict[str, concurrent.futures.ThreadPoolExecutor] = {}
+        self._running: Dict[str, int] = {}
+        self._waiting: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _upstream_name(self, upstream: str) -> str:
+        name = str(upstream or "").strip().lower()
+        return name if name in self._limits else "default"
+
+    def limit(self, upstream: str) -> int:
+        return max(1, int(self._limits[self._upstream_name(upstream)]))
+
+    def executor(self, upstream: str) -> concurrent.futures.ThreadPoolExecutor:
+        name = self._upstream_name(upstream)
+        with self._lock:
+            executor = self._executors.get(name)
+            if executor is None:
+                executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.limit(name),
+                    thread_name_prefix=f"aro-{name}",
+                )
+                self._executors[name] = executor
+            return executor
+
+    def _track(self, name: str, func: Callable[[], Any]) -> Any:
+        with self._lock:
+            self._waiting[name] = max(0, self._waiting.get(name, 0) - 1)
+            self._running[name] = self._running.get(name, 0) + 1
+        try:
+            return func()
+        finally:
+            with self._lock:
+                self._running[name] = max(0, self._running.get(name, 0) - 1)
+
+    async def run(self, upstream: str, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """在上游专属线程池中执行同步调用，不阻塞当前事件循环。"""
+        name = self._upstream_name(upstream)
+        call = functools.partial(contextvars.copy_context().run, func, *args, **kwargs)
+        with self._lock:
+            self._waiting[name] = self._waiting.get(name, 0) + 1
+        loop = asyncio.get_running_loop()
+        try:
+            future = self.executor(name).submit(self._track, name, call)
+        except RuntimeError:
+            with self._lock:
+                self._waiting[name] = max(0, self._waiting.get(name, 0) - 1)
+            raise
+        future.add_done_callback(functools.partial(self._discard_cancelled, name))
+        return await asyncio.wrap_future(future, loop=loop)
+
+    def _discard_cancelled(self, name: str, future: concurrent.futures.Future) -> None:
+        # 排队中被取消（例如调用方超时）的任务不会进入 _track，这里补扣排队计数
+        if future.cancelled():
+            with self._lock:
+                self._waiting[name] = max(0, self._waiting.get(name, 0) - 1)
+
+    async def run_with_timeout(
+        self,
+        upstream: str,
+        func: Callable[..., Any],
+        *args: Any,
+        timeout: float,
+        **kwargs: Any,
+    ) -> Any:
+        """同 run，超过 timeout 秒未返回时抛出 asyncio.TimeoutError；线程中的调用会自然结束。"""
+        return await asyncio.wait_for(self.run(upstream, func, *args, **kwargs), timeout=max(1.0, float(timeout)))
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {
+                name: {
+                    "limit": self.limit(name),
+                    "running": self._running.get(name, 0),
+                    "waiting": self._waiting.get(name, 0),
+                }
+                for name in self._limits
+            }
+
+    def shutdown(self) -> None:
+        """关闭现有线程池；已提交的调用继续执行完，之后的调用会重新创建线程池。"""
+        with self._lock:
+            executors, self._executors = list(self._executors.values()), {}
+        for executor in executors:
+            executor.shutdown(wait=False)
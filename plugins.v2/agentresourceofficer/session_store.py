@@ -0,0 +1,268 @@
+import heapq
+import itertools
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+
+class SessionStore:
+    """
+    Agent影视助手 交互会话存储。
+
+    - 内存中按 session_id 保存会话，过期时间进入最小堆，写入时顺带淘汰已过期和超出容量上限的会话；
+    - 需要持久化的会话（由 should_persist 判断）每个会话单独一条插件数据，另存一份会话 ID 索引；
+    - 写入只标记脏会话，延迟 flush_delay 秒合并落盘，同一会话的多次更新只写最后一次。
+    """
+
+    def __init__(
+        self,
+        *,
+        key_prefix: str,
+        retention_seconds: int,
+        should_persist: Callable[[str, Dict[str, Any]], bool],
+        max_items: int = 2000,
+        flush_delay: float = 3.0,
+        flush_batch: int = 50,
+    ) -> None:
+        self._key_prefix = key_prefix
+        self._index_key = f"{key_prefix}_index"
+        self._retention_seconds = max(1, int(retention_seconds))
+        self._should_persist = should_persist
+        self._max_items = max(1, int(max_items))
+        self._flush_delay = max(0.0, float(flush_delay))
+        self._flush_batch = max(1, int(flush_batch))
+
+        self._sessions: Dict[str, Dict[str, Any]] = {}
+        # session_id -> 当前过期时间；堆中过期时间与此不一致的条目视为作废
+        self._expires: Dict[str, float] = {}
+        self._heap: List[Tuple[float, int, str]] = []
+        self._counter = itertools.count()
+        self._persisted: Set[str] = set()
+        self._dirty: Set[str] = set()
+        self._index_stale = False
+
+        self._lock = threading.RLock()
+        self._flush_lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+
+        self._save: Optional[Callable[..., Any]] = None
+        self._load: Optional[Callable[..., Any]] = None
+        self._delete: Optional[Callable[..., Any]] = None
+        self.loaded = False
+        self.flush_count = 0
+        self.written_count = 0
+
+    def bind(self, *, save: Callable[..., Any], load: Callable[..., Any], delete: Callable[..., Any]) -> None:
+        self._save = save
+        self._load = load
+        self._delete = delete
+
+    def _data_key(self, session_id: str) -> str:
+        return f"{self._key_prefix}::{session_id}"
+
+    def _expires_at(self, payload: Dict[str, Any]) -> float:
+        try:
+            updated_at = int(payload.get("updated_at") or 0)
+        except (TypeError, ValueError):
+            updated_at = 0
+        # 没有更新时间的会话沿用旧逻辑视为不过期，但仍受容量上限约束
+        if updated_at <= 0:
+            return float("inf")
+        return updated_at + self._retention_seconds
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._sessions)
+
+    def __contains__(self, session_id: str) -> bool:
+        with self._lock:
+            return session_id in self._sessions
+
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            session = self._sessions.get(session_id)
+            return dict(session) if session else None
+
+    def items(self) -> List[Tuple[str, Dict[str, Any]]]:
+        with self._lock:
+            self._evict_locked()
+            return [(session_id, dict(payload)) for session_id, payload in self._sessions.items()]
+
+    def values(self) -> List[Dict[str, Any]]:
+        return [payload for _, payload in self.items()]
+
+    def set(self, session_id: str, payload: Dict[str, Any]) -> None:
+        session_id = str(session_id)
+        with self._lock:
+            self._put_locked(session_id, dict(payload))
+            self._evict_locked()
+        self._schedule_flush()
+
+    def pop(self, session_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            payload = self._remove_locked(str(session_id))
+        if payload is not None:
+            self._schedule_flush()
+        return payload
+
+    def _put_locked(self, session_id: str, payload: Dict[str, Any]) -> None:
+        self._sessions[session_id] = payload
+        expires_at = self._expires_at(payload)
+        self._expires[session_id] = expires_at
+        heapq.heappush(self._heap, (expires_at, next(self._counter), session_id))
+        if session_id in self._persisted or self._should_persist(session_id, payload):
+            self._dirty.add(session_id)
+
+    def _remove_locked(self, session_id: str) -> Optional[Dict[str, Any]]:
+        payload = self._sessions.pop(session_id, None)
+        self._expires.pop(session_id, None)
+        if session_id in self._persisted:
+            self._dirty.add(session_id)
+        else:
+            self._dirty.discard(session_id)
+        return payload
+
+    def _evict_locked(self, now: Optional[float] = None) -> None:
+        now = time.time() if now is None else now
+        while self._heap:
+            expires_at, _, session_id = self._heap[0]
+            if self._expires.get(session_id) != expires_at:
+                heapq.heappop(self._heap)
+                continue
+            if expires_at < now or len(self._sessions) > self._max_items:
+                heapq.heappop(self._heap)
+                self._remove_locked(session_id)
+                continue
+            break
+        # 作废条目过多时重建堆，避免频繁更新的会话让堆无限增长
+        if len(self._heap) > 2 * len(self._sessions) + 64:
+            self._heap = [
+                (expires_at, next(self._counter), session_id)
+                for session_id, expires_at in self._expires.items()
+            ]
+            heapq.heapify(self._heap)
+
+    def _schedule_flush(self) -> None:
+        with self._lock:
+            if not self._dirty or self._save is None:
+                return
+            if len(self._dirty) < self._flush_batch and self._flush_delay > 0:
+                if self._timer is None:
+                    self._timer = threading.Timer(self._flush_delay, self.flush)
+                    self._timer.daemon = True
+                    self._timer.start()
+                return
+        self.flush()
+
+    def flush(self) -> int:
+        """将脏会话写入插件数据，返回写入或删除的会话数。"""
+        with self._flush_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                if self._save is None or not (self._dirty or self._index_stale):
+                    return 0
+                now = time.time()
+                upserts: Dict[str, Dict[str, Any]] = {}
+                deletes: List[str] = []
+                for session_id in self._dirty:
+                    payload = self._sessions.get(session_id)
+                    if (
+                        payload is not None
+                        and self._expires.get(session_id, 0) >= now
+                        and self._should_persist(session_id, payload)
+                    ):
+                        upserts[session_id] = dict(payload)
+                    elif session_id in self._persisted:
+                        deletes.append(session_id)
+                self._dirty = set()
+                persisted = (self._persisted | set(upserts)) - set(deletes)
+                index_changed = persisted != self._persisted or self._index_stale
+                self._persisted = persisted
+                index = sorted(persisted)
+            failed: List[str] = []
+            for session_id, payload in upserts.items():
+                try:
+                    self._save(key=self._data_key(session_id), value=payload)
+                except Exception:
+                    failed.append(session_id)
+            for session_id in deletes:
+                try:
+                    self._delete(key=self._data_key(session_id))
+                except Exception:
+                    failed.append(session_id)
+                    # 删除失败的会话保留在索引中，下次落盘时重试
+                    with self._lock:
+                        self._persisted.add(session_id)
+            if index_changed:
+                try:
+                    self._save(key=self._index_key, value=index)
+                    self._index_stale = False
+                except Exception:
+                    self._index_stale = True
+            if failed:
+                with self._lock:
+                    self._dirty.update(failed)
+            written = len((set(upserts) | set(deletes)) - set(failed))
+            self.flush_count += 1
+            self.written_count += written
+            return written
+
+    def restore(self, legacy_key: str = "") -> int:
+        """从插件数据恢复持久化会话；legacy_key 为旧版整表存储的键，读取后迁移为逐会话存储。"""
+        if self._load is None:
+            return 0
+        restored: Dict[str, Dict[str, Any]] = {}
+        try:
+            index = self._load(self._index_key) or []
+        except Exception:
+            index = []
+        for session_id in index if isinstance(index, list) else []:
+            try:
+                payload = self._load(self._data_key(str(session_id)))
+            except Exception:
+                payload = None
+            if isinstance(payload, dict):
+                restored[str(session_id)] = payload
+        legacy: Dict[str, Any] = {}
+        if legacy_key:
+            try:
+                legacy = self._load(legacy_key) or {}
+            except Exception:
+                legacy = {}
+        with self._lock:
+            self._persisted = {str(session_id) for session_id in index} if isinstance(index, list) else set()
+            for session_id, payload in restored.items():
+                if session_id not in self._sessions:
+                    self._put_locked(session_id, dict(payload))
+            self._dirty -= set(restored)
+            # 索引中存在但读取不到的会话，下次落盘时从索引移除
+            self._dirty.update(self._persisted - set(restored))
+            if isinstance(legacy, dict):
+                for session_id, payload in legacy.items():
+                    if isinstance(payload, dict) and str(session_id) not in self._sessions:
+                        self._put_locked(str(session_id), dict(payload))
+            self._evict_locked()
+            self.loaded = True
+            count = len(self._sessions)
+        if legacy:
+            self.flush()
+            try:
+                self._delete(key=legacy_key)
+            except Exception:
+                pass
+        else:
+            self._schedule_flush()
+        return count
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "persisted": len(self._persisted),
+                "dirty": len(self._dirty),
+                "max_items": self._max_items,
+                "flush_count": self.flush_count,
+                "written_count": self.written_count,
+            }
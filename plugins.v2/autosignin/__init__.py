@@ -1,8 +1,6 @@
 import re
 import traceback
 from datetime import datetime, timedelta
-from multiprocessing.dummy import Pool as ThreadPool
-from multiprocessing.pool import ThreadPool
 from typing import Any, List, Dict, Tuple, Optional
 from urllib.parse import urljoin
 
@@ -13,10 +11,12 @@ from app.core.event import eventmanager, Event
 from app.db.site_oper import SiteOper
 from app.helper.browser import PlaywrightHelper
 from app.helper.cloudflare import under_challenge
-from app.helper.module import ModuleHelper
 from app.helper.sites import SitesHelper
 from app.log import logger
 from app.plugins import _PluginBase
+from app.plugins.autosignin.engine import SigninEngine, SiteSessionPool, run_with_session
+from app.plugins.autosignin.registry import SiteHandlerRegistry
+from app.plugins.autosignin.sites import current_session
 from app.schemas.types import EventType, NotificationType
 from app.utils.http import RequestUtils
 from app.utils.site import SiteUtils
@@ -37,7 +37,7 @@ class AutoSignIn(_PluginBase):
     # 插件图标
     plugin_icon = "signin.png"
     # 插件版本
-    plugin_version = "2.9.2"
+    plugin_version = "2.10.1"
     # 插件作者
     plugin_author = "thsrite"
     # 作者主页
@@ -51,8 +51,8 @@ class AutoSignIn(_PluginBase):
 
     # 定时器
     _scheduler: Optional[BackgroundScheduler] = None
-    # 加载的模块
-    _site_schema: list = []
+    # 站点签到类索引，按需导入站点模块
+    _site_registry: Optional[SiteHandlerRegistry] = None
 
     # 配置属性
     _enabled: bool = False
@@ -67,6 +67,14 @@ class AutoSignIn(_PluginBase):
     _start_time: int = None
     _end_time: int = None
     _auto_cf: int = 0
+    # 单个站点单次签到|登录超时时间（秒）
+    _site_timeout: int = 120
+    # 整个签到|登录任务的总时长（分钟）
+    _timeout_budget: int = 15
+    # 同一域名同时执行的任务数，固定为 1，避免同站并发请求触发风控，不开放配置
+    _domain_concurrency: int = 1
+    # 网络类失败的重试次数，固定值，不开放配置
+    _retry_times: int = 1
 
     def init_plugin(self, config: dict = None):
 
@@ -84,6 +92,8 @@ class AutoSignIn(_PluginBase):
             self._login_sites = config.get("login_sites") or []
             self._retry_keyword = config.get("retry_keyword")
             self._auto_cf = config.get("auto_cf")
+            self._site_timeout = self.__to_int(config.get("site_timeout"), 120)
+            self._timeout_budget = self.__to_int(config.get("timeout_budget"), 15)
             self._clean = config.get("clean")
 
             # 过滤掉已删除的站点
@@ -94,11 +104,10 @@ class AutoSignIn(_PluginBase):
             # 保存配置
             self.__update_config()
 
-        # 加载模块
+        # 建立站点签到类索引，站点模块在首次签到时才导入
         if self._enabled or self._onlyonce:
 
-            self._site_schema = ModuleHelper.load('app.plugins.autosignin.sites',
-                                                  filter_func=lambda _, obj: hasattr(obj, 'match'))
+            self._site_registry = SiteHandlerRegistry()
 
             # 立即运行一次
             if self._onlyonce:
@@ -122,6 +131,17 @@ class AutoSignIn(_PluginBase):
     def get_state(self) -> bool:
         return self._enabled
 
+    @staticmethod
+    def __to_int(value: Any, default: int) -> int:
+        """
+        解析正整数配置，未配置或格式错误时使用默认值
+        """
+        try:
+            value = int(value)
+        except (TypeError, ValueError):
+            return default
+        return value if value > 0 else default
+
     def __update_config(self):
         # 保存配置
         self.update_config(
@@ -135,6 +155,8 @@ class AutoSignIn(_PluginBase):
                 "login_sites": self._login_sites,
                 "retry_keyword": self._retry_keyword,
                 "auto_cf": self._auto_cf,
+                "site_timeout": self._site_timeout,
+                "timeout_budget": self._timeout_budget,
                 "clean": self._clean,
             }
         )
@@ -407,6 +429,40 @@ class AutoSignIn(_PluginBase):
                                         }
                                     }
                                 ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 6
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'site_timeout',
+                                            'label': '单站超时(秒)',
+                                            'placeholder': '单个站点签到超过该时间视为失败'
+                                        }
+                                    }
+                                ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 6
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'timeout_budget',
+                                            'label': '任务总时长(分钟)',
+                                            'placeholder': '超出后未执行的站点直接记为失败'
+                                        }
+                                    }
+                                ]
                             }
                         ]
                     },
@@ -527,6 +583,8 @@ class AutoSignIn(_PluginBase):
             "onlyonce": False,
             "clean": False,
             "queue_cnt": 5,
+            "site_timeout": 120,
+            "timeout_budget": 15,
             "sign_sites": [],
             "login_sites": [],
             "retry_keyword": "错误|失败"
@@ -1417,12 +1475,20 @@ class AutoSignIn(_PluginBase):
                               title="开始站点签到 ...",
                               userid=event.event_data.get("user"))
 
-        if self._sign_sites:
-            self.__do(today=today, type_str="签到", do_sites=self._sign_sites, event=event)
-        if self._login_sites:
-            self.__do(today=today, type_str="登录", do_sites=self._login_sites, event=event)
-
-    def __do(self, today: datetime, type_str: str, do_sites: list, event: Event = None):
+        # 签到与登录共用站点连接，连接池只属于本次任务，同时执行的任务互不影响
+        session_pool = SiteSessionPool(pool_size=self._domain_concurrency + 1)
+        try:
+            if self._sign_sites:
+                self.__do(today=today, type_str="签到", do_sites=self._sign_sites, event=event,
+                          session_pool=session_pool)
+            if self._login_sites:
+                self.__do(today=today, type_str="登录", do_sites=self._login_sites, event=event,
+                          session_pool=session_pool)
+        finally:
+            session_pool.close()
+
+    def __do(self, today: datetime, type_str: str, do_sites: list, event: Event = None,
+             session_pool: Optional[SiteSessionPool] = None):
         """
         签到逻辑
         """
@@ -1474,12 +1540,16 @@ class AutoSignIn(_PluginBase):
 
         # 执行签到
         logger.info(f"开始执行{type_str}任务 ...")
-        if type_str == "签到":
-            with ThreadPool(min(len(do_sites), int(self._queue_cnt))) as p:
-                status = p.map(self.signin_site, do_sites)
-        else:
-            with ThreadPool(min(len(do_sites), int(self._queue_cnt))) as p:
-                status = p.map(self.login_site, do_sites)
+        engine = SigninEngine(concurrency=min(len(do_sites), self.__to_int(self._queue_cnt, 5)),
+                              domain_concurrency=self._domain_concurrency,
+                              site_timeout=self._site_timeout,
+                              total_timeout=self._timeout_budget * 60,
+                              retries=self._retry_times)
+        task = self.signin_site if type_str == "签到" else self.login_site
+        status = engine.run(sites=do_sites,
+                            task=run_with_session(session_pool, task),
+                            type_str=type_str,
+                            should_retry=self.__should_retry)
 
         if status:
             logger.info(f"站点{type_str}任务完成！")
@@ -1600,14 +1670,17 @@ class AutoSignIn(_PluginBase):
         # 保存配置
         self.__update_config()
 
+    @staticmethod
+    def __should_retry(result: Tuple[str, str]) -> bool:
+        """
+        只对无法连接站点的失败重试，已返回页面或已超时的站点不再重复执行，避免重复签到
+        """
+        return bool(result) and "无法打开网站" in str(result[1])
+
     def __build_class(self, url) -> Any:
-        for site_schema in self._site_schema:
-            try:
-                if site_schema.match(url):
-                    return site_schema
-            except Exception as e:
-                logger.error("站点模块加载失败：%s" % str(e))
-        return None
+        if not self._site_registry:
+            self._site_registry = SiteHandlerRegistry()
+        return self._site_registry.get(url)
 
     def signin_by_domain(self, url: str, apikey: str) -> schemas.Response:
         """
@@ -1702,6 +1775,7 @@ class AutoSignIn(_PluginBase):
                 res = RequestUtils(cookies=site_cookie,
                                    ua=ua,
                                    proxies=proxies,
+                                   session=current_session(),
                                    timeout=timeout
                                    ).get_res(url=checkin_url)
                 if not res and site_url != checkin_url:
@@ -1709,6 +1783,7 @@ class AutoSignIn(_PluginBase):
                     res = RequestUtils(cookies=site_cookie,
                                        ua=ua,
                                        proxies=proxies,
+                                       session=current_session(),
                                        timeout=timeout
                                        ).get_res(url=site_url)
                 # 判断登录状态
@@ -1801,6 +1876,7 @@ class AutoSignIn(_PluginBase):
                 res = RequestUtils(cookies=site_cookie,
                                    ua=ua,
                                    proxies=proxies,
+                                   session=current_session(),
                                    timeout=timeout
                                    ).get_res(url=site_url)
                 # 判断登录状态
@@ -0,0 +1,209 @@
+import asyncio
+import random
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from http.cookiejar import DefaultCookiePolicy
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from app.log import logger
+from app.plugins.autosignin.sites import use_session
+
+# 执行单个站点签到|登录，返回站点名称与结果信息
+SiteTask = Callable[[dict], Tuple[str, str]]
+
+
+def site_domain(url: Optional[str]) -> str:
+    """
+    返回站点地址的域名，用于连接复用与并发限制
+    """
+    return urlparse(url or "").netloc.lower()
+
+
+class SiteSessionPool:
+    """
+    按站点域名复用的HTTP连接池，一次签到任务中同一站点的签到、登录及重试共用连接
+
+    超时的站点线程无法中断，关闭时若仍有站点在使用会话，推迟到最后一个站点结束后再关闭
+    """
+
+    def __init__(self, pool_size: int = 2):
+        self._pool_size = pool_size
+        self._sessions: Dict[str, requests.Session] = {}
+        self._lock = threading.Lock()
+        self._users = 0
+        self._closing = False
+
+    def __get(self, url: str) -> requests.Session:
+        domain = site_domain(url) or url
+        session = self._sessions.get(domain)
+        if not session:
+            session = requests.Session()
+            session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self._pool_size)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._sessions[domain] = session
+        return session
+
+    def get(self, url: str) -> requests.Session:
+        """
+        获取站点对应的会话，会话不保存响应下发的Cookie，避免覆盖站点配置的Cookie
+        """
+        with self._lock:
+            return self.__get(url)
+
+    @contextmanager
+    def lease(self, url: str) -> Iterator[requests.Session]:
+        """
+        在站点执行期间占用会话，占用期间连接池不会被关闭
+        """
+        with self._lock:
+            self._users += 1
+            session = self.__get(url)
+        try:
+            yield session
+        finally:
+            with self._lock:
+                self._users -= 1
+                release = self._closing and not self._users
+            if release:
+                self.__close_sessions()
+
+    def close(self):
+        """
+        关闭全部会话，仍有站点占用时由最后一个站点结束后关闭
+        """
+        with self._lock:
+            self._closing = True
+            if self._users:
+                return
+        self.__close_sessions()
+
+    def __close_sessions(self):
+        with self._lock:
+            sessions, self._sessions = list(self._sessions.values()), {}
+        for session in sessions:
+            try:
+                session.close()
+            except Exception as err:
+                logger.debug(f"关闭站点连接失败：{str(err)}")
+
+
+class SigninEngine:
+    """
+    基于 asyncio 的站点签到调度：站点处理仍为同步函数，在线程池中执行；
+    全局与单域名并发受限，每个站点单次执行有超时，整个任务受总时长约束，网络类失败按抖动退避重试
+    """
+
+    def __init__(self,
+                 concurrency: int = 5,
+                 domain_concurrency: int = 1,
+                 site_timeout: float = 120,
+                 total_timeout: float = 900,
+                 retries: int = 1,
+                 backoff: float = 3.0):
+        self._concurrency = max(int(concurrency), 1)
+        self._domain_concurrency = max(int(domain_concurrency), 1)
+        self._site_timeout = site_timeout
+        self._total_timeout = total_timeout
+        self._retries = retries
+        self._backoff = backoff
+
+    def run(self,
+            sites: List[dict],
+            task: SiteTask,
+            type_str: str,
+            should_retry: Optional[Callable[[Tuple[str, str]], bool]] = None) -> List[Tuple[str, str]]:
+        """
+        执行全部站点，按输入顺序返回结果；超时的站点返回超时信息，不阻塞其他站点
+        """
+        if not sites:
+            return []
+        # 超时的站点线程无法中断，线程池留出余量，避免慢站点占满线程导致其他站点无法执行
+        executor = ThreadPoolExecutor(max_workers=self._concurrency * 2, thread_name_prefix="autosignin")
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(self.__run(sites, task, type_str, should_retry, executor))
+        finally:
+            loop.close()
+            executor.shutdown(wait=False)
+
+    async def __run(self,
+                    sites: List[dict],
+                    task: SiteTask,
+                    type_str: str,
+                    should_retry: Optional[Callable[[Tuple[str, str]], bool]],
+                    executor: ThreadPoolExecutor) -> List[Tuple[str, str]]:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self._total_timeout
+        global_limit = asyncio.Semaphore(self._concurrency)
+        domain_limits: Dict[str, asyncio.Semaphore] = defaultdict(
+            lambda: asyncio.Semaphore(self._domain_concurrency))
+
+        async def attempt_once(site: dict) -> Tuple[str, str]:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return site.get("name"), f"{type_str}失败，超出任务总时长！"
+            started = asyncio.Event()
+
+            def call() -> Tuple[str, str]:
+                try:
+                    loop.call_soon_threadsafe(started.set)
+                except RuntimeError:
+                    # 事件循环已结束，任务已放弃
+                    return site.get("name"), f"{type_str}失败，超出任务总时长！"
+                return task(site)
+
+            future = loop.run_in_executor(executor, call)
+            try:
+                # 等待线程池空闲的时间不计入单站超时，只受任务总时长约束
+                await asyncio.wait_for(started.wait(), timeout=remaining)
+            except asyncio.TimeoutError:
+                future.cancel()
+                return site.get("name"), f"{type_str}失败，超出任务总时长！"
+            try:
+                return await asyncio.wait_for(future,
+                                              timeout=min(self._site_timeout, max(deadline - loop.time(), 0)))
+            except asyncio.TimeoutError:
+                logger.warn(f"{site.get('name')} {type_str}超时")
+                return site.get("name"), f"{type_str}失败，请求超时！"
+            except Exception as err:
+                return site.get("name"), f"{type_str}失败：{str(err)}！"
+
+        async def run_site(site: dict) -> Tuple[str, str]:
+            domain = site_domain(site.get("url")) or site.get("name")
+            attempt = 0
+            while True:
+                async with domain_limits[domain]:
+                    async with global_limit:
+                        result = await attempt_once(site)
+                if attempt >= self._retries or not should_retry or not should_retry(result):
+                    return result
+                attempt += 1
+                # 指数退避并加入随机抖动，避免同时失败的站点同时重试
+                delay = self._backoff * (2 ** (attempt - 1)) * random.uniform(0.5, 1.5)
+                if deadline - loop.time() <= delay:
+                    return result
+                logger.info(f"{site.get('name')} {type_str}失败，{delay:.1f} 秒后第 {attempt} 次重试：{result[1]}")
+                await asyncio.sleep(delay)
+
+        return list(await asyncio.gather(*(run_site(site) for site in sites)))
+
+
+def run_with_session(pool: Optional[SiteSessionPool], task: SiteTask) -> SiteTask:
+    """
+    包装站点任务，执行期间将站点连接池会话设置为当前线程的会话
+    """
+    def wrapper(site: dict) -> Tuple[str, str]:
+        if not pool:
+            return task(site)
+        with pool.lease(site.get("url")) as session, use_session(session):
+            return task(site)
+
+    return wrapper
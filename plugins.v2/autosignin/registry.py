@@ -0,0 +1,137 @@
+import importlib
+import pkgutil
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from app.log import logger
+
+# 站点签到模块所在的包
+SITES_PACKAGE = "app.plugins.autosignin.sites"
+
+# 站点域名 -> (模块名, 签到类名)，与各模块的 site_url 对应，命中后才导入对应模块
+SITE_HANDLERS: Dict[str, Tuple[str, str]] = {
+    "52pt.site": ("52pt", "Pt52"),
+    "pt.btschool.club": ("btschool", "BTSchool"),
+    "ptchdbits.co": ("chdbits", "CHDBits"),
+    "haidan.video": ("haidan", "HaiDan"),
+    "club.hares.top": ("hares", "Hares"),
+    "hdarea.club": ("hdarea", "HDArea"),
+    "hdchina.org": ("hdchina", "HDChina"),
+    "hdcity.city": ("hdcity", "HDCity"),
+    "hdsky.me": ("hdsky", "HDSky"),
+    "pt.hdupt.com": ("hdupt", "HDUpt"),
+    "v6.nexushd.org": ("nexushd", "NexusHD"),
+    "open.cd": ("opencd", "Opencd"),
+    "pterclub.com": ("pterclub", "PTerClub"),
+    "pttime.org": ("pttime", "PTTime"),
+    "rousi.pro": ("rousipro", "RousiPro"),
+    "tjupt.org": ("tjupt", "Tjupt"),
+    "totheglory.im": ("ttg", "TTG"),
+    "u2.dmhy.org": ("u2", "U2"),
+    "zhuque.in": ("zhuque", "ZhuQue"),
+}
+
+# 域名不固定的站点：(模块名, 签到类名, 匹配规则)，匹配规则与模块自身的 match 保持一致
+PATTERN_HANDLERS: List[Tuple[str, str, Callable[[str], bool]]] = [
+    ("mteam", "MTorrent", lambda url: "m-team" in url.split(".")),
+    ("yema", "YemaPT", lambda url: "yemapt.org" in url),
+]
+
+
+def site_host(url: Optional[str]) -> str:
+    """
+    返回与 StringUtils.url_equal 一致的站点域名：去掉协议、路径与 www. 前缀
+    """
+    if not url:
+        return ""
+    host = urlparse(url).netloc if url.startswith("http") else url.split("/")[0]
+    return host.replace("www.", "").lower()
+
+
+class SiteHandlerRegistry:
+    """
+    站点签到类索引：按域名查表分发，首次使用某个站点时才导入对应模块；
+    未登记在索引中的新模块在首次未命中时加载一次，仍按 match 匹配
+    """
+
+    def __init__(self, package: str = SITES_PACKAGE):
+        self._package = package
+        self._lock = threading.Lock()
+        # 域名 -> 签到类，未匹配的域名缓存为None
+        self._cache: Dict[str, Optional[type]] = {}
+        # 模块名 -> 签到类
+        self._classes: Dict[str, Optional[type]] = {}
+        # 未登记在索引中的签到类
+        self._extra: Optional[List[type]] = None
+
+    def get(self, url: Optional[str]) -> Optional[type]:
+        """
+        返回站点对应的签到类，没有专用签到类时返回None
+        """
+        host = site_host(url)
+        if not host:
+            return None
+        with self._lock:
+            if host not in self._cache:
+                self._cache[host] = self.__resolve(url, host)
+            return self._cache[host]
+
+    def loaded_modules(self) -> List[str]:
+        """
+        返回已导入的签到模块名
+        """
+        with self._lock:
+            return [name for name, handler in self._classes.items() if handler]
+
+    def __resolve(self, url: str, host: str) -> Optional[type]:
+        entry = SITE_HANDLERS.get(host)
+        if entry:
+            return self.__load(*entry)
+        for module_name, class_name, matcher in PATTERN_HANDLERS:
+            if matcher(url):
+                return self.__load(module_name, class_name)
+        for handler in self.__extra_handlers():
+            try:
+                if handler.match(url):
+                    return handler
+            except Exception as e:
+                logger.error("站点模块加载失败：%s" % str(e))
+        return None
+
+    def __load(self, module_name: str, class_name: str) -> Optional[type]:
+        if module_name not in self._classes:
+            try:
+                module = importlib.import_module(f"{self._package}.{module_name}")
+                self._classes[module_name] = getattr(module, class_name)
+            except Exception as e:
+                logger.error(f"站点模块 {module_name} 加载失败：{str(e)}")
+                self._classes[module_name] = None
+        return self._classes[module_name]
+
+    def __extra_handlers(self) -> List[type]:
+        """
+        加载签到目录中未登记到索引的模块，只在首次未命中时执行一次
+        """
+        if self._extra is not None:
+            return self._extra
+        self._extra = []
+        registered = {module_name for module_name, _ in SITE_HANDLERS.values()} \
+            | {module_name for module_name, _, _ in PATTERN_HANDLERS}
+        try:
+            package = importlib.import_module(self._package)
+        except Exception as e:
+            logger.error(f"站点模块目录加载失败：{str(e)}")
+            return self._extra
+        for module_info in pkgutil.iter_modules(package.__path__):
+            if module_info.name in registered or module_info.name.startswith("_"):
+                continue
+            try:
+                module = importlib.import_module(f"{self._package}.{module_info.name}")
+            except Exception as e:
+                logger.error(f"站点模块 {module_info.name} 加载失败：{str(e)}")
+                continue
+            for obj in vars(module).values():
+                if isinstance(obj, type) and obj.__module__ == module.__name__ and hasattr(obj, "match"):
+                    self._extra.append(obj)
+        return self._extra
@@ -1,7 +1,9 @@
 # -*- coding: utf-8 -*-
 import re
+import threading
 from abc import ABCMeta, abstractmethod
-from typing import Tuple
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional, Tuple
 
 import chardet
 from ruamel.yaml import CommentedMap
@@ -12,11 +14,34 @@ from app.log import logger
 from app.utils.http import RequestUtils
 from app.utils.string import StringUtils
 
+# 当前线程执行站点签到时使用的复用会话，由签到引擎按站点设置
+_session_local = threading.local()
+
+
+def current_session() -> Optional[Any]:
+    """
+    返回当前线程的站点复用会话，未设置时返回None，RequestUtils将使用独立请求
+    """
+    return getattr(_session_local, "session", None)
+
+
+@contextmanager
+def use_session(session: Optional[Any]) -> Iterator[None]:
+    """
+    在上下文内将会话设置为当前线程的站点复用会话
+    """
+    previous = current_session()
+    _session_local.session = session
+    try:
+        yield
+    finally:
+        _session_local.session = previous
+
 
 class _ISiteSigninHandler(metaclass=ABCMeta):
     """
     实现站点签到的基类，所有站点签到类都需要继承此类，并实现match和signin方法
-    实现类放置到sitesignin目录下将会自动加载
+    实现类放置到sitesignin目录下将会自动加载，在 registry.SITE_HANDLERS 中登记域名后改为按需导入
     """
     # 匹配的站点Url，每一个实现类都需要设置为自己的站点Url
     site_url = ""
@@ -73,6 +98,7 @@ class _ISiteSigninHandler(metaclass=ABCMeta):
                     "Cookie": cookie
                 }
             res = RequestUtils(headers=headers,
+                               session=current_session(),
                                proxies=settings.PROXY if proxy else None,
                                timeout=timeout or 20).get_res(url=url)
             if res is not None:
@@ -7,8 +7,8 @@ import uuid
 from collections import Counter
 from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, Union
-from urllib.parse import parse_qs, parse_qsl, unquote, urlencode, urljoin, urlparse, urlunparse
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+from urllib.parse import parse_qsl, urlencode, urljoin, urlparse, urlunparse
 from zoneinfo import ZoneInfo
 
 from apscheduler.triggers.cron import CronTrigger
@@ -36,7 +36,20 @@ from app.schemas.types import EventType
 from app.utils.http import RequestUtils
 from app.utils.string import StringUtils
 
-from .models import BrushFlowSettingsPayload, BrushTaskPayload, BrushTaskStatePayload
+from .batcher import DownloaderOperation, DownloaderOperationBatcher
+from .matcher import SubscribeTitleMatcher
+from .models import (
+    BrushFlowSettingsPayload,
+    BrushTaskPayload,
+    BrushTaskStatePayload,
+    GlobalDeleteSimulationPayload,
+)
+from .reservation import BrushReservationLedger
+from .rules import CompiledBrushRules
+from .simulation import replay_global_dynamic_delete
+from .siteindex import TrackerSiteIndex
+from .snapshot import DownloaderSnapshot, DownloaderSnapshotCache
+from .store import RECORD_BUCKETS, TorrentRecordStore
 
 
 TASK_CONFIG_FIELDS = (
@@ -213,28 +226,37 @@ class BrushFlow(_PluginBase):
     plugin_name = "站点刷流"
     plugin_desc = "自动托管多个站点刷流任务，并独立调度、统计与诊断。"
     plugin_icon = "brush-flow.png"
-    plugin_version = "5.2.3"
+    plugin_version = "5.5.1"
     plugin_author = "jxxghp,InfinityPacer,Seed680"
     author_url = "https://github.com/InfinityPacer"
     plugin_config_prefix = "brushflow_"
     plugin_order = 21
     auth_level = 2
 
-    DATA_SCHEMA_VERSION = 2
+    DATA_SCHEMA_VERSION = 3
     MAX_RUN_HISTORY = 50
+    DEFAULT_BRUSH_CONCURRENCY = 4
     GLOBAL_BRUSH_TAG = "刷流"
     TASK_DATA_NAMES = ("torrents", "archived", "unmanaged", "statistic", "runs")
+    # Tracker 地址到站点的识别结果与插件实例无关，重载插件后继续复用。
+    TRACKER_SITE_INDEX = TrackerSiteIndex()
 
     def init_plugin(self, config: dict = None) -> None:
         """初始化全局开关、任务配置、运行锁和历史数据迁移"""
         raw_config = config or {}
         self._task_context = threading.local()
         self._task_locks: Dict[str, threading.Lock] = {}
-        self._brush_lock = threading.Lock()
+        self._brush_ledger = BrushReservationLedger()
+        self._subscribe_lock = threading.Lock()
         self._global_delete_lock = threading.Lock()
         self._runtime_lock = threading.Lock()
         self._runtime: Dict[str, dict] = {}
         self._subscribe_infos: Dict[str, List[str]] = {}
+        self._subscribe_matcher: Optional[SubscribeTitleMatcher] = None
+        self._snapshot_cache = DownloaderSnapshotCache()
+        self._operation_batcher = DownloaderOperationBatcher(self._execute_downloader_operation)
+        if not getattr(self, "_record_store", None):
+            self._record_store = TorrentRecordStore(self.get_data_path() / "records.sqlite3")
         self._enabled = bool(raw_config.get("enabled", False))
         self._show_sidebar_nav = bool(raw_config.get("show_sidebar_nav", True))
 
@@ -254,6 +276,7 @@ class BrushFlow(_PluginBase):
             global_proxy_delete,
             raw_config.get("global_delete_size_range", legacy_delete_range),
         )
+        self._set_brush_concurrency(raw_config.get("global_brush_concurrency"))
 
         task_rows = raw_config.get("tasks") if isinstance(raw_config.get("tasks"), list) else None
         migrated = task_rows is None and bool(raw_config.get("brushsites"))
@@ -392,6 +415,20 @@ class BrushFlow(_PluginBase):
                 "auth": "bear",
                 "summary": "清除单个刷流任务数据",
             },
+            {
+                "path": "/global_delete/recording",
+                "endpoint": self.get_global_delete_recording,
+                "methods": ["GET"],
+                "auth": "bear",
+                "summary": "录制全局动态删种所需的下载器状态与任务记录",
+            },
+            {
+                "path": "/global_delete/simulate",
+                "endpoint": self.simulate_global_delete,
+                "methods": ["POST"],
+                "auth": "bear",
+                "summary": "离线模拟全局动态删种",
+            },
         ]
 
     def get_form(self) -> Tuple[List[dict], Dict[str, Any]]:
@@ -471,10 +508,14 @@ class BrushFlow(_PluginBase):
         return services
 
     def stop_service(self) -> None:
-        """插件不再维护私有调度器，公共服务由宿主统一停止"""
+        """插件不再维护私有调度器，公共服务由宿主统一停止；关闭记录库连接，重新初始化时再打开"""
         with getattr(self, "_runtime_lock", threading.Lock()):
             for runtime in getattr(self, "_runtime", {}).values():
                 runtime.update({"state": "idle", "operation": None})
+        record_store = getattr(self, "_record_store", None)
+        if record_store:
+            self._record_store = None
+            record_store.close()
 
     @property
     def service_info(self) -> Optional[ServiceInfo]:
@@ -510,6 +551,9 @@ class BrushFlow(_PluginBase):
             setattr(self, f"_{field}", getattr(payload, field))
         for field in GLOBAL_DYNAMIC_DELETE_FIELDS:
             setattr(self, f"_{field}", getattr(payload, field))
+        # 工作台表单暂未提供并行数，未提交该字段时保留当前配置。
+        if "global_brush_concurrency" in payload.model_fields_set:
+            self._set_brush_concurrency(payload.global_brush_concurrency)
         if global_dynamic_delete_was_enabled and not self._global_dynamic_delete_enabled():
             for task in self._task_configs.values():
                 if task.proxy_delete and not task.delete_size_range:
@@ -570,13 +614,12 @@ class BrushFlow(_PluginBase):
             return schemas.Response(success=False, message="刷流任务不存在")
         if self._is_task_busy(task_id):
             return schemas.Response(success=False, message="任务正在执行，请稍后再删除")
-        torrents = self._get_task_data(task_id, "torrents") or {}
-        active_count = sum(1 for item in torrents.values() if not item.get("deleted"))
-        if active_count:
+        if self._record_store.statistic(task_id)["active"]:
             return schemas.Response(success=False, message="任务仍有活跃种子，请先处理后再删除")
         self._task_configs.pop(task_id, None)
         self._task_locks.pop(task_id, None)
         self._runtime.pop(task_id, None)
+        self._record_store.clear_task(task_id)
         for data_name in self.TASK_DATA_NAMES:
             self.del_data(self._task_data_key(task_id, data_name))
         self._save_config()
@@ -612,10 +655,43 @@ class BrushFlow(_PluginBase):
             return schemas.Response(success=False, message="刷流任务不存在")
         if self._is_task_busy(task_id):
             return schemas.Response(success=False, message="任务正在执行，请稍后再清除")
-        for data_name in self.TASK_DATA_NAMES:
-            self._save_task_data(task_id, data_name, {} if data_name != "runs" else [])
+        self._record_store.clear_task(task_id)
+        self._save_task_data(task_id, "runs", [])
         return schemas.Response(success=True, data=self._build_task_detail(task_id))
 
+    def get_global_delete_recording(self) -> schemas.Response:
+        """录制当前下载器种子状态与任务记录，供离线回放全局动态删种"""
+        try:
+            return schemas.Response(success=True, data=self._record_global_delete_state())
+        except RuntimeError as err:
+            return schemas.Response(success=False, message=str(err))
+
+    def simulate_global_delete(self, payload: GlobalDeleteSimulationPayload) -> schemas.Response:
+        """按录制状态或当前状态回放多个检查周期，返回预计删除的种子与选择耗时"""
+        size_range = payload.delete_size_range or getattr(self, "_global_delete_size_range", None)
+        if not size_range:
+            return schemas.Response(success=False, message="未设置全局动态删种阈值")
+        downloaders, records = payload.downloaders, payload.records
+        if downloaders is None or records is None:
+            try:
+                recording = self._record_global_delete_state()
+            except RuntimeError as err:
+                return schemas.Response(success=False, message=str(err))
+            downloaders = recording["downloaders"] if downloaders is None else downloaders
+            records = recording["records"] if records is None else records
+        limits = [float(value) * 1024 ** 3 for value in size_range.split("-")]
+        result = replay_global_dynamic_delete(
+            downloaders,
+            build_candidates=lambda torrents: self._build_simulated_global_delete_candidates(torrents, records),
+            select_deletions=self._select_global_dynamic_deletions,
+            min_size=limits[0],
+            max_size=limits[1] if len(limits) > 1 else limits[0],
+            hours=payload.hours,
+            interval_minutes=payload.interval_minutes,
+            growth_per_hour=payload.growth_gb_per_hour * 1024 ** 3,
+        )
+        return schemas.Response(success=True, data=result)
+
     @eventmanager.register(EventType.PluginReload)
     def reload(self, event: Event) -> None:
         """插件重载后重新注册动态 API 和任务调度"""
@@ -623,6 +699,12 @@ class BrushFlow(_PluginBase):
             register_plugin_api(plugin_id=self.__class__.__name__)
             Scheduler().update_plugin_job(self.__class__.__name__)
 
+    @eventmanager.register(EventType.SiteUpdated)
+    @eventmanager.register(EventType.SiteDeleted)
+    def site_changed(self, event: Event) -> None:
+        """站点新增、修改或删除后使 Tracker 站点索引失效"""
+        self.TRACKER_SITE_INDEX.invalidate()
+
     def _current_config(self) -> Dict[str, Any]:
         """返回插件当前可持久化配置快照"""
         config = {
@@ -633,12 +715,20 @@ class BrushFlow(_PluginBase):
         }
         config.update({field: getattr(self, f"_{field}", None) for field in GLOBAL_LIMIT_FIELDS})
         config.update({field: getattr(self, f"_{field}", None) for field in GLOBAL_DYNAMIC_DELETE_FIELDS})
+        config["global_brush_concurrency"] = getattr(self, "_global_brush_concurrency", None)
         return config
 
     def _save_config(self) -> None:
         """保存全局设置和全部任务配置"""
         self.update_config(self._current_config())
 
+    def _set_brush_concurrency(self, value: Any) -> None:
+        """设置可同时获取站点候选并选种的任务数，未设置时使用默认并行数"""
+        parsed_value = BrushTaskConfig._parse_number(value)
+        concurrency = int(parsed_value) if parsed_value and parsed_value >= 1 else None
+        self._global_brush_concurrency = concurrency
+        self._brush_slots = threading.BoundedSemaphore(concurrency or self.DEFAULT_BRUSH_CONCURRENCY)
+
     def _refresh_scheduler(self) -> None:
         """通知宿主按最新任务列表重建插件服务"""
         try:
@@ -725,17 +815,56 @@ class BrushFlow(_PluginBase):
             self._log_and_notify_error(f"刷流任务 [{task.name}] 引用的站点或下载器不存在")
         return valid
 
-    @staticmethod
-    def _torrent_has_tag(torrent: Any, tag: str) -> bool:
-        """判断 qBittorrent 种子是否仍绑定指定标签"""
-        if not isinstance(torrent, dict):
+    def _get_downloader_snapshot(
+        self,
+        downloader_name: str,
+        service: Any,
+        qbittorrent: Optional[bool] = None,
+        fresh: bool = False,
+    ) -> Tuple[Optional[DownloaderSnapshot], bool]:
+        """从共享快照缓存获取下载器种子列表，返回快照及是否命中缓存；fresh 时丢弃旧快照重新采集"""
+        snapshot_cache = getattr(self, "_snapshot_cache", None)
+        if snapshot_cache is None:
+            self._snapshot_cache = DownloaderSnapshotCache()
+            snapshot_cache = self._snapshot_cache
+        if fresh:
+            snapshot_cache.invalidate(downloader_name)
+        if qbittorrent is None:
+            qbittorrent = DownloaderHelper().is_downloader("qbittorrent", service=service)
+        return snapshot_cache.get(downloader_name, service.instance.get_torrents, qbittorrent=bool(qbittorrent))
+
+    def _invalidate_downloader_snapshot(self, downloader_name: Optional[str]) -> None:
+        """下载器种子增删后丢弃对应快照，确保后续读取最新状态"""
+        snapshot_cache = getattr(self, "_snapshot_cache", None)
+        if snapshot_cache is not None and downloader_name:
+            snapshot_cache.invalidate(downloader_name)
+
+    def _submit_downloader_operations(self, operations: List[DownloaderOperation]) -> List[bool]:
+        """把删种、重新汇报和标签清理交给合并器，与同一窗口内其他任务的操作合并执行"""
+        batcher = getattr(self, "_operation_batcher", None)
+        if batcher is None:
+            self._operation_batcher = DownloaderOperationBatcher(self._execute_downloader_operation)
+            batcher = self._operation_batcher
+        return batcher.submit(operations)
+
+    def _execute_downloader_operation(self, downloader_name: str, service: Any, action: str, items: List[str]) -> bool:
+        """对单个下载器执行一次合并后的操作"""
+        downloader = getattr(service, "instance", None)
+        if not downloader:
             return False
-        tags = {
-            item.strip()
-            for item in str(torrent.get("tags") or "").split(",")
-            if item.strip()
-        }
-        return tag in tags
+        if action == "reannounce":
+            client = getattr(downloader, "qbc", None)
+            if client:
+                client.torrents_reannounce(torrent_hashes=items)
+            return True
+        if action == "delete":
+            try:
+                return bool(downloader.delete_torrents(ids=items, delete_file=True))
+            finally:
+                self._invalidate_downloader_snapshot(downloader_name)
+        if action == "delete_tags":
+            return self._delete_qbittorrent_tags(service, ",".join(items))
+        return False
 
     @staticmethod
     def _delete_qbittorrent_tags(service: Any, tags: Union[str, List[str]]) -> bool:
@@ -746,11 +875,7 @@ class BrushFlow(_PluginBase):
         client.torrents_delete_tags(tags=tags)
         return True
 
-    def _cleanup_unused_task_tag(
-        self,
-        task: BrushTaskConfig,
-        torrents: Optional[List[Any]] = None,
-    ) -> None:
+    def _cleanup_unused_task_tag(self, task: BrushTaskConfig) -> None:
         """仅删除不再被任何 qBittorrent 种子使用的任务唯一标签"""
         if not task or not task.downloader:
             return
@@ -759,21 +884,23 @@ class BrushFlow(_PluginBase):
             service = helper.get_service(name=task.downloader)
             if not service or not service.instance or not helper.is_downloader("qbittorrent", service=service):
                 return
-            if torrents is None:
-                torrents, error = service.instance.get_torrents()
-                if error:
-                    logger.warning(f"清理刷流任务 [{task.name}] 标签时获取下载器种子失败")
-                    return
-            if any(self._torrent_has_tag(torrent, task.brush_tag) for torrent in torrents or []):
+            # 删除标签不可逆，必须依据最新种子列表判断，不能使用可能已过期的缓存快照。
+            snapshot, _ = self._get_downloader_snapshot(task.downloader, service, qbittorrent=True, fresh=True)
+            if not snapshot:
+                logger.warning(f"清理刷流任务 [{task.name}] 标签时获取下载器种子失败")
+                return
+            if task.brush_tag in snapshot.used_tags():
                 return
-            if self._delete_qbittorrent_tags(service, task.brush_tag):
+            operation = DownloaderOperation(task.downloader, "delete_tags", [task.brush_tag], service)
+            if all(self._submit_downloader_operations([operation])):
                 logger.info(f"清理刷流任务 [{task.name}] 未使用标签：{task.brush_tag}")
         except Exception as err:
             # 标签清理失败不应影响刷流检查或任务删除主流程。
             logger.warning(f"清理刷流任务 [{task.name}] 标签失败：{str(err)}")
 
     def _cleanup_unused_task_tags(self) -> None:
-        """扫描全部 qBittorrent 下载器，清理历史遗留的刷流唯一标签"""
+        """扫描全部 qBittorrent 下载器，清理历史遗留的刷流唯一标签，各下载器的标签删除交给合并器执行"""
+        operations: List[DownloaderOperation] = []
         try:
             helper = DownloaderHelper()
             downloader_names = set(helper.get_configs().keys())
@@ -788,22 +915,18 @@ class BrushFlow(_PluginBase):
                 task_tags = [tag for tag in all_tags if tag.startswith("刷流-")]
                 if not task_tags:
                     continue
-                torrents, error = service.instance.get_torrents()
-                if error:
+                snapshot, _ = self._get_downloader_snapshot(downloader_name, service, qbittorrent=True, fresh=True)
+                if not snapshot:
                     logger.warning(f"扫描下载器 [{downloader_name}] 刷流标签时获取种子失败")
                     continue
-                used_tags = {
-                    tag
-                    for torrent in torrents or []
-                    for tag in {
-                        item.strip()
-                        for item in str(torrent.get("tags") or "").split(",")
-                        if item.strip()
-                    }
-                }
+                used_tags = snapshot.used_tags()
                 unused_tags = [tag for tag in task_tags if tag not in used_tags]
-                if unused_tags and self._delete_qbittorrent_tags(service, unused_tags):
-                    logger.info(f"清理下载器 [{downloader_name}] 未使用刷流标签：{','.join(unused_tags)}")
+                if unused_tags:
+                    operations.append(DownloaderOperation(downloader_name, "delete_tags", unused_tags, service))
+            results = self._submit_downloader_operations(operations)
+            for operation, result in zip(operations, results):
+                if result:
+                    logger.info(f"清理下载器 [{operation.downloader}] 未使用刷流标签：{','.join(operation.items)}")
         except Exception as err:
             logger.warning(f"扫描清理历史刷流标签失败：{str(err)}")
 
@@ -857,7 +980,12 @@ class BrushFlow(_PluginBase):
 
     def _migrate_legacy_data(self) -> None:
         """按站点把旧全局种子、归档和未托管记录迁移到任务命名空间"""
-        if (self.get_data("task_data_schema_version") or 0) >= self.DATA_SCHEMA_VERSION:
+        schema_version = self.get_data("task_data_schema_version") or 0
+        if schema_version >= self.DATA_SCHEMA_VERSION:
+            return
+        if schema_version == 2:
+            self._migrate_task_data_to_record_store()
+            self.save_data("task_data_schema_version", self.DATA_SCHEMA_VERSION)
             return
         tasks = list(self._task_configs.values())
         by_site_id = {str(task.site_id): task for task in tasks}
@@ -880,10 +1008,22 @@ class BrushFlow(_PluginBase):
                 current = self._get_task_data(task_id, data_name)
                 if not current and rows:
                     self._save_task_data(task_id, data_name, rows)
-        for task in tasks:
-            self._recalculate_statistics(task.id)
         self.save_data("task_data_schema_version", self.DATA_SCHEMA_VERSION)
 
+    def _migrate_task_data_to_record_store(self) -> None:
+        """把 V2 按任务整字典保存的种子记录逐行迁入记录库并清理旧数据键"""
+        for task_id in self._task_configs:
+            if self._record_store.has_records(task_id):
+                continue
+            # 各分组按行独立保存，同一 Hash 出现在多个分组时各自保留。
+            for data_name in RECORD_BUCKETS:
+                rows = self.get_data(self._task_data_key(task_id, data_name))
+                if isinstance(rows, dict) and rows:
+                    self._record_store.upsert(task_id, data_name, rows)
+        for task_id in self._task_configs:
+            for data_name in (*RECORD_BUCKETS, "statistic"):
+                self.del_data(self._task_data_key(task_id, data_name))
+
     @staticmethod
     def _get_site_name(site_id: int) -> Optional[str]:
         """按站点 ID 获取名称并兼容已删除站点"""
@@ -942,11 +1082,16 @@ class BrushFlow(_PluginBase):
         return f"task.{task_id}.{data_name}"
 
     def _get_task_data(self, task_id: str, data_name: str) -> Any:
-        """读取指定任务的独立持久化数据"""
+        """读取指定任务的独立持久化数据，种子记录分组由记录库提供"""
+        if data_name in RECORD_BUCKETS:
+            return self._record_store.load(task_id, data_name)
         return self.get_data(self._task_data_key(task_id, data_name))
 
     def _save_task_data(self, task_id: str, data_name: str, value: Any) -> None:
-        """保存指定任务的独立持久化数据"""
+        """保存指定任务的独立持久化数据，种子记录分组只写入变化的行"""
+        if data_name in RECORD_BUCKETS:
+            self._record_store.replace(task_id, data_name, value or {})
+            return
         self.save_data(self._task_data_key(task_id, data_name), value)
 
     def _current_task_data(self, data_name: str, default: Any = None) -> Any:
@@ -1050,13 +1195,19 @@ class BrushFlow(_PluginBase):
             {"title": item.name, "value": item.name}
             for item in DownloaderHelper().get_configs().values()
         ]
+        snapshot_cache = getattr(self, "_snapshot_cache", None)
+        operation_batcher = getattr(self, "_operation_batcher", None)
         return {
             "enabled": self.get_state(),
             "show_sidebar_nav": self._show_sidebar_nav,
             **{field: getattr(self, f"_{field}", None) for field in GLOBAL_LIMIT_FIELDS},
             **{field: getattr(self, f"_{field}", None) for field in GLOBAL_DYNAMIC_DELETE_FIELDS},
+            "global_brush_concurrency": getattr(self, "_global_brush_concurrency", None),
             "summary": aggregate,
             "tasks": task_rows,
+            "downloader_snapshots": snapshot_cache.stats() if snapshot_cache else {},
+            "tracker_site_index": self.TRACKER_SITE_INDEX.stats(),
+            "downloader_operations": operation_batcher.stats() if operation_batcher else {},
             "options": {"sites": site_options, "downloaders": downloader_options},
         }
 
@@ -1070,7 +1221,6 @@ class BrushFlow(_PluginBase):
         if not task:
             return {}
         statistic = self._get_statistic_info(task_id)
-        torrents = self._get_task_data(task_id, "torrents") or {}
         history = self._get_task_data(task_id, "runs") or []
         runtime = dict(self._runtime.get(task_id, {}))
         site_ratio = self._build_site_ratio_status(task, site_user_data_by_domain)
@@ -1107,7 +1257,7 @@ class BrushFlow(_PluginBase):
             "next_run_at": self._next_run_at(task, history),
             "last_run": history[0] if history else None,
             "statistic": statistic,
-            "seeding_size": self.__calculate_seeding_torrents_size(torrents),
+            "seeding_size": self._record_store.seeding_size([task_id]),
             "site_ratio": site_ratio,
         }
 
@@ -1196,19 +1346,12 @@ class BrushFlow(_PluginBase):
     ) -> Dict[str, Any]:
         """组装任务编辑、概览、诊断与分页种子数据"""
         task = self._task_configs[task_id]
-        torrents = self._get_task_data(task_id, "torrents") or {}
-        archived = self._get_task_data(task_id, "archived") or {}
-        rows = list(torrents.values())
-        if state == "active":
-            rows = [row for row in rows if not row.get("deleted")]
-        elif state == "deleted":
-            rows = [row for row in rows if row.get("deleted")] + list(archived.values())
-        else:
-            rows.extend(archived.values())
-        rows.sort(key=lambda item: item.get("time") or 0, reverse=True)
-        total = len(rows)
-        start = (page - 1) * page_size
-        selected_rows = rows[start : start + page_size]
+        selected_rows, total = self._record_store.page(
+            task_id,
+            state,
+            offset=(page - 1) * page_size,
+            limit=page_size,
+        )
         return {
             "task": task.to_dict(),
             "summary": self._task_summary(task_id),
@@ -1251,8 +1394,13 @@ class BrushFlow(_PluginBase):
             return
         report = self._new_run_report("brush")
         self._set_runtime(task.id, state="running", operation="brush", last_error=None)
+        brush_slots = getattr(self, "_brush_slots", None)
+        if brush_slots is None:
+            self._set_brush_concurrency(None)
+            brush_slots = self._brush_slots
         try:
-            with self._brush_lock, self._task_scope(task.id):
+            # 站点拉取和选种可按并行数同时执行，体积预留与提交由记录台账串行处理。
+            with brush_slots, self._task_scope(task.id):
                 self._run_brush(task, report)
             report["success"] = report.get("result") not in {"downloader_unavailable", "site_missing"}
         except Exception as err:
@@ -1287,9 +1435,7 @@ class BrushFlow(_PluginBase):
             report["result"] = "site_ratio_blocked"
             report["reason_counts"][ratio_reason] = 1
             return
-        torrent_tasks: Dict[str, dict] = self._current_task_data("torrents", {})
-        seeding_size = self.__calculate_seeding_torrents_size(torrent_tasks)
-        global_seeding_size = self._calculate_global_seeding_size(task.id, torrent_tasks)
+        seeding_size, global_seeding_size = self._reserved_seeding_sizes(task.id)
         passed, reason = self.__evaluate_size_condition_for_brush(
             seeding_size,
             global_torrents_size=global_seeding_size,
@@ -1303,74 +1449,86 @@ class BrushFlow(_PluginBase):
             report["result"] = "precondition_blocked"
             report["reason_counts"][reason] = 1
             return
-        all_torrent_tasks = self._load_all_torrent_tasks()
-        subscribe_titles = self.__get_subscribe_titles()
-        self.__brush_site_torrents(
-            site=site,
-            torrent_tasks=torrent_tasks,
-            all_torrent_tasks=all_torrent_tasks,
-            subscribe_titles=subscribe_titles,
-            report=report,
-            global_seeding_size=global_seeding_size,
-        )
-        self._save_current_task_data("torrents", torrent_tasks)
-        self._recalculate_statistics(task.id)
+        ledger = self._get_brush_ledger()
+        cursor = ledger.begin(task.id)
+        try:
+            # 登记游标后读取一次下载中数量，之后提交的种子由台账按游标补齐，逐个候选复核时不再访问下载器
+            downloading_counts = self.__get_downloading_counts()
+            all_torrent_tasks = self._load_all_torrent_tasks()
+            subscribe_matcher = self.__get_subscribe_matcher()
+            self.__brush_site_torrents(
+                site=site,
+                all_torrent_tasks=all_torrent_tasks,
+                subscribe_matcher=subscribe_matcher,
+                report=report,
+                ledger_cursor=cursor,
+                downloading_counts=downloading_counts,
+            )
+        finally:
+            ledger.end(task.id)
+
+    def _get_brush_ledger(self) -> BrushReservationLedger:
+        """返回并行刷流共享的体积预留台账"""
+        ledger = getattr(self, "_brush_ledger", None)
+        if ledger is None:
+            self._brush_ledger = BrushReservationLedger()
+            ledger = self._brush_ledger
+        return ledger
+
+    def _reserved_seeding_sizes(self, task_id: str) -> Tuple[float, float]:
+        """返回任务与全局做种体积，包含其他任务已预留但尚未提交的种子"""
+        ledger = self._get_brush_ledger()
+        with ledger.lock:
+            return (
+                self._record_store.seeding_size([task_id]) + ledger.pending_size(task_id),
+                self._calculate_global_seeding_size() + ledger.pending_size(),
+            )
 
     def _load_all_torrent_tasks(self) -> Dict[str, dict]:
         """聚合所有任务的当前记录以保持跨站点重复种子保护"""
-        rows: Dict[str, dict] = {}
-        for task_id in self._task_configs:
-            task_rows = self._get_task_data(task_id, "torrents") or {}
-            rows.update(task_rows)
-        return rows
+        return self._record_store.load_many(self._task_configs, "torrents")
 
-    def _calculate_global_seeding_size(
-        self,
-        current_task_id: Optional[str] = None,
-        current_torrent_tasks: Optional[Dict[str, dict]] = None,
-    ) -> float:
-        """汇总所有任务未删除种子的体积，并允许使用当前任务的内存快照。"""
-        total_size = 0.0
-        for task_id in self._task_configs:
-            if task_id == current_task_id and current_torrent_tasks is not None:
-                task_rows = current_torrent_tasks
-            else:
-                task_rows = self._get_task_data(task_id, "torrents") or {}
-            total_size += self.__calculate_seeding_torrents_size(task_rows)
-        return total_size
+    def _calculate_global_seeding_size(self) -> float:
+        """读取记录库维护的全部任务未删除种子累计体积。"""
+        return self._record_store.seeding_size(self._task_configs)
 
     def __brush_site_torrents(
         self,
         site: Any,
-        torrent_tasks: Dict[str, dict],
         all_torrent_tasks: Dict[str, dict],
-        subscribe_titles: Set[str],
+        subscribe_matcher: Optional[SubscribeTitleMatcher],
         report: dict,
-        global_seeding_size: float,
-    ) -> None:
-        """获取当前任务站点候选并逐项执行保留的选种规则"""
+        ledger_cursor: int = 0,
+        downloading_counts: Optional[Tuple[Optional[int], Optional[int]]] = None,
+    ) -> Dict[str, dict]:
+        """获取当前任务站点候选并逐项执行保留的选种规则，返回本轮新增记录"""
         task = self._get_task_config()
+        added_tasks: Dict[str, dict] = {}
         logger.info(f"刷流任务 [{task.name}] 开始获取站点 {site.name} 的新种子")
         torrents = TorrentsChain().rss(domain=site.domain) if task.rss_support else TorrentsChain().browse(domain=site.domain)
         if not torrents:
             report["result"] = "no_candidates"
-            return
+            return added_tasks
         report["source_count"] = len(torrents)
         if task.except_subscribe:
             before_count = len(torrents)
-            torrents = self.__filter_torrents_contains_subscribe(torrents, subscribe_titles)
+            torrents = self.__filter_torrents_contains_subscribe(torrents, subscribe_matcher)
             report["subscription_excluded"] = before_count - len(torrents)
             if report["subscription_excluded"]:
                 report["reason_counts"]["命中订阅内容"] = report["subscription_excluded"]
         report["candidate_count"] = len(torrents)
         torrents.sort(key=lambda item: item.pubdate or "", reverse=True)
-        seeding_size = self.__calculate_seeding_torrents_size(torrent_tasks)
         for torrent in torrents:
-            passed, reason = self.__evaluate_pre_conditions_for_brush(include_network_conditions=False)
+            passed, reason = self.__evaluate_pre_conditions_for_brush(
+                include_network_conditions=False,
+                downloading_counts=downloading_counts,
+                ledger_cursor=ledger_cursor,
+            )
             if not passed:
                 report["reason_counts"][reason] += 1
                 report["result"] = "precondition_blocked"
                 break
+            seeding_size, global_seeding_size = self._reserved_seeding_sizes(task.id)
             passed, reason = self.__evaluate_size_condition_for_brush(
                 seeding_size,
                 torrent.size,
@@ -1379,19 +1537,33 @@ class BrushFlow(_PluginBase):
             if not passed:
                 report["reason_counts"][reason] += 1
                 continue
-            passed, reason = self.__evaluate_conditions_for_brush(torrent, all_torrent_tasks)
+            passed, reason = self.__evaluate_conditions_for_brush(
+                torrent,
+                all_torrent_tasks,
+                rule_stats=report["rule_stats"],
+            )
             if not passed:
                 report["reason_counts"][reason] += 1
                 continue
-            hash_string = self.__download(torrent)
+            token, reason = self.__reserve_brush_torrent(
+                torrent, site, all_torrent_tasks, ledger_cursor, downloading_counts
+            )
+            if not token:
+                report["reason_counts"][reason] += 1
+                continue
+            try:
+                hash_string = self.__download(torrent)
+            except Exception:
+                self._get_brush_ledger().release(token)
+                raise
             if not hash_string:
+                self._get_brush_ledger().release(token)
                 report["reason_counts"]["下载器添加失败"] += 1
                 continue
             torrent_task = self._torrent_to_task_record(torrent, site, task)
-            torrent_tasks[hash_string] = torrent_task
+            self.__commit_brush_torrent(token, hash_string, torrent_task)
+            added_tasks[hash_string] = torrent_task
             all_torrent_tasks[hash_string] = torrent_task
-            seeding_size += torrent.size
-            global_seeding_size += torrent.size
             report["added_count"] += 1
             report["added_titles"].append(torrent.title)
             self.eventmanager.send_event(
@@ -1407,7 +1579,65 @@ class BrushFlow(_PluginBase):
             logger.info(f"刷流任务 [{task.name}] 新增种子：{torrent.title}|{torrent.description}")
             self.__send_add_message(torrent)
         report["filtered_count"] = max(report["candidate_count"] - report["added_count"], 0)
+        for rule_stats in report["rule_stats"].values():
+            rule_stats["elapsed_ms"] = round(rule_stats["elapsed_ms"], 3)
         report["result"] = "completed"
+        return added_tasks
+
+    def __reserve_brush_torrent(
+        self,
+        torrent: TorrentInfo,
+        site: Any,
+        all_torrent_tasks: Dict[str, dict],
+        ledger_cursor: int,
+        downloading_counts: Optional[Tuple[Optional[int], Optional[int]]] = None,
+    ) -> Tuple[Optional[int], Optional[str]]:
+        """串行复核其他任务新提交或预留的种子、同时下载数与保种体积，通过后预留体积"""
+        task = self._get_task_config()
+        ledger = self._get_brush_ledger()
+        if downloading_counts is None:
+            downloading_counts = self.__get_downloading_counts()
+        with ledger.lock:
+            # 并行任务可能同时通过了下载数前置检查，需在临界区内计入彼此的预留与提交后复核；
+            # 下载器数量已在临界区外读取，锁内只做台账计数。
+            passed, reason = self.__evaluate_downloading_count_for_brush(downloading_counts, ledger_cursor)
+            if not passed:
+                return None, reason
+            # 并行任务读取全部记录后，其他任务可能已新增同名种子或占用全局保种体积。
+            all_torrent_tasks.update(ledger.committed_since(ledger_cursor))
+            passed, reason = self.__evaluate_conditions_for_brush(
+                torrent,
+                {**all_torrent_tasks, **ledger.pending_records()},
+            )
+            if not passed:
+                return None, reason
+            seeding_size, global_seeding_size = self._reserved_seeding_sizes(task.id)
+            passed, reason = self.__evaluate_size_condition_for_brush(
+                seeding_size,
+                torrent.size,
+                global_torrents_size=global_seeding_size,
+            )
+            if not passed:
+                return None, reason
+            token = ledger.reserve(
+                task.id,
+                {
+                    "downloader": task.downloader,
+                    "site_name": site.name,
+                    "title": torrent.title,
+                    "page_url": torrent.page_url,
+                    "size": torrent.size,
+                },
+            )
+        return token, None
+
+    def __commit_brush_torrent(self, token: int, hash_string: str, torrent_task: dict) -> None:
+        """把已添加到下载器的种子写入记录库，并在同一临界区撤销体积预留"""
+        task = self._get_task_config()
+        ledger = self._get_brush_ledger()
+        with ledger.lock:
+            self._record_store.upsert(task.id, "torrents", {hash_string: torrent_task})
+            ledger.commit(token, hash_string, torrent_task)
 
     @staticmethod
     def _torrent_to_task_record(torrent: TorrentInfo, site: Any, task: BrushTaskConfig) -> dict:
@@ -1457,6 +1687,7 @@ class BrushFlow(_PluginBase):
             "deleted_count": 0,
             "active_count": 0,
             "reason_counts": Counter(),
+            "rule_stats": {},
             "added_titles": [],
         }
 
@@ -1500,16 +1731,16 @@ class BrushFlow(_PluginBase):
     def __evaluate_pre_conditions_for_brush(
         self,
         include_network_conditions: bool = True,
+        downloading_counts: Optional[Tuple[Optional[int], Optional[int]]] = None,
+        ledger_cursor: Optional[int] = None,
     ) -> Tuple[bool, Optional[str]]:
         """校验单任务与全局下载并发及上传下载带宽。"""
         task = self._get_task_config()
         if not task:
             return False, "任务配置不存在"
-        global_maxdlcount = getattr(self, "_global_maxdlcount", None)
-        if global_maxdlcount and self.__get_global_downloading_count() >= int(global_maxdlcount):
-            return False, f"全局同时下载任务数达到上限 {global_maxdlcount}"
-        if task.maxdlcount and self.__get_downloading_count() >= int(task.maxdlcount):
-            return False, f"同时下载任务数达到上限 {task.maxdlcount}"
+        passed, reason = self.__evaluate_downloading_count_for_brush(downloading_counts, ledger_cursor)
+        if not passed:
+            return passed, reason
         if not include_network_conditions:
             return True, None
         avg_upload_speed, avg_download_speed = self.__get_average_bandwidth()
@@ -1527,15 +1758,83 @@ class BrushFlow(_PluginBase):
             return False, f"总下载带宽达到上限 {task.maxdlspeed} KB/s"
         return True, None
 
+    def __get_downloading_counts(self) -> Tuple[Optional[int], Optional[int]]:
+        """从下载器读取全局与当前任务的下载中数量，未设置上限的一项返回None"""
+        task = self._get_task_config()
+        global_count = self.__get_global_downloading_count() if getattr(self, "_global_maxdlcount", None) else None
+        task_count = self.__get_downloading_count() if task and task.maxdlcount else None
+        return global_count, task_count
+
+    def __evaluate_downloading_count_for_brush(
+        self,
+        downloading_counts: Optional[Tuple[Optional[int], Optional[int]]] = None,
+        ledger_cursor: Optional[int] = None,
+    ) -> Tuple[bool, Optional[str]]:
+        """
+        校验单任务与全局同时下载数，已预留但尚未添加到下载器的种子一并计入
+
+        :param downloading_counts: 已读取的全局与任务下载中数量，未传入时从下载器读取
+        :param ledger_cursor: 读取下载中数量前登记的台账游标，之后提交的种子一并计入
+        """
+        task = self._get_task_config()
+        ledger = self._get_brush_ledger()
+        global_count, task_count = downloading_counts or self.__get_downloading_counts()
+        global_maxdlcount = getattr(self, "_global_maxdlcount", None)
+        if global_maxdlcount and global_count is not None:
+            downloading_count = global_count + ledger.pending_count()
+            if ledger_cursor is not None:
+                downloading_count += ledger.committed_count(ledger_cursor)
+            if downloading_count >= int(global_maxdlcount):
+                return False, f"全局同时下载任务数达到上限 {global_maxdlcount}"
+        if task.maxdlcount and task_count is not None:
+            downloading_count = task_count + ledger.pending_count(task_id=task.id)
+            if ledger_cursor is not None:
+                downloading_count += ledger.committed_count(ledger_cursor, task_id=task.id)
+            if downloading_count >= int(task.maxdlcount):
+                return False, f"同时下载任务数达到上限 {task.maxdlcount}"
+        return True, None
+
     def __evaluate_conditions_for_brush(
         self,
         torrent: TorrentInfo,
         torrent_tasks: Dict[str, dict],
+        rule_stats: Optional[Dict[str, dict]] = None,
     ) -> Tuple[bool, Optional[str]]:
-        """按原有促销、H&R、规则、体积、人数和发布时间筛选候选"""
+        """先执行预编译的任务规则，再按已有记录排除重复种子"""
         task = self._get_task_config()
         if not task:
             return False, "任务配置不存在"
+        passed, reason = self._compiled_brush_rules(task).evaluate(torrent, rule_stats)
+        if not passed:
+            return passed, reason
+        if rule_stats is None:
+            return self.__evaluate_duplicate_for_brush(torrent, torrent_tasks)
+        started = time.perf_counter()
+        passed, reason = self.__evaluate_duplicate_for_brush(torrent, torrent_tasks)
+        duplicate_stats = rule_stats.setdefault("duplicate", {"checked": 0, "rejected": 0, "elapsed_ms": 0.0})
+        duplicate_stats["checked"] += 1
+        duplicate_stats["elapsed_ms"] += (time.perf_counter() - started) * 1000
+        if not passed:
+            duplicate_stats["rejected"] += 1
+        return passed, reason
+
+    def _compiled_brush_rules(self, task: BrushTaskConfig) -> CompiledBrushRules:
+        """返回任务的预编译规则链，任务规则字段变化后重新编译"""
+        compiled_rules = getattr(self, "_compiled_rules", None)
+        if compiled_rules is None:
+            self._compiled_rules = compiled_rules = {}
+        rules = compiled_rules.get(task.id)
+        if not rules or rules.fingerprint != CompiledBrushRules.fingerprint_of(task):
+            rules = CompiledBrushRules(task)
+            compiled_rules[task.id] = rules
+        return rules
+
+    @staticmethod
+    def __evaluate_duplicate_for_brush(
+        torrent: TorrentInfo,
+        torrent_tasks: Dict[str, dict],
+    ) -> Tuple[bool, Optional[str]]:
+        """排除同站点重复种子及其他站点尚未下载完成的同名种子"""
         task_key = f"{torrent.site_name}{torrent.title}"
         if any(task_key == f"{item.get('site_name')}{item.get('title')}" for item in torrent_tasks.values()):
             return False, "重复种子"
@@ -1551,46 +1850,6 @@ class BrushFlow(_PluginBase):
             for item in torrent_tasks.values()
         ):
             return False, "其他站点存在尚未下载完成的相同种子"
-        if task.freeleech and torrent.downloadvolumefactor != 0:
-            return False, "非免费种子"
-        if task.freeleech == "2xfree" and torrent.uploadvolumefactor != 2:
-            return False, "非双倍上传种子"
-        if task.hr == "yes" and torrent.hit_and_run:
-            return False, "存在 H&R"
-        if task.include:
-            include_match = bool(
-                (torrent.title and re.search(task.include, torrent.title, re.I))
-                or (torrent.description and re.search(task.include, torrent.description, re.I))
-            )
-            if not include_match:
-                return False, "不符合包含规则"
-        if task.exclude:
-            exclude_match = bool(
-                (torrent.title and re.search(task.exclude, torrent.title, re.I))
-                or (torrent.description and re.search(task.exclude, torrent.description, re.I))
-            )
-            if exclude_match:
-                return False, "符合排除规则"
-        if task.size:
-            size_range = [float(value) * 1024 ** 3 for value in task.size.split("-")]
-            if len(size_range) == 1 and torrent.size < size_range[0]:
-                return False, "种子大小低于下限"
-            if len(size_range) > 1 and not size_range[0] <= torrent.size <= size_range[1]:
-                return False, "种子大小不在范围内"
-        if task.seeder:
-            seeder_range = [float(value) for value in task.seeder.split("-")]
-            seeders = torrent.seeders or 0
-            if len(seeder_range) == 1 and seeders > seeder_range[0]:
-                return False, "做种人数超过上限"
-            if len(seeder_range) > 1 and not seeder_range[0] <= seeders <= seeder_range[1]:
-                return False, "做种人数不在范围内"
-        if task.pubtime:
-            pubdate_minutes = self.__get_pubminutes(torrent.pubdate) - task.timezone_offset * 60
-            pubtime_range = [float(value) for value in task.pubtime.split("-")]
-            if len(pubtime_range) == 1 and pubdate_minutes > pubtime_range[0]:
-                return False, "发布时间超过上限"
-            if len(pubtime_range) > 1 and not pubtime_range[0] <= pubdate_minutes <= pubtime_range[1]:
-                return False, "发布时间不在范围内"
         return True, None
 
     def check(self, task_id: Optional[str] = None, wait_for_lock: bool = False) -> None:
@@ -1629,28 +1888,38 @@ class BrushFlow(_PluginBase):
 
     def _run_check(self, task: BrushTaskConfig, report: dict) -> None:
         """在已绑定任务上下文中执行刷流种子检查"""
-        if not self._validate_task_reference(task) or not self.downloader:
+        service = self.service_info if self._validate_task_reference(task) else None
+        if not service:
             report["result"] = "downloader_unavailable"
             return
         torrent_tasks: Dict[str, dict] = self._current_task_data("torrents", {})
         unmanaged_tasks: Dict[str, dict] = self._current_task_data("unmanaged", {})
-        downloader = self.downloader
-        seeding_torrents, error = downloader.get_torrents()
-        if error:
+        is_qbittorrent = DownloaderHelper().is_downloader("qbittorrent", service=service)
+        snapshot, snapshot_hit = self._get_downloader_snapshot(task.downloader, service, qbittorrent=is_qbittorrent)
+        if not snapshot:
             report["result"] = "downloader_error"
             raise RuntimeError("连接下载器出错")
-        seeding_torrents_dict = {self.__get_hash(torrent): torrent for torrent in seeding_torrents}
-        self.__update_seeding_tasks_based_on_tags(torrent_tasks, unmanaged_tasks, seeding_torrents_dict)
+        report["downloader_snapshot"] = {"hit": snapshot_hit, "age": round(snapshot.age, 1)}
+        if is_qbittorrent:
+            self.__update_seeding_tasks_based_on_tags(torrent_tasks, unmanaged_tasks, snapshot)
         check_hashes = list(torrent_tasks.keys())
         if not check_hashes:
-            self._cleanup_unused_task_tag(task, torrents=seeding_torrents)
+            self._save_current_task_data("torrents", torrent_tasks)
+            self._save_current_task_data("unmanaged", unmanaged_tasks)
+            self._cleanup_unused_task_tag(task)
             report.update({"result": "no_managed_torrents", "active_count": 0})
-            self._recalculate_statistics(task.id)
             return
-        check_torrents = [seeding_torrents_dict[item] for item in check_hashes if item in seeding_torrents_dict]
+        check_torrents = {
+            torrent_hash: snapshot.by_hash[torrent_hash]
+            for torrent_hash in check_hashes
+            if torrent_hash in snapshot.by_hash
+        }
         self.__update_torrent_tasks_state(check_torrents, torrent_tasks)
-        self.__update_undeleted_torrents_missing_in_downloader(torrent_tasks, check_hashes, seeding_torrents)
-        filtered_torrents = self.__filter_torrents_by_tag(check_torrents, task.delete_except_tags)
+        self.__update_undeleted_torrents_missing_in_downloader(torrent_tasks, check_hashes, snapshot.by_hash)
+        filtered_torrents = [
+            check_torrents[torrent_hash]
+            for torrent_hash in self.__filter_hashes_by_tag(check_torrents, task.delete_except_tags, snapshot)
+        ]
         if self._global_dynamic_delete_enabled():
             need_delete_hashes = []
         elif task.proxy_delete and task.delete_size_range:
@@ -1658,23 +1927,20 @@ class BrushFlow(_PluginBase):
         else:
             need_delete_hashes = self.__delete_torrent_for_evaluate_conditions(filtered_torrents, torrent_tasks)
         need_delete_hashes = list(dict.fromkeys(need_delete_hashes or []))
-        deleted_from_downloader = False
         if need_delete_hashes:
-            if DownloaderHelper().is_downloader("qbittorrent", service=self.service_info):
-                self.__qb_torrents_reannounce(need_delete_hashes)
-            if downloader.delete_torrents(ids=need_delete_hashes, delete_file=True):
-                deleted_from_downloader = True
+            operations = [DownloaderOperation(task.downloader, "delete", need_delete_hashes, service)]
+            if is_qbittorrent:
+                operations.insert(0, DownloaderOperation(task.downloader, "reannounce", need_delete_hashes, service))
+            self._submit_downloader_operations(operations)
+            if operations[-1].result:
                 for torrent_hash in need_delete_hashes:
                     if torrent_hash in torrent_tasks:
                         torrent_tasks[torrent_hash]["deleted"] = True
                         torrent_tasks[torrent_hash]["deleted_time"] = time.time()
         self.__auto_archive_tasks(torrent_tasks)
-        self._cleanup_unused_task_tag(
-            task,
-            torrents=None if deleted_from_downloader else seeding_torrents,
-        )
+        self._cleanup_unused_task_tag(task)
         self._save_current_task_data("torrents", torrent_tasks)
-        self._recalculate_statistics(task.id)
+        self._save_current_task_data("unmanaged", unmanaged_tasks)
         report.update(
             {
                 "result": "completed",
@@ -1683,10 +1949,9 @@ class BrushFlow(_PluginBase):
             }
         )
 
-    def __update_torrent_tasks_state(self, torrents: List[Any], torrent_tasks: Dict[str, dict]) -> None:
-        """更新当前任务种子的上下传、分享率和做种时间"""
-        for torrent in torrents:
-            torrent_hash = self.__get_hash(torrent)
+    def __update_torrent_tasks_state(self, torrents: Dict[str, Any], torrent_tasks: Dict[str, dict]) -> None:
+        """按 Hash 索引更新当前任务种子的上下传、分享率和做种时间"""
+        for torrent_hash, torrent in torrents.items():
             torrent_task = torrent_tasks.get(torrent_hash)
             if not torrent_task:
                 continue
@@ -1704,17 +1969,17 @@ class BrushFlow(_PluginBase):
         self,
         torrent_tasks: Dict[str, dict],
         unmanaged_tasks: Dict[str, dict],
-        seeding_torrents_dict: Dict[str, Any],
+        snapshot: DownloaderSnapshot,
     ) -> None:
-        """按任务唯一标签同步 qBittorrent 中的纳管和移除状态"""
+        """按快照中预提取的任务唯一标签同步 qBittorrent 中的纳管和移除状态"""
         task = self._get_task_config()
-        if not task or not DownloaderHelper().is_downloader("qbittorrent", service=self.service_info):
+        if not task:
             return
         added_tasks: List[dict] = []
         removed_tasks: List[dict] = []
         reset_tasks: List[dict] = []
-        for torrent_hash, torrent in seeding_torrents_dict.items():
-            tags = self.__get_label(torrent)
+        for torrent_hash, torrent in snapshot.by_hash.items():
+            tags = snapshot.tags[torrent_hash]
             has_unique_tag = task.brush_tag in tags
             has_global_tag = self.GLOBAL_BRUSH_TAG in tags
             existing = torrent_hash in torrent_tasks
@@ -1737,8 +2002,6 @@ class BrushFlow(_PluginBase):
             elif existing:
                 unmanaged_tasks[torrent_hash] = torrent_tasks.pop(torrent_hash)
                 removed_tasks.append(unmanaged_tasks[torrent_hash])
-        self._save_current_task_data("torrents", torrent_tasks)
-        self._save_current_task_data("unmanaged", unmanaged_tasks)
         if added_tasks:
             self.__log_and_send_torrent_task_update_message(
                 "【刷流任务种子加入】", "纳入刷流管理", "刷流任务标签匹配", added_tasks
@@ -1977,7 +2240,7 @@ class BrushFlow(_PluginBase):
         total_size = 0.0
         task_records: Dict[str, Dict[str, dict]] = {}
         services: Dict[str, ServiceInfo] = {}
-        downloader_cache: Dict[str, Tuple[ServiceInfo, List[Any]]] = {}
+        snapshots: Dict[str, DownloaderSnapshot] = {}
         counted_torrents: Set[Tuple[str, str]] = set()
         associated_records: Dict[Tuple[str, str], List[Tuple[BrushTaskConfig, dict]]] = {}
         downloader_helper = DownloaderHelper()
@@ -1995,42 +2258,37 @@ class BrushFlow(_PluginBase):
             if not task.enabled:
                 continue
             torrent_tasks = task_records[task.id]
-            if task.downloader not in downloader_cache:
+            if task.downloader not in snapshots:
                 service = downloader_helper.get_service(name=task.downloader)
                 if not service or not service.instance or service.instance.is_inactive():
                     raise RuntimeError(
                         f"全局动态删种无法获取下载器 [{task.downloader}] 实时状态，本轮已中止"
                     )
-                torrents, error = service.instance.get_torrents()
-                if error:
+                # 与同一调度周期内各任务检查共享短时快照，避免重复拉取完整种子列表。
+                snapshot, _ = self._get_downloader_snapshot(task.downloader, service)
+                if not snapshot:
                     raise RuntimeError(
                         f"全局动态删种获取下载器 [{task.downloader}] 种子失败，本轮已中止"
                     )
-                downloader_cache[task.downloader] = (service, torrents or [])
+                snapshots[task.downloader] = snapshot
                 services[task.downloader] = service
 
-            service, downloader_torrents = downloader_cache[task.downloader]
+            snapshot = snapshots[task.downloader]
             with self._task_scope(task.id):
-                downloader_torrent_map: Dict[str, Any] = {}
-                for torrent in downloader_torrents:
-                    torrent_hash = self.__get_hash(torrent)
-                    if torrent_hash:
-                        downloader_torrent_map[torrent_hash] = torrent
                 check_hashes = list(torrent_tasks)
-                check_torrents = [
-                    downloader_torrent_map[torrent_hash]
+                check_torrents = {
+                    torrent_hash: snapshot.by_hash[torrent_hash]
                     for torrent_hash in check_hashes
-                    if torrent_hash in downloader_torrent_map
-                ]
+                    if torrent_hash in snapshot.by_hash
+                }
                 self.__update_torrent_tasks_state(check_torrents, torrent_tasks)
                 self.__update_undeleted_torrents_missing_in_downloader(
                     torrent_tasks,
                     check_hashes,
-                    downloader_torrents,
+                    snapshot.by_hash,
                 )
                 self._save_task_data(task.id, "torrents", torrent_tasks)
-                for torrent in check_torrents:
-                    torrent_hash = self.__get_hash(torrent)
+                for torrent_hash, torrent in check_torrents.items():
                     torrent_task = torrent_tasks.get(torrent_hash)
                     if not torrent_task or torrent_task.get("deleted"):
                         continue
@@ -2042,49 +2300,64 @@ class BrushFlow(_PluginBase):
                         )
                         counted_torrents.add(torrent_key)
 
-                filtered_torrents = self.__filter_torrents_by_tag(check_torrents, task.delete_except_tags)
-                for torrent in filtered_torrents:
-                    torrent_hash = self.__get_hash(torrent)
+                filtered_hashes = self.__filter_hashes_by_tag(check_torrents, task.delete_except_tags, snapshot)
+                for torrent_hash in filtered_hashes:
                     torrent_task = torrent_tasks.get(torrent_hash)
                     if not torrent_task or torrent_task.get("deleted"):
                         continue
-                    torrent_key = (task.downloader, torrent_hash)
-                    torrent_info = self.__get_torrent_info(torrent)
-                    pre_delete_reason = ""
-                    if not torrent_task.get("hit_and_run"):
-                        expired, expired_reason = self.__promotion_expired(torrent_info, torrent_task)
-                        timed_out = bool(
-                            task.download_time
-                            and torrent_info.get("downloaded", 0) < torrent_info.get("total_size", 0)
-                            and torrent_info.get("dltime", 0) >= float(task.download_time) * 3600
-                        )
-                        if expired:
-                            pre_delete_reason = expired_reason
-                        elif timed_out:
-                            pre_delete_reason = f"下载耗时达到 {task.download_time} 小时"
-                    should_delete, conditional_reason = self.__evaluate_conditions_for_delete(
-                        torrent_info,
-                        torrent_task,
-                    )
-                    torrent_size = float(torrent_info.get("total_size") or torrent_task.get("size") or 0)
-                    candidate_rows.setdefault(torrent_key, []).append(
-                        {
-                            "task": task,
-                            "torrent_hash": torrent_hash,
-                            "torrent_task": torrent_task,
-                            "downloader_name": task.downloader,
-                            "size": torrent_size,
-                            "pre_delete_reason": pre_delete_reason,
-                            "conditional_reason": conditional_reason if should_delete else "",
-                            "proxy_delete": task.proxy_delete,
-                            "completed": bool(
-                                torrent_size > 0 and torrent_info.get("downloaded", 0) >= torrent_size
-                            ),
-                            "hit_and_run": bool(torrent_task.get("hit_and_run")),
-                            "seeding_time": torrent_info.get("seeding_time", 0),
-                        }
+                    torrent_info = self.__get_torrent_info(check_torrents[torrent_hash])
+                    candidate_rows.setdefault((task.downloader, torrent_hash), []).append(
+                        self.__global_delete_candidate_row(task, torrent_hash, torrent_task, torrent_info)
                     )
 
+        candidates = self._merge_global_delete_candidate_rows(candidate_rows, associated_records)
+        return candidates, total_size, task_records, services
+
+    def __global_delete_candidate_row(
+        self,
+        task: BrushTaskConfig,
+        torrent_hash: str,
+        torrent_task: dict,
+        torrent_info: dict,
+    ) -> dict:
+        """在任务上下文中评估单个种子的预删除与条件删除原因，生成全局删种候选行"""
+        pre_delete_reason = ""
+        if not torrent_task.get("hit_and_run"):
+            expired, expired_reason = self.__promotion_expired(torrent_info, torrent_task)
+            timed_out = bool(
+                task.download_time
+                and torrent_info.get("downloaded", 0) < torrent_info.get("total_size", 0)
+                and torrent_info.get("dltime", 0) >= float(task.download_time) * 3600
+            )
+            if expired:
+                pre_delete_reason = expired_reason
+            elif timed_out:
+                pre_delete_reason = f"下载耗时达到 {task.download_time} 小时"
+        should_delete, conditional_reason = self.__evaluate_conditions_for_delete(
+            torrent_info,
+            torrent_task,
+        )
+        torrent_size = float(torrent_info.get("total_size") or torrent_task.get("size") or 0)
+        return {
+            "task": task,
+            "torrent_hash": torrent_hash,
+            "torrent_task": torrent_task,
+            "downloader_name": task.downloader,
+            "size": torrent_size,
+            "pre_delete_reason": pre_delete_reason,
+            "conditional_reason": conditional_reason if should_delete else "",
+            "proxy_delete": task.proxy_delete,
+            "completed": bool(torrent_size > 0 and torrent_info.get("downloaded", 0) >= torrent_size),
+            "hit_and_run": bool(torrent_task.get("hit_and_run")),
+            "seeding_time": torrent_info.get("seeding_time", 0),
+        }
+
+    @staticmethod
+    def _merge_global_delete_candidate_rows(
+        candidate_rows: Dict[Tuple[str, str], List[dict]],
+        associated_records: Dict[Tuple[str, str], List[Tuple[BrushTaskConfig, dict]]],
+    ) -> List[dict]:
+        """合并同一物理种子的各任务候选行，仅保留全部关联任务都允许删除的种子"""
         candidates: List[dict] = []
         for torrent_key, rows in candidate_rows.items():
             associations = associated_records.get(torrent_key, [])
@@ -2118,7 +2391,105 @@ class BrushFlow(_PluginBase):
                 }
             )
             candidates.append(candidate)
-        return candidates, total_size, task_records, services
+        return candidates
+
+    def _record_global_delete_state(self) -> Dict[str, Any]:
+        """读取全部任务记录及其所在下载器中对应种子的统一状态"""
+        records = {task_id: self._get_task_data(task_id, "torrents") or {} for task_id in self._task_configs}
+        downloaders: Dict[str, List[dict]] = {}
+        downloader_helper = DownloaderHelper()
+        for task in self._task_configs.values():
+            if not task.enabled or not task.downloader or task.downloader in downloaders:
+                continue
+            service = downloader_helper.get_service(name=task.downloader)
+            if not service or not service.instance or service.instance.is_inactive():
+                raise RuntimeError(f"无法获取下载器 [{task.downloader}] 实时状态")
+            snapshot, _ = self._get_downloader_snapshot(task.downloader, service)
+            if not snapshot:
+                raise RuntimeError(f"获取下载器 [{task.downloader}] 种子失败")
+            managed_hashes = {
+                torrent_hash
+                for item in self._task_configs.values()
+                if item.downloader == task.downloader
+                for torrent_hash in records[item.id]
+            }
+            with self._task_scope(task.id):
+                downloaders[task.downloader] = [
+                    {
+                        **self.__get_torrent_info(snapshot.by_hash[torrent_hash]),
+                        "tags": ",".join(sorted(snapshot.tags[torrent_hash])),
+                    }
+                    for torrent_hash in managed_hashes
+                    if torrent_hash in snapshot.by_hash
+                ]
+        return {"captured_at": self._now_iso(), "downloaders": downloaders, "records": records}
+
+    def _build_simulated_global_delete_candidates(
+        self,
+        downloaders: Dict[str, Dict[str, dict]],
+        task_records: Dict[str, Dict[str, dict]],
+    ) -> Tuple[List[dict], float]:
+        """以录制的种子状态复用实时删种的候选评估，不访问下载器也不修改记录"""
+        snapshots = {
+            name: DownloaderSnapshot(
+                name,
+                [
+                    {
+                        "hash": torrent_hash,
+                        "tags": ",".join(info["tags"]) if isinstance(info.get("tags"), list) else info.get("tags"),
+                    }
+                    for torrent_hash, info in torrents.items()
+                ],
+                qbittorrent=True,
+            )
+            for name, torrents in downloaders.items()
+        }
+        managed: Dict[str, List[str]] = {}
+        associated_records: Dict[Tuple[str, str], List[Tuple[BrushTaskConfig, dict]]] = {}
+        for task in self._task_configs.values():
+            torrents = downloaders.get(task.downloader) or {}
+            torrent_tasks = task_records.get(task.id) or {}
+            managed[task.id] = [
+                torrent_hash
+                for torrent_hash, torrent_task in torrent_tasks.items()
+                if not torrent_task.get("deleted") and torrent_hash in torrents
+            ]
+            for torrent_hash in managed[task.id]:
+                associated_records.setdefault((task.downloader, torrent_hash), []).append(
+                    (task, torrent_tasks[torrent_hash])
+                )
+
+        total_size = 0.0
+        counted_torrents: Set[Tuple[str, str]] = set()
+        candidate_rows: Dict[Tuple[str, str], List[dict]] = {}
+        for task in self._task_configs.values():
+            if not task.enabled or task.downloader not in snapshots:
+                continue
+            torrents = downloaders[task.downloader]
+            torrent_tasks = task_records[task.id]
+            for torrent_hash in managed[task.id]:
+                torrent_key = (task.downloader, torrent_hash)
+                if torrent_key not in counted_torrents:
+                    total_size += float(
+                        torrents[torrent_hash].get("total_size") or torrent_tasks[torrent_hash].get("size") or 0
+                    )
+                    counted_torrents.add(torrent_key)
+            with self._task_scope(task.id):
+                filtered_hashes = self.__filter_hashes_by_tag(
+                    managed[task.id],
+                    task.delete_except_tags,
+                    snapshots[task.downloader],
+                )
+                for torrent_hash in filtered_hashes:
+                    candidate_rows.setdefault((task.downloader, torrent_hash), []).append(
+                        self.__global_delete_candidate_row(
+                            task,
+                            torrent_hash,
+                            torrent_tasks[torrent_hash],
+                            torrents[torrent_hash],
+                        )
+                    )
+        return self._merge_global_delete_candidate_rows(candidate_rows, associated_records), total_size
 
     def _send_global_dynamic_delete_summary(
         self,
@@ -2192,7 +2563,9 @@ class BrushFlow(_PluginBase):
                 for entry in delete_plan:
                     plan_by_downloader.setdefault(entry["downloader_name"], []).append(entry)
 
-                deleted_entries: List[dict] = []
+                # 全部下载器的重新汇报和删除一次提交，每个下载器每类操作只调用一次。
+                operations: List[DownloaderOperation] = []
+                delete_operations: Dict[str, DownloaderOperation] = {}
                 downloader_helper = DownloaderHelper()
                 for downloader_name, entries in plan_by_downloader.items():
                     service = services.get(downloader_name)
@@ -2200,18 +2573,18 @@ class BrushFlow(_PluginBase):
                         continue
                     torrent_hashes = list(dict.fromkeys(entry["torrent_hash"] for entry in entries))
                     if downloader_helper.is_downloader("qbittorrent", service=service):
-                        try:
-                            if getattr(service.instance, "qbc", None):
-                                service.instance.qbc.torrents_reannounce(torrent_hashes=torrent_hashes)
-                        except Exception as err:
-                            logger.warning(f"全局动态删种重新汇报下载器 [{downloader_name}] 失败：{str(err)}")
-                    try:
-                        if service.instance.delete_torrents(ids=torrent_hashes, delete_file=True):
-                            deleted_entries.extend(entries)
-                    except Exception as err:
-                        logger.error(
-                            f"全局动态删种调用下载器 [{downloader_name}] 删除失败：{str(err)}"
-                        )
+                        operations.append(DownloaderOperation(downloader_name, "reannounce", torrent_hashes, service))
+                    delete_operations[downloader_name] = DownloaderOperation(
+                        downloader_name, "delete", torrent_hashes, service
+                    )
+                operations.extend(delete_operations.values())
+                self._submit_downloader_operations(operations)
+                deleted_entries: List[dict] = [
+                    entry
+                    for downloader_name, operation in delete_operations.items()
+                    if operation.result
+                    for entry in plan_by_downloader[downloader_name]
+                ]
 
                 deleted_at = time.time()
                 affected_task_ids: Set[str] = set()
@@ -2334,10 +2707,9 @@ class BrushFlow(_PluginBase):
         self,
         torrent_tasks: Dict[str, dict],
         torrent_check_hashes: List[str],
-        torrents: List[Any],
+        existing_hashes: Dict[str, Any],
     ) -> None:
-        """把下载器中已不存在但仍标记正常的记录更新为已删除"""
-        existing_hashes = set(self.__get_all_hashes(torrents))
+        """把下载器快照中已不存在但仍标记正常的记录更新为已删除"""
         missing_hashes = [
             item for item in torrent_check_hashes
             if item not in existing_hashes and not torrent_tasks[item].get("deleted")
@@ -2504,6 +2876,8 @@ class BrushFlow(_PluginBase):
                 download_limit=down_limit,
             ):
                 return None
+            # 新增种子后快照已过时，需丢弃以免检查时误判为下载器中已删除。
+            self._invalidate_downloader_snapshot(task.downloader)
             torrent_hash = downloader.get_torrent_id_by_tag(tags=random_tag)
             if not torrent_hash:
                 logger.error(f"刷流任务 [{task.name}] 获取种子 Hash 失败")
@@ -2523,6 +2897,7 @@ class BrushFlow(_PluginBase):
             )
             if not added_torrent:
                 return None
+            self._invalidate_downloader_snapshot(task.downloader)
             if task.up_speed or task.dl_speed:
                 downloader.change_torrent(
                     hash_string=added_torrent.hashString,
@@ -2532,16 +2907,6 @@ class BrushFlow(_PluginBase):
             return added_torrent.hashString
         return None
 
-    def __qb_torrents_reannounce(self, torrent_hashes: List[str]) -> None:
-        """删除 qBittorrent 种子前强制重新汇报 Tracker"""
-        downloader = self.downloader
-        if not downloader or not getattr(downloader, "qbc", None) or not torrent_hashes:
-            return
-        try:
-            downloader.qbc.torrents_reannounce(torrent_hashes=torrent_hashes)
-        except Exception as err:
-            logger.error(f"强制重新汇报 Tracker 失败：{str(err)}")
-
     def __get_hash(self, torrent: Any) -> str:
         """兼容获取 qBittorrent 与 Transmission 种子 Hash"""
         try:
@@ -2553,10 +2918,6 @@ class BrushFlow(_PluginBase):
             logger.error(f"获取种子 Hash 失败：{str(err)}")
             return ""
 
-    def __get_all_hashes(self, torrents: List[Any]) -> List[str]:
-        """提取下载器种子列表中的全部有效 Hash"""
-        return [torrent_hash for torrent in torrents if (torrent_hash := self.__get_hash(torrent))]
-
     def __get_label(self, torrent: Any) -> List[str]:
         """兼容获取 qBittorrent 标签和 Transmission Labels"""
         try:
@@ -2685,37 +3046,48 @@ class BrushFlow(_PluginBase):
         return total_count
 
     @staticmethod
-    def __get_pubminutes(pubdate: str) -> float:
-        """计算站点发布时间距当前时间的分钟数"""
-        if not pubdate:
-            return 0
-        try:
-            publish_time = datetime.strptime(pubdate.replace("T", " ").replace("Z", ""), "%Y-%m-%d %H:%M:%S")
-            return (datetime.now() - publish_time).total_seconds() / 60
-        except (TypeError, ValueError) as err:
-            logger.error(f"解析发布时间 {pubdate} 失败：{str(err)}")
-            return 0
-
-    def __filter_torrents_by_tag(self, torrents: List[Any], exclude_tag: Optional[str]) -> List[Any]:
-        """过滤包含任一删除排除标签的种子"""
+    def __filter_hashes_by_tag(
+        torrent_hashes: Iterable[str],
+        exclude_tag: Optional[str],
+        snapshot: DownloaderSnapshot,
+    ) -> List[str]:
+        """按快照中的标签过滤包含任一删除排除标签的种子 Hash"""
         if not exclude_tag:
-            return torrents
+            return list(torrent_hashes)
         excluded_tags = {item.strip() for item in exclude_tag.split(",") if item.strip()}
         return [
-            torrent for torrent in torrents
-            if not excluded_tags.intersection(self.__get_label(torrent))
+            torrent_hash for torrent_hash in torrent_hashes
+            if excluded_tags.isdisjoint(snapshot.tags.get(torrent_hash, ()))
         ]
 
-    def __get_subscribe_titles(self) -> Set[str]:
-        """识别并缓存当前订阅可用于排除匹配的标题集合"""
+    def __get_subscribe_matcher(self) -> Optional[SubscribeTitleMatcher]:
+        """识别并缓存当前订阅标题，返回据此构建的多模式匹配器"""
         task = self._get_task_config()
         if not task or not task.except_subscribe:
-            return set()
+            return None
+        subscribe_lock = getattr(self, "_subscribe_lock", None)
+        if subscribe_lock is None:
+            self._subscribe_lock = threading.Lock()
+            subscribe_lock = self._subscribe_lock
+        # 多个任务并行刷流时共享订阅标题缓存，需串行识别和清理。
+        with subscribe_lock:
+            changed = self.__refresh_subscribe_titles()
+            matcher = getattr(self, "_subscribe_matcher", None)
+            if changed or matcher is None:
+                # 仅在订阅增删后重建自动机，未变化时各轮刷流复用同一匹配器。
+                matcher = SubscribeTitleMatcher(self._subscribe_infos)
+                self._subscribe_matcher = matcher
+            return matcher
+
+    def __refresh_subscribe_titles(self) -> bool:
+        """识别新增订阅并清理已删除订阅的缓存标题，返回缓存是否发生变化"""
         subscribes = SubscribeOper().list() or []
+        changed = False
         for subscribe in subscribes:
             cache_key = f"{subscribe.id}_{subscribe.name}"
             if cache_key in self._subscribe_infos:
                 continue
+            changed = True
             titles = [subscribe.name]
             try:
                 meta = MetaInfo(subscribe.name)
@@ -2737,22 +3109,26 @@ class BrushFlow(_PluginBase):
         current_keys = {f"{subscribe.id}_{subscribe.name}" for subscribe in subscribes}
         for cache_key in set(self._subscribe_infos) - current_keys:
             self._subscribe_infos.pop(cache_key, None)
-        return {title for titles in self._subscribe_infos.values() for title in titles}
+            changed = True
+        return changed
 
     @staticmethod
     def __filter_torrents_contains_subscribe(
         torrents: List[TorrentInfo],
-        subscribe_titles: Set[str],
+        subscribe_matcher: Optional[SubscribeTitleMatcher],
     ) -> List[TorrentInfo]:
         """排除标题或描述命中任一订阅名称的候选种子"""
-        if not subscribe_titles:
+        if not subscribe_matcher:
             return torrents
         included: List[TorrentInfo] = []
         for torrent in torrents:
             title = torrent.title or ""
             description = torrent.description or ""
-            if any(item in title or item in description for item in subscribe_titles):
-                logger.info(f"命中订阅内容，排除种子：{title}|{description}")
+            matched = subscribe_matcher.search(title, description)
+            if matched:
+                matched_title, subscribe_key = matched
+                subscribe_name = subscribe_key.split("_", 1)[-1]
+                logger.info(f"命中订阅 {subscribe_name}（{matched_title}），排除种子：{title}|{description}")
                 continue
             included.append(torrent)
         return included
@@ -2776,7 +3152,6 @@ class BrushFlow(_PluginBase):
         task = self._get_task_config()
         if not task or not task.auto_archive_days or task.auto_archive_days <= 0:
             return
-        archived_tasks: Dict[str, dict] = self._current_task_data("archived", {})
         threshold = float(task.auto_archive_days) * 86400
         now_timestamp = time.time()
         archive_hashes = []
@@ -2789,46 +3164,20 @@ class BrushFlow(_PluginBase):
                 and now_timestamp - deleted_time > threshold
             ):
                 archive_hashes.append(torrent_hash)
-        for torrent_hash in archive_hashes:
-            archived_tasks[torrent_hash] = torrent_tasks.pop(torrent_hash)
-        self._save_current_task_data("archived", archived_tasks)
+        # 归档只写入对应行，不读取也不重写历史归档记录；当前分组中的行随任务记录保存时移除。
+        self._record_store.upsert(
+            task.id,
+            "archived",
+            {torrent_hash: torrent_tasks.pop(torrent_hash) for torrent_hash in archive_hashes},
+        )
 
     def _recalculate_statistics(self, task_id: str) -> Dict[str, int]:
-        """从当前和归档记录重新计算单任务统计"""
-        torrents = self._get_task_data(task_id, "torrents") or {}
-        archived = self._get_task_data(task_id, "archived") or {}
-        combined = {**archived, **torrents}
-        statistic = {
-            "count": len(combined),
-            "deleted": sum(1 for item in combined.values() if item.get("deleted")),
-            "uploaded": sum(item.get("uploaded", 0) or 0 for item in combined.values()),
-            "downloaded": sum(item.get("downloaded", 0) or 0 for item in combined.values()),
-            "unarchived": sum(1 for item in torrents.values() if item.get("deleted")),
-            "active": sum(1 for item in torrents.values() if not item.get("deleted")),
-            "active_uploaded": sum(
-                item.get("uploaded", 0) or 0 for item in torrents.values() if not item.get("deleted")
-            ),
-            "active_downloaded": sum(
-                item.get("downloaded", 0) or 0 for item in torrents.values() if not item.get("deleted")
-            ),
-        }
-        self._save_task_data(task_id, "statistic", statistic)
-        return statistic
+        """返回记录库随行写入维护的单任务累计统计"""
+        return self._record_store.statistic(task_id)
 
     def _get_statistic_info(self, task_id: str) -> Dict[str, int]:
-        """读取单任务统计并为历史空数据补齐字段"""
-        defaults = {
-            "count": 0,
-            "deleted": 0,
-            "uploaded": 0,
-            "downloaded": 0,
-            "unarchived": 0,
-            "active": 0,
-            "active_uploaded": 0,
-            "active_downloaded": 0,
-        }
-        statistic = self._get_task_data(task_id, "statistic") or {}
-        return {**defaults, **statistic}
+        """读取单任务统计，空任务返回全零字段"""
+        return self._record_store.statistic(task_id)
 
     @staticmethod
     def _is_valid_time_range(time_range: Optional[str]) -> bool:
@@ -2858,35 +3207,8 @@ class BrushFlow(_PluginBase):
 
     @staticmethod
     def __get_site_by_torrent(torrent: Any) -> Tuple[int, str]:
-        """根据 Tracker 或磁力链接识别种子所属站点"""
-        trackers: List[str] = []
-        last_domain = "未知"
-        tracker_url = torrent.get("tracker") if isinstance(torrent, dict) else None
-        if not tracker_url:
-            tracker_list = getattr(torrent, "tracker_list", None)
-            tracker_url = tracker_list[0] if tracker_list else None
-        if tracker_url:
-            trackers.append(tracker_url)
-        magnet_link = torrent.get("magnet_uri") if isinstance(torrent, dict) else getattr(torrent, "magnet_link", None)
-        if magnet_link:
-            trackers.extend(unquote(item) for item in parse_qs(urlparse(magnet_link).query).get("tr", []))
-        tracker_mappings = {
-            "chdbits.xyz": "ptchdbits.co",
-            "agsvpt.trackers.work": "agsvpt.com",
-            "tracker.cinefiles.info": "audiences.me",
-        }
-        for tracker in trackers:
-            if not tracker:
-                continue
-            domain = next(
-                (mapped for keyword, mapped in tracker_mappings.items() if keyword in tracker),
-                StringUtils.get_url_domain(tracker),
-            )
-            last_domain = domain or last_domain
-            site = SitesHelper().get_indexer(domain)
-            if site:
-                return site.get("id"), site.get("name")
-        return 0, last_domain
+        """通过纳管、删种与统计共用的 Tracker 站点索引识别种子所属站点"""
+        return BrushFlow.TRACKER_SITE_INDEX.resolve(torrent)
 
     def _log_and_notify_error(self, message: str) -> None:
         """记录错误并写入系统消息中心"""
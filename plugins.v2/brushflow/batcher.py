@@ -0,0 +1,128 @@
+import threading
+import time
+from itertools import groupby
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from app.log import logger
+
+# 同一下载器内的执行顺序：删除前先重新汇报，删除种子后再清理不再使用的标签。
+ACTION_ORDER = ("reannounce", "delete", "delete_tags")
+
+# 执行合并后的单次下载器调用：下载器名称、服务、操作类型与去重后的条目，返回是否成功。
+OperationExecutor = Callable[[str, Any, str, List[str]], bool]
+
+
+@dataclass
+class DownloaderOperation:
+    """
+    待合并执行的单个下载器操作
+    """
+
+    downloader: str
+    action: str
+    items: List[str]
+    service: Any = None
+    result: Optional[bool] = None
+    done: threading.Event = field(default_factory=threading.Event, repr=False)
+
+
+def plan_operations(operations: Iterable[DownloaderOperation]) -> List[dict]:
+    """按下载器和操作类型合并条目，返回固定顺序的调用计划，不执行任何操作"""
+    groups: Dict[Tuple[str, str], dict] = {}
+    downloader_order: Dict[str, int] = {}
+    for operation in operations:
+        if operation.action not in ACTION_ORDER:
+            raise ValueError(f"不支持的下载器操作：{operation.action}")
+        downloader_order.setdefault(operation.downloader, len(downloader_order))
+        group = groups.setdefault(
+            (operation.downloader, operation.action),
+            {"downloader": operation.downloader, "action": operation.action, "items": {}, "operations": []},
+        )
+        group["items"].update(dict.fromkeys(item for item in operation.items if item))
+        group["operations"].append(operation)
+    ordered = sorted(
+        groups.values(),
+        key=lambda group: (downloader_order[group["downloader"]], ACTION_ORDER.index(group["action"])),
+    )
+    return [{**group, "items": list(group["items"])} for group in ordered if group["items"]]
+
+
+class DownloaderOperationBatcher:
+    """
+    收集同一时间窗口内各任务提交的删种、重新汇报和标签清理，按下载器和操作类型合并为单次调用
+    """
+
+    DEFAULT_WINDOW = 0.2
+
+    def __init__(self, executor: OperationExecutor, window: float = DEFAULT_WINDOW):
+        """初始化执行函数、合并窗口和调用统计"""
+        self._executor = executor
+        self._window = window
+        self._lock = threading.Lock()
+        self._pending: List[DownloaderOperation] = []
+        self._leader = False
+        self._flush_locks: Dict[str, threading.Lock] = {}
+        self._stats = {"flushes": 0, "operations": 0, "calls": 0}
+
+    def submit(self, operations: List[DownloaderOperation]) -> List[bool]:
+        """提交一组操作并等待所在批次执行完成，按提交顺序返回各操作结果"""
+        operations = [operation for operation in operations if operation.items]
+        if not operations:
+            return []
+        with self._lock:
+            self._pending.extend(operations)
+            leader = not self._leader
+            self._leader = True
+        if leader:
+            # 首个提交者等待合并窗口后负责执行整批，其余提交者只等待结果。
+            if self._window > 0:
+                time.sleep(self._window)
+            with self._lock:
+                batch, self._pending = self._pending, []
+                self._leader = False
+            self._flush(batch)
+        for operation in operations:
+            operation.done.wait()
+        return [bool(operation.result) for operation in operations]
+
+    def stats(self) -> Dict[str, int]:
+        """返回已执行批次数、合并前操作数和实际下载器调用数"""
+        with self._lock:
+            return dict(self._stats)
+
+    def _flush(self, batch: List[DownloaderOperation]) -> None:
+        """按计划依次执行合并后的调用，并把结果回填给对应操作"""
+        try:
+            plan = plan_operations(batch)
+            # 计划中同一下载器的调用相邻，逐个下载器持有执行锁，上一批未执行完时后续批次不得插入。
+            for downloader, groups in groupby(plan, key=lambda group: group["downloader"]):
+                with self._lock:
+                    flush_lock = self._flush_locks.setdefault(downloader, threading.Lock())
+                with flush_lock:
+                    for group in groups:
+                        self._execute_group(group)
+            with self._lock:
+                self._stats["flushes"] += 1
+                self._stats["operations"] += len(batch)
+                self._stats["calls"] += len(plan)
+        finally:
+            for operation in batch:
+                operation.done.set()
+
+    def _execute_group(self, group: dict) -> None:
+        """执行单次合并调用，异常只记为该组操作失败"""
+        service = next(
+            (operation.service for operation in group["operations"] if operation.service is not None),
+            None,
+        )
+        try:
+            result = bool(self._executor(group["downloader"], service, group["action"], group["items"]))
+        except Exception as err:
+            logger.error(
+                f"下载器 [{group['downloader']}] 批量执行 {group['action']} "
+                f"（{len(group['items'])} 项）失败：{str(err)}"
+            )
+            result = False
+        for operation in group["operations"]:
+            operation.result = result
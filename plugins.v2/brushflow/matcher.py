@@ -0,0 +1,64 @@
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class SubscribeTitleMatcher:
+    """
+    由全部订阅标题构建的 Aho-Corasick 自动机，单次扫描文本即可判断命中哪个订阅
+    """
+
+    def __init__(self, subscribe_titles: Dict[str, Iterable[str]]):
+        """按订阅名称登记全部标题并构建转移表与失败指针"""
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Optional[Tuple[str, str]]] = [None]
+        for subscribe_name, titles in subscribe_titles.items():
+            for title in titles:
+                if title:
+                    self._add(title, subscribe_name)
+        self._build()
+
+    def __bool__(self) -> bool:
+        """没有任何订阅标题时视为空匹配器"""
+        return len(self._goto) > 1
+
+    def _add(self, title: str, subscribe_name: str) -> None:
+        """把单个订阅标题插入字典树，同一标题保留首个订阅"""
+        node = 0
+        for char in title:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(None)
+            node = next_node
+        if self._output[node] is None:
+            self._output[node] = (title, subscribe_name)
+
+    def _build(self) -> None:
+        """按层序计算失败指针，并让节点继承失败链上的命中结果"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0)
+                if self._output[child] is None:
+                    self._output[child] = self._output[self._fail[child]]
+
+    def search(self, *texts: Optional[str]) -> Optional[Tuple[str, str]]:
+        """返回文本中首个命中的订阅标题及订阅名称，未命中返回 None"""
+        for text in texts:
+            node = 0
+            for char in text or "":
+                while node and char not in self._goto[node]:
+                    node = self._fail[node]
+                node = self._goto[node].get(char, 0)
+                if self._output[node]:
+                    return self._output[node]
+        return None
@@ -1,6 +1,6 @@
 import re
 from datetime import datetime
-from typing import Literal, Optional
+from typing import Dict, List, Literal, Optional
 
 from pydantic import BaseModel, Field, field_validator, model_validator
 
@@ -17,6 +17,17 @@ def _normalize_optional_positive_number(value):
     return value
 
 
+def _validate_delete_size_range(value: Optional[str]) -> Optional[str]:
+    """校验动态删种的单值或区间阈值。"""
+    if value and not re.fullmatch(r"\d+(?:\.\d+)?(?:-\d+(?:\.\d+)?)?", value):
+        raise ValueError("请输入数字或数字范围，例如 100 或 50-100")
+    if value:
+        limits = [float(item) for item in value.split("-")]
+        if any(item <= 0 for item in limits) or (len(limits) > 1 and limits[0] >= limits[1]):
+            raise ValueError("动态删种区间下限必须小于上限")
+    return value
+
+
 class BrushTaskPayload(BaseModel):
     """
     刷流任务新增与更新请求模型
@@ -179,6 +190,7 @@ class BrushFlowSettingsPayload(BaseModel):
     global_maxdlspeed: Optional[float] = Field(None, gt=0)
     global_proxy_delete: bool = False
     global_delete_size_range: Optional[str] = None
+    global_brush_concurrency: Optional[int] = Field(None, ge=1, le=16)
 
     @model_validator(mode="before")
     @classmethod
@@ -218,13 +230,7 @@ class BrushFlowSettingsPayload(BaseModel):
     @classmethod
     def validate_global_delete_size_range(cls, value: Optional[str]) -> Optional[str]:
         """校验全局动态删种的单值或区间阈值。"""
-        if value and not re.fullmatch(r"\d+(?:\.\d+)?(?:-\d+(?:\.\d+)?)?", value):
-            raise ValueError("请输入数字或数字范围，例如 100 或 50-100")
-        if value:
-            limits = [float(item) for item in value.split("-")]
-            if any(item <= 0 for item in limits) or (len(limits) > 1 and limits[0] >= limits[1]):
-                raise ValueError("动态删种区间下限必须小于上限")
-        return value
+        return _validate_delete_size_range(value)
 
     @model_validator(mode="after")
     def validate_global_dynamic_delete(self):
@@ -232,3 +238,31 @@ class BrushFlowSettingsPayload(BaseModel):
         if self.global_proxy_delete and not self.global_delete_size_range:
             raise ValueError("启用全局动态删种时必须设置动态删种阈值")
         return self
+
+
+class GlobalDeleteSimulationPayload(BaseModel):
+    """
+    全局动态删种离线模拟请求模型
+    """
+
+    downloaders: Optional[Dict[str, List[dict]]] = None
+    records: Optional[Dict[str, Dict[str, dict]]] = None
+    hours: float = Field(24, gt=0, le=168)
+    interval_minutes: float = Field(5, ge=1, le=1440)
+    growth_gb_per_hour: float = Field(0, ge=0)
+    delete_size_range: Optional[str] = None
+
+    @field_validator("delete_size_range", mode="before")
+    @classmethod
+    def normalize_delete_size_range(cls, value):
+        """清理模拟阈值中的空白值，未设置时沿用全局配置。"""
+        if value is None:
+            return None
+        cleaned = str(value).strip()
+        return cleaned or None
+
+    @field_validator("delete_size_range")
+    @classmethod
+    def validate_delete_size_range(cls, value: Optional[str]) -> Optional[str]:
+        """校验模拟使用的单值或区间阈值。"""
+        return _validate_delete_size_range(value)
@@ -0,0 +1,93 @@
+import itertools
+import threading
+from typing import Dict, List, Optional, Tuple
+
+
+class BrushReservationLedger:
+    """
+    并行刷流时登记尚未写入记录库的新增种子，串行完成体积预留与提交
+    """
+
+    def __init__(self):
+        """初始化可重入锁、待提交预留和本轮新增记录序列"""
+        self.lock = threading.RLock()
+        self._tokens = itertools.count(1)
+        self._sequence = 0
+        self._pending: Dict[int, dict] = {}
+        self._committed: List[Tuple[int, str, dict]] = []
+        self._cursors: Dict[str, int] = {}
+
+    def begin(self, task_id: str) -> int:
+        """任务读取全部记录前登记游标，之后提交的记录可由游标补齐"""
+        with self.lock:
+            self._cursors[task_id] = self._sequence
+            return self._sequence
+
+    def end(self, task_id: str) -> None:
+        """任务刷流结束后注销游标，并丢弃所有任务都已看到的提交记录"""
+        with self.lock:
+            self._cursors.pop(task_id, None)
+            oldest = min(self._cursors.values(), default=self._sequence)
+            self._committed = [item for item in self._committed if item[0] > oldest]
+
+    def committed_since(self, cursor: int) -> Dict[str, dict]:
+        """返回游标之后其他任务已提交的新增记录"""
+        with self.lock:
+            return {
+                torrent_hash: record
+                for sequence, torrent_hash, record in self._committed
+                if sequence > cursor
+            }
+
+    def pending_records(self) -> Dict[str, dict]:
+        """以记录格式返回已预留但尚未提交的种子，供重复种子判断使用"""
+        with self.lock:
+            return {f"pending-{token}": dict(record) for token, record in self._pending.items()}
+
+    def committed_count(self, cursor: int, task_id: Optional[str] = None) -> int:
+        """返回游标之后已提交的新增种子数量，可限定任务"""
+        with self.lock:
+            return sum(
+                1
+                for sequence, _, record in self._committed
+                if sequence > cursor and (task_id is None or record.get("task_id") == task_id)
+            )
+
+    def pending_size(self, task_id: Optional[str] = None) -> float:
+        """返回指定任务或全部任务已预留但尚未提交的种子体积"""
+        with self.lock:
+            return sum(
+                float(record.get("size") or 0)
+                for record in self._pending.values()
+                if task_id is None or record.get("task_id") == task_id
+            )
+
+    def pending_count(self, task_id: Optional[str] = None, downloader: Optional[str] = None) -> int:
+        """返回指定任务或下载器已预留但尚未提交的种子数量"""
+        with self.lock:
+            return sum(
+                1
+                for record in self._pending.values()
+                if (task_id is None or record.get("task_id") == task_id)
+                and (downloader is None or record.get("downloader") == downloader)
+            )
+
+    def reserve(self, task_id: str, record: dict) -> int:
+        """为即将添加到下载器的种子预留体积并返回凭据"""
+        with self.lock:
+            token = next(self._tokens)
+            self._pending[token] = {**record, "task_id": task_id, "downloaded": 0, "deleted": False}
+            return token
+
+    def commit(self, token: int, torrent_hash: str, record: dict) -> None:
+        """记录写入记录库后撤销预留，并向其他运行中任务公布新增记录"""
+        with self.lock:
+            self._pending.pop(token, None)
+            if self._cursors:
+                self._sequence += 1
+                self._committed.append((self._sequence, torrent_hash, record))
+
+    def release(self, token: int) -> None:
+        """下载器添加失败时撤销预留"""
+        with self.lock:
+            self._pending.pop(token, None)
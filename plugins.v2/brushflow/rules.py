@@ -0,0 +1,144 @@
+import re
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.log import logger
+
+# 选种规则依赖的任务字段，任一字段变化都需要重新编译规则链。
+RULE_CONFIG_FIELDS = ("freeleech", "hr", "include", "exclude", "size", "seeder", "pubtime", "timezone_offset")
+
+RuleCheck = Callable[[Any], Optional[str]]
+
+
+def pub_minutes(pubdate: str) -> float:
+    """计算站点发布时间距当前时间的分钟数"""
+    if not pubdate:
+        return 0
+    try:
+        publish_time = datetime.strptime(pubdate.replace("T", " ").replace("Z", ""), "%Y-%m-%d %H:%M:%S")
+        return (datetime.now() - publish_time).total_seconds() / 60
+    except (TypeError, ValueError) as err:
+        logger.error(f"解析发布时间 {pubdate} 失败：{str(err)}")
+        return 0
+
+
+def _parse_range(value: str, scale: float = 1) -> List[float]:
+    """把单值或区间配置解析为数值列表"""
+    return [float(item) * scale for item in value.split("-")]
+
+
+def _range_check(
+    limits: List[float],
+    value_of: Callable[[Any], float],
+    over_reason: str,
+    range_reason: str,
+    lower_bound: bool = False,
+) -> RuleCheck:
+    """生成单值上限（或下限）与区间判断的规则函数"""
+    if len(limits) == 1:
+        limit = limits[0]
+        if lower_bound:
+            return lambda torrent: over_reason if value_of(torrent) < limit else None
+        return lambda torrent: over_reason if value_of(torrent) > limit else None
+    lower, upper = limits[0], limits[1]
+    return lambda torrent: None if lower <= value_of(torrent) <= upper else range_reason
+
+
+def _text_matches(pattern: "re.Pattern", torrent: Any) -> bool:
+    """判断标题或副标题是否命中正则"""
+    return bool(
+        (torrent.title and pattern.search(torrent.title))
+        or (torrent.description and pattern.search(torrent.description))
+    )
+
+
+class CompiledBrushRules:
+    """
+    由任务配置预编译的选种规则链，按开销从低到高依次短路判断
+    """
+
+    def __init__(self, task: Any):
+        """预解析体积、人数、发布时间区间并编译包含与排除正则"""
+        self.fingerprint = self.fingerprint_of(task)
+        self.rules: List[Tuple[str, RuleCheck]] = []
+        if task.freeleech:
+            self.rules.append(
+                ("freeleech", lambda torrent: "非免费种子" if torrent.downloadvolumefactor != 0 else None)
+            )
+        if task.freeleech == "2xfree":
+            self.rules.append(
+                ("2xfree", lambda torrent: "非双倍上传种子" if torrent.uploadvolumefactor != 2 else None)
+            )
+        if task.hr == "yes":
+            self.rules.append(("hr", lambda torrent: "存在 H&R" if torrent.hit_and_run else None))
+        if task.size:
+            self.rules.append(
+                (
+                    "size",
+                    _range_check(
+                        _parse_range(task.size, 1024 ** 3),
+                        lambda torrent: torrent.size,
+                        "种子大小低于下限",
+                        "种子大小不在范围内",
+                        lower_bound=True,
+                    ),
+                )
+            )
+        if task.seeder:
+            self.rules.append(
+                (
+                    "seeder",
+                    _range_check(
+                        _parse_range(task.seeder),
+                        lambda torrent: torrent.seeders or 0,
+                        "做种人数超过上限",
+                        "做种人数不在范围内",
+                    ),
+                )
+            )
+        if task.pubtime:
+            offset_minutes = task.timezone_offset * 60
+            self.rules.append(
+                (
+                    "pubtime",
+                    _range_check(
+                        _parse_range(task.pubtime),
+                        lambda torrent: pub_minutes(torrent.pubdate) - offset_minutes,
+                        "发布时间超过上限",
+                        "发布时间不在范围内",
+                    ),
+                )
+            )
+        if task.include:
+            include = re.compile(task.include, re.I)
+            self.rules.append(
+                ("include", lambda torrent: None if _text_matches(include, torrent) else "不符合包含规则")
+            )
+        if task.exclude:
+            exclude = re.compile(task.exclude, re.I)
+            self.rules.append(
+                ("exclude", lambda torrent: "符合排除规则" if _text_matches(exclude, torrent) else None)
+            )
+
+    @staticmethod
+    def fingerprint_of(task: Any) -> tuple:
+        """返回决定规则链内容的任务配置取值"""
+        return tuple(getattr(task, field, None) for field in RULE_CONFIG_FIELDS)
+
+    def evaluate(self, torrent: Any, stats: Optional[Dict[str, dict]] = None) -> Tuple[bool, Optional[str]]:
+        """依次执行规则，首个不通过的规则短路返回原因，并可累计各规则耗时与淘汰数"""
+        for name, check in self.rules:
+            if stats is None:
+                reason = check(torrent)
+            else:
+                started = time.perf_counter()
+                reason = check(torrent)
+                rule_stats = stats.setdefault(name, {"checked": 0, "rejected": 0, "elapsed_ms": 0.0})
+                rule_stats["checked"] += 1
+                rule_stats["elapsed_ms"] += (time.perf_counter() - started) * 1000
+                if reason:
+                    rule_stats["rejected"] += 1
+            if reason:
+                return False, reason
+        return True, None
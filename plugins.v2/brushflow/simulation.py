@@ -0,0 +1,111 @@
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from .batcher import DownloaderOperation, plan_operations
+
+# 构建候选：输入各下载器 Hash 到种子状态的映射，返回候选列表和当前做种体积。
+CandidateBuilder = Callable[[Dict[str, Dict[str, dict]]], Tuple[List[dict], float]]
+# 生成删种计划：与 BrushFlow._select_global_dynamic_deletions 签名一致。
+DeletionSelector = Callable[[List[dict], float, float, float], Tuple[List[dict], float, bool]]
+
+# 随模拟时钟推进的种子计时字段。
+ELAPSING_FIELDS = ("seeding_time", "dltime", "iatime")
+
+
+def advance_torrent_info(torrent_info: dict, elapsed: float) -> dict:
+    """返回推进指定秒数后的种子状态，上传量保持录制时的值"""
+    advanced = dict(torrent_info)
+    for field in ELAPSING_FIELDS:
+        if advanced.get(field):
+            advanced[field] = advanced[field] + elapsed
+    dltime = advanced.get("dltime") or 0
+    uploaded = advanced.get("uploaded") or 0
+    advanced["avg_upspeed"] = int(uploaded / dltime) if dltime else uploaded
+    return advanced
+
+
+def replay_global_dynamic_delete(
+    downloaders: Dict[str, List[dict]],
+    build_candidates: CandidateBuilder,
+    select_deletions: DeletionSelector,
+    min_size: float,
+    max_size: float,
+    hours: float,
+    interval_minutes: float,
+    growth_per_hour: float = 0,
+) -> Dict[str, Any]:
+    """按检查周期回放录制的下载器状态，叠加合成的做种体积增长并统计删种计划与选择耗时"""
+    torrents = {
+        name: {item["hash"]: item for item in items if item.get("hash")}
+        for name, items in (downloaders or {}).items()
+    }
+    interval = max(float(interval_minutes), 1.0) * 60
+    cycle_count = int(max(float(hours), 0) * 3600 // interval) + 1
+    cycles: List[dict] = []
+    selection_times: List[float] = []
+    deleted_size = 0.0
+    deleted_count = 0
+    max_candidates = 0
+    call_count = 0
+    for cycle in range(cycle_count):
+        elapsed = cycle * interval
+        current = {
+            name: {torrent_hash: advance_torrent_info(info, elapsed) for torrent_hash, info in items.items()}
+            for name, items in torrents.items()
+        }
+        candidates, total_size = build_candidates(current)
+        total_size += growth_per_hour * elapsed / 3600
+        max_candidates = max(max_candidates, len(candidates))
+        started = time.perf_counter()
+        plan, remaining_size, triggered = select_deletions(candidates, total_size, min_size, max_size)
+        selection_ms = (time.perf_counter() - started) * 1000
+        selection_times.append(selection_ms)
+        deleted = []
+        for entry in plan:
+            torrent_info = torrents.get(entry["downloader_name"], {}).pop(entry["torrent_hash"], None)
+            if torrent_info is None:
+                continue
+            deleted.append(
+                {
+                    "downloader": entry["downloader_name"],
+                    "hash": entry["torrent_hash"],
+                    "title": torrent_info.get("title") or (entry.get("torrent_task") or {}).get("title"),
+                    "size": entry.get("size") or 0,
+                    "reason": entry.get("delete_reason"),
+                }
+            )
+        # 演练本周期合并后的下载器调用，只统计不执行。
+        operations = plan_operations(
+            DownloaderOperation(item["downloader"], "delete", [item["hash"]]) for item in deleted
+        )
+        call_count += len(operations)
+        deleted_count += len(deleted)
+        deleted_size += sum(float(item["size"]) for item in deleted)
+        cycles.append(
+            {
+                "elapsed_hours": round(elapsed / 3600, 3),
+                "candidate_count": len(candidates),
+                "total_size": total_size,
+                "remaining_size": remaining_size,
+                "triggered": triggered,
+                "deleted": deleted,
+                "operations": [
+                    {"downloader": item["downloader"], "action": item["action"], "count": len(item["items"])}
+                    for item in operations
+                ],
+                "selection_ms": round(selection_ms, 3),
+            }
+        )
+    return {
+        "cycle_count": cycle_count,
+        "deleted_count": deleted_count,
+        "deleted_size": deleted_size,
+        "max_candidate_count": max_candidates,
+        "downloader_call_count": call_count,
+        "selection_ms": {
+            "total": round(sum(selection_times), 3),
+            "max": round(max(selection_times, default=0), 3),
+            "avg": round(sum(selection_times) / len(selection_times), 3) if selection_times else 0,
+        },
+        "cycles": cycles,
+    }
@@ -0,0 +1,109 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlparse
+
+from app.helper.sites import SitesHelper
+from app.utils.string import StringUtils
+
+# Tracker 域名与站点域名不一致的已知站点。
+TRACKER_DOMAIN_MAPPINGS = {
+    "chdbits.xyz": "ptchdbits.co",
+    "agsvpt.trackers.work": "agsvpt.com",
+    "tracker.cinefiles.info": "audiences.me",
+}
+
+
+class TrackerSiteIndex:
+    """
+    按 Tracker 地址缓存识别出的站点，使用 LRU 淘汰并在站点增删时整体失效
+    """
+
+    DEFAULT_MAXSIZE = 8192
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE):
+        """初始化 LRU 缓存与命中统计"""
+        self._maxsize = maxsize
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[int, str]]" = OrderedDict()
+        # 每次失效递增，识别期间发生失效时丢弃过期结果
+        self._generation = 0
+        self._hits = 0
+        self._misses = 0
+
+    def resolve(self, torrent: Any) -> Tuple[int, str]:
+        """根据 Tracker 或磁力链接识别种子所属站点，仅在 Tracker 无法识别时解析磁力链接"""
+        last_domain = "未知"
+        tracker_url = torrent.get("tracker") if isinstance(torrent, dict) else None
+        if not tracker_url:
+            tracker_list = getattr(torrent, "tracker_list", None)
+            tracker_url = tracker_list[0] if tracker_list else None
+        if tracker_url:
+            site_id, site_name = self._lookup(tracker_url, self._resolve_tracker)
+            if site_id:
+                return site_id, site_name
+            last_domain = site_name or last_domain
+        magnet_link = torrent.get("magnet_uri") if isinstance(torrent, dict) else getattr(torrent, "magnet_link", None)
+        if magnet_link:
+            site_id, site_name = self._lookup(magnet_link, self._resolve_magnet)
+            if site_id:
+                return site_id, site_name
+            last_domain = site_name or last_domain
+        return 0, last_domain
+
+    def invalidate(self) -> None:
+        """站点新增、修改或删除后清空全部缓存"""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """返回缓存条目数与命中统计"""
+        with self._lock:
+            return {"size": len(self._entries), "hits": self._hits, "misses": self._misses}
+
+    def _lookup(self, key: str, resolver) -> Tuple[int, str]:
+        """读取缓存，未命中时调用识别函数，识别期间缓存未失效才写入"""
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return cached
+            self._misses += 1
+            generation = self._generation
+        resolved = resolver(key)
+        with self._lock:
+            if generation != self._generation:
+                return resolved
+            self._entries[key] = resolved
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+        return resolved
+
+    @classmethod
+    def _resolve_magnet(cls, magnet_link: str) -> Tuple[int, str]:
+        """依次识别磁力链接中的 Tracker，返回首个匹配站点"""
+        trackers: List[str] = [unquote(item) for item in parse_qs(urlparse(magnet_link).query).get("tr", [])]
+        last_domain = ""
+        for tracker in trackers:
+            site_id, site_name = cls._resolve_tracker(tracker)
+            if site_id:
+                return site_id, site_name
+            last_domain = site_name or last_domain
+        return 0, last_domain
+
+    @staticmethod
+    def _resolve_tracker(tracker: str) -> Tuple[int, str]:
+        """把单个 Tracker 地址映射为站点，未识别时返回其域名"""
+        if not tracker:
+            return 0, ""
+        domain: Optional[str] = next(
+            (mapped for keyword, mapped in TRACKER_DOMAIN_MAPPINGS.items() if keyword in tracker),
+            StringUtils.get_url_domain(tracker),
+        )
+        site = SitesHelper().get_indexer(domain)
+        if site:
+            return site.get("id"), site.get("name")
+        return 0, domain or ""
@@ -0,0 +1,123 @@
+import threading
+import time
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
+
+
+def torrent_hash(torrent: Any, qbittorrent: bool) -> str:
+    """兼容获取 qBittorrent 与 Transmission 种子 Hash"""
+    if qbittorrent:
+        return (torrent.get("hash") if isinstance(torrent, dict) else None) or ""
+    return getattr(torrent, "hashString", "") or ""
+
+
+def torrent_tags(torrent: Any, qbittorrent: bool) -> FrozenSet[str]:
+    """兼容获取 qBittorrent 标签和 Transmission Labels"""
+    if qbittorrent:
+        raw_tags = str(torrent.get("tags") or "").split(",") if isinstance(torrent, dict) else []
+    else:
+        raw_tags = [str(item) for item in getattr(torrent, "labels", None) or []]
+    return frozenset(item.strip() for item in raw_tags if item.strip())
+
+
+def torrent_tracker(torrent: Any) -> str:
+    """提取种子当前 Tracker 地址，Transmission 取第一项"""
+    if isinstance(torrent, dict):
+        return torrent.get("tracker") or ""
+    tracker_list = getattr(torrent, "tracker_list", None)
+    return tracker_list[0] if tracker_list else ""
+
+
+class DownloaderSnapshot:
+    """
+    单个下载器某一时刻的种子列表，预先建立 Hash 索引并提取标签与 Tracker
+    """
+
+    def __init__(self, name: str, torrents: List[Any], qbittorrent: bool):
+        """遍历一次种子列表生成只读索引"""
+        self.name = name
+        self.qbittorrent = qbittorrent
+        self.torrents = list(torrents or [])
+        self.taken_at = time.monotonic()
+        self.by_hash: Dict[str, Any] = {}
+        self.tags: Dict[str, FrozenSet[str]] = {}
+        self.trackers: Dict[str, str] = {}
+        used_tags = set()
+        for torrent in self.torrents:
+            tags = torrent_tags(torrent, qbittorrent)
+            used_tags.update(tags)
+            hash_string = torrent_hash(torrent, qbittorrent)
+            if not hash_string:
+                continue
+            self.by_hash[hash_string] = torrent
+            self.tags[hash_string] = tags
+            self.trackers[hash_string] = torrent_tracker(torrent)
+        self._used_tags = frozenset(used_tags)
+
+    @property
+    def age(self) -> float:
+        """返回快照距采集时的秒数"""
+        return time.monotonic() - self.taken_at
+
+    def used_tags(self) -> FrozenSet[str]:
+        """返回仍被任一种子使用的全部标签"""
+        return self._used_tags
+
+
+class DownloaderSnapshotCache:
+    """
+    按下载器缓存短时种子快照，供同一调度周期内的多个任务和全局删种共享
+    """
+
+    DEFAULT_TTL = 60
+
+    def __init__(self, ttl: float = DEFAULT_TTL):
+        """初始化快照表、各下载器采集锁和命中统计"""
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._fetch_locks: Dict[str, threading.Lock] = {}
+        self._snapshots: Dict[str, DownloaderSnapshot] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def get(
+        self,
+        name: str,
+        fetch: Callable[[], Tuple[Optional[List[Any]], bool]],
+        qbittorrent: bool,
+    ) -> Tuple[Optional[DownloaderSnapshot], bool]:
+        """返回未过期快照，否则调用下载器采集；同一下载器并发请求只采集一次"""
+        with self._lock:
+            fetch_lock = self._fetch_locks.setdefault(name, threading.Lock())
+        with fetch_lock:
+            with self._lock:
+                stats = self._stats.setdefault(name, {"hits": 0, "misses": 0})
+                snapshot = self._snapshots.get(name)
+                if snapshot and snapshot.qbittorrent == qbittorrent and snapshot.age <= self._ttl:
+                    stats["hits"] += 1
+                    return snapshot, True
+                stats["misses"] += 1
+            torrents, error = fetch()
+            if error:
+                return None, False
+            snapshot = DownloaderSnapshot(name, torrents or [], qbittorrent)
+            with self._lock:
+                self._snapshots[name] = snapshot
+            return snapshot, False
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        """下载器种子发生增删后丢弃对应快照，未指定时清空全部"""
+        with self._lock:
+            if name is None:
+                self._snapshots.clear()
+            else:
+                self._snapshots.pop(name, None)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """返回各下载器快照命中、未命中次数及当前快照年龄"""
+        with self._lock:
+            return {
+                name: {
+                    **counters,
+                    "age": round(self._snapshots[name].age, 1) if name in self._snapshots else None,
+                }
+                for name, counters in self._stats.items()
+            }
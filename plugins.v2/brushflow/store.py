@@ -0,0 +1,361 @@
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+
+RECORD_BUCKETS = ("torrents", "archived", "unmanaged")
+
+
+def _to_number(value: Any) -> float:
+    """把记录中的体积、流量和时间字段转换为可聚合的数值"""
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _dump_record(record: dict) -> str:
+    """以稳定键序序列化记录，便于比较内容是否发生变化"""
+    return json.dumps(record, ensure_ascii=False, sort_keys=True, default=str)
+
+
+class TorrentRecordStore:
+    """
+    按任务、分组与种子 Hash 行级存储刷流记录，并通过触发器维护累计统计
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        """打开插件私有 SQLite 数据库并初始化表结构"""
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._connection = sqlite3.connect(str(path), timeout=30, check_same_thread=False)
+        self._connection.row_factory = sqlite3.Row
+        self._connection.execute("PRAGMA busy_timeout=30000")
+        if str(path) != ":memory:":
+            self._connection.execute("PRAGMA journal_mode=WAL")
+        self._initialize()
+
+    def _initialize(self) -> None:
+        """创建记录表、索引、累计统计表及维护统计的触发器"""
+        with self._lock, self._connection:
+            self._migrate_primary_key()
+            self._connection.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS records (
+                    task_id TEXT NOT NULL,
+                    hash TEXT NOT NULL,
+                    bucket TEXT NOT NULL,
+                    site INTEGER,
+                    deleted INTEGER NOT NULL DEFAULT 0,
+                    size REAL NOT NULL DEFAULT 0,
+                    uploaded REAL NOT NULL DEFAULT 0,
+                    downloaded REAL NOT NULL DEFAULT 0,
+                    time REAL NOT NULL DEFAULT 0,
+                    data TEXT NOT NULL,
+                    PRIMARY KEY (task_id, bucket, hash)
+                );
+                CREATE INDEX IF NOT EXISTS records_task_bucket_deleted
+                    ON records(task_id, bucket, deleted);
+                CREATE INDEX IF NOT EXISTS records_task_time ON records(task_id, time);
+                CREATE INDEX IF NOT EXISTS records_site ON records(site);
+
+                CREATE TABLE IF NOT EXISTS record_totals (
+                    task_id TEXT NOT NULL,
+                    bucket TEXT NOT NULL,
+                    deleted INTEGER NOT NULL,
+                    count INTEGER NOT NULL DEFAULT 0,
+                    size REAL NOT NULL DEFAULT 0,
+                    uploaded REAL NOT NULL DEFAULT 0,
+                    downloaded REAL NOT NULL DEFAULT 0,
+                    PRIMARY KEY (task_id, bucket, deleted)
+                );
+
+                CREATE TRIGGER IF NOT EXISTS records_totals_insert AFTER INSERT ON records
+                BEGIN
+                    INSERT INTO record_totals (task_id, bucket, deleted, count, size, uploaded, downloaded)
+                    VALUES (NEW.task_id, NEW.bucket, NEW.deleted, 1, NEW.size, NEW.uploaded, NEW.downloaded)
+                    ON CONFLICT(task_id, bucket, deleted) DO UPDATE SET
+                        count = count + 1,
+                        size = size + excluded.size,
+                        uploaded = uploaded + excluded.uploaded,
+                        downloaded = downloaded + excluded.downloaded;
+                END;
+
+                CREATE TRIGGER IF NOT EXISTS records_totals_delete AFTER DELETE ON records
+                BEGIN
+                    UPDATE record_totals SET
+                        count = count - 1,
+                        size = size - OLD.size,
+                        uploaded = uploaded - OLD.uploaded,
+                        downloaded = downloaded - OLD.downloaded
+                    WHERE task_id = OLD.task_id AND bucket = OLD.bucket AND deleted = OLD.deleted;
+                END;
+
+                CREATE TRIGGER IF NOT EXISTS records_totals_update AFTER UPDATE ON records
+                BEGIN
+                    UPDATE record_totals SET
+                        count = count - 1,
+                        size = size - OLD.size,
+                        uploaded = uploaded - OLD.uploaded,
+                        downloaded = downloaded - OLD.downloaded
+                    WHERE task_id = OLD.task_id AND bucket = OLD.bucket AND deleted = OLD.deleted;
+                    INSERT INTO record_totals (task_id, bucket, deleted, count, size, uploaded, downloaded)
+                    VALUES (NEW.task_id, NEW.bucket, NEW.deleted, 1, NEW.size, NEW.uploaded, NEW.downloaded)
+                    ON CONFLICT(task_id, bucket, deleted) DO UPDATE SET
+                        count = count + 1,
+                        size = size + excluded.size,
+                        uploaded = uploaded + excluded.uploaded,
+                        downloaded = downloaded + excluded.downloaded;
+                END;
+                """
+            )
+
+    def _migrate_primary_key(self) -> None:
+        """
+        旧版记录表以 (task_id, hash) 为主键，同一 Hash 写入其他分组时会覆盖原分组的记录；
+        重建为按分组区分的主键，行数据不变，累计统计无需重算
+        """
+        columns = {
+            row["name"]: row["pk"]
+            for row in self._connection.execute("PRAGMA table_info(records)")
+        }
+        if not columns or columns.get("bucket"):
+            return
+        self._connection.executescript(
+            """
+            DROP TRIGGER IF EXISTS records_totals_insert;
+            DROP TRIGGER IF EXISTS records_totals_delete;
+            DROP TRIGGER IF EXISTS records_totals_update;
+            ALTER TABLE records RENAME TO records_v1;
+            DROP INDEX IF EXISTS records_task_bucket_deleted;
+            DROP INDEX IF EXISTS records_task_time;
+            DROP INDEX IF EXISTS records_site;
+            CREATE TABLE records (
+                task_id TEXT NOT NULL,
+                hash TEXT NOT NULL,
+                bucket TEXT NOT NULL,
+                site INTEGER,
+                deleted INTEGER NOT NULL DEFAULT 0,
+                size REAL NOT NULL DEFAULT 0,
+                uploaded REAL NOT NULL DEFAULT 0,
+                downloaded REAL NOT NULL DEFAULT 0,
+                time REAL NOT NULL DEFAULT 0,
+                data TEXT NOT NULL,
+                PRIMARY KEY (task_id, bucket, hash)
+            );
+            INSERT INTO records SELECT task_id, hash, bucket, site, deleted, size, uploaded, downloaded, time, data
+                FROM records_v1;
+            DROP TABLE records_v1;
+            """
+        )
+
+    def close(self) -> None:
+        """关闭数据库连接"""
+        with self._lock:
+            self._connection.close()
+
+    @staticmethod
+    def _row_params(task_id: str, bucket: str, torrent_hash: str, record: dict) -> tuple:
+        """把记录字典拆分为索引列和完整 JSON"""
+        site = record.get("site")
+        try:
+            site = int(site) if site not in (None, "") else None
+        except (TypeError, ValueError):
+            site = None
+        return (
+            task_id,
+            torrent_hash,
+            bucket,
+            site,
+            1 if record.get("deleted") else 0,
+            _to_number(record.get("size")),
+            _to_number(record.get("uploaded")),
+            _to_number(record.get("downloaded")),
+            _to_number(record.get("time")),
+            _dump_record(record),
+        )
+
+    def _upsert(self, params: List[tuple]) -> None:
+        """在当前事务中批量写入记录，只覆盖同一分组中的同名 Hash，其他分组的记录不受影响"""
+        self._connection.executemany(
+            """
+            INSERT INTO records (task_id, hash, bucket, site, deleted, size, uploaded, downloaded, time, data)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(task_id, bucket, hash) DO UPDATE SET
+                site = excluded.site,
+                deleted = excluded.deleted,
+                size = excluded.size,
+                uploaded = excluded.uploaded,
+                downloaded = excluded.downloaded,
+                time = excluded.time,
+                data = excluded.data
+            """,
+            params,
+        )
+
+    def load(self, task_id: str, bucket: str) -> Dict[str, dict]:
+        """读取单个任务指定分组的全部记录"""
+        return self.load_many([task_id], bucket)
+
+    def load_many(self, task_ids: Iterable[str], bucket: str) -> Dict[str, dict]:
+        """一次查询合并读取多个任务指定分组的记录"""
+        task_ids = list(task_ids)
+        if not task_ids:
+            return {}
+        placeholders = ",".join("?" for _ in task_ids)
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT hash, data FROM records WHERE bucket = ? AND task_id IN ({placeholders})",
+                (bucket, *task_ids),
+            ).fetchall()
+        return {row["hash"]: json.loads(row["data"]) for row in rows}
+
+    def has_records(self, task_id: str) -> bool:
+        """判断任务是否已经存在任一分组的记录"""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT 1 FROM records WHERE task_id = ? LIMIT 1",
+                (task_id,),
+            ).fetchone()
+        return row is not None
+
+    def replace(self, task_id: str, bucket: str, records: Dict[str, dict]) -> int:
+        """以字典为准同步分组内容，仅写入新增、变化和移除的行并返回变更行数"""
+        records = records or {}
+        with self._lock, self._connection:
+            stored = {
+                row["hash"]: row["data"]
+                for row in self._connection.execute(
+                    "SELECT hash, data FROM records WHERE task_id = ? AND bucket = ?",
+                    (task_id, bucket),
+                )
+            }
+            removed = [(task_id, bucket, torrent_hash) for torrent_hash in stored if torrent_hash not in records]
+            if removed:
+                self._connection.executemany(
+                    "DELETE FROM records WHERE task_id = ? AND bucket = ? AND hash = ?",
+                    removed,
+                )
+            changed = []
+            for torrent_hash, record in records.items():
+                if not isinstance(record, dict):
+                    continue
+                params = self._row_params(task_id, bucket, torrent_hash, record)
+                if stored.get(torrent_hash) != params[-1]:
+                    changed.append(params)
+            if changed:
+                self._upsert(changed)
+        return len(removed) + len(changed)
+
+    def upsert(self, task_id: str, bucket: str, records: Dict[str, dict]) -> None:
+        """新增或覆盖指定记录，不影响分组内其他行"""
+        params = [
+            self._row_params(task_id, bucket, torrent_hash, record)
+            for torrent_hash, record in (records or {}).items()
+            if isinstance(record, dict)
+        ]
+        if not params:
+            return
+        with self._lock, self._connection:
+            self._upsert(params)
+
+    def move(self, task_id: str, hashes: Iterable[str], bucket: str, source: str = "torrents") -> None:
+        """把指定 Hash 的记录从来源分组整体转移到另一分组，目标分组中的同名记录被替换"""
+        hashes = list(hashes)
+        if not hashes or source == bucket:
+            return
+        with self._lock, self._connection:
+            # 先显式删除目标分组的同名记录，使删除触发器同步扣减累计统计
+            self._connection.executemany(
+                "DELETE FROM records WHERE task_id = ? AND bucket = ? AND hash = ? AND EXISTS "
+                "(SELECT 1 FROM records WHERE task_id = ? AND bucket = ? AND hash = ?)",
+                [(task_id, bucket, torrent_hash, task_id, source, torrent_hash) for torrent_hash in hashes],
+            )
+            self._connection.executemany(
+                "UPDATE records SET bucket = ? WHERE task_id = ? AND bucket = ? AND hash = ?",
+                [(bucket, task_id, source, torrent_hash) for torrent_hash in hashes],
+            )
+
+    def clear_task(self, task_id: str) -> None:
+        """删除任务的全部记录及累计统计"""
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM records WHERE task_id = ?", (task_id,))
+            self._connection.execute("DELETE FROM record_totals WHERE task_id = ?", (task_id,))
+
+    def _totals(self, task_ids: Optional[List[str]] = None) -> List[sqlite3.Row]:
+        """读取累计统计行，可限定任务范围"""
+        if task_ids is None:
+            query, params = "SELECT * FROM record_totals", ()
+        elif not task_ids:
+            return []
+        else:
+            placeholders = ",".join("?" for _ in task_ids)
+            query, params = f"SELECT * FROM record_totals WHERE task_id IN ({placeholders})", tuple(task_ids)
+        with self._lock:
+            return self._connection.execute(query, params).fetchall()
+
+    def seeding_size(self, task_ids: Optional[Iterable[str]] = None) -> float:
+        """返回指定任务未删除托管种子的累计体积"""
+        rows = self._totals(list(task_ids) if task_ids is not None else None)
+        return sum(
+            float(row["size"] or 0)
+            for row in rows
+            if row["bucket"] == "torrents" and not row["deleted"]
+        )
+
+    def statistic(self, task_id: str) -> Dict[str, int]:
+        """由累计统计直接组装任务统计，无需扫描历史记录"""
+        statistic = {
+            "count": 0,
+            "deleted": 0,
+            "uploaded": 0,
+            "downloaded": 0,
+            "unarchived": 0,
+            "active": 0,
+            "active_uploaded": 0,
+            "active_downloaded": 0,
+        }
+        for row in self._totals([task_id]):
+            if row["bucket"] not in {"torrents", "archived"}:
+                continue
+            count = int(row["count"] or 0)
+            uploaded = row["uploaded"] or 0
+            downloaded = row["downloaded"] or 0
+            statistic["count"] += count
+            statistic["uploaded"] += uploaded
+            statistic["downloaded"] += downloaded
+            if row["deleted"]:
+                statistic["deleted"] += count
+                if row["bucket"] == "torrents":
+                    statistic["unarchived"] += count
+            elif row["bucket"] == "torrents":
+                statistic["active"] += count
+                statistic["active_uploaded"] += uploaded
+                statistic["active_downloaded"] += downloaded
+        return {
+            key: int(value) if float(value).is_integer() else value
+            for key, value in statistic.items()
+        }
+
+    def page(self, task_id: str, state: str, offset: int, limit: int) -> Tuple[List[dict], int]:
+        """按状态分页读取任务详情记录，并返回符合条件的总数"""
+        if state == "active":
+            condition = "bucket = 'torrents' AND deleted = 0"
+        elif state == "deleted":
+            condition = "((bucket = 'torrents' AND deleted = 1) OR bucket = 'archived')"
+        else:
+            condition = "bucket IN ('torrents', 'archived')"
+        with self._lock:
+            total = self._connection.execute(
+                f"SELECT COUNT(*) FROM records WHERE task_id = ? AND {condition}",
+                (task_id,),
+            ).fetchone()[0]
+            rows = self._connection.execute(
+                f"SELECT data FROM records WHERE task_id = ? AND {condition} "
+                "ORDER BY time DESC LIMIT ? OFFSET ?",
+                (task_id, limit, offset),
+            ).fetchall()
+        return [json.loads(row["data"]) for row in rows], int(total or 0)
@@ -36,7 +36,7 @@ class ClashRuleProvider(_PluginBase):
     # 插件图标
     plugin_icon = "Mihomo_Meta_A.png"
     # 插件版本
-    plugin_version = "2.1.8"
+    plugin_version = "2.1.10"
     # 插件作者
     plugin_author = "wumode"
     # 作者主页
@@ -221,6 +221,7 @@ class ClashRuleProvider(_PluginBase):
 
     def update_best_cf_ip(self, ips: List[str]):
         self.state.config.best_cf_ip = [*ips]
+        self.state.bump_version()
         conf = self.get_config()
         conf['best_cf_ip'] = self.state.config.best_cf_ip
         self.update_config(conf)
@@ -4,7 +4,6 @@ import secrets
 from typing import Any, Dict, List, Callable, Optional, Literal
 
 import websockets
-import yaml
 from fastapi import HTTPException, Request, status, Response, Body
 from fastapi.responses import PlainTextResponse
 from sse_starlette.sse import EventSourceResponse
@@ -266,15 +265,19 @@ class ClashRuleProviderApi:
         if not secrets.compare_digest(apikey, _apikey):
             raise HTTPException(status_code=403, detail="Invalid API Key")
         logger.info(f"{request.client.host} 正在获取配置")
-        config = self.services.build_clash_config(param=param)
-        if not config:
+        snapshot = self.services.get_clash_config(param=param)
+        if not snapshot:
             raise HTTPException(status_code=500, detail="配置不可用")
 
-        config_dict = config.model_dump(mode="json", by_alias=True, exclude_none=True)
-        res = yaml.dump(config_dict, allow_unicode=True, sort_keys=False)
         sub_info = self.services.get_subscription_user_info()
-        headers = {'Subscription-Userinfo': sub_info.header}
-        return Response(headers=headers, content=res, media_type="text/yaml")
+        headers = {
+            'Subscription-Userinfo': sub_info.header,
+            'ETag': snapshot.etag,
+            'Cache-Control': 'no-cache'
+        }
+        if snapshot.matches(request.headers.get("if-none-match")):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(headers=headers, content=snapshot.content, media_type="text/yaml")
 
     @apis.register(path="/clash/proxy/{path:path}", methods=["GET"], auth="bear", summary="转发 Clash API 请求")
     async def clash_proxy(self, path: str):
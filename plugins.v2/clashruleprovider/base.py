@@ -6,3 +6,4 @@ class Constant:
     ACL4SSR_API: Final[str] = "https://api.github.com/repos/ACL4SSR/ACL4SSR"
     METACUBEX_RULE_DAT_API: Final[str] = "https://api.github.com/repos/MetaCubeX/meta-rules-dat"
     MISFIRE_GRACE_TIME: Final[int] = 120
+    CONFIG_SNAPSHOTS: Final[int] = 32
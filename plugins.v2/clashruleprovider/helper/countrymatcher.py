@@ -0,0 +1,92 @@
+from collections import deque
+from typing import Dict, List, Optional
+
+
+class CountryMatcher:
+    """
+    根据节点名称识别国家/地区
+
+    加载时为国旗 emoji 建立查找表，为中文名和英文名建立 Aho-Corasick 自动机，每个节点名只需扫描一遍。
+    多个国家同时命中时返回 countries 中排在最前的一个，与逐个国家做子串判断的结果一致。
+    """
+
+    _NO_MATCH = 1 << 30
+
+    def __init__(self, countries: List[Dict[str, str]]):
+        self._countries = countries
+        # 国旗 emoji -> 国家序号
+        self._emoji: Dict[str, int] = {}
+        # 自动机：转移表、失配指针、每个状态（含失配链）命中的最小国家序号
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._best: List[int] = [self._NO_MATCH]
+        self._cache: Dict[str, int] = {}
+        self._abbr: Dict[str, Dict[str, str]] = {}
+
+        for index, country in enumerate(countries):
+            if country.get('abbr'):
+                self._abbr.setdefault(country['abbr'], country)
+            emoji = country.get('emoji')
+            if emoji:
+                if len(emoji) == 2:
+                    self._emoji.setdefault(emoji, index)
+                else:
+                    self._add_pattern(emoji, index)
+            # 中文名与 emoji 不区分大小写，统一在小写后的节点名上匹配
+            for key in ('chinese', 'english'):
+                if country.get(key):
+                    self._add_pattern(country[key].lower(), index)
+        self._build_fail_links()
+
+    def _add_pattern(self, pattern: str, index: int):
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._best.append(self._NO_MATCH)
+            state = next_state
+        self._best[state] = min(self._best[state], index)
+
+    def _build_fail_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._best[next_state] = min(self._best[next_state], self._best[self._fail[next_state]])
+                queue.append(next_state)
+
+    def _scan(self, node_name: str) -> int:
+        best = self._NO_MATCH
+        for i in range(len(node_name) - 1):
+            index = self._emoji.get(node_name[i:i + 2])
+            if index is not None and index < best:
+                best = index
+        state = 0
+        goto, fail, best_of = self._goto, self._fail, self._best
+        for char in node_name.lower():
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if best_of[state] < best:
+                best = best_of[state]
+        return best
+
+    def country_by_abbr(self, abbr: str) -> Optional[Dict[str, str]]:
+        return self._abbr.get(abbr)
+
+    def match(self, node_name: str) -> Optional[Dict[str, str]]:
+        index = self._cache.get(node_name)
+        if index is None:
+            index = self._scan(node_name)
+            if len(self._cache) >= 65536:
+                self._cache.clear()
+            self._cache[node_name] = index
+        return self._countries[index] if index != self._NO_MATCH else None
@@ -1,3 +1,4 @@
+import hashlib
 from typing import List
 
 from pydantic import BaseModel, Field, RootModel
@@ -69,3 +70,8 @@ class ConfigRequest(BaseModel):
 
     def resolve(self, expr) -> bool:
         return bool(simple_eval(expr=expr, names=self.model_dump()))
+
+    @property
+    def fingerprint(self) -> str:
+        # Visibility expressions may reference any field, so every field is part of the key
+        return hashlib.sha256(self.model_dump_json().encode("utf-8")).hexdigest()
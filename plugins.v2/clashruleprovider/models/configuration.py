@@ -229,3 +229,19 @@ class ClashConfig(BaseModel):
         self.rule_providers |= other.rule_providers
         self.proxy_providers |= other.proxy_providers
         return self
+
+
+class ClashConfigSnapshot(BaseModel):
+    """
+    A generated config together with its serialized YAML, reused while the plugin state is unchanged.
+    """
+    version: int
+    config: ClashConfig
+    content: bytes
+    etag: str
+
+    def matches(self, if_none_match: str | None) -> bool:
+        if not if_none_match:
+            return False
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or self.etag in tags
@@ -3,8 +3,10 @@ import hashlib
 import json
 import pytz
 import re
+import threading
 import time
 import yaml
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional, Tuple, Iterable, TypeVar
 
@@ -20,11 +22,12 @@ from app.utils.http import AsyncRequestUtils
 from .base import Constant
 from .helper.clashruleparser import ClashRuleParser, RoutingRuleType, Action
 from .helper.configconverter import Converter
+from .helper.countrymatcher import CountryMatcher
 from .helper.utilsprovider import UtilsProvider
 from .models import ProxyGroup, Proxy, RuleProvider, RuleProviderData, ProxyData, HostData, VehicleType, SelectGroup, \
     ProxyGroupData, RuleItem, RuleData, Metadata, RuleProviders
 from .models.api import ClashApi, SubscriptionSetting, DataUsage, SubscriptionInfo, ConfigRequest
-from .models.configuration import ClashConfig
+from .models.configuration import ClashConfig, ClashConfigSnapshot
 from .models.datapatch import PatchItem, DataPatch
 from .models.rule import RuleType
 from .models.types import DataSource, DataKey, RuleSet, ClashKey, SupportsPatch
@@ -43,6 +46,9 @@ class ClashRuleProviderService:
         self.plugin_id = plugin_id
         self.state = state
         self.scheduler = scheduler
+        # Generated configs keyed by ConfigRequest fingerprint, valid while state.version is unchanged
+        self._config_snapshots: OrderedDict[str, ClashConfigSnapshot] = OrderedDict()
+        self._config_lock = threading.Lock()
 
     def save_rules(self):
         self.state.save_data(DataKey.TOP_RULES, self.state.top_rules_manager.export_rules())
@@ -346,15 +352,22 @@ class ClashRuleProviderService:
             logger.error(f"加载国家/地区文件错误：{e}")
             return []
 
-    def proxy_groups_by_region(self) -> list[ProxyGroupData]:
+    @cached(maxsize=1, ttl=86400, skip_empty=True)
+    def _get_country_matcher(self) -> Optional[CountryMatcher]:
         countries = self._get_countries_data()
+        return CountryMatcher(countries) if countries else None
+
+    def proxy_groups_by_region(self) -> list[ProxyGroupData]:
+        matcher = self._get_country_matcher()
+        if not matcher:
+            return []
         proxies = self.get_proxies()
         return self._group_by_region(
-            countries, proxies, self.state.config.group_by_region, self.state.config.group_by_country
+            matcher, proxies, self.state.config.group_by_region, self.state.config.group_by_country
         )
 
-    @cached(maxsize=2, ttl=86400)
-    def _group_by_region(self, countries: list[dict[str, str]], proxies: list[ProxyData], group_by_continent: bool,
+    @staticmethod
+    def _group_by_region(matcher: CountryMatcher, proxies: list[ProxyData], group_by_continent: bool,
                          group_by_country: bool) -> list[ProxyGroupData]:
         continent_groups = {}
         country_groups = {}
@@ -363,12 +376,12 @@ class ClashRuleProviderService:
             '北美洲': 'NorthAmerica', '南美洲': 'SouthAmerica'
         }
         proxy_groups: list[ProxyGroup] = []
-        hk = next((c for c in countries if c['abbr'] == 'HK'), {})
-        tw = next((c for c in countries if c['abbr'] == 'TW'), {})
+        hk = matcher.country_by_abbr('HK') or {}
+        tw = matcher.country_by_abbr('TW') or {}
 
         for proxy_data in proxies:
             proxy_node = proxy_data.data
-            country = ClashRuleProviderService._country_from_node(countries, proxy_node.name)
+            country = matcher.match(proxy_node.name)
             if not country:
                 continue
             if country.get("abbr") == "CN":
@@ -403,19 +416,6 @@ class ClashRuleProviderService:
         ret = [ProxyGroupData(name=p.name, data=p, meta=Metadata(source=DataSource.AUTO)) for p in proxy_groups]
         return ret
 
-    @staticmethod
-    def _country_from_node(countries: List[Dict[str, str]], node_name: str) -> Optional[Dict[str, str]]:
-        node_name_lower = node_name.lower()
-        for country in countries:
-            if country.get('emoji') and country['emoji'] in node_name:
-                return country
-            if (
-                    (country.get('chinese') and country['chinese'] in node_name) or
-                    (country.get('english') and country['english'].lower() in node_name_lower)
-            ):
-                return country
-        return None
-
     @staticmethod
     def _build_graph(config: ClashConfig) -> Dict[str, Any]:
         """构建代理组有向图"""
@@ -527,6 +527,35 @@ class ClashRuleProviderService:
 
         return config
 
+    def get_clash_config(self, param: ConfigRequest) -> ClashConfigSnapshot | None:
+        """
+        Return the generated config for the request, rebuilding only when the plugin state has changed.
+        """
+        key = param.fingerprint
+        with self._config_lock:
+            snapshot = self._config_snapshots.get(key)
+            if snapshot is not None and snapshot.version == self.state.version:
+                self._config_snapshots.move_to_end(key)
+                return snapshot
+            # Read the version before building: if the build itself changes state, the next request rebuilds
+            version = self.state.version
+            config = self.build_clash_config(param)
+            if not config:
+                return None
+            config_dict = config.model_dump(mode="json", by_alias=True, exclude_none=True)
+            content = yaml.dump(config_dict, allow_unicode=True, sort_keys=False).encode("utf-8")
+            snapshot = ClashConfigSnapshot(
+                version=version,
+                config=config,
+                content=content,
+                etag=f'"{hashlib.sha256(content).hexdigest()[:32]}"'
+            )
+            self._config_snapshots[key] = snapshot
+            self._config_snapshots.move_to_end(key)
+            while len(self._config_snapshots) > Constant.CONFIG_SNAPSHOTS:
+                self._config_snapshots.popitem(last=False)
+            return snapshot
+
     def delete_proxy_group(self, name: str) -> Tuple[bool, str]:
         """
         Deletes a proxy group by name and saves the state.
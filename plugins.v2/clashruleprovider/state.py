@@ -1,3 +1,5 @@
+import json
+import threading
 from itertools import chain
 from typing import Any, Generator, Callable
 
@@ -24,7 +26,12 @@ class PluginState:
     """
     def __init__(self, plugin_id: str, config: PluginConfig = None):
         self.plugin_id = plugin_id
-        self.config = config or PluginConfig()
+        # Monotonic counter bumped on every effective state change, used to invalidate generated configs
+        self._version = 0
+        self._version_lock = threading.Lock()
+        # Last persisted serialization per key, so that rewriting an unchanged value is a no-op
+        self._fingerprints: dict[str, str] = {}
+        self._config = config or PluginConfig()
         self.plugin_data = PluginDataOper()
         self.cache = Cache(maxsize=256, ttl=self.config.cache_ttl)
         self.cache_region = f"app.plugins.{self.plugin_id.lower()}"
@@ -41,7 +48,37 @@ class PluginState:
         self.ruleset_rules_manager: ClashRuleManager = ClashRuleManager()
 
         # Runtime variables (not persisted directly or persisted via config)
-        self.clash_template: ClashConfig = ClashConfig()
+        self._clash_template: ClashConfig = ClashConfig()
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def bump_version(self):
+        with self._version_lock:
+            self._version += 1
+
+    @staticmethod
+    def _fingerprint(data: Any) -> str:
+        return json.dumps(data, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+
+    @property
+    def config(self) -> PluginConfig:
+        return self._config
+
+    @config.setter
+    def config(self, value: PluginConfig):
+        self._config = value
+        self.bump_version()
+
+    @property
+    def clash_template(self) -> ClashConfig:
+        return self._clash_template
+
+    @clash_template.setter
+    def clash_template(self, value: ClashConfig):
+        self._clash_template = value
+        self.bump_version()
 
     def _get_val(self, key: str) -> Any:
         # Check cache
@@ -63,6 +100,7 @@ class PluginState:
         else:
             val = data
 
+        self._fingerprints[key] = self._fingerprint(data)
         self.cache.set(key, val, region=self.cache_region)
         return val
 
@@ -72,8 +110,13 @@ class PluginState:
             data = adapter.dump_python(value, mode="json", by_alias=True, exclude_none=True)
         else:
             data = value
-        self.plugin_data.save(self.plugin_id, key, data)
         self.cache.set(key, value, region=self.cache_region)
+        fingerprint = self._fingerprint(data)
+        if self._fingerprints.get(key) == fingerprint:
+            return
+        self.plugin_data.save(self.plugin_id, key, data)
+        self._fingerprints[key] = fingerprint
+        self.bump_version()
 
     @property
     def proxies(self) -> Proxies:
@@ -184,7 +227,12 @@ class PluginState:
         return self.plugin_data.get_data(self.plugin_id, key)
 
     def save_data(self, key: str, value: Any):
+        fingerprint = self._fingerprint(value)
+        if self._fingerprints.get(key) == fingerprint:
+            return
         self.plugin_data.save(self.plugin_id, key, value)
+        self._fingerprints[key] = fingerprint
+        self.bump_version()
 
     def get_rule_manager(self, ruleset: RuleSet) -> ClashRuleManager:
         if ruleset == RuleSet.RULESET:
@@ -2,6 +2,7 @@ import hashlib
 import os
 import re
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 from threading import Event
@@ -21,6 +22,9 @@ from app.helper.sites import SitesHelper
 from app.helper.torrent import TorrentHelper
 from app.log import logger
 from app.plugins import _PluginBase
+from app.plugins.crossseed.seed_cache import SeedCache
+from app.plugins.crossseed.torrent_filter import TorrentFilter
+from app.plugins.crossseed.torrent_index import TorrentIndex
 from app.schemas import NotificationType, ServiceInfo
 from app.schemas.types import EventType
 from app.utils.string import StringUtils
@@ -118,10 +122,26 @@ class TorInfo:
 
 class CrossSeedHelper(object):
     _version = "0.2.0"
+    # 同时查询的站点数
+    _max_site_workers = 5
 
     @staticmethod
-    def get_local_torrent_info(torrent_path: Path | str) -> Tuple[Optional[TorInfo], str]:
+    def get_local_torrent_info(torrent_path: Path | str,
+                               index: Optional[TorrentIndex] = None,
+                               info_hash: Optional[str] = None,
+                               downloader: str = "") -> Tuple[Optional[TorInfo], str]:
+        """
+        读取本地种子文件信息，传入索引时文件未变化直接使用索引结果，变化或未命中时重新解析并更新索引
+        """
         try:
+            stat = None
+            if index is not None and info_hash:
+                stat = os.stat(torrent_path)
+                entry = index.lookup(downloader, info_hash, stat)
+                if entry:
+                    local_tor = TorInfo.local(str(torrent_path), info_hash, entry.get("pieces_hash"))
+                    local_tor.torrent_announce = entry.get("announce")
+                    return local_tor, ""
             if isinstance(torrent_path, Path):
                 torrent_data = torrent_path.read_bytes()
             else:
@@ -131,6 +151,11 @@ class CrossSeedHelper(object):
             if not local_tor:
                 return None, err
             local_tor.torrent_path = str(torrent_path)
+            if stat is not None:
+                announce = local_tor.torrent_announce
+                if isinstance(announce, bytes):
+                    announce = announce.decode("utf-8", errors="ignore")
+                index.update(downloader, info_hash, stat, local_tor.pieces_hash, announce)
             return local_tor, ""
         except Exception as err:
             return None, str(err)
@@ -165,11 +190,69 @@ class CrossSeedHelper(object):
                     remote_torrent_infos.append(
                         TorInfo.remote(site.name, pieces_hash, torrent_id)
                     )
-            time.sleep(site.query_gap)
         except requests.exceptions.RequestException as e:
             return None, f"站点{site.name}请求失败：{e}"
         return remote_torrent_infos, None
 
+    def get_site_torrents(
+            self,
+            site: CSSiteConfig,
+            pieces_hashes: List[str],
+            chunk_size: int = 100,
+            stop_event: Optional[Event] = None
+    ) -> List[TorInfo]:
+        """
+        分批查询单个站点可辅种的种子，同一站点的两次请求之间间隔query_gap秒
+        """
+        remote_tors: List[TorInfo] = []
+        total_size = len(pieces_hashes)
+        for i in range(0, total_size, chunk_size):
+            if i:
+                if stop_event is None:
+                    time.sleep(site.query_gap)
+                elif stop_event.wait(site.query_gap):
+                    break
+            if stop_event and stop_event.is_set():
+                break
+            chunk = pieces_hashes[i:i + chunk_size]
+            chunk_tors, err_msg = self.get_target_torrent(site, chunk)
+            if not chunk_tors and err_msg:
+                logger.info(
+                    f"查询站点{site.name}可辅种的信息出错 {err_msg},进度={i + 1}/{total_size}"
+                )
+            else:
+                logger.info(
+                    f"站点{site.name}本批次的可辅种/查询数={len(chunk_tors)}/{len(chunk)},进度={i + 1}/{total_size}"
+                )
+                remote_tors.extend(chunk_tors)
+        return remote_tors
+
+    def get_target_torrents(
+            self,
+            sites: List[CSSiteConfig],
+            pieces_hashes: List[str],
+            chunk_size: int = 100,
+            stop_event: Optional[Event] = None
+    ) -> Dict[str, List[TorInfo]]:
+        """
+        多个站点并发查询可辅种的种子，各站点内部仍按query_gap限速，返回站点名称到可辅种种子的映射
+        """
+        if not sites or not pieces_hashes:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(self._max_site_workers, len(sites))) as executor:
+            futures = {
+                site.name: executor.submit(self.get_site_torrents, site, pieces_hashes, chunk_size, stop_event)
+                for site in sites
+            }
+        results = {}
+        for site_name, future in futures.items():
+            try:
+                results[site_name] = future.result()
+            except Exception as err:
+                logger.error(f"查询站点{site_name}可辅种的信息出错 {err}")
+                results[site_name] = []
+        return results
+
 
 class CrossSeed(_PluginBase):
     # 插件名称
@@ -179,7 +262,7 @@ class CrossSeed(_PluginBase):
     # 插件图标
     plugin_icon = "qingwa.png"
     # 插件版本
-    plugin_version = "3.0.3"
+    plugin_version = "3.0.6"
     # 插件作者
     plugin_author = "233@qingwa"
     # 作者主页
@@ -213,15 +296,22 @@ class CrossSeed(_PluginBase):
     _recheck_torrents = {}
     _is_recheck_running = False
     # 辅种缓存，出错的种子不再重复辅种，可清除
-    _error_caches = []
+    _error_caches = SeedCache()
     # 辅种缓存，辅种成功的种子，可清除
-    _success_caches = []
+    _success_caches = SeedCache()
     # 辅种缓存，出错的种子不再重复辅种，且无法清除。种子被删除404等情况
-    _permanent_error_caches = []
-    # 辅种缓存最大保存条数，避免长期运行时配置缓存无限增长
+    _permanent_error_caches = SeedCache()
+    # 辅种缓存最大保存条数，超出时淘汰最早写入的记录
     _seed_cache_max_items = 10000
+    # 辅种缓存以压缩文本保存在插件数据中，不再写入插件配置
+    _seed_cache_data_key = "seed_caches"
+    _seed_cache_names = ("success_caches", "error_caches", "permanent_error_caches")
     _torrentpaths = []
     _site_cs_infos = []
+    # 预编译的路径与标签过滤规则
+    _filter = TorrentFilter()
+    # 本地种子文件索引，按文件修改时间增量更新
+    _torrent_index: Optional[TorrentIndex] = None
     # 辅种计数
     total = 0
     realtotal = 0
@@ -231,9 +321,9 @@ class CrossSeed(_PluginBase):
     cached = 0
 
     def init_plugin(self, config: dict = None):
-        self._error_caches = []
-        self._success_caches = []
-        self._permanent_error_caches = []
+        self._error_caches = SeedCache(max_items=self._seed_cache_max_items)
+        self._success_caches = SeedCache(max_items=self._seed_cache_max_items)
+        self._permanent_error_caches = SeedCache(max_items=self._seed_cache_max_items)
         self._torrentpaths = []
         self._site_cs_infos = []
 
@@ -251,15 +341,9 @@ class CrossSeed(_PluginBase):
             self._notify = config.get("notify")
             self._nolabels = config.get("nolabels")
             self._nopaths = config.get("nopaths")
+            self._filter = TorrentFilter(nopaths=self._nopaths, nolabels=self._nolabels)
             self._clearcache = config.get("clearcache")
-            self._permanent_error_caches = (
-                [] if self._clearcache else list(config.get("permanent_error_caches") or [])
-            )
-            self._error_caches = [] if self._clearcache else list(config.get("error_caches") or [])
-            self._success_caches = [] if self._clearcache else list(config.get("success_caches") or [])
-            self.__trim_seed_cache(self._permanent_error_caches)
-            self.__trim_seed_cache(self._error_caches)
-            self.__trim_seed_cache(self._success_caches)
+            self.__load_seed_caches(config)
 
             # 过滤掉已删除的站点
             inner_site_list = SiteOper().list_order_by_pri()
@@ -335,6 +419,8 @@ class CrossSeed(_PluginBase):
         # 启动定时任务 & 立即运行一次
         if self.get_state() or self._onlyonce:
             self.cross_helper = CrossSeedHelper()
+            self._torrent_index = TorrentIndex(self.get_data_path() / "torrent_index.json")
+            self._torrent_index.load()
             self._scheduler = BackgroundScheduler(timezone=settings.TZ)
 
             if self._onlyonce:
@@ -765,36 +851,28 @@ class CrossSeed(_PluginBase):
             "notify": self._notify,
             "nolabels": self._nolabels,
             "nopaths": self._nopaths,
-            "success_caches": self._success_caches,
-            "error_caches": self._error_caches,
-            "permanent_error_caches": self._permanent_error_caches
         })
+        self.__save_seed_caches()
 
-    def __trim_seed_cache(self, cache: list):
+    def __load_seed_caches(self, config: dict):
         """
-        去重并限制辅种缓存大小，避免长期任务把配置缓存无限撑大。
+        加载辅种缓存，兼容迁移旧版保存在插件配置中的缓存列表，清除缓存时全部置空。
         """
-        if not cache:
-            return
-        unique_cache = []
-        seen = set()
-        for item in reversed(cache):
-            if not item or item in seen:
-                continue
-            seen.add(item)
-            unique_cache.append(item)
-        unique_cache.reverse()
-        cache[:] = unique_cache[-self._seed_cache_max_items:]
-
-    def __append_seed_cache(self, cache: list, value: str):
+        data = {} if self._clearcache else (self.get_data(self._seed_cache_data_key) or {})
+        for name in self._seed_cache_names:
+            cache = SeedCache.loads(data.get(name), max_items=self._seed_cache_max_items)
+            if not self._clearcache:
+                for item in config.get(name) or []:
+                    cache.add(item)
+            setattr(self, f"_{name}", cache)
+
+    def __save_seed_caches(self):
         """
-        写入辅种缓存并保持上限，重复值只保留一份。
+        将辅种缓存压缩后保存到插件数据。
         """
-        if not value:
-            return
-        if value not in cache:
-            cache.append(value)
-        self.__trim_seed_cache(cache)
+        self.save_data(self._seed_cache_data_key, {
+            name: getattr(self, f"_{name}").dumps() for name in self._seed_cache_names
+        })
 
     def auto_seed(self):
         """
@@ -812,6 +890,8 @@ class CrossSeed(_PluginBase):
         self.exist = 0
         self.fail = 0
         self.cached = 0
+        if self._torrent_index is not None:
+            self._torrent_index.begin_scan()
         # 扫描下载器辅种
         for idx, service in enumerate(self.service_infos.values()):
             downloader = service.name
@@ -819,6 +899,9 @@ class CrossSeed(_PluginBase):
             logger.info(f"开始扫描下载器 {downloader} ...")
             # 获取下载器中已完成的种子
             torrents = downloader_obj.get_completed_torrents()
+            # 获取失败的下载器不清理其索引记录，避免下次运行重新解析全部种子文件
+            if torrents is not None and self._torrent_index is not None:
+                self._torrent_index.mark_listed(downloader)
             if torrents:
                 logger.info(f"下载器 {downloader} 已完成种子数：{len(torrents)}")
             else:
@@ -857,7 +940,10 @@ class CrossSeed(_PluginBase):
 
                 # 读取种子文件具体信息
                 if not torrent_info:
-                    torrent_info, err = self.cross_helper.get_local_torrent_info(torrent_path)
+                    torrent_info, err = self.cross_helper.get_local_torrent_info(torrent_path,
+                                                                                 index=self._torrent_index,
+                                                                                 info_hash=hash_str,
+                                                                                 downloader=downloader)
                     if not torrent_info:
                         logger.error(f"未能读取到种子文件具体信息：{torrent_path} {err}")
                         continue
@@ -889,27 +975,16 @@ class CrossSeed(_PluginBase):
                         if site_info:
                             torrent_info.site_name = site_info.get("name")
 
-                if self._nopaths and save_path:
-                    # 过滤不需要转移的路径
-                    nopath_skip = False
-                    for nopath in self._nopaths.split('\n'):
-                        if os.path.normpath(save_path).startswith(os.path.normpath(nopath)):
-                            logger.info(f"种子 {hash_str} 保存路径 {save_path} 不需要辅种，跳过 ...")
-                            nopath_skip = True
-                            break
-                    if nopath_skip:
-                        continue
+                # 过滤不需要辅种的路径
+                if self._filter.excluded_path(save_path):
+                    logger.info(f"种子 {hash_str} 保存路径 {save_path} 不需要辅种，跳过 ...")
+                    continue
 
-                # 获取种子标签
-                torrent_labels = self.__get_label(torrent, service.type)
-                if torrent_labels and self._nolabels:
-                    is_skip = False
-                    for label in self._nolabels.split(','):
-                        if label in torrent_labels:
-                            logger.info(f"种子 {hash_str} 含有不辅种标签 {label}，跳过 ...")
-                            is_skip = True
-                            break
-                    if is_skip:
+                # 排除含有不辅种标签的种子
+                if self._filter.has_nolabels:
+                    label = self._filter.excluded_label(self.__get_label(torrent, service.type))
+                    if label:
+                        logger.info(f"种子 {hash_str} 含有不辅种标签 {label}，跳过 ...")
                         continue
                 hash_strs.append({
                     "hash": hash_str,
@@ -922,6 +997,10 @@ class CrossSeed(_PluginBase):
                 self.check_recheck()
             else:
                 logger.info("没有需要辅种的种子")
+        # 保存种子文件索引，移除成功列出的下载器中已不存在的种子
+        if self._torrent_index is not None:
+            logger.info(f"种子文件索引命中 {self._torrent_index.hits} 个，重新解析 {self._torrent_index.misses} 个")
+            self._torrent_index.save(prune=True)
         # 保存缓存
         self.__update_config()
         # 发送消息
@@ -1011,35 +1090,26 @@ class CrossSeed(_PluginBase):
         logger.info(f"去重后，总共需要辅种查询的种子数：{len(pieces_hash_set)}")
         pieces_hashes = list(pieces_hash_set)
 
-        # 分站点逐个批次辅种
-        # 逐个站点查询可辅种数据
-        chunk_size = 100
+        # 检查站点是否已经停用
+        active_sites = []
         for site_config in self._site_cs_infos:
-            # 检查站点是否已经停用
             db_site = SiteOper().get(site_config.id)
             if db_site and not db_site.is_active:
                 logger.info(f"站点{site_config.name}已停用，跳过辅种")
                 continue
-            remote_tors: List[TorInfo] = []
-            total_size = len(pieces_hashes)
-            for i in range(0, len(pieces_hashes), chunk_size):
-                if self._event.is_set():
-                    logger.info("辅种服务停止")
-                    return
-                # 切片操作
-                chunk = pieces_hashes[i:i + chunk_size]
-                # 处理分组
-                chunk_tors, err_msg = self.cross_helper.get_target_torrent(site_config, chunk)
-                if not chunk_tors and err_msg:
-                    logger.info(
-                        f"查询站点{site_config.name}可辅种的信息出错 {err_msg},进度={i + 1}/{total_size}"
-                    )
-                else:
-                    logger.info(
-                        f"站点{site_config.name}本批次的可辅种/查询数={len(chunk_tors)}/{len(chunk)},进度={i + 1}/{total_size}"
-                    )
-                    remote_tors = remote_tors + chunk_tors
+            active_sites.append(site_config)
+
+        # 各站点并发分批查询可辅种数据，站点内部按请求间隔限速
+        site_remote_tors = self.cross_helper.get_target_torrents(sites=active_sites,
+                                                                 pieces_hashes=pieces_hashes,
+                                                                 stop_event=self._event)
+        if self._event.is_set():
+            logger.info("辅种服务停止")
+            return
 
+        # 逐个站点辅种
+        for site_config in active_sites:
+            remote_tors: List[TorInfo] = site_remote_tors.get(site_config.name) or []
             logger.info(f"站点{site_config.name}返回可以辅种的种子总数为{len(remote_tors)}")
 
             # 去除已经下载过的种子
@@ -1146,10 +1216,10 @@ class CrossSeed(_PluginBase):
             self.cached += 1
             # 加入失败缓存
             if error_msg and ('无法打开链接' in error_msg or '触发站点流控' in error_msg):
-                self.__append_seed_cache(self._error_caches, tor.get_name_id_tag())
+                self._error_caches.add(tor.get_name_id_tag())
             else:
                 # 种子不存在的情况
-                self.__append_seed_cache(self._permanent_error_caches, tor.get_name_id_tag())
+                self._permanent_error_caches.add(tor.get_name_id_tag())
             logger.error(f"下载种子文件失败：{tor.get_name_id_tag()}")
             return False
 
@@ -1160,7 +1230,7 @@ class CrossSeed(_PluginBase):
             tors, msg = downloader_obj.get_torrents(ids=[tmp_tor_info.info_hash])
             if tors:
                 self.exist += 1
-                self.__append_seed_cache(self._success_caches, tor.get_name_id_tag())
+                self._success_caches.add(tor.get_name_id_tag())
                 logger.info(f"下载的种子{tor.get_name_id_tag()}已存在, 跳过")
                 return True
         else:
@@ -1176,7 +1246,7 @@ class CrossSeed(_PluginBase):
             self.fail += 1
             self.cached += 1
             # 加入失败缓存
-            self.__append_seed_cache(self._error_caches, tor.get_name_id_tag())
+            self._error_caches.add(tor.get_name_id_tag())
             return False
         else:
             self.success += 1
@@ -1189,7 +1259,7 @@ class CrossSeed(_PluginBase):
             # 下载成功
             logger.info(f"成功添加辅种下载，站点种子：{tor.get_name_id_tag()}")
             # 成功也加入缓存，有一些改了路径校验不通过的，手动删除后，下一次又会辅上
-            self.__append_seed_cache(self._success_caches, tor.get_name_id_tag())
+            self._success_caches.add(tor.get_name_id_tag())
             return True
 
     def __add_recheck_torrents(self, service: ServiceInfo, download_id: str):
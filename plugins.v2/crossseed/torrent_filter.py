@@ -0,0 +1,92 @@
+import os
+from typing import Iterable, Optional
+
+
+class TorrentFilter:
+    """
+    种子过滤规则：初始化时一次性编译路径前缀树与标签、分类集合，扫描种子时不再重复拆分和规范化配置
+    """
+
+    # 前缀树中标记完整前缀的键，值为配置中的原始目录
+    _END = "\0"
+
+    def __init__(self,
+                 nopaths: Optional[str] = None,
+                 nolabels: Optional[str] = None,
+                 includelabels: Optional[str] = None,
+                 includecategory: Optional[str] = None):
+        self._path_trie: dict = {}
+        for nopath in (nopaths or "").split("\n"):
+            if nopath.strip():
+                self.__add_path(nopath.strip())
+        self._nolabels = self.__split(nolabels)
+        self._includelabels = self.__split(includelabels)
+        self._includecategory = self.__split(includecategory)
+
+    @staticmethod
+    def __split(value: Optional[str]) -> frozenset:
+        return frozenset(item.strip() for item in (value or "").split(",") if item.strip())
+
+    @staticmethod
+    def __normpath(path: str) -> str:
+        return os.path.normpath(path).replace("\\", "/")
+
+    def __add_path(self, path: str):
+        node = self._path_trie
+        for char in self.__normpath(path):
+            node = node.setdefault(char, {})
+        node.setdefault(self._END, path)
+
+    @property
+    def has_nopaths(self) -> bool:
+        return bool(self._path_trie)
+
+    @property
+    def has_nolabels(self) -> bool:
+        return bool(self._nolabels)
+
+    @property
+    def has_includelabels(self) -> bool:
+        return bool(self._includelabels)
+
+    @property
+    def has_includecategory(self) -> bool:
+        return bool(self._includecategory)
+
+    def excluded_path(self, save_path: Optional[str]) -> Optional[str]:
+        """
+        返回保存路径命中的不处理目录，未命中返回None
+        """
+        if not self._path_trie or not save_path:
+            return None
+        node = self._path_trie
+        for char in self.__normpath(save_path):
+            if self._END in node:
+                return node[self._END]
+            node = node.get(char)
+            if node is None:
+                return None
+        return node.get(self._END)
+
+    def excluded_label(self, labels: Optional[Iterable[str]]) -> Optional[str]:
+        """
+        返回种子含有的不处理标签，未命中返回None
+        """
+        if not self._nolabels or not labels:
+            return None
+        return next((label for label in labels if label in self._nolabels), None)
+
+    def missing_label(self, labels: Optional[Iterable[str]]) -> Optional[str]:
+        """
+        返回种子缺少的必需标签，全部包含时返回None
+        """
+        if not self._includelabels:
+            return None
+        missing = self._includelabels.difference(labels or ())
+        return next(iter(missing), None)
+
+    def category_allowed(self, category: Optional[str]) -> bool:
+        """
+        判断种子分类是否在允许的分类中，未配置分类时全部允许
+        """
+        return not self._includecategory or category in self._includecategory
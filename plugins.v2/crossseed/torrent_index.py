@@ -0,0 +1,124 @@
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Set
+
+
+class TorrentIndex:
+    """
+    本地种子文件索引：下载器 -> info_hash -> pieces_hash、announce、文件修改时间与大小，
+    文件未变化时直接复用索引结果，不再读取和解析种子文件
+    """
+
+    _version = 2
+
+    def __init__(self, index_path: Optional[Path] = None):
+        self._index_path = index_path
+        self._entries: Dict[str, Dict[str, dict]] = {}
+        self._seen: Dict[str, Set[str]] = {}
+        self._listed: Set[str] = set()
+        self._dirty = False
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._entries.values())
+
+    def load(self):
+        """
+        从磁盘加载索引，文件不存在、版本不一致或损坏时从空索引开始
+        """
+        self._entries = {}
+        self._seen = {}
+        self._listed = set()
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+        if not self._index_path or not self._index_path.exists():
+            return
+        try:
+            data = json.loads(self._index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict) and data.get("version") == self._version:
+            self._entries = data.get("entries") or {}
+
+    def begin_scan(self):
+        """
+        开始一次扫描，重置访问记录、已列出的下载器与命中统计
+        """
+        with self._lock:
+            self._seen = {}
+            self._listed = set()
+            self.hits = 0
+            self.misses = 0
+
+    def mark_listed(self, downloader: str):
+        """
+        标记下载器本次已成功获取种子列表，保存时只清理这些下载器中未访问到的记录
+        """
+        with self._lock:
+            self._listed.add(downloader)
+
+    def lookup(self, downloader: str, info_hash: str, stat: os.stat_result) -> Optional[dict]:
+        """
+        查询种子文件的索引记录，修改时间或大小发生变化时视为未命中
+        """
+        with self._lock:
+            self._seen.setdefault(downloader, set()).add(info_hash)
+            entry = self._entries.get(downloader, {}).get(info_hash)
+            if entry and entry.get("mtime") == stat.st_mtime_ns and entry.get("size") == stat.st_size:
+                self.hits += 1
+                return entry
+            self.misses += 1
+            return None
+
+    def update(self, downloader: str, info_hash: str, stat: os.stat_result, pieces_hash: str,
+               announce: Optional[str]):
+        """
+        写入重新解析后的种子文件信息
+        """
+        with self._lock:
+            self._seen.setdefault(downloader, set()).add(info_hash)
+            self._entries.setdefault(downloader, {})[info_hash] = {
+                "pieces_hash": pieces_hash,
+                "announce": announce,
+                "mtime": stat.st_mtime_ns,
+                "size": stat.st_size,
+            }
+            self._dirty = True
+
+    def clear(self):
+        with self._lock:
+            self._entries = {}
+            self._seen = {}
+            self._dirty = True
+
+    def save(self, prune: bool = False):
+        """
+        索引有变化时写回磁盘，prune为True时移除本次成功列出的下载器中未访问到的种子（已从下载器删除），
+        获取种子列表失败的下载器保留原有记录
+        """
+        with self._lock:
+            if prune:
+                for downloader in self._listed:
+                    entries = self._entries.get(downloader)
+                    if not entries:
+                        continue
+                    stale = set(entries) - self._seen.get(downloader, set())
+                    for info_hash in stale:
+                        entries.pop(info_hash, None)
+                    if not entries:
+                        self._entries.pop(downloader, None)
+                    self._dirty = self._dirty or bool(stale)
+            if not self._dirty or not self._index_path:
+                return
+            text = json.dumps({"version": self._version, "entries": self._entries},
+                              separators=(',', ':'), ensure_ascii=False)
+            self._dirty = False
+        self._index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._index_path.with_suffix(".tmp")
+        tmp_path.write_text(text, encoding="utf-8")
+        os.replace(tmp_path, self._index_path)
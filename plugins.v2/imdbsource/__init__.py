@@ -17,6 +17,8 @@ from app.core.context import MediaInfo
 from app.core.event import eventmanager, Event
 from app.core.meta import MetaBase
 from app.plugins import _PluginBase
+from app.plugins.imdbsource.datasetindex import ImdbDatasetIndex
+from app.plugins.imdbsource.diskcache import DiskCache, disk_cached
 from app.plugins.imdbsource.imdbhelper import ImdbHelper
 from app.plugins.imdbsource.officialapi import INTERESTS_ID
 from app.plugins.imdbsource.schema import StaffPickEntry, ImdbTitle, StaffPickApiResponse, ImdbMediaInfo, SearchParams
@@ -35,7 +37,7 @@ class ImdbSource(_PluginBase):
     # 插件图标
     plugin_icon = "IMDb_IOS-OSX_App.png"
     # 插件版本
-    plugin_version = "1.6.13"
+    plugin_version = "1.6.16"
     # 插件作者
     plugin_author = "wumode"
     # 作者主页
@@ -57,9 +59,12 @@ class ImdbSource(_PluginBase):
     _chinese_component: bool = False
     _recognition_mode: str = 'auxiliary'
     _interval: int = 10
+    _offline_index: bool = False
 
     # 私有属性
     _imdb_helper: ImdbHelper = None
+    _dataset_index: Optional[ImdbDatasetIndex] = None
+    _disk_cache: Optional[DiskCache] = None
     _img_proxy_prefix: str = '/api/v1/system/cache/image?url='
     _original_method: Optional[Callable] = None
     _original_async_method: Optional[Callable[..., Coroutine[Any, Any, Optional[MediaInfo]]]] = None
@@ -152,9 +157,22 @@ class ImdbSource(_PluginBase):
                     self._interests = [self._interests]
             self._component_size = config.get("component_size") or "medium"
             self._recognition_mode = config.get("recognition_mode") or "auxiliary"
+            self._offline_index = bool(config.get("offline_index"))
             self._update_config()
 
-        self._imdb_helper = ImdbHelper(proxies=settings.PROXY if self._proxy else None)
+        if self._dataset_index:
+            self._dataset_index.close()
+        self._dataset_index = None
+        if self._offline_index:
+            self._dataset_index = ImdbDatasetIndex(self.get_data_path() / "imdb_dataset.db",
+                                                   proxies=settings.PROXY if self._proxy else None,
+                                                   ua=settings.NORMAL_USER_AGENT)
+        if self._disk_cache:
+            self._disk_cache.close()
+        self._disk_cache = DiskCache(self.get_data_path() / "response_cache.db")
+        self._imdb_helper = ImdbHelper(proxies=settings.PROXY if self._proxy else None,
+                                       dataset_index=self._dataset_index,
+                                       disk_cache=self._disk_cache)
         if "media-amazon.com" not in settings.SECURITY_IMAGE_DOMAINS:
             settings.SECURITY_IMAGE_DOMAINS.append("media-amazon.com")
         if "media-imdb.com" not in settings.SECURITY_IMAGE_DOMAINS:
@@ -180,8 +198,11 @@ class ImdbSource(_PluginBase):
             self.stop_service()
 
     def get_service(self) -> List[Dict[str, Any]]:
-        if self.get_state() and self._staff_picks:
-            return [
+        if not self.get_state():
+            return []
+        services = []
+        if self._staff_picks:
+            services.extend([
                 {
                     "id": "ImdbSource",
                     "name": "刷新主屏幕组件",
@@ -196,23 +217,59 @@ class ImdbSource(_PluginBase):
                     "func": self.async_fetch_staff_picks,
                     "kwargs": {}
                 }
-            ]
-        return []
+            ])
+        if self._offline_index and self._dataset_index:
+            # IMDb 数据集每日更新一次
+            services.append({
+                "id": "ImdbSource.DatasetIndex",
+                "name": "更新IMDb离线索引",
+                "trigger": CronTrigger.from_crontab('30 4 * * *'),
+                "func": self.refresh_dataset_index,
+                "kwargs": {}
+            })
+            if not self._dataset_index.ready:
+                services.append({
+                    "id": "ImdbSource.DatasetIndex.Now",
+                    "name": "更新IMDb离线索引",
+                    "trigger": 'date',
+                    "func": self.refresh_dataset_index,
+                    "kwargs": {}
+                })
+        return services
+
+    def refresh_dataset_index(self):
+        """
+        下载 IMDb 数据集并更新离线索引
+        """
+        if not self._dataset_index:
+            return
+        logger.info("开始更新 IMDb 离线索引 ...")
+        try:
+            if self._dataset_index.refresh():
+                logger.info(f"IMDb 离线索引更新完成：{self._dataset_index.stats()}")
+        except InterruptedError as e:
+            logger.info(str(e))
+        except Exception as e:
+            logger.error(f"IMDb 离线索引更新失败：{e}")
 
     def get_state(self) -> bool:
         return self._enabled
 
     def get_dashboard_meta(self) -> Optional[List[Dict[str, str]]]:
-        if not self._staff_picks:
-            return []
-        return [
-            {
+        components = []
+        if self._staff_picks:
+            components.append({
                 "key": "Staff Picks",
                 "name": "IMDb 编辑精选"
-            },
-        ]
-
-    def get_dashboard(self, **kwargs) -> Optional[Tuple[Dict[str, Any], Dict[str, Any], List[dict]]]:
+            })
+        if self._disk_cache:
+            components.append({
+                "key": "Cache Stats",
+                "name": "IMDb 缓存统计"
+            })
+        return components
+
+    def get_dashboard(self, key: str = None, **kwargs) -> Optional[Tuple[Dict[str, Any], Dict[str, Any], List[dict]]]:
         """
         获取插件仪表盘页面，需要返回：1、仪表板col配置字典；2、全局配置（自动刷新等）；3、仪表板页面元素配置json（含数据）
         1、col配置参考：
@@ -225,6 +282,8 @@ class ImdbSource(_PluginBase):
         }
         3、页面配置使用Vuetify组件拼装，参考：https://vuetifyjs.com/
         """
+        if key == "Cache Stats":
+            return self._cache_stats_dashboard()
         if not self._staff_picks:
             return None
 
@@ -804,6 +863,45 @@ class ImdbSource(_PluginBase):
                             }
                         ],
                     },
+                    {
+                        'component': 'VRow',
+                        'content': [
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 3
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VSwitch',
+                                        'props': {
+                                            'model': 'offline_index',
+                                            'label': '离线索引'
+                                        }
+                                    }
+                                ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 9
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VAlert',
+                                        'props': {
+                                            'type': 'info',
+                                            'variant': 'tonal',
+                                            'density': 'compact',
+                                            'text': '下载 IMDb 官方数据集（约 1GB）建立本地名称索引，媒体识别优先查询本地，每日自动增量更新'
+                                        }
+                                    }
+                                ]
+                            }
+                        ]
+                    },
                     {
                         'component': 'VExpansionPanels',
                         'props': {
@@ -1004,9 +1102,75 @@ class ImdbSource(_PluginBase):
             "interests": ['Anime', 'Documentary', 'Sitcom'],
             "component_size": "medium",
             "recognition_mode": "auxiliary",
-            "interval": 10
+            "interval": 10,
+            "offline_index": False
         }
 
+    def _cache_stats_dashboard(self) -> Optional[Tuple[Dict[str, Any], Dict[str, Any], List[dict]]]:
+        """
+        磁盘缓存命中率仪表板
+        """
+        if not self._disk_cache:
+            return None
+        stats = self._disk_cache.stats()
+        family_names = {
+            "imdbapi.title": "条目详情",
+            "imdbapi.search": "搜索",
+            "imdbapi.list": "列表",
+            "graphql": "GraphQL",
+            "tmdb.find": "TMDB 映射",
+        }
+        rows = [
+            {
+                'component': 'tr',
+                'content': [
+                    {'component': 'td', 'text': family_names.get(family, family)},
+                    {'component': 'td', 'text': f"{item['hits']}/{item['hits'] + item['misses']}"},
+                    {'component': 'td', 'text': f"{item['hit_rate']:.1%}"},
+                ]
+            }
+            for family, item in stats["families"].items()
+        ]
+        elements = [
+            {
+                'component': 'VCard',
+                'props': {'variant': 'tonal'},
+                'content': [
+                    {
+                        'component': 'VCardText',
+                        'props': {'class': 'pb-0'},
+                        'text': (f"命中率 {stats['hit_rate']:.1%}（{stats['hits']}/{stats['lookups']}） · "
+                                 f"{stats['entries']} 条 · "
+                                 f"{stats['size'] / 1048576:.1f}/{stats['max_size'] / 1048576:.0f} MB")
+                    },
+                    {
+                        'component': 'VTable',
+                        'props': {'density': 'compact', 'hover': True},
+                        'content': [
+                            {
+                                'component': 'thead',
+                                'content': [
+                                    {
+                                        'component': 'tr',
+                                        'content': [
+                                            {'component': 'th', 'text': '类别'},
+                                            {'component': 'th', 'text': '命中/查询'},
+                                            {'component': 'th', 'text': '命中率'},
+                                        ]
+                                    }
+                                ]
+                            },
+                            {
+                                'component': 'tbody',
+                                'content': rows
+                            }
+                        ]
+                    }
+                ]
+            }
+        ]
+        return {"cols": 12, "md": 4}, {"refresh": 60, "border": False}, elements
+
     def get_page(self) -> List[dict]:
         pass
 
@@ -1020,6 +1184,10 @@ class ImdbSource(_PluginBase):
         if (getattr(ChainBase.async_recognize_media, "_patched_by", object()) == id(self) and
                 self._original_async_method):
             ChainBase.async_recognize_media = self._original_async_method
+        if self._dataset_index:
+            self._dataset_index.close()
+        if self._disk_cache:
+            self._disk_cache.close()
 
     def get_module(self) -> Dict[str, Any]:
         """
@@ -1046,7 +1214,8 @@ class ImdbSource(_PluginBase):
                 "component_size": self._component_size,
                 "recognition_mode": self._recognition_mode,
                 "chinese_component": self._chinese_component,
-                "interval": self._interval
+                "interval": self._interval,
+                "offline_index": self._offline_index
             }
         )
 
@@ -2125,6 +2294,7 @@ class ImdbSource(_PluginBase):
         return most_popular.get("id") if most_popular else None
 
     @cached(maxsize=4096, ttl=86400)
+    @disk_cached("tmdb.find", attr="_disk_cache")
     def find_imdb_id(self, imdb_id: str) -> Optional[dict]:
         api_key = settings.TMDB_API_KEY
         api_url = (
@@ -2136,6 +2306,7 @@ class ImdbSource(_PluginBase):
         return data
 
     @cached(maxsize=4096, ttl=86400)
+    @disk_cached("tmdb.find", attr="_disk_cache")
     async def async_find_imdb_id(self, imdb_id: str) -> Optional[dict]:
         api_key = settings.TMDB_API_KEY
         api_url = (
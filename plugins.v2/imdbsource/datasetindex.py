@@ -0,0 +1,372 @@
+import gzip
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from app.log import logger
+from app.utils.http import RequestUtils
+from app.utils.string import StringUtils
+
+DATASET_URL = "https://datasets.imdbws.com"
+
+# 只索引识别会用到的类型，剧集单集、短片、游戏等不入库
+INDEX_TITLE_TYPES = frozenset({"movie", "tvMovie", "tvSeries", "tvMiniSeries", "tvSpecial"})
+
+
+class ImdbDatasetIndex:
+    """
+    基于 IMDb 公开数据集（title.basics / title.akas）的本地名称索引
+
+    名称按 ImdbHelper.compare_names 相同的规则归一化后建立索引，识别时先查本地，未命中再走在线接口；
+    刷新时按 ETag/Last-Modified 条件下载，数据集未变化则跳过，变化的数据集按代数原地更新并清理旧记录
+    """
+
+    SCHEMA_VERSION = 1
+    BATCH_SIZE = 20000
+    CHUNK_SIZE = 1024 * 1024
+
+    def __init__(self, db_path: Path, proxies: Optional[Dict[str, str]] = None, ua: Optional[str] = None):
+        self._db_path = Path(db_path)
+        self._proxies = proxies
+        self._ua = ua
+        self._local = threading.local()
+        self._refresh_lock = threading.Lock()
+        self._ready: Optional[bool] = None
+
+    @staticmethod
+    def name_key(name: Optional[str]) -> str:
+        """
+        与 compare_names 一致的名称归一化：去除特殊字符与空白后转大写
+        """
+        if not name:
+            return ""
+        return (StringUtils.clear(name) or "").strip().upper()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self._db_path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA mmap_size=268435456")
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE IF NOT EXISTS titles (
+                tconst TEXT PRIMARY KEY,
+                title_type TEXT NOT NULL,
+                primary_title TEXT,
+                original_title TEXT,
+                start_year INTEGER,
+                end_year INTEGER,
+                genres TEXT,
+                gen INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS names (
+                key TEXT NOT NULL,
+                tconst TEXT NOT NULL,
+                source TEXT NOT NULL,
+                name TEXT,
+                region TEXT,
+                gen INTEGER NOT NULL,
+                PRIMARY KEY (key, tconst, source)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS names_tconst ON names (tconst);
+            """
+        )
+        return conn
+
+    def _reader(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self._db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = self._connect()
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _get_meta(conn: sqlite3.Connection, key: str) -> Optional[str]:
+        row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    @staticmethod
+    def _set_meta(conn: sqlite3.Connection, key: str, value: Optional[str]):
+        conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    @property
+    def ready(self) -> bool:
+        """
+        索引已建立且版本匹配
+        """
+        if self._ready is None:
+            if not self._db_path.exists():
+                return False
+            try:
+                conn = self._reader()
+                version = self._get_meta(conn, "schema_version")
+                has_titles = conn.execute("SELECT 1 FROM titles LIMIT 1").fetchone() is not None
+                self._ready = version == str(self.SCHEMA_VERSION) and has_titles
+            except sqlite3.Error as e:
+                logger.warn(f"IMDb 离线索引不可用：{e}")
+                self._ready = False
+        return self._ready
+
+    def lookup(self, name: str, types: Optional[Iterable[str]] = None, year: Optional[int] = None) -> List[dict]:
+        """
+        按归一化名称查询候选条目
+
+        :param name: 识别的名称
+        :param types: 限定的 IMDb 类型，如 movie、tvSeries
+        :param year: 限定的首播年份
+        :return: 候选条目列表
+        """
+        key = self.name_key(name)
+        if not key or not self.ready:
+            return []
+        sql = ("SELECT DISTINCT t.tconst, t.title_type, t.primary_title, t.original_title, t.start_year, "
+               "t.end_year, t.genres FROM names n JOIN titles t ON t.tconst = n.tconst WHERE n.key = ?")
+        args: list = [key]
+        types = list(types or [])
+        if types:
+            sql += f" AND t.title_type IN ({','.join('?' * len(types))})"
+            args.extend(types)
+        if year:
+            sql += " AND t.start_year = ?"
+            args.append(int(year))
+        try:
+            rows = self._reader().execute(sql, args).fetchall()
+        except sqlite3.Error as e:
+            logger.warn(f"IMDb 离线索引查询失败：{e}")
+            return []
+        return [
+            {
+                "id": row[0],
+                "type": row[1],
+                "primaryTitle": row[2],
+                "originalTitle": row[3],
+                "startYear": row[4],
+                "endYear": row[5],
+                "genres": row[6].split(",") if row[6] else [],
+            }
+            for row in rows
+        ]
+
+    def akas(self, tconst: str) -> List[Tuple[str, Optional[str]]]:
+        """
+        返回条目的全部别名及地区
+        """
+        if not self.ready:
+            return []
+        try:
+            rows = self._reader().execute(
+                "SELECT name, region FROM names WHERE tconst = ? AND source = 'a'", (tconst,)
+            ).fetchall()
+        except sqlite3.Error:
+            return []
+        return [(row[0], row[1]) for row in rows if row[0]]
+
+    def stats(self) -> Dict[str, Optional[str]]:
+        if not self._db_path.exists():
+            return {}
+        conn = self._reader()
+        return {
+            "titles": str(conn.execute("SELECT COUNT(*) FROM titles").fetchone()[0]),
+            "updated_at": self._get_meta(conn, "updated_at"),
+        }
+
+    def _download(self, conn: sqlite3.Connection, dataset: str, stop_event: Optional[threading.Event]
+                  ) -> Optional[Path]:
+        """
+        条件下载数据集，未变化返回None
+        """
+        headers = {}
+        etag = self._get_meta(conn, f"{dataset}.etag")
+        last_modified = self._get_meta(conn, f"{dataset}.last_modified")
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        target = self._db_path.parent / f".{dataset}.tsv.gz.part"
+        url = f"{DATASET_URL}/{dataset}.tsv.gz"
+        with RequestUtils(headers=headers, ua=self._ua, proxies=self._proxies, timeout=60).get_stream(url) as response:
+            if response is None:
+                raise ConnectionError(f"无法下载 {url}")
+            if response.status_code == 304:
+                return None
+            response.raise_for_status()
+            with target.open("wb") as output:
+                for chunk in response.iter_content(chunk_size=self.CHUNK_SIZE):
+                    if stop_event and stop_event.is_set():
+                        raise InterruptedError("IMDb 数据集下载已取消")
+                    if chunk:
+                        output.write(chunk)
+            self._set_meta(conn, f"{dataset}.pending_etag", response.headers.get("ETag"))
+            self._set_meta(conn, f"{dataset}.pending_last_modified", response.headers.get("Last-Modified"))
+        return target
+
+    @staticmethod
+    def _read_tsv(path: Path) -> Iterator[List[str]]:
+        with gzip.open(path, "rt", encoding="utf-8", newline="\n") as f:
+            next(f, None)
+            for line in f:
+                yield line.rstrip("\n").split("\t")
+
+    @staticmethod
+    def _null(value: str) -> Optional[str]:
+        return None if value == "\\N" else value
+
+    @staticmethod
+    def _year(value: str) -> Optional[int]:
+        return int(value) if value.isdigit() else None
+
+    def _import_basics(self, conn: sqlite3.Connection, path: Path, gen: int,
+                       stop_event: Optional[threading.Event]) -> int:
+        title_rows, name_rows, count = [], [], 0
+        for fields in self._read_tsv(path):
+            if len(fields) < 9 or fields[1] not in INDEX_TITLE_TYPES:
+                continue
+            tconst, title_type, primary_title, original_title = fields[0], fields[1], fields[2], fields[3]
+            title_rows.append((tconst, title_type, primary_title, original_title, self._year(fields[5]),
+                               self._year(fields[6]), self._null(fields[8]), gen))
+            for name in {primary_title, original_title}:
+                key = self.name_key(name)
+                if key:
+                    name_rows.append((key, tconst, "b", name, None, gen))
+            if len(title_rows) >= self.BATCH_SIZE:
+                count += self._flush_basics(conn, title_rows, name_rows)
+                if stop_event and stop_event.is_set():
+                    raise InterruptedError("IMDb 离线索引更新已取消")
+        count += self._flush_basics(conn, title_rows, name_rows)
+        conn.execute("DELETE FROM titles WHERE gen < ?", (gen,))
+        conn.execute("DELETE FROM names WHERE source = 'b' AND gen < ?", (gen,))
+        # title.akas 未变化时不会重新导入，已下架条目的别名在这里一并清理
+        conn.execute("DELETE FROM names WHERE source = 'a' AND tconst NOT IN (SELECT tconst FROM titles)")
+        conn.commit()
+        return count
+
+    @staticmethod
+    def _flush_basics(conn: sqlite3.Connection, title_rows: list, name_rows: list) -> int:
+        conn.executemany(
+            "INSERT INTO titles VALUES (?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT(tconst) DO UPDATE SET "
+            "title_type = excluded.title_type, primary_title = excluded.primary_title, "
+            "original_title = excluded.original_title, start_year = excluded.start_year, "
+            "end_year = excluded.end_year, genres = excluded.genres, gen = excluded.gen",
+            title_rows
+        )
+        conn.executemany(
+            "INSERT INTO names VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT(key, tconst, source) DO UPDATE SET "
+            "name = excluded.name, gen = excluded.gen",
+            name_rows
+        )
+        conn.commit()
+        count = len(title_rows)
+        title_rows.clear()
+        name_rows.clear()
+        return count
+
+    def _import_akas(self, conn: sqlite3.Connection, path: Path, gen: int,
+                     stop_event: Optional[threading.Event]) -> int:
+        # 只保留已入库条目的别名，条目 ID 转成整数以降低内存占用
+        indexed: Set[int] = {int(row[0][2:]) for row in conn.execute("SELECT tconst FROM titles")}
+        rows, count = [], 0
+        for fields in self._read_tsv(path):
+            if len(fields) < 4 or int(fields[0][2:]) not in indexed:
+                continue
+            key = self.name_key(fields[2])
+            if not key:
+                continue
+            rows.append((key, fields[0], "a", fields[2], self._null(fields[3]), gen))
+            if len(rows) >= self.BATCH_SIZE:
+                count += self._flush_akas(conn, rows)
+                if stop_event and stop_event.is_set():
+                    raise InterruptedError("IMDb 离线索引更新已取消")
+        count += self._flush_akas(conn, rows)
+        conn.execute("DELETE FROM names WHERE source = 'a' AND gen < ?", (gen,))
+        conn.commit()
+        return count
+
+    @staticmethod
+    def _flush_akas(conn: sqlite3.Connection, rows: list) -> int:
+        conn.executemany(
+            "INSERT INTO names VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT(key, tconst, source) DO UPDATE SET "
+            "region = COALESCE(names.region, excluded.region), gen = excluded.gen",
+            rows
+        )
+        conn.commit()
+        count = len(rows)
+        rows.clear()
+        return count
+
+    def _commit_dataset(self, conn: sqlite3.Connection, dataset: str, gen: int):
+        self._set_meta(conn, f"{dataset}.gen", str(gen))
+        self._set_meta(conn, f"{dataset}.etag", self._get_meta(conn, f"{dataset}.pending_etag"))
+        self._set_meta(conn, f"{dataset}.last_modified", self._get_meta(conn, f"{dataset}.pending_last_modified"))
+        conn.commit()
+
+    def refresh(self, force: bool = False, stop_event: Optional[threading.Event] = None) -> bool:
+        """
+        下载并更新索引，数据集均未变化时直接返回
+
+        :param force: 忽略 ETag/Last-Modified 强制重新下载
+        :param stop_event: 取消信号
+        :return: 索引是否有更新
+        """
+        if not self._refresh_lock.acquire(blocking=False):
+            logger.info("IMDb 离线索引正在更新中")
+            return False
+        self._db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        updated = False
+        try:
+            conn.execute("PRAGMA synchronous=OFF")
+            if self._get_meta(conn, "schema_version") != str(self.SCHEMA_VERSION):
+                # 结构变化后旧记录不可复用，清空重建
+                conn.execute("DELETE FROM titles")
+                conn.execute("DELETE FROM names")
+                conn.execute("DELETE FROM meta")
+                self._set_meta(conn, "schema_version", str(self.SCHEMA_VERSION))
+                conn.commit()
+            elif force:
+                # 强制刷新只清除下载条件，保留代数使其继续递增，导入后按代数清理旧记录
+                conn.execute("DELETE FROM meta WHERE key LIKE '%.etag' OR key LIKE '%.last_modified'")
+                conn.commit()
+            # akas 依赖已入库的条目，必须在 basics 之后导入
+            for dataset, importer in (("title.basics", self._import_basics), ("title.akas", self._import_akas)):
+                path = self._download(conn, dataset, stop_event)
+                if not path:
+                    logger.info(f"IMDb 数据集 {dataset} 未变化，跳过")
+                    continue
+                try:
+                    gen = int(self._get_meta(conn, f"{dataset}.gen") or 0) + 1
+                    count = importer(conn, path, gen, stop_event)
+                    self._commit_dataset(conn, dataset, gen)
+                    logger.info(f"IMDb 数据集 {dataset} 已更新：{count} 条")
+                    updated = True
+                finally:
+                    path.unlink(missing_ok=True)
+            if updated:
+                self._set_meta(conn, "updated_at", datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+                conn.commit()
+                conn.execute("PRAGMA optimize")
+        finally:
+            conn.close()
+            self._ready = None
+            self._refresh_lock.release()
+        return updated
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def remove(self):
+        """
+        删除索引文件
+        """
+        self.close()
+        for suffix in ("", "-wal", "-shm"):
+            path = Path(f"{self._db_path}{suffix}")
+            if path.exists():
+                os.remove(path)
+        self._ready = None
@@ -0,0 +1,257 @@
+import asyncio
+import functools
+import hashlib
+import inspect
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Union
+
+from app.log import logger
+
+# 各类接口的磁盘缓存有效期（秒）
+FAMILY_TTLS: Dict[str, int] = {
+    # 条目详情、剧集、演职员、图片、别名变化很少
+    "imdbapi.title": 7 * 86400,
+    # 搜索与列表结果随热度变化
+    "imdbapi.search": 86400,
+    "imdbapi.list": 6 * 3600,
+    "graphql": 86400,
+    "tmdb.find": 7 * 86400,
+}
+DEFAULT_TTL = 86400
+
+_MISS = object()
+
+
+def imdbapi_family(path: str, **kwargs) -> str:
+    """
+    按 Free IMDb API 路径划分缓存类别
+    """
+    if path.startswith("/search"):
+        return "imdbapi.search"
+    if path.rstrip("/") == "/titles":
+        return "imdbapi.list"
+    return "imdbapi.title"
+
+
+class DiskCache:
+    """
+    插件响应的磁盘缓存层，位于 @cached 内存缓存之下，插件重载或重启后仍然有效
+
+    值以 zlib 压缩的 JSON 存入 SQLite，按类别设置有效期，总大小超过上限时按最近访问时间淘汰
+    """
+
+    def __init__(self, db_path: Path, max_bytes: int = 256 * 1024 * 1024):
+        self._db_path = Path(db_path)
+        self._max_bytes = max(1024 * 1024, int(max_bytes))
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._size: Optional[int] = None
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self._db_path, timeout=10, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS entries (
+                    key TEXT PRIMARY KEY,
+                    family TEXT NOT NULL,
+                    value BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    expires REAL NOT NULL,
+                    accessed REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+                """
+            )
+            conn.execute("DELETE FROM entries WHERE expires < ?", (time.time(),))
+            conn.commit()
+            self._size = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def make_key(family: str, name: str, arguments: dict) -> str:
+        raw = json.dumps([name, arguments], sort_keys=True, ensure_ascii=False, default=str)
+        return f"{family}:{hashlib.sha1(raw.encode('utf-8')).hexdigest()}"
+
+    def _count(self, family: str, field: str):
+        stats = self._stats.setdefault(family, {"hits": 0, "misses": 0, "writes": 0})
+        stats[field] += 1
+
+    def get(self, family: str, key: str) -> Any:
+        """
+        读取缓存，未命中返回 _MISS
+        """
+        with self._lock:
+            try:
+                conn = self._connection()
+                row = conn.execute("SELECT value, expires FROM entries WHERE key = ?", (key,)).fetchone()
+                now = time.time()
+                if row and row[1] >= now:
+                    conn.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+                    conn.commit()
+                    self._count(family, "hits")
+                    return json.loads(zlib.decompress(row[0]))
+            except (sqlite3.Error, zlib.error, ValueError) as e:
+                logger.debug(f"读取磁盘缓存失败：{e}")
+            self._count(family, "misses")
+            return _MISS
+
+    def set(self, family: str, key: str, value: Any, ttl: Optional[int] = None):
+        try:
+            blob = zlib.compress(json.dumps(value, ensure_ascii=False).encode("utf-8"))
+        except (TypeError, ValueError):
+            return
+        now = time.time()
+        expires = now + (ttl or FAMILY_TTLS.get(family, DEFAULT_TTL))
+        with self._lock:
+            try:
+                conn = self._connection()
+                old = conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+                conn.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)",
+                             (key, family, blob, len(blob), expires, now))
+                self._size += len(blob) - (old[0] if old else 0)
+                self._count(family, "writes")
+                if self._size > self._max_bytes:
+                    self._evict(conn)
+                conn.commit()
+            except sqlite3.Error as e:
+                logger.debug(f"写入磁盘缓存失败：{e}")
+
+    def _evict(self, conn: sqlite3.Connection):
+        """
+        先清理过期条目，仍超出上限时按最近访问时间淘汰到上限的 90%
+        """
+        conn.execute("DELETE FROM entries WHERE expires < ?", (time.time(),))
+        self._size = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        target = int(self._max_bytes * 0.9)
+        if self._size <= target:
+            return
+        freed, keys = 0, []
+        for key, size in conn.execute("SELECT key, size FROM entries ORDER BY accessed"):
+            keys.append((key,))
+            freed += size
+            if self._size - freed <= target:
+                break
+        conn.executemany("DELETE FROM entries WHERE key = ?", keys)
+        self._size -= freed
+
+    def clear(self):
+        with self._lock:
+            try:
+                conn = self._connection()
+                conn.execute("DELETE FROM entries")
+                conn.commit()
+                self._size = 0
+            except sqlite3.Error as e:
+                logger.warn(f"清空磁盘缓存失败：{e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        缓存统计，命中率按本次运行期间的磁盘层查询计算
+        """
+        with self._lock:
+            families = {}
+            for family, stats in sorted(self._stats.items()):
+                lookups = stats["hits"] + stats["misses"]
+                families[family] = {**stats, "hit_rate": stats["hits"] / lookups if lookups else 0.0}
+            hits = sum(s["hits"] for s in self._stats.values())
+            lookups = hits + sum(s["misses"] for s in self._stats.values())
+            try:
+                entries = self._connection().execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            except sqlite3.Error:
+                entries = 0
+            return {
+                "entries": entries,
+                "size": self._size or 0,
+                "max_size": self._max_bytes,
+                "hits": hits,
+                "lookups": lookups,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "families": families,
+            }
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def _cacheable(value: Any) -> bool:
+    # 空结果与接口错误不落盘，避免把临时失败或尚未收录的条目缓存数天
+    if not value:
+        return False
+    if isinstance(value, dict):
+        if "error" in value or value.get("success") is False:
+            return False
+        # 如 TMDB find 未匹配时返回的各类结果均为空列表
+        if all(isinstance(item, (list, dict)) and not item for item in value.values()):
+            return False
+    return True
+
+
+def disk_cached(family: Union[str, Callable[..., str]], ttl: Optional[int] = None, attr: str = "disk_cache"):
+    """
+    为实例方法增加磁盘缓存层，缓存实例由方法所属对象的 attr 属性提供，未设置时直接调用原方法
+
+    :param family: 缓存类别，或根据调用参数返回类别的函数
+    :param ttl: 有效期，默认按类别取 FAMILY_TTLS
+    :param attr: 保存 DiskCache 实例的属性名
+    """
+
+    def decorator(func):
+        # 同步与异步版本共用缓存条目，如 _free_imdb_api 与 _async_free_imdb_api
+        name = func.__name__.replace("async_", "")
+        signature = inspect.signature(func)
+
+        def resolve(self, args, kwargs):
+            cache: Optional[DiskCache] = getattr(self, attr, None)
+            if cache is None:
+                return None, None, None
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            arguments = dict(list(bound.arguments.items())[1:])
+            fam = family(**arguments) if callable(family) else family
+            return cache, fam, DiskCache.make_key(fam, name, arguments)
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(self, *args, **kwargs):
+                cache, fam, key = resolve(self, args, kwargs)
+                # SQLite 读写与压缩在线程中执行，不阻塞事件循环
+                if cache is not None:
+                    value = await asyncio.to_thread(cache.get, fam, key)
+                    if value is not _MISS:
+                        return value
+                value = await func(self, *args, **kwargs)
+                if cache is not None and _cacheable(value):
+                    await asyncio.to_thread(cache.set, fam, key, value, ttl)
+                return value
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            cache, fam, key = resolve(self, args, kwargs)
+            if cache is not None:
+                value = cache.get(fam, key)
+                if value is not _MISS:
+                    return value
+            value = func(self, *args, **kwargs)
+            if cache is not None and _cacheable(value):
+                cache.set(fam, key, value, ttl)
+            return value
+
+        return wrapper
+
+    return decorator
@@ -9,6 +9,8 @@ from app.log import logger
 from app.utils.common import retry
 from app.utils.http import RequestUtils, AsyncRequestUtils
 
+from .diskcache import DiskCache, disk_cached, imdbapi_family
+from .pagination import Paginator, RateLimiter
 from .schema.imdbapi import ImdbApiTitle, ImdbApiEpisode, ImdbApiCredit, ImdbapiImage
 from .schema.imdbapi import (ImdbApiSearchTitlesResponse, ImdbApiListTitlesResponse, ImdbApiListTitleEpisodesResponse,
                              ImdbApiListTitleSeasonsResponse, ImdbApiListTitleCreditsResponse,
@@ -22,7 +24,9 @@ CACHE_LIFESPAN: Final[int] = 86400
 class ImdbApiClient:
     BASE_URL = 'https://api.tiffara.com'
 
-    def __init__(self, proxies: Optional[Dict[str, str]] = None, ua: Optional[str] = None) -> None:
+    def __init__(self, proxies: Optional[Dict[str, str]] = None, ua: Optional[str] = None,
+                 disk_cache: Optional[DiskCache] = None) -> None:
+        self.disk_cache = disk_cache
         headers = {
             "user-agent": ua or settings.NORMAL_USER_AGENT,
             "accept": "application/json",
@@ -42,9 +46,16 @@ class ImdbApiClient:
             accept_type="application/json",
             client=self._free_api_client
         )
+        # 同一客户端的所有分页共享限速与并发上限
+        self._paginator = Paginator(RateLimiter(rate=5, burst=5), prefetch=2, concurrency=4)
+
+    @staticmethod
+    def _next_page_token(response) -> Optional[str]:
+        return response.next_page_token
 
     @retry(Exception, logger=logger, delay=1)
     @cached(maxsize=4096, ttl=CACHE_LIFESPAN)
+    @disk_cached(imdbapi_family)
     def _free_imdb_api(self, path: str, params: Optional[dict] = None) -> Optional[dict]:
         r = self._req.get_res(url=f"{self.BASE_URL}{path}", params=params, raise_exception=True)
         if r is None:
@@ -61,6 +72,7 @@ class ImdbApiClient:
 
     @retry(Exception, logger=logger, delay=1)
     @cached(maxsize=4096, ttl=CACHE_LIFESPAN)
+    @disk_cached(imdbapi_family)
     async def _async_free_imdb_api(self, path: str, params: Optional[dict] = None) -> Optional[dict]:
         r = await self._async_req.get_res(url=f"{self.BASE_URL}{path}", params=params, raise_exception=True)
         if r is None:
@@ -346,9 +358,8 @@ class ImdbApiClient:
                          sort_by: Optional[str] = None,
                          sort_order: Optional[str] = None,
                          ) -> Generator[ImdbApiTitle, None, None]:
-        page_token = None
-        while True:
-            response = self.titles(
+        def fetch(page_token: Optional[str]):
+            return self.titles(
                 types=types,
                 genres=genres,
                 country_codes=country_codes,
@@ -365,12 +376,8 @@ class ImdbApiClient:
                 sort_order=sort_order,
                 page_token=page_token
             )
-            if not response:
-                return
-            for title in response.titles:
-                yield title
-            if not page_token:
-                break
+
+        yield from self._paginator.iterate(fetch, self._next_page_token, lambda r: r.titles)
 
     async def async_titles_generator(self,
                                      types: Optional[List[ImdbType]] = None,
@@ -388,10 +395,8 @@ class ImdbApiClient:
                                      sort_by: Optional[str] = None,
                                      sort_order: Optional[str] = None,
                                      ) -> AsyncGenerator[ImdbApiTitle, None]:
-
-        page_token = None
-        while True:
-            response = await self.async_titles(
+        async def fetch(page_token: Optional[str]):
+            return await self.async_titles(
                 types=types,
                 genres=genres,
                 country_codes=country_codes,
@@ -408,15 +413,9 @@ class ImdbApiClient:
                 sort_order=sort_order,
                 page_token=page_token
             )
-            if not response:
-                return
 
-            for title in response.titles:
-                yield title
-
-            page_token = response.next_page_token
-            if not page_token:
-                break
+        async for item in self._paginator.async_iterate(fetch, self._next_page_token, lambda r: r.titles):
+            yield item
 
     def title(self, title_id: str) -> Optional[ImdbApiTitle]:
         """
@@ -499,43 +498,28 @@ class ImdbApiClient:
         return ret
 
     def episodes_generator(self, title_id: str, season: Optional[str] = None) -> Generator[ImdbApiEpisode, None, None]:
-        page_token = None
-        while True:
-            response = self.episodes(
+        def fetch(page_token: Optional[str]):
+            return self.episodes(
                 title_id=title_id,
                 season=season,
                 page_size=50,
                 page_token=page_token
             )
-            if not response:
-                return
-
-            for episode in response.episodes:
-                yield episode
 
-            page_token = response.next_page_token
-            if not page_token:
-                break
+        yield from self._paginator.iterate(fetch, self._next_page_token, lambda r: r.episodes)
 
     async def async_episodes_generator(self, title_id: str, season: Optional[str] = None
                                        ) -> AsyncGenerator[ImdbApiEpisode, None]:
-        page_token = None
-        while True:
-            response = await self.async_episodes(
+        async def fetch(page_token: Optional[str]):
+            return await self.async_episodes(
                 title_id=title_id,
                 season=season,
                 page_size=50,
                 page_token=page_token
             )
-            if not response:
-                return
 
-            for episode in response.episodes:
-                yield episode
-
-            page_token = response.next_page_token
-            if not page_token:
-                break
+        async for item in self._paginator.async_iterate(fetch, self._next_page_token, lambda r: r.episodes):
+            yield item
 
     def seasons(self, title_id: str) -> Optional[ImdbApiListTitleSeasonsResponse]:
         """
@@ -619,43 +603,28 @@ class ImdbApiClient:
 
     def credits_generator(self, title_id: str, categories: Optional[List[str]] = None
                           ) -> Generator[ImdbApiCredit, None, None]:
-        page_token = None
-        while True:
-            response = self.credits(
+        def fetch(page_token: Optional[str]):
+            return self.credits(
                 title_id=title_id,
                 categories=categories,
                 page_size=50,
                 page_token=page_token
             )
-            if not response:
-                return
-
-            for credit in response.credits:
-                yield credit
 
-            page_token = response.next_page_token
-            if not page_token:
-                break
+        yield from self._paginator.iterate(fetch, self._next_page_token, lambda r: r.credits)
 
     async def async_credits_generator(self, title_id: str, categories: Optional[List[str]] = None
                                       ) -> AsyncGenerator[ImdbApiCredit, None]:
-        page_token = None
-        while True:
-            response = await self.async_credits(
+        async def fetch(page_token: Optional[str]):
+            return await self.async_credits(
                 title_id=title_id,
                 categories=categories,
                 page_size=50,
                 page_token=page_token
             )
-            if not response:
-                return
 
-            for credit in response.credits:
-                yield credit
-
-            page_token = response.next_page_token
-            if not page_token:
-                break
+        async for item in self._paginator.async_iterate(fetch, self._next_page_token, lambda r: r.credits):
+            yield item
 
     def akas(self, title_id: str) -> Optional[ImdbapiListTitleAKAsResponse]:
         """
@@ -741,41 +710,28 @@ class ImdbApiClient:
 
     def images_generator(self, title_id: str, types: list[str] | None = None
                          ) -> Generator[ImdbapiImage, None, None]:
-        page_token = None
-        while True:
-            response = self.images(
+        def fetch(page_token: Optional[str]):
+            return self.images(
                 title_id=title_id,
                 types=types,
                 page_size=50,
                 page_token=page_token
             )
-            if not response:
-                return
-            for image in response.images:
-                yield image
 
-            page_token = response.next_page_token
-            if not page_token:
-                break
+        yield from self._paginator.iterate(fetch, self._next_page_token, lambda r: r.images)
 
     async def async_images_generator(self, title_id: str, types: list[str] | None = None
                                      ) -> AsyncGenerator[ImdbapiImage, None]:
-        page_token = None
-        while True:
-            response = await self.async_images(
+        async def fetch(page_token: Optional[str]):
+            return await self.async_images(
                 title_id=title_id,
                 types=types,
                 page_size=50,
                 page_token=page_token
             )
-            if not response:
-                return
-            for image in response.images:
-                yield image
-
-            page_token = response.next_page_token
-            if not page_token:
-                break
+
+        async for item in self._paginator.async_iterate(fetch, self._next_page_token, lambda r: r.images):
+            yield item
 
     async def company_credits(self, title_id: str, categories: list[str] | None = None
                               ) -> Optional[ImdbapiCompanyCreditResponse]:
@@ -1,3 +1,4 @@
+import asyncio
 import base64
 from collections import OrderedDict
 from json import JSONDecodeError
@@ -15,21 +16,27 @@ from app.schemas.types import MediaType
 from app.utils.http import AsyncRequestUtils
 from app.utils.string import StringUtils
 
+from .datasetindex import ImdbDatasetIndex
+from .diskcache import DiskCache
 from .imdbapi import ImdbApiClient
 from .officialapi import SearchParams, OfficialApiClient, PersistedQueryNotFound
 from .schema import StaffPickApiResponse, ImdbMediaInfo, ImdbApiHash, TitleEdge
 from .schema.imdbapi import ImdbapiPrecisionDate, ImdbApiTitle
-from .schema.imdbtypes import ImdbType, AkasNode, ImdbTitle, ImdbDate
+from .schema.imdbtypes import ImdbType, AkasNode, ImdbTitle, ImdbDate, Country
 from ...utils.common import retry
 
 
 class ImdbHelper:
     MAX_STATES = 128
 
-    def __init__(self, proxies: Dict[str, str] = None):
+    def __init__(self, proxies: Dict[str, str] = None, dataset_index: Optional[ImdbDatasetIndex] = None,
+                 disk_cache: Optional[DiskCache] = None):
         self._proxies = proxies
-        self.imdbapi_client = ImdbApiClient(proxies=self._proxies, ua=settings.NORMAL_USER_AGENT)
-        self.official_api_client = OfficialApiClient(proxies=self._proxies, ua=settings.NORMAL_USER_AGENT)
+        self._dataset_index = dataset_index
+        self.imdbapi_client = ImdbApiClient(proxies=self._proxies, ua=settings.NORMAL_USER_AGENT,
+                                            disk_cache=disk_cache)
+        self.official_api_client = OfficialApiClient(proxies=self._proxies, ua=settings.NORMAL_USER_AGENT,
+                                                     disk_cache=disk_cache)
         self._imdb_api_hash = ImdbApiHash(
             AdvancedTitleSearch='d32303ed2711e4d03bd5e36cfe0e5304bcffd7e31d1898695f6b6919736ff2a8'
         )
@@ -266,6 +273,44 @@ class ImdbHelper:
             return None
         return ImdbMediaInfo.from_title(title)
 
+    def _offline_candidates(self, name: str, search_types: List[ImdbType], year: Optional[str] = None
+                            ) -> List[tuple[ImdbApiTitle, List[AkasNode], bool]]:
+        """
+        从本地数据集索引查询名称匹配的候选条目
+
+        :return: (条目, 别名, 是否主标题或原始标题匹配) 列表，索引不可用时返回空列表
+        """
+        if not self._dataset_index or not self._dataset_index.ready:
+            return []
+        rows = self._dataset_index.lookup(name, types=[t.value for t in search_types],
+                                          year=int(year) if year and str(year).isdigit() else None)
+        candidates = []
+        for row in rows:
+            try:
+                title = ImdbApiTitle.model_validate(row)
+            except ValidationError:
+                continue
+            akas = [AkasNode(text=text, country=Country(id=region, text=region) if region else None)
+                    for text, region in self._dataset_index.akas(title.id)]
+            primary = self.compare_names(name, [title.primary_title or '', title.original_title or ''])
+            candidates.append((title, akas, primary))
+        return candidates
+
+    def _offline_match_by(self, name: str, mtypes: List[MediaType], search_types: List[ImdbType],
+                          year: Optional[str] = None) -> Optional[ImdbMediaInfo]:
+        candidates = [c for c in self._offline_candidates(name, search_types, year)
+                      if ImdbHelper.type_to_mtype(c[0].type.value) in mtypes]
+        if not candidates:
+            return None
+        # 与在线搜索保持相同的优先级：电影优先，其次首播年份较新者
+        candidates.sort(
+            key=lambda c: ('1' if c[0].type in [ImdbType.MOVIE, ImdbType.TV_MOVIE] else '0') + f"{c[0].start_year}",
+            reverse=True
+        )
+        title, akas, _ = candidates[0]
+        logger.debug(f"{name} 命中 IMDb 离线索引：{title.id}")
+        return ImdbMediaInfo.from_title(title, akas=akas)
+
     def match_by(self, name: str, mtype: MediaType | None = None, year: str | None = None) -> ImdbMediaInfo | None:
         """
         根据名称同时查询电影和电视剧，没有类型也没有年份时使用
@@ -282,6 +327,9 @@ class ImdbHelper:
             search_types.extend([ImdbType.TV_SERIES, ImdbType.TV_MINI_SERIES, ImdbType.TV_SPECIAL])
         if MediaType.MOVIE in mtypes:
             search_types.extend([ImdbType.MOVIE, ImdbType.TV_MOVIE])
+        offline_info = self._offline_match_by(name, mtypes, search_types, year)
+        if offline_info:
+            return offline_info
         if year:
             multi_res = self.imdbapi_client.advanced_search(query=name, year=int(year),
                                                             media_types=search_types)
@@ -326,6 +374,9 @@ class ImdbHelper:
             search_types.extend([ImdbType.TV_SERIES, ImdbType.TV_MINI_SERIES, ImdbType.TV_SPECIAL])
         if MediaType.MOVIE in mtypes:
             search_types.extend([ImdbType.MOVIE, ImdbType.TV_MOVIE])
+        offline_info = self._offline_match_by(name, mtypes, search_types, year)
+        if offline_info:
+            return offline_info
         if year:
             multi_res = await self.imdbapi_client.async_advanced_search(query=name, year=int(year),
                                                                         media_types=search_types)
@@ -374,6 +425,8 @@ class ImdbHelper:
 
         def __season_match(imdb_id: str, _season_year: str, _season_number: int) -> bool:
             release_dates = self._tv_release_data_by_season(imdb_id)
+            if not release_dates:
+                return False
             for s, release_date in release_dates.items():
                 if not release_date or not release_date.year:
                     continue
@@ -382,6 +435,12 @@ class ImdbHelper:
             return False
 
         search_types = [ImdbType.TV_SERIES, ImdbType.TV_MINI_SERIES, ImdbType.TV_SPECIAL]
+        candidates = sorted(self._offline_candidates(name, search_types), key=lambda c: c[0].start_year or 0,
+                            reverse=True)
+        for tv, akas, primary in candidates:
+            if (primary and str(tv.start_year) == season_year) or __season_match(
+                    imdb_id=tv.id, _season_year=season_year, _season_number=season_number):
+                return ImdbMediaInfo.from_title(tv, akas=akas)
         res = self.imdbapi_client.advanced_search(query=name, media_types=search_types)
         if not res:
             logger.debug(f"{name} 未找到季{season_number}相关信息!")
@@ -425,6 +484,12 @@ class ImdbHelper:
             return False
 
         search_types = [ImdbType.TV_SERIES, ImdbType.TV_MINI_SERIES, ImdbType.TV_SPECIAL]
+        candidates = sorted(self._offline_candidates(name, search_types), key=lambda c: c[0].start_year or 0,
+                            reverse=True)
+        for tv, akas, primary in candidates:
+            if (primary and str(tv.start_year) == season_year) or await __season_match(
+                    imdb_id=tv.id, _season_year=season_year, _season_number=season_number):
+                return ImdbMediaInfo.from_title(tv, akas=akas)
         res = await self.imdbapi_client.async_advanced_search(query=name, media_types=search_types)
         if not res:
             logger.debug(f"{name} 未找到季{season_number}相关信息!")
@@ -533,16 +598,23 @@ class ImdbHelper:
         return ImdbMediaInfo.from_title(details, akas=akas, api_credits=credit_list, episodes=episodes, images=images,
                                         seasons=seasons.seasons if seasons else None)
 
+    @staticmethod
+    async def _async_collect(generator: AsyncGenerator) -> list:
+        return [item async for item in generator]
+
     async def async_update_info(self, title_id: str, info: ImdbMediaInfo) -> ImdbMediaInfo:
         details = await self.imdbapi_client.async_title(title_id) or info
         akas = info.akas
         if not akas:
             resp = await self.imdbapi_client.async_akas(title_id)
             akas = resp.akas if resp else []
-        credit_list = [credit async for credit in self.imdbapi_client.async_credits_generator(title_id)]
-        episodes = [episode async for episode in self.imdbapi_client.async_episodes_generator(title_id)]
-        images = [image async for image in self.imdbapi_client.async_images_generator(title_id)]
-        seasons = await self.imdbapi_client.async_seasons(title_id)
+        # 演职员、剧集、图片各自分页预取，相互之间并发
+        credit_list, episodes, images, seasons = await asyncio.gather(
+            ImdbHelper._async_collect(self.imdbapi_client.async_credits_generator(title_id)),
+            ImdbHelper._async_collect(self.imdbapi_client.async_episodes_generator(title_id)),
+            ImdbHelper._async_collect(self.imdbapi_client.async_images_generator(title_id)),
+            self.imdbapi_client.async_seasons(title_id)
+        )
         return ImdbMediaInfo.from_title(details, akas=akas, api_credits=credit_list, episodes=episodes, images=images,
                                         seasons=seasons.seasons if seasons else None)
 
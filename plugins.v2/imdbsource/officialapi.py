@@ -12,6 +12,8 @@ from app.log import logger
 from app.utils.common import retry
 from app.utils.http import RequestUtils, AsyncRequestUtils
 
+from .diskcache import DiskCache, disk_cached
+from .pagination import Paginator, RateLimiter
 from .schema.imdbtypes import ImdbType
 from .schema import VerticalList, AdvancedTitleSearchResponse, AdvancedTitleSearch, TitleEdge, SearchParams
 
@@ -355,7 +357,9 @@ class OfficialApiClient:
     BASE_URL = "https://caching.graphql.imdb.com/"
 
     def __init__(self, proxies: Optional[Dict[str, str]] = None,
-                 ua: Optional[str] = None):
+                 ua: Optional[str] = None,
+                 disk_cache: Optional[DiskCache] = None):
+        self.disk_cache = disk_cache
         headers = {
             "accept": "application/graphql+json, application/json",
             "content-type": "application/json",
@@ -378,6 +382,8 @@ class OfficialApiClient:
             client=self._client,
             ua=ua,
         )
+        # 探索页翻页时预取下一页
+        self._paginator = Paginator(RateLimiter(rate=3, burst=3), prefetch=1, concurrency=4)
         self.flat_interest_id = {}
         for category, value in INTERESTS_ID.items():
             for name, in_id in value.items():
@@ -400,6 +406,7 @@ class OfficialApiClient:
 
     @retry(Exception, logger=logger, delay=1)
     @cached(maxsize=1024, ttl=CACHE_LIFETIME)
+    @disk_cached("graphql")
     def _query_graphql(self, query: str, variables: Dict[str, Any]) -> Optional[dict]:
         params = {"query": query, "variables": variables}
         data = self._req.post_json(f"{self.BASE_URL}", json=params, raise_exception=True)
@@ -412,6 +419,7 @@ class OfficialApiClient:
 
     @retry(Exception, logger=logger, delay=1)
     @cached(maxsize=1024, ttl=CACHE_LIFETIME)
+    @disk_cached("graphql")
     async def _async_query_graphql(self, query: str, variables: Dict[str, Any]) -> Optional[Dict]:
         params = {"query": query, "variables": variables}
         data = await self._async_req.post_json(f"{self.BASE_URL}", json=params, raise_exception=True)
@@ -568,18 +576,16 @@ class OfficialApiClient:
 
     async def advanced_title_search_generator(self, params: SearchParams, sha256: str) -> AsyncGenerator[
         TitleEdge, None]:
-        last_cursor = None
-        while True:
-            response = await self.async_advanced_title_search(params, sha256, last_cursor=last_cursor)
-            if not response:
-                return
+        async def fetch(last_cursor: Optional[str]):
+            return await self.async_advanced_title_search(params, sha256, last_cursor=last_cursor)
 
-            for edge in response.edges:
-                yield edge
+        def next_cursor(response: AdvancedTitleSearch) -> Optional[str]:
+            if not response.page_info.has_next_page:
+                return None
+            return response.page_info.end_cursor
 
-            last_cursor = response.page_info.end_cursor
-            if not last_cursor or not response.page_info.has_next_page:
-                break
+        async for edge in self._paginator.async_iterate(fetch, next_cursor, lambda r: r.edges):
+            yield edge
 
     @staticmethod
     def _ranked_list_to_constraint(ranked: str) -> Optional[Dict]:
@@ -0,0 +1,187 @@
+import asyncio
+import queue
+import threading
+import time
+import weakref
+from contextlib import suppress
+from typing import Any, AsyncGenerator, Awaitable, Callable, Generator, Iterable, Optional, TypeVar
+
+P = TypeVar("P")
+T = TypeVar("T")
+
+_END = object()
+
+
+class _PageError:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+class RateLimiter:
+    """
+    令牌桶限速器，同步线程与协程共用同一个桶
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self._rate = max(0.001, float(rate))
+        self._burst = max(1, int(burst))
+        self._tokens = float(self._burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """
+        预约一个令牌，返回需要等待的秒数
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._burst, self._tokens + (now - self._updated) * self._rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self._rate
+
+    def acquire(self):
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def async_acquire(self):
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class Paginator:
+    """
+    预取式分页迭代
+
+    后台按 page token 顺序拉取后续页面放入长度为 prefetch 的队列，调用方处理当前页时下一页已在请求中；
+    同一 Paginator 的所有分页共享限速器与并发上限，调用方提前结束迭代时取消后台拉取
+    """
+
+    def __init__(self, limiter: Optional[RateLimiter] = None, prefetch: int = 2, concurrency: int = 4):
+        self._limiter = limiter
+        self._prefetch = max(1, int(prefetch))
+        self._concurrency = max(1, int(concurrency))
+        self._semaphore = threading.BoundedSemaphore(self._concurrency)
+        # asyncio.Semaphore 与事件循环绑定，按循环分别创建
+        self._async_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = \
+            weakref.WeakKeyDictionary()
+
+    def _async_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._async_semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self._concurrency)
+            self._async_semaphores[loop] = semaphore
+        return semaphore
+
+    async def async_iterate(self,
+                            fetch: Callable[[Optional[Any]], Awaitable[Optional[P]]],
+                            next_token: Callable[[P], Optional[Any]],
+                            items: Callable[[P], Iterable[T]],
+                            prefetch: Optional[int] = None) -> AsyncGenerator[T, None]:
+        """
+        异步分页迭代
+
+        :param fetch: 根据 page token 获取一页，首页 token 为 None，返回空值时结束
+        :param next_token: 从页面中取下一页的 token，没有下一页时返回空值
+        :param items: 从页面中取条目
+        :param prefetch: 预取页数，默认使用构造参数
+        """
+        pages: asyncio.Queue = asyncio.Queue(maxsize=max(1, prefetch or self._prefetch))
+
+        async def producer():
+            token = None
+            try:
+                while True:
+                    async with self._async_semaphore():
+                        if self._limiter:
+                            await self._limiter.async_acquire()
+                        page = await fetch(token)
+                    if not page:
+                        break
+                    token = next_token(page)
+                    await pages.put(page)
+                    if not token:
+                        break
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                await pages.put(_PageError(e))
+                return
+            await pages.put(_END)
+
+        task = asyncio.create_task(producer())
+        try:
+            while True:
+                page = await pages.get()
+                if page is _END:
+                    return
+                if isinstance(page, _PageError):
+                    raise page.error
+                for item in items(page):
+                    yield item
+        finally:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+
+    def iterate(self,
+                fetch: Callable[[Optional[Any]], Optional[P]],
+                next_token: Callable[[P], Optional[Any]],
+                items: Callable[[P], Iterable[T]],
+                prefetch: Optional[int] = None) -> Generator[T, None, None]:
+        """
+        同步分页迭代，后台线程拉取页面，参数同 async_iterate
+        """
+        pages: queue.Queue = queue.Queue(maxsize=max(1, prefetch or self._prefetch))
+        stop_event = threading.Event()
+
+        def put(value) -> bool:
+            while not stop_event.is_set():
+                try:
+                    pages.put(value, timeout=0.5)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def producer():
+            token = None
+            try:
+                while not stop_event.is_set():
+                    with self._semaphore:
+                        if self._limiter:
+                            self._limiter.acquire()
+                        if stop_event.is_set():
+                            return
+                        page = fetch(token)
+                    if not page:
+                        break
+                    token = next_token(page)
+                    if not put(page) or not token:
+                        break
+            except Exception as e:
+                put(_PageError(e))
+                return
+            put(_END)
+
+        thread = threading.Thread(target=producer, name="imdb-paginator", daemon=True)
+        thread.start()
+        try:
+            while True:
+                page = pages.get()
+                if page is _END:
+                    return
+                if isinstance(page, _PageError):
+                    raise page.error
+                yield from items(page)
+        finally:
+            stop_event.set()
+            # 取出队列中的页面，让阻塞在 put 上的后台线程尽快退出
+            with suppress(queue.Empty):
+                while True:
+                    pages.get_nowait()
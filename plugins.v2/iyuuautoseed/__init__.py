@@ -1,4 +1,3 @@
-import os
 import re
 from datetime import datetime, timedelta
 from threading import Event
@@ -20,6 +19,8 @@ from app.helper.torrent import TorrentHelper
 from app.log import logger
 from app.plugins import _PluginBase
 from app.plugins.iyuuautoseed.iyuu_helper import IyuuHelper
+from app.plugins.iyuuautoseed.seed_cache import SeedCache
+from app.plugins.iyuuautoseed.torrent_filter import TorrentFilter
 from app.schemas import NotificationType, ServiceInfo
 from app.schemas.types import EventType
 from app.utils.http import RequestUtils
@@ -34,7 +35,7 @@ class IYUUAutoSeed(_PluginBase):
     # 插件图标
     plugin_icon = "IYUU.png"
     # 插件版本
-    plugin_version = "2.18"
+    plugin_version = "2.21"
     # 插件作者
     plugin_author = "jxxghp,CKun"
     # 作者主页
@@ -70,6 +71,10 @@ class IYUUAutoSeed(_PluginBase):
     _size = None
     _clearcache = False
     _auto_start = False
+    # 预编译的路径与标签过滤规则
+    _filter = TorrentFilter()
+    # IYUU查询结果缓存时间（小时），0为不缓存
+    _seed_info_ttl = 24
     # 退出事件
     _event = Event()
     # 种子链接xpaths
@@ -83,13 +88,18 @@ class IYUUAutoSeed(_PluginBase):
     _recheck_torrents = {}
     _is_recheck_running = False
     # 辅种缓存，出错的种子不再重复辅种，可清除
-    _error_caches = []
+    _error_caches = SeedCache()
     # 辅种缓存，辅种成功的种子，可清除
-    _success_caches = []
+    _success_caches = SeedCache()
     # 辅种缓存，出错的种子不再重复辅种，且无法清除。种子被删除404等情况
-    _permanent_error_caches = []
-    # 辅种缓存最大保存条数，避免长期运行时配置缓存无限增长
+    _permanent_error_caches = SeedCache()
+    # 辅种缓存最大保存条数，超出时淘汰最早写入的记录
     _seed_cache_max_items = 10000
+    # 辅种缓存以压缩文本保存在插件数据中，不再写入插件配置
+    _seed_cache_data_key = "seed_caches"
+    _seed_cache_names = ("success_caches", "error_caches", "permanent_error_caches")
+    # IYUU查询结果缓存的插件数据键
+    _seed_info_data_key = "seed_info_cache"
     # 辅种计数
     total = 0
     realtotal = 0
@@ -99,9 +109,9 @@ class IYUUAutoSeed(_PluginBase):
     cached = 0
 
     def init_plugin(self, config: dict = None):
-        self._error_caches = []
-        self._success_caches = []
-        self._permanent_error_caches = []
+        self._error_caches = SeedCache(max_items=self._seed_cache_max_items)
+        self._success_caches = SeedCache(max_items=self._seed_cache_max_items)
+        self._permanent_error_caches = SeedCache(max_items=self._seed_cache_max_items)
 
         # 读取配置
         if config:
@@ -116,6 +126,7 @@ class IYUUAutoSeed(_PluginBase):
             self._notify = config.get("notify")
             self._nolabels = config.get("nolabels")
             self._nopaths = config.get("nopaths")
+            self._filter = TorrentFilter(nopaths=self._nopaths, nolabels=self._nolabels)
             self._labelsafterseed = config.get("labelsafterseed") if config.get("labelsafterseed") else "已整理,辅种"
             self._categoryafterseed = config.get("categoryafterseed")
             self._auto_category = config.get("auto_category")
@@ -123,15 +134,9 @@ class IYUUAutoSeed(_PluginBase):
             self._reuse_save_path = config.get("reuse_save_path", True)
             self._addhosttotag = config.get("addhosttotag")
             self._size = float(config.get("size")) if config.get("size") else 0
+            self._seed_info_ttl = self.__parse_ttl(config.get("seed_info_ttl"))
             self._clearcache = config.get("clearcache")
-            self._permanent_error_caches = (
-                [] if self._clearcache else list(config.get("permanent_error_caches") or [])
-            )
-            self._error_caches = [] if self._clearcache else list(config.get("error_caches") or [])
-            self._success_caches = [] if self._clearcache else list(config.get("success_caches") or [])
-            self.__trim_seed_cache(self._permanent_error_caches)
-            self.__trim_seed_cache(self._error_caches)
-            self.__trim_seed_cache(self._success_caches)
+            self.__load_seed_caches(config)
 
             # 过滤掉已删除的站点
             all_sites = [site.id for site in SiteOper().list_order_by_pri()] + [site.get("id") for site in
@@ -146,7 +151,9 @@ class IYUUAutoSeed(_PluginBase):
 
         # 启动定时任务 & 立即运行一次
         if self.get_state() or self._onlyonce:
-            self.iyuu_helper = IyuuHelper(token=self._token)
+            self.iyuu_helper = IyuuHelper(token=self._token, cache_ttl=self._seed_info_ttl * 3600)
+            if not self._clearcache:
+                self.iyuu_helper.load_cache(self.get_data(self._seed_info_data_key))
             self._scheduler = BackgroundScheduler(timezone=settings.TZ)
 
             if self._onlyonce:
@@ -159,8 +166,9 @@ class IYUUAutoSeed(_PluginBase):
                 self._onlyonce = False
 
             if self._clearcache:
-                # 关闭清除缓存开关
+                # 关闭清除缓存开关，同时清空IYUU查询结果缓存
                 self._clearcache = False
+                self.save_data(self._seed_info_data_key, "")
             # 保存配置
             self.__update_config()
 
@@ -339,7 +347,7 @@ class IYUUAutoSeed(_PluginBase):
                                 'component': 'VCol',
                                 'props': {
                                     'cols': 12,
-                                    'md': 6
+                                    'md': 4
                                 },
                                 'content': [
                                     {
@@ -355,7 +363,7 @@ class IYUUAutoSeed(_PluginBase):
                                 'component': 'VCol',
                                 'props': {
                                     'cols': 12,
-                                    'md': 6
+                                    'md': 4
                                 },
                                 'content': [
                                     {
@@ -368,6 +376,23 @@ class IYUUAutoSeed(_PluginBase):
                                     }
                                 ]
                             },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 4
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'seed_info_ttl',
+                                            'label': '查询结果缓存(小时)',
+                                            'placeholder': '0为不缓存，每次重新查询全部种子'
+                                        }
+                                    }
+                                ]
+                            },
                         ]
                     },
                     {
@@ -679,7 +704,8 @@ class IYUUAutoSeed(_PluginBase):
             "nolabels": "",
             "labelsafterseed": "",
             "categoryafterseed": "",
-            "size": ""
+            "size": "",
+            "seed_info_ttl": 24
         }
 
     def get_page(self) -> List[dict]:
@@ -706,36 +732,41 @@ class IYUUAutoSeed(_PluginBase):
             "auto_start": self._auto_start,
             "reuse_save_path": self._reuse_save_path,
             "size": self._size,
-            "success_caches": self._success_caches,
-            "error_caches": self._error_caches,
-            "permanent_error_caches": self._permanent_error_caches
+            "seed_info_ttl": self._seed_info_ttl,
         })
+        self.__save_seed_caches()
 
-    def __trim_seed_cache(self, cache: list):
+    @staticmethod
+    def __parse_ttl(value: Any) -> float:
         """
-        去重并限制辅种缓存大小，避免长期任务把配置缓存无限撑大。
+        解析查询结果缓存时间（小时），未配置时默认24小时，非法值视为不缓存
         """
-        if not cache:
-            return
-        unique_cache = []
-        seen = set()
-        for item in reversed(cache):
-            if not item or item in seen:
-                continue
-            seen.add(item)
-            unique_cache.append(item)
-        unique_cache.reverse()
-        cache[:] = unique_cache[-self._seed_cache_max_items:]
+        if value is None or value == "":
+            return 24
+        try:
+            return max(float(value), 0)
+        except (TypeError, ValueError):
+            return 0
 
-    def __append_seed_cache(self, cache: list, value: str):
+    def __load_seed_caches(self, config: dict):
         """
-        写入辅种缓存并保持上限，重复值只保留一份。
+        加载辅种缓存，兼容迁移旧版保存在插件配置中的缓存列表，清除缓存时全部置空。
         """
-        if not value:
-            return
-        if value not in cache:
-            cache.append(value)
-        self.__trim_seed_cache(cache)
+        data = {} if self._clearcache else (self.get_data(self._seed_cache_data_key) or {})
+        for name in self._seed_cache_names:
+            cache = SeedCache.loads(data.get(name), max_items=self._seed_cache_max_items)
+            if not self._clearcache:
+                for item in config.get(name) or []:
+                    cache.add(item)
+            setattr(self, f"_{name}", cache)
+
+    def __save_seed_caches(self):
+        """
+        将辅种缓存压缩后保存到插件数据。
+        """
+        self.save_data(self._seed_cache_data_key, {
+            name: getattr(self, f"_{name}").dumps() for name in self._seed_cache_names
+        })
 
     def auto_seed(self):
         """
@@ -776,27 +807,16 @@ class IYUUAutoSeed(_PluginBase):
                     continue
                 save_path = self.__get_save_path(torrent=torrent, dl_type=service.type)
 
-                if self._nopaths and save_path:
-                    # 过滤不需要转移的路径
-                    nopath_skip = False
-                    for nopath in self._nopaths.split('\n'):
-                        if os.path.normpath(save_path).startswith(os.path.normpath(nopath)):
-                            logger.info(f"种子 {hash_str} 保存路径 {save_path} 不需要辅种，跳过 ...")
-                            nopath_skip = True
-                            break
-                    if nopath_skip:
-                        continue
+                # 过滤不需要辅种的路径
+                if self._filter.excluded_path(save_path):
+                    logger.info(f"种子 {hash_str} 保存路径 {save_path} 不需要辅种，跳过 ...")
+                    continue
 
-                # 获取种子标签
-                torrent_labels = self.__get_label(torrent=torrent, dl_type=service.type)
-                if torrent_labels and self._nolabels:
-                    is_skip = False
-                    for label in self._nolabels.split(','):
-                        if label in torrent_labels:
-                            logger.info(f"种子 {hash_str} 含有不辅种标签 {label}，跳过 ...")
-                            is_skip = True
-                            break
-                    if is_skip:
+                # 排除含有不辅种标签的种子
+                if self._filter.has_nolabels:
+                    label = self._filter.excluded_label(self.__get_label(torrent=torrent, dl_type=service.type))
+                    if label:
+                        logger.info(f"种子 {hash_str} 含有不辅种标签 {label}，跳过 ...")
                         continue
                 # 体积排除辅种
                 torrent_size = self.__get_torrent_size(torrent=torrent, dl_type=service.type) / 1024 / 1024 / 1024
@@ -811,14 +831,9 @@ class IYUUAutoSeed(_PluginBase):
                 })
             if hash_strs:
                 logger.info(f"总共需要辅种的种子数：{len(hash_strs)}")
-                # 分组处理，减少IYUU Api请求次数
-                chunk_size = 200
-                for i in range(0, len(hash_strs), chunk_size):
-                    # 切片操作
-                    chunk = hash_strs[i:i + chunk_size]
-                    # 处理分组
-                    self.__seed_torrents(hash_strs=chunk,
-                                         service=service)
+                # 由IYUU助手分组并发查询，已缓存且未过期的Hash不再请求
+                self.__seed_torrents(hash_strs=hash_strs,
+                                     service=service)
                 # 触发校验检查
                 self.check_recheck()
             else:
@@ -826,6 +841,7 @@ class IYUUAutoSeed(_PluginBase):
 
         # 保存缓存
         self.__update_config()
+        self.save_data(self._seed_info_data_key, self.iyuu_helper.dump_cache())
         # 发送消息
         if self._notify:
             if self.success or self.fail:
@@ -905,6 +921,7 @@ class IYUUAutoSeed(_PluginBase):
         logger.info(f"下载器 {service.name} 开始查询辅种，数量：{len(hash_strs)} ...")
         # 下载器中的Hashs
         hashs = [item.get("hash") for item in hash_strs]
+        hash_set = set(hashs)
         # 每个Hash的保存目录
         save_paths = {}
         save_category = {}
@@ -912,7 +929,7 @@ class IYUUAutoSeed(_PluginBase):
             save_paths[item.get("hash")] = item.get("save_path")
             save_category[item.get("hash")] = item.get("category")
         # 查询可辅种数据
-        seed_list, msg = self.iyuu_helper.get_seed_info(hashs)
+        seed_list, msg = self.iyuu_helper.query_seed_info(hashs)
         if not isinstance(seed_list, dict):
             # 判断辅种异常是否是由于Token未认证导致的，由于没有解决接口，只能从返回值来判断
             if self._token and msg == '请求缺少token':
@@ -922,8 +939,13 @@ class IYUUAutoSeed(_PluginBase):
             return
         else:
             logger.info(f"IYUU返回可辅种数：{len(seed_list)}")
+            if msg:
+                logger.warn(f"部分种子查询辅种失败，将在下次重新查询：{msg}")
         # 遍历
         for current_hash, seed_info in seed_list.items():
+            if self._event.is_set():
+                logger.info(f"辅种服务停止")
+                return
             if not seed_info:
                 continue
             seed_torrents = seed_info.get("torrent")
@@ -940,7 +962,7 @@ class IYUUAutoSeed(_PluginBase):
                     continue
                 if not seed.get("sid") or not seed.get("info_hash"):
                     continue
-                if seed.get("info_hash") in hashs:
+                if seed.get("info_hash") in hash_set:
                     logger.info(f"{seed.get('info_hash')} 已在下载器中，跳过 ...")
                     continue
                 if seed.get("info_hash") in self._success_caches:
@@ -1103,7 +1125,7 @@ class IYUUAutoSeed(_PluginBase):
         site_url, download_page = self.iyuu_helper.get_torrent_url(seed.get("sid"))
         if not site_url or not download_page:
             # 加入缓存
-            self.__append_seed_cache(self._error_caches, seed.get("info_hash"))
+            self._error_caches.add(seed.get("info_hash"))
             self.fail += 1
             self.cached += 1
             return False
@@ -1138,7 +1160,7 @@ class IYUUAutoSeed(_PluginBase):
                                               base_url=download_page)
         if not torrent_url:
             # 加入失败缓存
-            self.__append_seed_cache(self._error_caches, seed.get("info_hash"))
+            self._error_caches.add(seed.get("info_hash"))
             self.fail += 1
             self.cached += 1
             return False
@@ -1159,10 +1181,10 @@ class IYUUAutoSeed(_PluginBase):
             self.fail += 1
             # 加入失败缓存
             if error_msg and ('无法打开链接' in error_msg or '触发站点流控' in error_msg):
-                self.__append_seed_cache(self._error_caches, seed.get("info_hash"))
+                self._error_caches.add(seed.get("info_hash"))
             else:
                 # 种子不存在的情况
-                self.__append_seed_cache(self._permanent_error_caches, seed.get("info_hash"))
+                self._permanent_error_caches.add(seed.get("info_hash"))
             logger.error(f"下载种子文件失败：{torrent_url}")
             return False
         # 添加下载，辅种任务默认暂停
@@ -1176,7 +1198,7 @@ class IYUUAutoSeed(_PluginBase):
             # 下载失败
             self.fail += 1
             # 加入失败缓存
-            self.__append_seed_cache(self._error_caches, seed.get("info_hash"))
+            self._error_caches.add(seed.get("info_hash"))
             return False
         else:
             self.success += 1
@@ -1197,7 +1219,7 @@ class IYUUAutoSeed(_PluginBase):
             # 下载成功
             logger.info(f"成功添加辅种下载，站点：{site_info.get('name')}，种子链接：{torrent_url}")
             # 成功也加入缓存，有一些改了路径校验不通过的，手动删除后，下一次又会辅上
-            self.__append_seed_cache(self._success_caches, seed.get("info_hash"))
+            self._success_caches.add(seed.get("info_hash"))
             return True
 
     def __add_recheck_torrents(self, service: ServiceInfo, download_id: str):
@@ -1,7 +1,11 @@
+import base64
 import hashlib
 import json
+import threading
 import time
-from typing import Tuple, Optional
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple, Optional
 
 from app.utils.http import RequestUtils
 
@@ -15,9 +19,24 @@ class IyuuHelper(object):
     _sites = {}
     _token = None
     _sid_sha1 = None
+    # 单次查询的Hash数量
+    _query_chunk_size = 200
+    # 并发查询线程数
+    _query_workers = 3
+    # 两次查询请求之间的最小间隔（秒）
+    _query_interval = 0.5
+    # 查询结果缓存最大保存条数
+    _cache_max_items = 50000
 
-    def __init__(self, token: str):
+    def __init__(self, token: str, cache_ttl: float = 0):
         self._token = token
+        # 查询结果缓存：info_hash -> (查询时间, 辅种结果)，无可辅种结果时也缓存为None
+        self._cache_ttl = cache_ttl
+        self._seed_cache: Dict[str, Tuple[float, Optional[dict]]] = {}
+        self._cache_lock = threading.Lock()
+        self._rate_lock = threading.Lock()
+        self._sid_lock = threading.Lock()
+        self._last_request = 0.0
         if self._token:
             self.init_config()
 
@@ -99,10 +118,11 @@ class IyuuHelper(object):
             'version': self._version
         })
 
-    def get_seed_info(self, info_hashs: list) -> Tuple[Optional[dict], str]:
+    def get_seed_info(self, info_hashs: list, report: bool = True) -> Tuple[Optional[dict], str]:
         """
         返回info_hash对应的站点id、种子id
         :param info_hashs:
+        :param report: 站点哈希值失效时是否重新汇报后重试
         :return:
         """
         if not self._sid_sha1:
@@ -111,11 +131,120 @@ class IyuuHelper(object):
         json_data = json.dumps(info_hashs, separators=(',', ':'), ensure_ascii=False)
         sha1 = self.get_sha1(json_data)
         result, msg = self.__reseed_index(json_data, sha1)
-        if msg and "站点哈希值 require" in msg:
+        if report and msg and "站点哈希值 require" in msg:
             self._sid_sha1 = self.__report_existing()
             result, msg = self.__reseed_index(json_data, sha1)
         return result, msg
 
+    def query_seed_info(self, info_hashs: List[str]) -> Tuple[Optional[dict], str]:
+        """
+        分组并发查询info_hash对应的辅种信息，未过期的结果直接从缓存读取，只向IYUU发送新增或已过期的Hash
+        :param info_hashs: 下载器中的种子Hash
+        :return: 可辅种数据、错误信息，全部分组均查询失败时数据为None
+        """
+        now = time.time()
+        result = {}
+        pending = []
+        with self._cache_lock:
+            for info_hash in dict.fromkeys(info_hashs):
+                cached = self._seed_cache.get(info_hash)
+                if cached and self._cache_ttl and now - cached[0] < self._cache_ttl:
+                    if cached[1]:
+                        result[info_hash] = cached[1]
+                else:
+                    pending.append(info_hash)
+        if not pending:
+            return result, ""
+        if not self._sid_sha1:
+            self._sid_sha1 = self.__report_existing()
+        chunks = [pending[i:i + self._query_chunk_size] for i in range(0, len(pending), self._query_chunk_size)]
+        with ThreadPoolExecutor(max_workers=min(self._query_workers, len(chunks))) as executor:
+            responses = list(executor.map(self.__query_chunk, chunks))
+        msgs = []
+        succeed = False
+        for chunk, (seed_list, msg) in zip(chunks, responses):
+            if not isinstance(seed_list, dict):
+                msgs.append(msg)
+                continue
+            succeed = True
+            result.update({info_hash: seed_info for info_hash, seed_info in seed_list.items() if seed_info})
+            self.__cache_results(chunk, seed_list)
+        if not succeed and not result:
+            return None, msgs[0] if msgs else ""
+        return result, "；".join(dict.fromkeys(msgs))
+
+    def __query_chunk(self, info_hashs: List[str]) -> Tuple[Optional[dict], str]:
+        """
+        按最小请求间隔查询一组Hash
+        """
+        with self._rate_lock:
+            wait = self._last_request + self._query_interval - time.time()
+            if wait > 0:
+                time.sleep(wait)
+            self._last_request = time.time()
+        sid_sha1 = self._sid_sha1
+        result, msg = self.get_seed_info(list(info_hashs), report=False)
+        if msg and "站点哈希值 require" in msg:
+            with self._sid_lock:
+                # 多个分组同时失效时只重新汇报一次
+                if self._sid_sha1 == sid_sha1:
+                    self._sid_sha1 = self.__report_existing()
+            result, msg = self.get_seed_info(list(info_hashs), report=False)
+        return result, msg
+
+    def __cache_results(self, info_hashs: List[str], seed_list: dict):
+        """
+        写入一组Hash的查询结果，超出上限时淘汰最早查询的记录
+        """
+        if not self._cache_ttl:
+            return
+        now = time.time()
+        with self._cache_lock:
+            for info_hash in info_hashs:
+                self._seed_cache.pop(info_hash, None)
+                self._seed_cache[info_hash] = (now, seed_list.get(info_hash) or None)
+            while len(self._seed_cache) > self._cache_max_items:
+                self._seed_cache.pop(next(iter(self._seed_cache)))
+
+    def load_cache(self, data: Optional[str]):
+        """
+        从 dump_cache 生成的文本恢复查询结果缓存，丢弃已过期或损坏的数据
+        """
+        self._seed_cache = {}
+        if not data or not self._cache_ttl:
+            return
+        try:
+            items = json.loads(zlib.decompress(base64.b64decode(data)).decode("utf-8"))
+            if not isinstance(items, list):
+                return
+            now = time.time()
+            for item in items:
+                # 逐条校验，跳过结构不符的记录，避免个别损坏数据导致插件初始化失败
+                if not isinstance(item, list) or len(item) != 3:
+                    continue
+                info_hash, cached_at, seed_info = item
+                if not isinstance(info_hash, str) \
+                        or not isinstance(cached_at, (int, float)) or isinstance(cached_at, bool) \
+                        or not (seed_info is None or isinstance(seed_info, dict)):
+                    continue
+                if now - cached_at < self._cache_ttl:
+                    self._seed_cache[info_hash] = (cached_at, seed_info)
+        except (ValueError, zlib.error):
+            self._seed_cache = {}
+
+    def dump_cache(self) -> str:
+        """
+        将未过期的查询结果缓存压缩为 zlib + base64 文本，用于插件数据持久化
+        """
+        now = time.time()
+        with self._cache_lock:
+            items = [[info_hash, cached_at, seed_info] for info_hash, (cached_at, seed_info) in self._seed_cache.items()
+                     if self._cache_ttl and now - cached_at < self._cache_ttl]
+        if not items:
+            return ""
+        text = json.dumps(items, separators=(',', ':'), ensure_ascii=False)
+        return base64.b64encode(zlib.compress(text.encode("utf-8"), 9)).decode("ascii")
+
     @staticmethod
     def get_sha1(json_str: str) -> str:
         return hashlib.sha1(json_str.encode('utf-8')).hexdigest()
@@ -0,0 +1,65 @@
+import base64
+import zlib
+from collections import OrderedDict
+from typing import Iterable, Iterator, List, Optional
+
+
+class SeedCache:
+    """
+    辅种缓存：按写入顺序保存的有序集合，判重与写入均为 O(1)，超出上限时淘汰最早写入的记录
+    """
+
+    def __init__(self, items: Optional[Iterable[str]] = None, max_items: int = 10000):
+        self._max_items = max_items
+        self._items: "OrderedDict[str, None]" = OrderedDict()
+        for item in items or []:
+            self.add(item)
+
+    def __contains__(self, item: object) -> bool:
+        return item in self._items
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._items)
+
+    def add(self, item: str):
+        """
+        写入一条记录，已存在时移到末尾视为最近写入
+        """
+        if not item:
+            return
+        if item in self._items:
+            self._items.move_to_end(item)
+            return
+        self._items[item] = None
+        while len(self._items) > self._max_items:
+            self._items.popitem(last=False)
+
+    def clear(self):
+        self._items.clear()
+
+    def to_list(self) -> List[str]:
+        return list(self._items)
+
+    def dumps(self) -> str:
+        """
+        压缩为 zlib + base64 文本，用于插件数据持久化
+        """
+        if not self._items:
+            return ""
+        return base64.b64encode(zlib.compress("\n".join(self._items).encode("utf-8"), 9)).decode("ascii")
+
+    @classmethod
+    def loads(cls, data: Optional[str], max_items: int = 10000) -> "SeedCache":
+        """
+        从 dumps 生成的文本恢复缓存，数据损坏时返回空缓存
+        """
+        if not data:
+            return cls(max_items=max_items)
+        try:
+            text = zlib.decompress(base64.b64decode(data)).decode("utf-8")
+        except (ValueError, zlib.error):
+            return cls(max_items=max_items)
+        return cls(text.split("\n"), max_items=max_items)
@@ -16,8 +16,10 @@ import asyncio
 import datetime
 import inspect
 import json
+import math
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from decimal import Decimal, ROUND_HALF_UP
 from typing import Any, Dict, List, Optional, Set, Tuple
 from urllib.parse import urlparse
@@ -46,7 +48,7 @@ class QbUploadLimiter(_PluginBase):
     plugin_name = "QB上传限速"
     plugin_desc = "仅处理 MoviePilot 已整理入库成功的种子：分享率达到全局或站点单独阈值后自动限制上传速度（qBittorrent 与全局上传限速取较小值）；可选 AI 智能限速——调用系统设置的大模型按种子分享率、上传活跃度与站点账号分享率逐种子智能决策限速；支持多下载器、站点筛选、定时检测，停用/卸载自动恢复不限速。"
     plugin_icon = "Qbittorrent_A.png"
-    plugin_version = "1.3.18"
+    plugin_version = "1.3.21"
     plugin_author = "xlmc"
     author_url = "https://github.com/xlmc"
     plugin_config_prefix = "qbuploadlimiter_"
@@ -79,6 +81,17 @@ class QbUploadLimiter(_PluginBase):
     # 站点名称(小写) -> 原始名称，用于标签/分类匹配
     _site_names: Dict[str, str] = {}
 
+    # 是否增量同步种子列表（qBittorrent sync/maindata、Transmission recently-active）
+    _incremental_sync = True
+    # 增量同步缓存：{下载器名称: {rid, torrents: {种子Hash: 种子}, ids: {Transmission id: 种子Hash}, full_at}}
+    _sync_cache: Dict[str, dict] = {}
+    # 已确认整理入库成功的种子：{下载器名称: {种子Hash}}，入库状态只会由否变为是，增量轮次只查询新种子
+    _transferred_cache: Dict[str, set] = {}
+    # 增量同步时每隔该秒数强制全量同步一次，校准可能遗漏的变化
+    _FULL_SYNC_INTERVAL = 600
+    # Transmission recently-active 只返回最近 60 秒内有活动的种子，检测间隔需小于该窗口
+    _TR_RECENTLY_ACTIVE_WINDOW = 60
+
     _scheduler = None
     _last_result = None
     # 停用/卸载后兜底恢复重试的调度器与已重试次数：恢复失败项在下载器重连后自动重试
@@ -113,6 +126,14 @@ class QbUploadLimiter(_PluginBase):
     _uploaded_snapshots: Dict[str, Dict[str, float]] = {}
     # 上次大模型调用时间戳（限频）
     _last_ai_eval_at = 0.0
+    # 最近一次 AI 评估统计：{下载器名称: {at, sent, reused, chunks: [{size, latency_ms, input_tokens, output_tokens, ok}]}}
+    _ai_metrics: Dict[str, dict] = {}
+    # 单次大模型调用最多携带的种子数，超出时分块并发评估
+    _AI_CHUNK_SIZE = 40
+    # 分块并发调用大模型的最大线程数
+    _AI_MAX_WORKERS = 4
+    # 特征指纹未变化的决策最长复用时间（秒），超过后即使指纹不变也重新评估
+    _AI_DECISION_MAX_AGE = 86400
     # 系统设置未配置大模型标记：置位后降频重试探测（而非永久放弃），补配置后自动恢复
     _ai_config_missing = False
     # 下次重试探测大模型配置的时间戳（配置缺失时降频重试，避免每轮刷错误日志）
@@ -180,6 +201,8 @@ class QbUploadLimiter(_PluginBase):
         # 监控超时取消配置（秒），0 表示不启用
         self._complete_timeout = max(self._to_int(config.get("complete_timeout"), 0), 0)
         self._limit_timeout = max(self._to_int(config.get("limit_timeout"), 0), 0)
+        # 增量同步种子列表，默认开启；未保存过该项的旧配置同样开启
+        self._incremental_sync = bool(config.get("incremental_sync", True))
         # AI 智能限速配置
         self._ai_enabled = bool(config.get("ai_enabled"))
         self._ai_eval_interval = max(self._to_int(config.get("ai_eval_interval"), 3600), 60)
@@ -228,11 +251,15 @@ class QbUploadLimiter(_PluginBase):
         # 快照丢失后首轮只建快照、次轮起窗口增量判断生效，种子状态自动重新归位
         self._seed_states = {}
         self._ai_decisions = {}
+        self._ai_metrics = {}
         self._uploaded_snapshots = {}
         self._last_ai_eval_at = 0.0
         self._ai_config_missing = False
         self._ai_config_retry_at = 0.0
         self._seed_page_snapshot = {}
+        # 增量同步缓存与入库缓存同为会话级数据，重新初始化后首轮全量同步
+        self._sync_cache = {}
+        self._transferred_cache = {}
         # 重新初始化后 AI 生效标记与决策缓存一并清零：详情页显隐跟随新一轮
         # 大模型调用结果重新判定，避免保存配置后出现「有页面无数据」或残留旧标记
         self._ai_active = False
@@ -398,11 +425,38 @@ class QbUploadLimiter(_PluginBase):
                     ],
                 }
             )
+        # 最近一次 AI 评估统计：发送/沿用数量、分块耗时与 token 用量
+        metric_lines = []
+        for service_name, metrics in self._ai_metrics.items():
+            chunks = metrics.get("chunks") or []
+            line = f"[{service_name}] 发送 {metrics.get('sent', 0)} 个 / 沿用 {metrics.get('reused', 0)} 个"
+            if chunks:
+                line += (
+                    f"，{len(chunks)} 个分块最长耗时 {max(c.get('latency_ms', 0) for c in chunks)} ms，"
+                    f"输入 {sum(c.get('input_tokens', 0) for c in chunks)} / "
+                    f"输出 {sum(c.get('output_tokens', 0) for c in chunks)} tokens"
+                )
+            metric_lines.append(line)
+        metric_content = []
+        if metric_lines:
+            metric_content.append(
+                {
+                    "component": "VAlert",
+                    "props": {
+                        "type": "info",
+                        "variant": "tonal",
+                        "density": "compact",
+                        "class": "mt-2",
+                        "text": "最近一次 AI 评估：" + "；".join(metric_lines),
+                    },
+                }
+            )
         return [
             {
                 "component": "VRow",
                 "content": header_cards,
             },
+            *metric_content,
             {
                 "component": "VCard",
                 "props": {"class": "mt-2"},
@@ -425,7 +479,7 @@ class QbUploadLimiter(_PluginBase):
         第二行：下载器（多选）/ 站点（多选，按站点筛选）；
         第三行：全局分享率阈值 / 上传速度 / 定时检测间隔；
         第四行：按站点单独分享率阈值；
-        第五行：下载完成后监控超时 / 限速后取消监控超时；
+        第五行：下载完成后监控超时 / 限速后取消监控超时 / 增量同步种子列表；
         第六行：功能说明。
         """
         # 下载器下拉：MoviePilot 已配置并启用的 qBittorrent / Transmission
@@ -744,7 +798,7 @@ class QbUploadLimiter(_PluginBase):
                         "content": [
                             {
                                 "component": "VCol",
-                                "props": {"cols": 12, "md": 6},
+                                "props": {"cols": 12, "md": 4},
                                 "content": [
                                     {
                                         "component": "VTextField",
@@ -764,7 +818,7 @@ class QbUploadLimiter(_PluginBase):
                             },
                             {
                                 "component": "VCol",
-                                "props": {"cols": 12, "md": 6},
+                                "props": {"cols": 12, "md": 4},
                                 "content": [
                                     {
                                         "component": "VTextField",
@@ -782,6 +836,21 @@ class QbUploadLimiter(_PluginBase):
                                     }
                                 ],
                             },
+                            {
+                                "component": "VCol",
+                                "props": {"cols": 12, "md": 4},
+                                "content": [
+                                    {
+                                        "component": "VSwitch",
+                                        "props": {
+                                            "model": "incremental_sync",
+                                            "label": "增量同步种子列表",
+                                            "hint": "qBittorrent 按 sync/maindata 只拉取变化的种子，Transmission 在检测间隔小于 60 秒时只拉取近期活动种子；每 10 分钟自动全量校准一次",
+                                            "persistent-hint": True,
+                                        },
+                                    }
+                                ],
+                            },
                         ],
                     },
                     {
@@ -819,6 +888,7 @@ class QbUploadLimiter(_PluginBase):
             "interval_seconds": self._interval_seconds,
             "complete_timeout": self._complete_timeout,
             "limit_timeout": self._limit_timeout,
+            "incremental_sync": self._incremental_sync,
             "ai_enabled": self._ai_enabled,
             "ai_eval_interval": self._ai_eval_interval,
             "ai_max_limit": self._ai_max_limit,
@@ -931,6 +1001,30 @@ class QbUploadLimiter(_PluginBase):
         # 常见的整数 KB/s 保持整数显示；非整 KB/s 则保留 qB 返回的精确值。
         return int(effective_limit) if effective_limit.is_integer() else effective_limit
 
+    @staticmethod
+    def _bulk_change_upload_limit(downloader: Any, torrent_hashes: List[str], limit_kb: float) -> bool:
+        """
+        单次请求为一组种子设置相同的上传限速（KB/s），0 表示恢复不限速。
+
+        qBittorrent 调用 torrents/setUploadLimit 并传入 Hash 列表（单位字节/秒）；
+        Transmission 调用 torrent-set 并传入 id 列表（单位 KB/s）；
+        下载器实例未暴露底层客户端时逐个调用 change_torrent 兜底，任一失败即返回 False。
+        """
+        if not torrent_hashes:
+            return True
+        qbc = getattr(downloader, "qbc", None)
+        if qbc is not None:
+            qbc.torrents_set_upload_limit(limit=int(float(limit_kb) * 1024), torrent_hashes=torrent_hashes)
+            return True
+        trc = getattr(downloader, "trc", None)
+        if trc is not None:
+            trc.change_torrent(ids=torrent_hashes, upload_limit=int(float(limit_kb)), upload_limited=limit_kb > 0)
+            return True
+        return all(
+            downloader.change_torrent(hash_string=torrent_hash, upload_limit=limit_kb)
+            for torrent_hash in torrent_hashes
+        )
+
     def _set_torrent_limits(self, share_ratio: float, upload_limit: int, channel: Any = None) -> bool:
         """
         检测所有选中下载器中的种子分享率，达到阈值的设置上传限速。
@@ -980,18 +1074,19 @@ class QbUploadLimiter(_PluginBase):
             downloader_type = getattr(service_info, "type", "")
             effective_limit = self._effective_upload_limit(downloader, downloader_type, limit)
             try:
-                torrents, error = downloader.get_torrents()
-                if error:
+                # 增量同步时 removed_hashes 为本轮移除的种子，全量同步时为 None
+                torrents, removed_hashes = self._sync_torrents(service_name, downloader, downloader_type)
+                if torrents is None:
                     failed_names.append(service_name)
                     logger.warning(f"{self.LOG_TAG}获取下载器 [{service_name}] 种子列表失败")
                     continue
-                # 空列表是下载器中没有任何种子的合法成功结果，不是获取失败
-                torrents = torrents or []
 
                 # 入库成功门禁：先批量查询 MP 整理入库记录，得到「已入库成功」的种子集合；
                 # 种子入库成功前对插件完全不可见（不监控、不限速），等同于插件未开启
-                transferred_hashes = self._load_transferred_hashes(
-                    [self._torrent_hash(t, downloader_type) for t in torrents]
+                transferred_hashes = self._sync_transferred_hashes(
+                    service_name,
+                    [self._torrent_hash(t, downloader_type) for t in torrents],
+                    removed_hashes,
                 )
                 eligible_torrents = [
                     t for t in torrents if self._torrent_hash(t, downloader_type) in transferred_hashes
@@ -1003,6 +1098,7 @@ class QbUploadLimiter(_PluginBase):
                 self._refresh_torrent_state(
                     service_name, torrents, downloader_type, effective_limit, now,
                     transferred_hashes=transferred_hashes,
+                    removed_hashes=removed_hashes,
                 )
                 # 站点识别缓存：{种子Hash: 站点名称}，同一轮内每个种子只计算一次
                 site_cache: Dict[str, str] = {}
@@ -1209,13 +1305,15 @@ class QbUploadLimiter(_PluginBase):
         limit: float,
         now: float,
         transferred_hashes: Optional[Set[str]] = None,
+        removed_hashes: Optional[Set[str]] = None,
     ):
         """
         每个检测周期刷新种子监控状态：
         - 为已下载完成且已入库成功的种子维护「上传速度持续低于限速值」的连续低速计时：
           速度低于限速值时开始/延续计时，速度回升到限速值即清零重新计时
           （仅「下载完成后监控超时」启用且限速值大于 0 时需要）；
-        - 清理已不在下载器中的种子状态，避免记录无限增长。
+        - 清理已不在下载器中的种子状态，避免记录无限增长；增量同步轮次（removed_hashes
+          非 None）只清理本轮移除的种子，全量同步轮次按完整列表清理。
         """
         current_hashes = set()
         for torrent in torrents:
@@ -1252,12 +1350,119 @@ class QbUploadLimiter(_PluginBase):
             mapping = state.get(service_name)
             if not mapping:
                 continue
-            for key in [key for key in mapping if key not in current_hashes]:
+            if removed_hashes is not None:
+                stale_keys = [key for key in removed_hashes if key in mapping]
+            else:
+                stale_keys = [key for key in mapping if key not in current_hashes]
+            for key in stale_keys:
                 if isinstance(mapping, set):
                     mapping.discard(key)
                 else:
                     mapping.pop(key, None)
 
+    def _sync_torrents(
+        self, service_name: str, downloader: Any, downloader_type: str
+    ) -> Tuple[Optional[List[Any]], Optional[Set[str]]]:
+        """
+        获取下载器完整种子列表，返回 (种子列表, 本轮移除的种子Hash)，获取失败时种子列表为 None。
+
+        增量同步开启时，qBittorrent 按 sync/maindata 的 rid 只拉取变化字段，下载器返回
+        full_update（rid 失效）时整体替换缓存；Transmission 在检测间隔小于 recently-active
+        窗口时只拉取近期活动种子。变化合并进本地缓存后返回完整列表，移除集合为 None 表示
+        本轮为全量同步（首轮、每 _FULL_SYNC_INTERVAL 秒一次、增量失败回退）。
+        """
+        now = time.time()
+        cache = self._sync_cache.get(service_name)
+        full_due = not cache or now - cache.get("full_at", 0) >= self._FULL_SYNC_INTERVAL
+        if self._incremental_sync:
+            try:
+                if downloader_type == "qbittorrent" and getattr(downloader, "qbc", None) is not None:
+                    return self._sync_qbittorrent_maindata(service_name, downloader.qbc, cache, full_due, now)
+                if (
+                    downloader_type != "qbittorrent"
+                    and not full_due
+                    and self._interval_seconds < self._TR_RECENTLY_ACTIVE_WINDOW
+                    and getattr(downloader, "trc", None) is not None
+                ):
+                    return self._sync_transmission_recently_active(downloader.trc, cache, downloader_type)
+            except Exception as err:
+                logger.warning(f"{self.LOG_TAG}增量同步下载器 [{service_name}] 失败，回退全量获取：{err}")
+        self._sync_cache.pop(service_name, None)
+        torrents, error = downloader.get_torrents()
+        if error:
+            return None, None
+        # 空列表是下载器中没有任何种子的合法成功结果，不是获取失败
+        torrents = torrents or []
+        if (
+            self._incremental_sync
+            and downloader_type != "qbittorrent"
+            and self._interval_seconds < self._TR_RECENTLY_ACTIVE_WINDOW
+        ):
+            cached: Dict[str, Any] = {}
+            ids: Dict[Any, str] = {}
+            for torrent in torrents:
+                torrent_hash = self._torrent_hash(torrent, downloader_type)
+                if torrent_hash:
+                    cached[torrent_hash] = torrent
+                    ids[getattr(torrent, "id", None)] = torrent_hash
+            self._sync_cache[service_name] = {"torrents": cached, "ids": ids, "full_at": now}
+        return torrents, None
+
+    def _sync_qbittorrent_maindata(
+        self, service_name: str, qbc: Any, cache: Optional[dict], full_due: bool, now: float
+    ) -> Tuple[List[dict], Optional[Set[str]]]:
+        """按 sync/maindata 的 rid 协议同步 qBittorrent 种子，rid 为 0 或下载器要求时全量替换缓存。"""
+        rid = 0 if full_due else cache.get("rid", 0)
+        data = qbc.sync_maindata(rid=rid) or {}
+        changed = data.get("torrents") or {}
+        if full_due or data.get("full_update"):
+            # maindata 的种子以 Hash 为键，补回 hash 字段以兼容 torrents/info 结构
+            torrents = {torrent_hash: {**dict(info), "hash": torrent_hash} for torrent_hash, info in changed.items()}
+            self._sync_cache[service_name] = {"rid": data.get("rid", 0), "torrents": torrents, "full_at": now}
+            return list(torrents.values()), None
+        torrents = cache["torrents"]
+        for torrent_hash, info in changed.items():
+            torrents.setdefault(torrent_hash, {"hash": torrent_hash}).update(dict(info))
+        removed = set(data.get("torrents_removed") or [])
+        for torrent_hash in removed:
+            torrents.pop(torrent_hash, None)
+        cache["rid"] = data.get("rid", rid)
+        return list(torrents.values()), removed
+
+    def _sync_transmission_recently_active(
+        self, trc: Any, cache: dict, downloader_type: str
+    ) -> Tuple[List[Any], Set[str]]:
+        """按 recently-active 同步 Transmission 近期活动种子，并按 id 映射移除已删除的种子。"""
+        active, removed_ids = trc.get_recently_active_torrents()
+        torrents = cache["torrents"]
+        ids = cache["ids"]
+        for torrent in active or []:
+            torrent_hash = self._torrent_hash(torrent, downloader_type)
+            if torrent_hash:
+                torrents[torrent_hash] = torrent
+                ids[getattr(torrent, "id", None)] = torrent_hash
+        removed = {ids.pop(torrent_id) for torrent_id in removed_ids or [] if torrent_id in ids}
+        for torrent_hash in removed:
+            torrents.pop(torrent_hash, None)
+        return list(torrents.values()), removed
+
+    def _sync_transferred_hashes(
+        self, service_name: str, hashes: List[str], removed_hashes: Optional[Set[str]]
+    ) -> Set[str]:
+        """
+        返回当前种子中已整理入库成功的 Hash 集合。
+
+        入库状态只会由否变为是：增量轮次只查询尚未确认入库的种子，全量轮次重新查询全部种子。
+        """
+        known = self._transferred_cache.get(service_name)
+        if removed_hashes is None or known is None:
+            known = set()
+        else:
+            known.difference_update(removed_hashes)
+        known.update(self._load_transferred_hashes([h for h in hashes if h and h not in known]))
+        self._transferred_cache[service_name] = known
+        return known & set(hashes)
+
     def _apply_limits(
         self,
         service_name: str,
@@ -1272,7 +1477,10 @@ class QbUploadLimiter(_PluginBase):
         ai_limits: Optional[Dict[str, float]] = None,
     ) -> Tuple[int, int, int, int]:
         """
-        对达标种子逐个设置上传限速，返回 (新增限速数, 已满足数, 失败数, 取消监控数)。
+        对达标种子设置上传限速，返回 (新增限速数, 已满足数, 失败数, 取消监控数)。
+
+        当前限速已是目标值的种子不发起任何请求；其余种子按目标限速值分组，
+        每个限速值只调用一次下载器批量接口（见 _bulk_change_upload_limit）。
 
         监控超时取消机制（对应配置项为 0 时关闭）：
         - 下载完成后超时：种子下载完成后，若在设定秒数内上传速度始终达不到限速值，
@@ -1288,6 +1496,8 @@ class QbUploadLimiter(_PluginBase):
         canceled_hashes = self._canceled_hashes.setdefault(service_name, set())
         # 限速值大于 0 时才需要发通知
         channels = self._normalize_channels(channel) if limit > 0 else []
+        # 待设置限速的种子：{目标限速值: [(种子, Hash, 名称, 阈值, 是否已认领)]}
+        pending_groups: Dict[float, List[Tuple[Any, str, str, float, bool]]] = {}
 
         for torrent in matched:
             torrent_hash = self._torrent_hash(torrent, downloader_type)
@@ -1330,10 +1540,27 @@ class QbUploadLimiter(_PluginBase):
                     already += 1
                     continue
 
+            # 需要调整的种子按目标限速值分组，循环结束后每个限速值只调用一次下载器接口
+            pending_groups.setdefault(torrent_limit, []).append(
+                (torrent, torrent_hash, torrent_name, torrent_threshold, owned)
+            )
+
+        for torrent_limit, entries in pending_groups.items():
+            group_hashes = [entry[1] for entry in entries]
             try:
-                if not downloader.change_torrent(hash_string=torrent_hash, upload_limit=torrent_limit):
-                    failed += 1
-                    continue
+                changed = self._bulk_change_upload_limit(downloader, group_hashes, torrent_limit)
+            except Exception as err:
+                changed = False
+                logger.error(
+                    f"{self.LOG_TAG}[{service_name}] 批量设置 {len(group_hashes)} 个种子上传限速 "
+                    f"{self._format_limit(torrent_limit)} 失败：{err}"
+                )
+            if not changed:
+                failed += len(entries)
+                continue
+            now = time.time()
+            restore_hashes = self._restore_hashes.setdefault(service_name, set())
+            for torrent, torrent_hash, torrent_name, torrent_threshold, owned in entries:
                 limited_hashes.add(torrent_hash)
                 # 登记到待恢复集合：即使后续取消监控，停用/卸载时也能恢复不限速
                 restore_hashes.add(torrent_hash)
@@ -1354,9 +1581,6 @@ class QbUploadLimiter(_PluginBase):
                 if channels and not owned:
                     site = site_cache.get(torrent_hash, "") or self._torrent_site(torrent, downloader_type)
                     self._send_limit_notify(site=site, torrent_name=torrent_name, limit=torrent_limit, channels=channels)
-            except Exception as err:
-                failed += 1
-                logger.error(f"{self.LOG_TAG}[{service_name}] 设置种子 [{torrent_name}] 上传限速失败：{err}")
         return new_limited, already, failed, canceled
 
     # ---------------------------------------------------------------- AI 智能限速
@@ -1522,8 +1746,12 @@ class QbUploadLimiter(_PluginBase):
         return result.get("value")
 
     def _ai_invoke(self, prompt: str, timeout: int = 180) -> str:
+        """调用系统设置中已配置的大模型，仅返回模型回复文本。"""
+        return self._ai_invoke_with_usage(prompt, timeout)[0]
+
+    def _ai_invoke_with_usage(self, prompt: str, timeout: int = 180) -> Tuple[str, Dict[str, int]]:
         """
-        调用 MoviePilot 系统设置中已配置的大模型（智能体），返回模型回复文本。
+        调用 MoviePilot 系统设置中已配置的大模型（智能体），返回 (模型回复文本, token 用量)。
 
         复用系统级 LLM 配置（provider/model/api_key/base_url），插件不做任何
         API 密钥配置；调用失败或超时抛异常，由调用方回退常规阈值规则。
@@ -1555,9 +1783,17 @@ class QbUploadLimiter(_PluginBase):
             raise RuntimeError("系统设置未配置大模型")
         self._ai_config_missing = False
         response = llm.invoke(prompt, config={"configurable": {"timeout": timeout}})
+        # token 用量：LangChain 新版为 usage_metadata，旧版 OpenAI 兼容接口在 response_metadata.token_usage
+        usage = getattr(response, "usage_metadata", None) or (
+            (getattr(response, "response_metadata", None) or {}).get("token_usage") or {}
+        )
+        tokens = {
+            "input_tokens": int(usage.get("input_tokens", usage.get("prompt_tokens", 0)) or 0),
+            "output_tokens": int(usage.get("output_tokens", usage.get("completion_tokens", 0)) or 0),
+        } if isinstance(usage, dict) else {"input_tokens": 0, "output_tokens": 0}
         # 带思考（reasoning）的模型 content 可能为空或缺失，兜底为空串，
         # 解析失败时由调用方回退常规阈值规则，避免 extract_text_content 收到空值报错
-        return LLMHelper.extract_text_content(getattr(response, "content", response)) or ""
+        return LLMHelper.extract_text_content(getattr(response, "content", response)) or "", tokens
 
     def _ai_background_check(self, seq: int):
         """
@@ -1639,6 +1875,17 @@ class QbUploadLimiter(_PluginBase):
             f"种子列表：\n{seed_lines}"
         )
 
+    @staticmethod
+    def _ai_fingerprint(ratio: float, speed: float, site_ratio: Optional[float]) -> str:
+        """
+        计算种子 AI 决策特征指纹：种子分享率按 0.5 分桶、上传速度按 KB/s 的 2 的幂分桶、
+        站点账号分享率按 0.5 分桶；指纹不变时沿用上次决策，不再发送给大模型。
+        """
+        ratio_bucket = int(max(ratio, 0) // 0.5)
+        speed_bucket = int(math.log2(max(speed, 0) / 1024 + 1))
+        site_bucket = "-" if site_ratio is None else str(int(max(site_ratio, 0) // 0.5))
+        return f"{ratio_bucket}:{speed_bucket}:{site_bucket}"
+
     def _ai_evaluate(self, service_name: str, torrents: List[Any], downloader_type: str,
                      site_ratios: Dict[str, float], now: float) -> Dict[str, Dict[str, Any]]:
         """
@@ -1646,38 +1893,40 @@ class QbUploadLimiter(_PluginBase):
         返回本轮生效的决策 {种子Hash: 决策}。
 
         按 _ai_eval_interval 限频调用大模型：限频期内直接复用现有决策缓存；
-        大模型调用失败/超时/输出解析失败时返回空字典（本轮回退常规阈值规则），
+        到期评估时，特征指纹（分享率、上传速度、站点账号分享率分桶）未变化且未超过
+        _AI_DECISION_MAX_AGE 的种子沿用上次决策，仅把指纹变化的种子按 _AI_CHUNK_SIZE
+        分块并发发送给大模型，并记录每个分块的耗时与 token 用量。
+        全部分块调用失败/超时/输出解析失败时返回空字典（本轮回退常规阈值规则），
         已成功的决策仍保留在缓存中供后续轮次使用。休眠种子不参与评估。
         """
         decisions = self._ai_decisions.setdefault(service_name, {})
         canceled = self._canceled_hashes.get(service_name, set())
         items: List[dict] = []
-        index_map: Dict[int, str] = {}
         for torrent in torrents:
             torrent_hash = self._torrent_hash(torrent, downloader_type)
             if not torrent_hash or torrent_hash in canceled:
                 continue
             if not self._is_torrent_active(service_name, torrent, downloader_type, torrent_hash):
                 continue
+            site_ratio = self._torrent_site_ratio(torrent, downloader_type, site_ratios)
             # 账号分享率门槛：门槛>0 时，站点账号分享率未达标（或查不到）的种子不参与 AI 决策，
             # 回退常规阈值规则；高分享率账号（很安全）才交给 AI 限速减上行流量，规避家宽被运营商限速
             if self._ai_site_ratio_threshold > 0:
-                site_ratio = self._torrent_site_ratio(torrent, downloader_type, site_ratios)
                 if site_ratio is None or site_ratio < self._ai_site_ratio_threshold:
                     continue
-            index = len(items)
+            ratio = self._torrent_ratio(torrent, downloader_type)
+            speed = self._torrent_upload_speed(torrent, downloader_type)
             items.append({
-                "index": index,
                 "hash": torrent_hash,
+                "fingerprint": self._ai_fingerprint(ratio, speed, site_ratio),
                 "site": self._torrent_site(torrent, downloader_type),
-                "ratio": self._torrent_ratio(torrent, downloader_type),
+                "ratio": ratio,
                 "uploaded": self._format_bytes(self._torrent_uploaded(torrent, downloader_type)),
                 "downloaded": self._format_bytes(self._torrent_downloaded(torrent, downloader_type)),
-                "speed": f"{self._torrent_upload_speed(torrent, downloader_type) / 1024:.1f} KB/s",
+                "speed": f"{speed / 1024:.1f} KB/s",
                 "window_upload": self._format_bytes(self._window_upload_delta(service_name, torrent, downloader_type, torrent_hash)),
                 "current_limit": self._torrent_current_limit_kb(torrent, downloader_type),
             })
-            index_map[index] = torrent_hash
         if not items:
             return {}
         # 系统设置未配置大模型：降频重试探测（补配置后无需重新保存插件即可自动恢复），
@@ -1695,9 +1944,10 @@ class QbUploadLimiter(_PluginBase):
         # 丢弃已过期（超过一个评估间隔未刷新）的旧决策，避免种子长时间休眠后
         # 重新活跃时命中陈旧结论（此类种子会回退阈值规则兜底，等下次评估刷新）
         if now - self._last_ai_eval_at < self._ai_eval_interval:
+            active_hashes = {item["hash"] for item in items}
             fresh: Dict[str, dict] = {}
             for torrent_hash, decision in decisions.items():
-                if torrent_hash not in index_map.values():
+                if torrent_hash not in active_hashes:
                     continue
                 try:
                     ts = float(decision.get("ts") or 0)
@@ -1710,22 +1960,82 @@ class QbUploadLimiter(_PluginBase):
         max_limit = self._ai_max_limit if self._ai_max_limit > 0 else self._upload_limit
         if max_limit <= 0:
             return {}
-        prompt = self._build_ai_prompt(items, self._build_site_ratio_lines(site_ratios), max_limit)
-        try:
-            text = self._ai_invoke(prompt)
-        except Exception as err:
-            logger.warning(f"{self.LOG_TAG}AI 智能限速调用大模型失败：{err}，本轮回退常规阈值限速")
-            return {}
-        parsed = self._parse_ai_result(text, index_map, max_limit)
+        # 指纹未变化的种子沿用上次决策并刷新时间戳，仅指纹变化（或决策过旧）的种子发送给大模型
+        reused: Dict[str, dict] = {}
+        changed: List[dict] = []
+        for item in items:
+            decision = decisions.get(item["hash"])
+            try:
+                decided_at = float((decision or {}).get("decided_at") or 0)
+            except (TypeError, ValueError):
+                decided_at = 0.0
+            if (
+                decision
+                and decision.get("fingerprint") == item["fingerprint"]
+                and now - decided_at < self._AI_DECISION_MAX_AGE
+            ):
+                decision["ts"] = now
+                reused[item["hash"]] = decision
+            else:
+                changed.append(item)
+        metrics = {"at": now, "sent": len(changed), "reused": len(reused), "chunks": []}
+        self._ai_metrics[service_name] = metrics
+        if not changed:
+            self._last_ai_eval_at = now
+            logger.info(f"{self.LOG_TAG}[{service_name}] AI 评估：{len(reused)} 个种子特征未变化，沿用上次决策")
+            return reused
+        site_lines = self._build_site_ratio_lines(site_ratios)
+        chunks = [changed[i:i + self._AI_CHUNK_SIZE] for i in range(0, len(changed), self._AI_CHUNK_SIZE)]
+        with ThreadPoolExecutor(
+            max_workers=min(self._AI_MAX_WORKERS, len(chunks)), thread_name_prefix="QbUploadLimiterAI"
+        ) as executor:
+            results = list(executor.map(
+                lambda chunk: self._ai_evaluate_chunk(chunk, site_lines, max_limit), chunks
+            ))
+        parsed: Dict[str, dict] = {}
+        for chunk_parsed, chunk_metrics in results:
+            parsed.update(chunk_parsed)
+            metrics["chunks"].append(chunk_metrics)
+        logger.info(
+            f"{self.LOG_TAG}[{service_name}] AI 评估：发送 {len(changed)} 个种子（{len(chunks)} 个分块），"
+            f"沿用 {len(reused)} 个；最长分块耗时 {max(c['latency_ms'] for c in metrics['chunks'])} ms，"
+            f"输入 {sum(c['input_tokens'] for c in metrics['chunks'])} / "
+            f"输出 {sum(c['output_tokens'] for c in metrics['chunks'])} tokens"
+        )
         if not parsed:
-            logger.warning(f"{self.LOG_TAG}AI 智能限速输出解析失败，本轮回退常规阈值限速")
+            logger.warning(f"{self.LOG_TAG}AI 智能限速全部分块调用或解析失败，本轮回退常规阈值限速")
             return {}
         self._last_ai_eval_at = now
         self._ai_active = True
+        fingerprints = {item["hash"]: item["fingerprint"] for item in changed}
         for torrent_hash, decision in parsed.items():
             decision["ts"] = now
+            decision["decided_at"] = now
+            decision["fingerprint"] = fingerprints.get(torrent_hash)
             decisions[torrent_hash] = decision
-        return parsed
+        return {**reused, **parsed}
+
+    def _ai_evaluate_chunk(
+        self, chunk: List[dict], site_lines: str, max_limit: int
+    ) -> Tuple[Dict[str, dict], Dict[str, Any]]:
+        """评估单个分块：分块内序号从 0 编号，返回 (解析出的决策, 分块耗时与 token 统计)。"""
+        items = [{**item, "index": index} for index, item in enumerate(chunk)]
+        index_map = {item["index"]: item["hash"] for item in items}
+        chunk_metrics = {"size": len(items), "latency_ms": 0, "input_tokens": 0, "output_tokens": 0, "ok": False}
+        started = time.perf_counter()
+        try:
+            text, tokens = self._ai_invoke_with_usage(self._build_ai_prompt(items, site_lines, max_limit))
+        except Exception as err:
+            chunk_metrics["latency_ms"] = int((time.perf_counter() - started) * 1000)
+            logger.warning(f"{self.LOG_TAG}AI 智能限速调用大模型失败（{len(items)} 个种子）：{err}")
+            return {}, chunk_metrics
+        chunk_metrics.update(tokens)
+        chunk_metrics["latency_ms"] = int((time.perf_counter() - started) * 1000)
+        parsed = self._parse_ai_result(text, index_map, max_limit)
+        if not parsed:
+            logger.warning(f"{self.LOG_TAG}AI 智能限速输出解析失败（{len(items)} 个种子）")
+        chunk_metrics["ok"] = bool(parsed)
+        return parsed, chunk_metrics
 
     def _build_ai_limits(
         self,
@@ -1777,17 +2087,18 @@ class QbUploadLimiter(_PluginBase):
         """
         limited = self._limited_hashes.get(service_name, set())
         restore = self._restore_hashes.get(service_name, set())
+        hashes = [torrent_hash for torrent_hash in unlimit_hashes if torrent_hash in limited]
+        if not hashes:
+            return 0
+        try:
+            if not self._bulk_change_upload_limit(downloader, hashes, 0):
+                logger.warning(f"{self.LOG_TAG}[{service_name}] {len(hashes)} 个种子 AI 解限失败：下载器返回失败")
+                return 0
+        except Exception as err:
+            logger.error(f"{self.LOG_TAG}[{service_name}] {len(hashes)} 个种子 AI 解限失败：{err}")
+            return 0
         count = 0
-        for torrent_hash in unlimit_hashes:
-            if torrent_hash not in limited:
-                continue
-            try:
-                if not downloader.change_torrent(hash_string=torrent_hash, upload_limit=0):
-                    logger.warning(f"{self.LOG_TAG}[{service_name}] 种子 [{torrent_hash}] AI 解限失败：下载器返回失败")
-                    continue
-            except Exception as err:
-                logger.error(f"{self.LOG_TAG}[{service_name}] 种子 [{torrent_hash}] AI 解限失败：{err}")
-                continue
+        for torrent_hash in hashes:
             limited.discard(torrent_hash)
             restore.discard(torrent_hash)
             self._limited_times.get(service_name, {}).pop(torrent_hash, None)
@@ -2542,16 +2853,17 @@ class QbUploadLimiter(_PluginBase):
             downloader = service_info.instance
             hashes = self._restore_hashes.get(service_name) or set()
             failed_hashes = set()
-            for torrent_hash in hashes:
+            if hashes:
+                # 全部待恢复种子一次请求恢复不限速，失败时整组保留待重试
                 try:
-                    if not downloader.change_torrent(hash_string=torrent_hash, upload_limit=0):
-                        failed_hashes.add(torrent_hash)
-                        logger.error(f"{self.LOG_TAG}[{service_name}] 恢复种子 [{torrent_hash}] 上传限速失败：下载器返回失败")
-                        continue
-                    logger.info(f"{self.LOG_TAG}[{service_name}] 种子 [{torrent_hash}] 已恢复不限速")
+                    if self._bulk_change_upload_limit(downloader, sorted(hashes), 0):
+                        logger.info(f"{self.LOG_TAG}[{service_name}] {len(hashes)} 个种子已恢复不限速")
+                    else:
+                        failed_hashes = set(hashes)
+                        logger.error(f"{self.LOG_TAG}[{service_name}] 恢复 {len(hashes)} 个种子上传限速失败：下载器返回失败")
                 except Exception as err:
-                    failed_hashes.add(torrent_hash)
-                    logger.error(f"{self.LOG_TAG}[{service_name}] 恢复种子 [{torrent_hash}] 上传限速失败：{err}")
+                    failed_hashes = set(hashes)
+                    logger.error(f"{self.LOG_TAG}[{service_name}] 恢复 {len(hashes)} 个种子上传限速失败：{err}")
             # 仅移除确认恢复成功的记录，失败项保留以便后续重试
             if failed_hashes:
                 self._restore_hashes[service_name] = failed_hashes
@@ -2663,18 +2975,15 @@ class QbUploadLimiter(_PluginBase):
         )
         if not pending:
             return
-        succeeded = set()
-        for torrent_hash in pending:
-            try:
-                if not downloader.change_torrent(hash_string=torrent_hash, upload_limit=0):
-                    logger.error(f"{self.LOG_TAG}[{service_name}] 兜底恢复种子 [{torrent_hash}] 上传限速失败：下载器返回失败")
-                    continue
-                succeeded.add(torrent_hash)
-                logger.info(f"{self.LOG_TAG}[{service_name}] 种子 [{torrent_hash}] 已兜底恢复不限速")
-            except Exception as err:
-                logger.error(f"{self.LOG_TAG}[{service_name}] 兜底恢复种子 [{torrent_hash}] 上传限速失败：{err}")
-        if succeeded:
-            self._restore_hashes.get(service_name, set()).difference_update(succeeded)
+        try:
+            if not self._bulk_change_upload_limit(downloader, sorted(pending), 0):
+                logger.error(f"{self.LOG_TAG}[{service_name}] 兜底恢复 {len(pending)} 个种子上传限速失败：下载器返回失败")
+                return
+        except Exception as err:
+            logger.error(f"{self.LOG_TAG}[{service_name}] 兜底恢复 {len(pending)} 个种子上传限速失败：{err}")
+            return
+        self._restore_hashes.get(service_name, set()).difference_update(pending)
+        logger.info(f"{self.LOG_TAG}[{service_name}] {len(pending)} 个种子已兜底恢复不限速")
 
     def _retry_all_stuck_restores(self):
         """
@@ -1,7 +1,9 @@
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 from pathlib import Path
-from threading import Event
+from threading import Event, Lock
 from typing import Any, List, Dict, Tuple, Optional, Union
 
 import pytz
@@ -16,10 +18,39 @@ from app.log import logger
 from app.modules.qbittorrent import Qbittorrent
 from app.modules.transmission import Transmission
 from app.plugins import _PluginBase
+from app.plugins.torrenttransfer.torrent_filter import TorrentFilter
 from app.schemas import NotificationType, ServiceInfo
 from app.utils.string import StringUtils
 
 
+class RateLimiter:
+    """
+    限制向目的下载器添加任务的速率，rate为每秒添加数，0为不限制
+    """
+
+    def __init__(self, rate: float = 0):
+        self._interval = 1 / rate if rate and rate > 0 else 0
+        self._next = 0.0
+        self._lock = Lock()
+
+    def acquire(self, event: Optional[Event] = None) -> bool:
+        """
+        等待到允许添加的时间，退出事件触发时返回False
+        """
+        if not self._interval:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next - now
+            self._next = max(self._next, now) + self._interval
+        if wait <= 0:
+            return True
+        if event:
+            return not event.wait(wait)
+        time.sleep(wait)
+        return True
+
+
 class TorrentTransfer(_PluginBase):
     # 插件名称
     plugin_name = "自动转移做种"
@@ -28,7 +59,7 @@ class TorrentTransfer(_PluginBase):
     # 插件图标
     plugin_icon = "seed.png"
     # 插件版本
-    plugin_version = "1.10.3"
+    plugin_version = "1.11.1"
     # 插件作者
     plugin_author = "jxxghp"
     # 作者主页
@@ -70,8 +101,26 @@ class TorrentTransfer(_PluginBase):
     # 待检查种子清单
     _recheck_torrents = {}
     _is_recheck_running = False
+    _recheck_lock = Lock()
     # 任务标签
     _torrent_tags = []
+    # 预编译的路径、标签与分类过滤规则
+    _filter = TorrentFilter()
+    # 并发转移线程数
+    _transfer_workers = 4
+    # 目的下载器每秒添加任务数，0为不限制
+    _add_rate = 2.0
+    # 各目的下载器的添加限速器
+    _limiters: Dict[str, RateLimiter] = {}
+    # 批量查询目的下载器已有种子时每批的数量
+    _query_chunk_size = 200
+    # QB校验请求合并发送的数量
+    _recheck_batch_size = 50
+    # 每处理多少个种子保存一次进度
+    _progress_save_interval = 20
+    # 转移进度与统计数据的插件数据键
+    _progress_key = "transfer_progress"
+    _metrics_key = "transfer_metrics"
 
     def init_plugin(self, config: dict = None):
 
@@ -99,6 +148,13 @@ class TorrentTransfer(_PluginBase):
             self._torrent_tags = self._add_torrent_tags.strip().split(",") if self._add_torrent_tags else []
             self._remainoldcat = config.get("remainoldcat")
             self._remainoldtag = config.get("remainoldtag")
+            self._transfer_workers = self.__to_number(config.get("transfer_workers"), 4, int)
+            self._add_rate = self.__to_number(config.get("add_rate"), 2.0, float)
+        self._limiters = {}
+        self._filter = TorrentFilter(nopaths=self._nopaths,
+                                     nolabels=self._nolabels,
+                                     includelabels=self._includelabels,
+                                     includecategory=self._includecategory)
 
         # 停止现有任务
         self.stop_service()
@@ -133,6 +189,18 @@ class TorrentTransfer(_PluginBase):
                 self._scheduler.print_jobs()
                 self._scheduler.start()
 
+    @staticmethod
+    def __to_number(value: Any, default: Union[int, float], cast: type) -> Union[int, float]:
+        """
+        解析数字配置，未配置或格式错误时使用默认值
+        """
+        if value is None or value == "":
+            return default
+        try:
+            return max(cast(value), 0)
+        except (TypeError, ValueError):
+            return default
+
     @staticmethod
     def service_info(name: str) -> Optional[ServiceInfo]:
         """
@@ -469,6 +537,45 @@ class TorrentTransfer(_PluginBase):
                             }
                         ]
                     },
+                    {
+                        'component': 'VRow',
+                        'content': [
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 6
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'transfer_workers',
+                                            'label': '并发转移数',
+                                            'placeholder': '同时读取和添加的种子数，1为逐个转移'
+                                        }
+                                    }
+                                ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 6
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'add_rate',
+                                            'label': '目的下载器添加速率(个/秒)',
+                                            'placeholder': '0为不限制'
+                                        }
+                                    }
+                                ]
+                            }
+                        ]
+                    },
                     {
                         'component': 'VRow',
                         'content': [
@@ -590,11 +697,35 @@ class TorrentTransfer(_PluginBase):
             "transferemptylabel": False,
             "add_torrent_tags": "已整理,转移做种",
             "remainoldcat": False,
-            "remainoldtag": False
+            "remainoldtag": False,
+            "transfer_workers": 4,
+            "add_rate": 2
         }
 
-    def get_page(self) -> List[dict]:
-        pass
+    def get_page(self) -> Optional[List[dict]]:
+        """
+        展示最近一次转移的吞吐量统计，没有转移记录时不显示详情页
+        """
+        metrics = self.get_data(self._metrics_key)
+        if not metrics:
+            return None
+        progress = self.get_data(self._progress_key) or {}
+        text = (f"最近一次转移（{metrics.get('updated')}）：总数 {metrics.get('total')}，"
+                f"成功 {metrics.get('success')}，失败 {metrics.get('fail')}，跳过 {metrics.get('skip')}，"
+                f"删除重复 {metrics.get('del_dup')}；耗时 {metrics.get('elapsed')} 秒，"
+                f"吞吐量 {metrics.get('speed')} 个/分钟，校验队列 {metrics.get('recheck_queue')} 个")
+        if progress.get("done"):
+            text += f"；未完成任务已保存进度 {len(progress.get('done'))} 个，下次运行时继续"
+        return [
+            {
+                'component': 'VAlert',
+                'props': {
+                    'type': 'info',
+                    'variant': 'tonal',
+                    'text': text
+                }
+            }
+        ]
 
     def __validate_config(self) -> bool:
         """
@@ -612,14 +743,14 @@ class TorrentTransfer(_PluginBase):
         return True
 
     def __download(self, service: ServiceInfo, content: bytes,
-                   save_path: str, torrent: TorrentDictionary) -> Optional[str]:
+                   save_path: str, torrent: TorrentDictionary,
+                   from_service: ServiceInfo) -> Optional[str]:
         """
         添加下载任务
         """
         if not service or not service.instance:
             return
         downloader = service.instance
-        from_service = self.service_info(self._fromdownloader)
         downloader_helper = DownloaderHelper()
         if downloader_helper.is_downloader("qbittorrent", service=service):
             # 生成随机Tag
@@ -706,16 +837,10 @@ class TorrentTransfer(_PluginBase):
             # 获取保存路径
             save_path = self.__get_save_path(torrent, from_service.type)
 
-            if self._nopaths and save_path:
-                # 过滤不需要转移的路径
-                nopath_skip = False
-                for nopath in self._nopaths.split('\n'):
-                    if os.path.normpath(save_path).startswith(os.path.normpath(nopath)):
-                        logger.info(f"种子 {hash_str} 保存路径 {save_path} 不需要转移，跳过 ...")
-                        nopath_skip = True
-                        break
-                if nopath_skip:
-                    continue
+            # 过滤不需要转移的路径
+            if self._filter.excluded_path(save_path):
+                logger.info(f"种子 {hash_str} 保存路径 {save_path} 不需要转移，跳过 ...")
+                continue
 
             # 获取种子标签
             torrent_labels = self.__get_label(torrent, from_service.type)
@@ -726,37 +851,25 @@ class TorrentTransfer(_PluginBase):
             if is_torrent_labels_empty:
                 torrent_labels = []
 
-            # 如果分类项存在数值，则进行判断
-            if self._includecategory:
-                # 排除未标记的分类
-                if torrent_category not in self._includecategory.split(','):
-                    logger.info(f"种子 {hash_str} 不含有转移分类 {self._includecategory}，跳过 ...")
-                    continue
+            # 排除未标记的分类
+            if not self._filter.category_allowed(torrent_category):
+                logger.info(f"种子 {hash_str} 不含有转移分类 {self._includecategory}，跳过 ...")
+                continue
             # 根据设置决定是否转移无标签的种子
             if is_torrent_labels_empty:
                 if not self._transferemptylabel:
                     continue
             else:
                 # 排除含有不转移的标签
-                if self._nolabels:
-                    is_skip = False
-                    for label in self._nolabels.split(','):
-                        if label in torrent_labels:
-                            logger.info(f"种子 {hash_str} 含有不转移标签 {label}，跳过 ...")
-                            is_skip = True
-                            break
-                    if is_skip:
-                        continue
+                label = self._filter.excluded_label(torrent_labels)
+                if label:
+                    logger.info(f"种子 {hash_str} 含有不转移标签 {label}，跳过 ...")
+                    continue
                 # 排除不含有转移标签的种子
-                if self._includelabels:
-                    is_skip = False
-                    for label in self._includelabels.split(','):
-                        if label not in torrent_labels:
-                            logger.info(f"种子 {hash_str} 不含有转移标签 {label}，跳过 ...")
-                            is_skip = True
-                            break
-                    if is_skip:
-                        continue
+                label = self._filter.missing_label(torrent_labels)
+                if label:
+                    logger.info(f"种子 {hash_str} 不含有转移标签 {label}，跳过 ...")
+                    continue
 
             # 添加转移数据
             trans_torrents.append({
@@ -768,168 +881,268 @@ class TorrentTransfer(_PluginBase):
         # 开始转移任务
         if trans_torrents:
             logger.info(f"需要转移的种子数：{len(trans_torrents)}")
-            # 记数
-            total = len(trans_torrents)
-            # 总成功数
-            success = 0
-            # 总失败数
-            fail = 0
-            # 跳过数
-            skip = 0
-            # 删除重复数
-            del_dup = 0
-
-            downloader_helper = DownloaderHelper()
-            for torrent_item in trans_torrents:
-                # 检查种子文件是否存在
-                torrent_file = Path(self._fromtorrentpath) / f"{torrent_item.get('hash')}.torrent"
-                if not torrent_file.exists():
-                    logger.error(f"种子文件不存在：{torrent_file}")
-                    # 失败计数
-                    fail += 1
-                    continue
+            self.__transfer_torrents(trans_torrents=trans_torrents,
+                                     from_service=from_service,
+                                     to_service=to_service)
+        else:
+            logger.info(f"没有需要转移的种子")
+        logger.info("转移做种任务执行完成")
 
-                # 查询hash值是否已经在目的下载器中
-                torrent_info, _ = to_downloader.get_torrents(ids=[torrent_item.get('hash')])
-                if torrent_info:
-                    # 删除重复的源种子，不能删除文件！
-                    if self._deleteduplicate:
-                        logger.info(f"删除重复的源下载器任务（不含文件）：{torrent_item.get('hash')} ...")
-                        from_downloader.delete_torrents(delete_file=False, ids=[torrent_item.get('hash')])
-                        del_dup += 1
+    def __transfer_torrents(self, trans_torrents: List[dict], from_service: ServiceInfo, to_service: ServiceInfo):
+        """
+        流水线转移种子：批量查询目的下载器已有种子后，由多个线程并发读取种子文件并按限速添加到目的下载器，
+        QB的校验请求按批次合并发送，进度定期保存以便中断后继续
+        """
+        from_downloader: Union[Qbittorrent, Transmission] = from_service.instance
+        to_downloader: Union[Qbittorrent, Transmission] = to_service.instance
+        downloader_helper = DownloaderHelper()
+        to_qbittorrent = downloader_helper.is_downloader("qbittorrent", service=to_service)
+
+        # 读取上次未完成的进度，已完成的种子不再处理
+        done = self.__load_progress(from_service.name, to_service.name)
+        if done:
+            logger.info(f"继续上次未完成的转移任务，已完成 {len(done)} 个种子")
+        pending = [item for item in trans_torrents if item.get("hash") not in done]
+
+        # 分批查询目的下载器中已存在的种子，避免逐个查询
+        exist_hashes = set()
+        pending_hashes = [item.get("hash") for item in pending]
+        for i in range(0, len(pending_hashes), self._query_chunk_size):
+            torrents, _ = to_downloader.get_torrents(ids=pending_hashes[i:i + self._query_chunk_size])
+            for torrent in torrents or []:
+                exist_hashes.add(self.__get_hash(torrent, to_service.type))
+
+        limiter = self._limiters.get(to_service.name)
+        if not limiter:
+            limiter = RateLimiter(self._add_rate)
+            self._limiters[to_service.name] = limiter
+        lock = Lock()
+        counts = {"success": 0, "fail": 0, "skip": 0, "del_dup": 0}
+        recheck_ids: List[str] = []
+        started = time.time()
+
+        def flush_recheck(force: bool = False):
+            """
+            合并发送QB校验请求
+            """
+            with lock:
+                if not recheck_ids or (not force and len(recheck_ids) < self._recheck_batch_size):
+                    return
+                batch = recheck_ids[:]
+                recheck_ids.clear()
+            logger.info(f"qbittorrent 开始校验 {len(batch)} 个种子 ...")
+            to_downloader.recheck_torrents(ids=batch)
+
+        def handle(torrent_item: dict):
+            """
+            处理单个种子，返回处理结果
+            """
+            if self._event.is_set():
+                return None
+            torrent_hash = torrent_item.get("hash")
+            if torrent_hash in exist_hashes:
+                # 删除重复的源种子，不能删除文件！
+                if self._deleteduplicate:
+                    logger.info(f"删除重复的源下载器任务（不含文件）：{torrent_hash} ...")
+                    from_downloader.delete_torrents(delete_file=False, ids=[torrent_hash])
+                    return "del_dup"
+                logger.info(f"{torrent_hash} 已在目的下载器中，跳过 ...")
+                return "skip"
+            download_id = self.__transfer_torrent(torrent_item=torrent_item,
+                                                  from_service=from_service,
+                                                  to_service=to_service,
+                                                  limiter=limiter)
+            if not download_id:
+                return "fail"
+            # TR会自动校验，QB需要手动校验
+            if to_qbittorrent:
+                if self._skipverify:
+                    if self._autostart:
+                        logger.info(f"{download_id} 跳过校验，开启自动开始，注意观察种子的完整性")
+                        self.__add_recheck_torrents(to_service, download_id)
                     else:
-                        logger.info(f"{torrent_item.get('hash')} 已在目的下载器中，跳过 ...")
-                        # 跳过计数
-                        skip += 1
+                        logger.info(f"{download_id} 跳过校验，请自行检查手动开始任务...")
+                else:
+                    with lock:
+                        recheck_ids.append(download_id)
+                    self.__add_recheck_torrents(to_service, download_id)
+                    flush_recheck()
+            else:
+                self.__add_recheck_torrents(to_service, download_id)
+            # 删除源种子，不能删除文件！
+            if self._deletesource:
+                logger.info(f"删除源下载器任务（不含文件）：{torrent_hash} ...")
+                from_downloader.delete_torrents(delete_file=False, ids=[torrent_hash])
+            # 插入转种记录
+            self.save_data(key=f"{from_service.name}-{torrent_hash}",
+                           value={
+                               "to_download": to_service.name,
+                               "to_download_id": download_id,
+                               "delete_source": self._deletesource,
+                               "delete_duplicate": self._deleteduplicate,
+                           })
+            return "success"
+
+        finished = 0
+        with ThreadPoolExecutor(max_workers=max(self._transfer_workers, 1)) as executor:
+            futures = {executor.submit(handle, item): item.get("hash") for item in pending}
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                except Exception as err:
+                    logger.error(f"转移种子 {futures[future]} 出错：{str(err)}")
+                    result = "fail"
+                if not result:
                     continue
+                counts[result] += 1
+                if result != "fail":
+                    done.add(futures[future])
+                finished += 1
+                if finished % self._progress_save_interval == 0:
+                    self.__save_progress(from_service.name, to_service.name, done)
+                    self.__update_metrics(total=len(trans_torrents), counts=counts, started=started)
+        flush_recheck(force=True)
+
+        if self._event.is_set():
+            logger.info(f"转移服务停止，已保存进度，下次运行时继续")
+            self.__save_progress(from_service.name, to_service.name, done)
+        else:
+            self.del_data(key=self._progress_key)
+        metrics = self.__update_metrics(total=len(trans_torrents), counts=counts, started=started)
+        logger.info(f"转移完成：{metrics.get('speed')} 个/分钟，校验队列 {metrics.get('recheck_queue')} 个")
+
+        # 触发校验任务
+        if counts["success"] > 0 and self._autostart:
+            self.check_recheck()
+
+        # 发送通知
+        if self._notify:
+            self.post_message(
+                mtype=NotificationType.SiteMessage,
+                title="【转移做种任务执行完成】",
+                text=f"总数：{len(trans_torrents)}，成功：{counts['success']}，失败：{counts['fail']}，"
+                     f"跳过：{counts['skip']}，删除重复：{counts['del_dup']}"
+            )
+
+    def __transfer_torrent(self, torrent_item: dict, from_service: ServiceInfo, to_service: ServiceInfo,
+                           limiter: "RateLimiter") -> Optional[str]:
+        """
+        读取种子文件并添加到目的下载器，返回目的下载器中的任务ID
+        """
+        torrent_hash = torrent_item.get("hash")
+        # 检查种子文件是否存在
+        torrent_file = Path(self._fromtorrentpath) / f"{torrent_hash}.torrent"
+        if not torrent_file.exists():
+            logger.error(f"种子文件不存在：{torrent_file}")
+            return None
 
-                # 转换保存路径
-                download_dir = self.__convert_save_path(torrent_item.get('save_path'),
-                                                        self._frompath,
-                                                        self._topath)
-                if not download_dir:
-                    logger.error(f"转换保存路径失败：{torrent_item.get('save_path')}")
-                    # 失败计数
-                    fail += 1
-                    continue
+        # 转换保存路径
+        download_dir = self.__convert_save_path(torrent_item.get('save_path'),
+                                                self._frompath,
+                                                self._topath)
+        if not download_dir:
+            logger.error(f"转换保存路径失败：{torrent_item.get('save_path')}")
+            return None
 
-                # 如果源下载器是QB检查是否有Tracker，没有的话额外获取
-                if downloader_helper.is_downloader("qbittorrent", service=from_service):
-                    # 读取种子内容、解析种子文件
-                    content = torrent_file.read_bytes()
-                    if not content:
-                        logger.warn(f"读取种子文件失败：{torrent_file}")
-                        fail += 1
-                        continue
+        # 读取种子内容，只读取一次
+        content = torrent_file.read_bytes()
+        if not content:
+            logger.warn(f"读取种子文件失败：{torrent_file}")
+            return None
+
+        # 如果源下载器是QB检查是否有Tracker，没有的话从fastresume补充
+        if DownloaderHelper().is_downloader("qbittorrent", service=from_service):
+            try:
+                torrent_main = bdecode(content)
+                main_announce = torrent_main.get('announce')
+            except Exception as err:
+                logger.warn(f"解析种子文件 {torrent_file} 失败：{str(err)}")
+                return None
+
+            if not main_announce:
+                logger.info(f"{torrent_hash} 未发现tracker信息，尝试补充tracker信息...")
+                # 读取fastresume文件
+                fastresume_file = Path(self._fromtorrentpath) / f"{torrent_hash}.fastresume"
+                if not fastresume_file.exists():
+                    logger.warn(f"fastresume文件不存在：{fastresume_file}")
+                    return None
+                # 尝试补充trackers
+                try:
+                    # 解析fastresume文件
+                    torrent_fastresume = bdecode(fastresume_file.read_bytes())
                     # 读取trackers
-                    try:
-                        torrent_main = bdecode(content)
-                        main_announce = torrent_main.get('announce')
-                    except Exception as err:
-                        logger.warn(f"解析种子文件 {torrent_file} 失败：{str(err)}")
-                        fail += 1
-                        continue
-
-                    if not main_announce:
-                        logger.info(f"{torrent_item.get('hash')} 未发现tracker信息，尝试补充tracker信息...")
-                        # 读取fastresume文件
-                        fastresume_file = Path(self._fromtorrentpath) / f"{torrent_item.get('hash')}.fastresume"
-                        if not fastresume_file.exists():
-                            logger.warn(f"fastresume文件不存在：{fastresume_file}")
-                            fail += 1
-                            continue
-                        # 尝试补充trackers
-                        try:
-                            # 解析fastresume文件
-                            fastresume = fastresume_file.read_bytes()
-                            torrent_fastresume = bdecode(fastresume)
-                            # 读取trackers
-                            fastresume_trackers = torrent_fastresume.get('trackers')
-                            if isinstance(fastresume_trackers, list) \
-                                    and len(fastresume_trackers) > 0 \
-                                    and fastresume_trackers[0]:
-                                # 重新赋值
-                                torrent_main['announce'] = fastresume_trackers[0][0]
-                                # 保留其他tracker，避免单一tracker无法连接
-                                if len(fastresume_trackers) > 1 or len(fastresume_trackers[0]) > 1:
-                                    torrent_main['announce-list'] = fastresume_trackers
-                                # 替换种子文件路径
-                                torrent_file = settings.TEMP_PATH / f"{torrent_item.get('hash')}.torrent"
-                                # 编码并保存到临时文件
-                                torrent_file.write_bytes(bencode(torrent_main))
-                        except Exception as err:
-                            logger.error(f"解析fastresume文件 {fastresume_file} 出错：{str(err)}")
-                            fail += 1
-                            continue
-
-                # 发送到另一个下载器中下载：默认暂停、传输下载路径、关闭自动管理模式
-                logger.info(f"添加转移做种任务到下载器 {to_service.name}：{torrent_file}")
-                download_id = self.__download(service=to_service,
-                                              content=torrent_file.read_bytes(),
-                                              save_path=download_dir,
-                                              torrent=torrent_item.get('torrent'))
-                if not download_id:
-                    # 下载失败
-                    fail += 1
-                    logger.error(f"添加下载任务失败：{torrent_file}")
-                    continue
-                else:
-                    # 下载成功
-                    logger.info(f"成功添加转移做种任务，种子文件：{torrent_file}")
-
-                    # TR会自动校验，QB需要手动校验
-                    if downloader_helper.is_downloader("qbittorrent", service=to_service):
-                        if self._skipverify:
-                            if self._autostart:
-                                logger.info(f"{download_id} 跳过校验，开启自动开始，注意观察种子的完整性")
-                                self.__add_recheck_torrents(to_service, download_id)
-                            else:
-                                # 跳过校验
-                                logger.info(f"{download_id} 跳过校验，请自行检查手动开始任务...")
-                        else:
-                            logger.info(f"qbittorrent 开始校验 {download_id} ...")
-                            to_downloader.recheck_torrents(ids=[download_id])
-                            self.__add_recheck_torrents(to_service, download_id)
-                    else:
-                        self.__add_recheck_torrents(to_service, download_id)
+                    fastresume_trackers = torrent_fastresume.get('trackers')
+                    if isinstance(fastresume_trackers, list) \
+                            and len(fastresume_trackers) > 0 \
+                            and fastresume_trackers[0]:
+                        # 重新赋值
+                        torrent_main['announce'] = fastresume_trackers[0][0]
+                        # 保留其他tracker，避免单一tracker无法连接
+                        if len(fastresume_trackers) > 1 or len(fastresume_trackers[0]) > 1:
+                            torrent_main['announce-list'] = fastresume_trackers
+                        # 直接在内存中重新编码，不再写入临时文件
+                        content = bencode(torrent_main)
+                except Exception as err:
+                    logger.error(f"解析fastresume文件 {fastresume_file} 出错：{str(err)}")
+                    return None
 
-                    # 删除源种子，不能删除文件！
-                    if self._deletesource:
-                        logger.info(f"删除源下载器任务（不含文件）：{torrent_item.get('hash')} ...")
-                        from_downloader.delete_torrents(delete_file=False, ids=[torrent_item.get('hash')])
-
-                    # 成功计数
-                    success += 1
-                    # 插入转种记录
-                    history_key = f"{from_service.name}-{torrent_item.get('hash')}"
-                    self.save_data(key=history_key,
-                                   value={
-                                       "to_download": to_service.name,
-                                       "to_download_id": download_id,
-                                       "delete_source": self._deletesource,
-                                       "delete_duplicate": self._deleteduplicate,
-                                   })
-            # 触发校验任务
-            if success > 0 and self._autostart:
-                self.check_recheck()
-
-            # 发送通知
-            if self._notify:
-                self.post_message(
-                    mtype=NotificationType.SiteMessage,
-                    title="【转移做种任务执行完成】",
-                    text=f"总数：{total}，成功：{success}，失败：{fail}，跳过：{skip}，删除重复：{del_dup}"
-                )
-        else:
-            logger.info(f"没有需要转移的种子")
-        logger.info("转移做种任务执行完成")
+        # 按目的下载器限速后添加：默认暂停、传输下载路径、关闭自动管理模式
+        if not limiter.acquire(self._event):
+            return None
+        logger.info(f"添加转移做种任务到下载器 {to_service.name}：{torrent_file}")
+        download_id = self.__download(service=to_service,
+                                      content=content,
+                                      save_path=download_dir,
+                                      torrent=torrent_item.get('torrent'),
+                                      from_service=from_service)
+        if not download_id:
+            logger.error(f"添加下载任务失败：{torrent_file}")
+            return None
+        logger.info(f"成功添加转移做种任务，种子文件：{torrent_file}")
+        return download_id
+
+    def __load_progress(self, from_name: str, to_name: str) -> set:
+        """
+        读取上次中断的转移进度，源或目的下载器变化时重新开始
+        """
+        progress = self.get_data(self._progress_key) or {}
+        if progress.get("from") != from_name or progress.get("to") != to_name:
+            return set()
+        return set(progress.get("done") or [])
+
+    def __save_progress(self, from_name: str, to_name: str, done: set):
+        """
+        保存转移进度
+        """
+        self.save_data(self._progress_key, {
+            "from": from_name,
+            "to": to_name,
+            "done": list(done),
+            "updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        })
+
+    def __update_metrics(self, total: int, counts: dict, started: float) -> dict:
+        """
+        计算并保存转移吞吐量与校验队列深度
+        """
+        elapsed = max(time.time() - started, 1e-6)
+        handled = counts["success"] + counts["fail"] + counts["del_dup"]
+        metrics = {
+            **counts,
+            "total": total,
+            "elapsed": round(elapsed, 1),
+            "speed": round(handled * 60 / elapsed, 1),
+            "recheck_queue": sum(len(ids) for ids in self._recheck_torrents.values()),
+            "updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        self.save_data(self._metrics_key, metrics)
+        return metrics
 
     def __add_recheck_torrents(self, service: ServiceInfo, download_id: str):
         # 追加校验任务
         logger.info(f"添加校验检查任务：{download_id} ...")
-        if not self._recheck_torrents.get(service.name):
-            self._recheck_torrents[service.name] = []
-        self._recheck_torrents[service.name].append(download_id)
+        with self._recheck_lock:
+            self._recheck_torrents.setdefault(service.name, []).append(download_id)
 
     def check_recheck(self):
         """
@@ -950,7 +1163,7 @@ class TorrentTransfer(_PluginBase):
             return
 
         # 需要检查的种子
-        recheck_torrents = self._recheck_torrents.get(to_service.name, [])
+        recheck_torrents = list(self._recheck_torrents.get(to_service.name, []))
         if not recheck_torrents:
             return
 
@@ -974,9 +1187,13 @@ class TorrentTransfer(_PluginBase):
                 logger.info(f"共 {len(can_seeding_torrents)} 个任务校验完成，开始做种")
                 # 开始做种
                 to_downloader.start_torrents(ids=can_seeding_torrents)
-                # 去除已经处理过的种子
-                self._recheck_torrents[to_service.name] = list(
-                    set(recheck_torrents).difference(set(can_seeding_torrents)))
+                # 去除已经处理过的种子，保留检查期间新加入的任务
+                seeded = set(can_seeding_torrents)
+                with self._recheck_lock:
+                    self._recheck_torrents[to_service.name] = [
+                        torrent_id for torrent_id in self._recheck_torrents.get(to_service.name, [])
+                        if torrent_id not in seeded
+                    ]
             else:
                 logger.info(f"没有新的任务校验完成，将在下次个周期继续检查 ...")
 
@@ -984,7 +1201,11 @@ class TorrentTransfer(_PluginBase):
             logger.info(f"下载器 {to_service.name} 查询校验任务失败，将在下次继续查询 ...")
         else:
             logger.info(f"下载器 {to_service.name} 中没有需要检查的校验任务，清空待处理列表")
-            self._recheck_torrents[to_service.name] = []
+            with self._recheck_lock:
+                self._recheck_torrents[to_service.name] = [
+                    torrent_id for torrent_id in self._recheck_torrents.get(to_service.name, [])
+                    if torrent_id not in recheck_torrents
+                ]
 
         self._is_recheck_running = False
 
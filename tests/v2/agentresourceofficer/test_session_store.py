@@ -0,0 +1,119 @@
+"""AgentResourceOfficer 会话增量持久化与合并写入测试。"""
+
+import time
+
+from app.plugins.agentresourceofficer.session_store import SessionStore
+
+
+class _FakeData:
+    """记录保存与删除调用的内存插件数据。"""
+
+    def __init__(self, initial=None):
+        self.data = dict(initial or {})
+        self.saves = []
+        self.deletes = []
+
+    def save(self, key, value):
+        self.saves.append(key)
+        self.data[key] = value
+
+    def load(self, key):
+        return self.data.get(key)
+
+    def delete(self, key):
+        self.deletes.append(key)
+        self.data.pop(key, None)
+
+
+def _persist_assistant(session_id, payload):
+    """仅持久化智能助手会话和待确认的 115 会话。"""
+    return str(session_id).startswith("assistant::") or bool(payload.get("pending_p115"))
+
+
+def _store(data, **kwargs):
+    """创建绑定到内存数据的会话存储，默认不按时间触发写入。"""
+    options = {"key_prefix": "s", "retention_seconds": 3600, "should_persist": _persist_assistant, "flush_delay": 60}
+    options.update(kwargs)
+    store = SessionStore(**options)
+    store.bind(save=data.save, load=data.load, delete=data.delete)
+    return store
+
+
+def test_only_dirty_persistent_sessions_are_written_once():
+    """只写入需持久化且有变更的会话，同一会话多次修改合并为一次写入。"""
+    data = _FakeData()
+    store = _store(data)
+    now = int(time.time())
+    for index in range(20):
+        store.set("assistant::chat", {"updated_at": now, "n": index})
+        store.set(f"feishu-{index}", {"updated_at": now})
+    assert data.saves == []
+    assert store.flush() == 1
+    assert data.data["s::assistant::chat"]["n"] == 19
+    assert data.data["s_index"] == ["assistant::chat"]
+    assert "s::feishu-0" not in data.data
+    assert store.flush() == 0
+
+    data.saves.clear()
+    store.set("assistant::chat", {"updated_at": now, "n": 20})
+    store.flush()
+    assert data.saves == ["s::assistant::chat"]
+
+
+def test_pop_and_expiry_remove_persisted_rows():
+    """移除或过期的会话应同步删除已持久化的记录与索引。"""
+    data = _FakeData()
+    store = _store(data)
+    now = int(time.time())
+    store.set("assistant::a", {"updated_at": now})
+    store.set("assistant::b", {"updated_at": now - 7200})
+    store.flush()
+    assert "assistant::b" not in store
+    assert "s::assistant::b" not in data.data
+
+    store.pop("assistant::a")
+    store.flush()
+    assert "s::assistant::a" not in data.data
+    assert data.data["s_index"] == []
+
+
+def test_memory_cap_evicts_oldest():
+    """内存会话超出上限时淘汰最早更新的会话。"""
+    data = _FakeData()
+    store = _store(data, max_items=3)
+    now = int(time.time())
+    for index in range(5):
+        store.set(f"chat-{index}", {"updated_at": now + index})
+    assert len(store) == 3
+    assert [session_id for session_id, _ in store.items()] == ["chat-2", "chat-3", "chat-4"]
+
+
+def test_restore_and_legacy_migration():
+    """旧版整字典会话应迁移为逐条存储，并丢弃已过期的会话。"""
+    now = int(time.time())
+    data = _FakeData({
+        "legacy": {
+            "assistant::old": {"updated_at": now, "kind": "assistant"},
+            "assistant::stale": {"updated_at": now - 7200},
+        },
+    })
+    store = _store(data)
+    assert store.restore(legacy_key="legacy") == 1
+    assert "legacy" not in data.data
+    assert data.data["s_index"] == ["assistant::old"]
+
+    restored = _store(data)
+    restored.restore(legacy_key="legacy")
+    assert restored.get("assistant::old")["kind"] == "assistant"
+    assert restored.stats()["dirty"] == 0
+
+
+def test_batch_size_triggers_flush():
+    """待写入会话达到批量上限时应立即写入。"""
+    data = _FakeData()
+    store = _store(data, flush_batch=3)
+    now = int(time.time())
+    for index in range(3):
+        store.set(f"assistant::{index}", {"updated_at": now})
+    assert len(data.data["s_index"]) == 3
+
@@ -0,0 +1,104 @@
+"""AgentResourceOfficer 上游调用分组有界线程池测试。"""
+
+import asyncio
+import threading
+import time
+
+from app.plugins.agentresourceofficer.services.upstream_executor import UpstreamExecutor
+
+
+def test_run_does_not_block_event_loop():
+    """阻塞的上游调用应在线程池中执行，不阻塞事件循环。"""
+    executor = UpstreamExecutor()
+
+    async def main():
+        ticks = []
+
+        async def ticker():
+            for _ in range(5):
+                ticks.append(time.monotonic())
+                await asyncio.sleep(0.02)
+
+        result, _ = await asyncio.gather(
+            executor.run("hdhive", lambda: time.sleep(0.2) or "done"),
+            ticker(),
+        )
+        return result, ticks
+
+    result, ticks = asyncio.run(main())
+    executor.shutdown()
+    assert result == "done"
+    assert len(ticks) == 5
+    assert ticks[-1] - ticks[0] < 0.2
+
+
+def test_per_upstream_limit():
+    """各上游的并发数不超过各自配置的上限。"""
+    executor = UpstreamExecutor(limits={"p115": 1, "quark": 2})
+    lock = threading.Lock()
+    running = {"p115": 0, "quark": 0}
+    peak = {"p115": 0, "quark": 0}
+
+    def call(name):
+        with lock:
+            running[name] += 1
+            peak[name] = max(peak[name], running[name])
+        time.sleep(0.05)
+        with lock:
+            running[name] -= 1
+        return name
+
+    async def main():
+        return await asyncio.gather(
+            *(executor.run("p115", call, "p115") for _ in range(3)),
+            *(executor.run("quark", call, "quark") for _ in range(4)),
+        )
+
+    results = asyncio.run(main())
+    executor.shutdown()
+    assert results.count("p115") == 3
+    assert results.count("quark") == 4
+    assert peak == {"p115": 1, "quark": 2}
+    assert executor.stats()["p115"] == {"limit": 1, "running": 0, "waiting": 0}
+
+
+def test_slow_upstream_does_not_starve_others():
+    """单个上游被占满时，其他上游的调用仍能立即执行。"""
+    executor = UpstreamExecutor(limits={"hdhive": 1})
+    release = threading.Event()
+
+    async def main():
+        slow = asyncio.ensure_future(executor.run("hdhive", release.wait, 2))
+        await asyncio.sleep(0.01)
+        started = time.monotonic()
+        quark = await executor.run("quark", lambda: "quark")
+        elapsed = time.monotonic() - started
+        release.set()
+        await slow
+        return quark, elapsed
+
+    quark, elapsed = asyncio.run(main())
+    executor.shutdown()
+    assert quark == "quark"
+    assert elapsed < 0.5
+
+
+def test_run_with_timeout_and_unknown_upstream():
+    """超时调用抛出 TimeoutError，未配置的上游使用默认线程池。"""
+    executor = UpstreamExecutor()
+
+    async def main():
+        try:
+            await executor.run_with_timeout("p115", time.sleep, 1.5, timeout=1)
+        except asyncio.TimeoutError:
+            timed_out = True
+        else:
+            timed_out = False
+        other = await executor.run("pansou", lambda: threading.current_thread().name)
+        return timed_out, other
+
+    timed_out, thread_name = asyncio.run(main())
+    executor.shutdown()
+    assert timed_out is True
+    assert thread_name.startswith("aro-default")
+
@@ -0,0 +1,122 @@
+"""AutoSignIn V2 签到引擎的并发、超时与重试测试。"""
+
+import threading
+import time
+
+from app.plugins.autosignin.engine import SigninEngine, SiteSessionPool, run_with_session
+from app.plugins.autosignin.sites import current_session
+
+
+def _site(name: str, url: str) -> dict:
+    """构造签到引擎需要的站点信息。"""
+    return {"name": name, "url": url}
+
+
+def test_results_keep_order_and_slow_site_times_out():
+    """慢站点超时后应返回超时信息，其余站点结果按输入顺序返回。"""
+    def task(site):
+        """模拟站点签到，慢站点阻塞超过单站超时。"""
+        if site["name"] == "slow":
+            time.sleep(0.5)
+        return site["name"], "签到成功"
+
+    engine = SigninEngine(concurrency=2, site_timeout=0.1, total_timeout=5)
+    started = time.monotonic()
+    status = engine.run([_site("slow", "https://slow.test/"), _site("a", "https://a.test/"),
+                         _site("b", "https://b.test/")], task, "签到")
+
+    assert time.monotonic() - started < 0.45
+    assert status == [("slow", "签到失败，请求超时！"), ("a", "签到成功"), ("b", "签到成功")]
+
+
+def test_same_domain_runs_serially_and_network_failure_retries():
+    """同一域名的站点不应并发执行，网络类失败应按退避重试一次。"""
+    lock = threading.Lock()
+    running = {"count": 0, "max": 0}
+    attempts = {}
+
+    def task(site):
+        """记录同域名并发数，首次访问 flaky 站点时模拟无法连接。"""
+        with lock:
+            running["count"] += 1
+            running["max"] = max(running["max"], running["count"])
+            attempts[site["name"]] = attempts.get(site["name"], 0) + 1
+        time.sleep(0.05)
+        with lock:
+            running["count"] -= 1
+        if site["name"] == "flaky" and attempts["flaky"] == 1:
+            return site["name"], "签到失败，无法打开网站！"
+        return site["name"], "签到成功"
+
+    engine = SigninEngine(concurrency=4, site_timeout=5, total_timeout=5, retries=1, backoff=0.01)
+    status = engine.run([_site("flaky", "https://same.test/"), _site("other", "https://same.test/attendance.php")],
+                        task, "签到", should_retry=lambda result: "无法打开网站" in result[1])
+
+    assert status == [("flaky", "签到成功"), ("other", "签到成功")]
+    assert attempts == {"flaky": 2, "other": 1}
+    assert running["max"] == 1
+
+
+def test_session_pool_reuses_session_per_domain_without_storing_cookies():
+    """同一站点应复用同一会话，且会话不保存响应下发的 Cookie。"""
+    pool = SiteSessionPool()
+    seen = []
+
+    def task(site):
+        """记录执行期间当前线程的复用会话。"""
+        seen.append(current_session())
+        return site["name"], "签到成功"
+
+    wrapped = run_with_session(pool, task)
+    wrapped(_site("a", "https://a.test/"))
+    wrapped(_site("a", "https://a.test/attendance.php"))
+    wrapped(_site("b", "https://b.test/"))
+
+    assert seen[0] is seen[1] and seen[0] is not seen[2]
+    assert current_session() is None
+    assert seen[0].cookies.get_policy().allowed_domains() == ()
+    pool.close()
+
+
+def test_site_timeout_starts_when_task_starts():
+    """超时站点占满线程池时，排队等待线程的时间不计入后续站点的单站超时。"""
+    def task(site):
+        """慢站点超时后仍占用线程，普通站点很快完成。"""
+        time.sleep(1.0 if site["name"].startswith("slow") else 0.1)
+        return site["name"], "签到成功"
+
+    engine = SigninEngine(concurrency=1, site_timeout=0.3, total_timeout=5)
+    status = engine.run([_site("slow1", "https://slow1.test/"), _site("slow2", "https://slow2.test/"),
+                         _site("c", "https://c.test/")], task, "签到")
+
+    assert status == [("slow1", "签到失败，请求超时！"), ("slow2", "签到失败，请求超时！"), ("c", "签到成功")]
+
+
+def test_session_pool_close_waits_for_running_sites():
+    """关闭连接池时仍在执行的站点继续使用原会话，结束后才关闭，新的连接池互不影响。"""
+    pool = SiteSessionPool()
+    entered, release = threading.Event(), threading.Event()
+    seen = {}
+
+    def task(site):
+        """记录会话后阻塞，模拟超时仍在执行的站点线程。"""
+        seen["session"] = current_session()
+        entered.set()
+        release.wait(2)
+        seen["adapter"] = current_session().get_adapter("https://a.test/")
+        return site["name"], "签到成功"
+
+    worker = threading.Thread(target=run_with_session(pool, task), args=(_site("a", "https://a.test/"),))
+    worker.start()
+    assert entered.wait(2)
+    pool.close()
+    assert pool.get("https://a.test/") is seen["session"]
+
+    other = SiteSessionPool()
+    assert other.get("https://a.test/") is not seen["session"]
+    other.close()
+
+    release.set()
+    worker.join(2)
+    assert seen["adapter"] is not None
+    assert pool._sessions == {}
@@ -0,0 +1,33 @@
+"""AutoSignIn V2 站点签到类索引的分发与按需导入测试。"""
+
+import importlib
+import pkgutil
+import sys
+
+from app.plugins.autosignin import sites
+from app.plugins.autosignin.registry import PATTERN_HANDLERS, SITE_HANDLERS, SiteHandlerRegistry, site_host
+
+
+def test_registry_covers_every_site_module():
+    """索引应覆盖签到目录中的全部模块，且域名与各模块 site_url 一致。"""
+    module_names = {info.name for info in pkgutil.iter_modules(sites.__path__)}
+    registered = {module for module, _ in SITE_HANDLERS.values()} | {module for module, _, _ in PATTERN_HANDLERS}
+
+    assert module_names == registered
+    for host, (module_name, class_name) in SITE_HANDLERS.items():
+        handler = getattr(importlib.import_module(f"{sites.__name__}.{module_name}"), class_name)
+        assert site_host(handler.site_url) == host
+        assert handler.match(f"https://{host}/")
+
+
+def test_dispatch_imports_only_matched_module():
+    """按域名分发时只导入命中的站点模块，未适配站点返回 None。"""
+    sys.modules.pop(f"{sites.__name__}.hdsky", None)
+    sys.modules.pop(f"{sites.__name__}.ttg", None)
+    registry = SiteHandlerRegistry()
+
+    assert registry.get("https://www.hdsky.me/").__name__ == "HDSky"
+    assert registry.get("https://kp.m-team.cc/").__name__ == "MTorrent"
+    assert registry.get("https://unknown.example/") is None
+    assert registry.loaded_modules() == ["hdsky", "mteam"]
+    assert f"{sites.__name__}.ttg" not in sys.modules
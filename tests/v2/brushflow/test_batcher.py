@@ -0,0 +1,134 @@
+"""BrushFlow 下载器批量操作合并测试。"""
+
+import threading
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from brushflow import BrushFlow
+from brushflow.batcher import DownloaderOperation, DownloaderOperationBatcher, plan_operations
+
+
+def test_plan_groups_by_downloader_and_orders_actions():
+    """调用计划应按下载器合并条目，并保证重新汇报、删除、清理标签的顺序。"""
+    plan = plan_operations(
+        [
+            DownloaderOperation("主下载器", "delete_tags", ["刷流-1"]),
+            DownloaderOperation("主下载器", "delete", ["a", "b"]),
+            DownloaderOperation("备用下载器", "delete", ["c"]),
+            DownloaderOperation("主下载器", "reannounce", ["a", "b"]),
+            DownloaderOperation("主下载器", "delete", ["b", "d"]),
+        ]
+    )
+
+    assert [(group["downloader"], group["action"], group["items"]) for group in plan] == [
+        ("主下载器", "reannounce", ["a", "b"]),
+        ("主下载器", "delete", ["a", "b", "d"]),
+        ("主下载器", "delete_tags", ["刷流-1"]),
+        ("备用下载器", "delete", ["c"]),
+    ]
+
+
+def test_concurrent_submissions_share_one_call_per_downloader_and_action():
+    """同一窗口内多个任务的删种应合并为每个下载器每类操作一次调用。"""
+    calls = []
+    executor_lock = threading.Lock()
+
+    def executor(downloader_name, service, action, items):
+        """记录实际下载器调用，删除备用下载器时模拟失败。"""
+        with executor_lock:
+            calls.append((downloader_name, action, sorted(items)))
+        return downloader_name != "备用下载器"
+
+    batcher = DownloaderOperationBatcher(executor, window=0.2)
+    results = {}
+
+    def submit(name, downloader_name, hashes):
+        """模拟单个任务提交重新汇报与删除。"""
+        results[name] = batcher.submit(
+            [
+                DownloaderOperation(downloader_name, "reannounce", hashes),
+                DownloaderOperation(downloader_name, "delete", hashes),
+            ]
+        )
+
+    threads = [
+        threading.Thread(target=submit, args=("task-a", "主下载器", ["a"])),
+        threading.Thread(target=submit, args=("task-b", "主下载器", ["b"])),
+        threading.Thread(target=submit, args=("task-c", "备用下载器", ["c"])),
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(calls) == [
+        ("主下载器", "delete", ["a", "b"]),
+        ("主下载器", "reannounce", ["a", "b"]),
+        ("备用下载器", "delete", ["c"]),
+        ("备用下载器", "reannounce", ["c"]),
+    ]
+    assert calls.index(("主下载器", "reannounce", ["a", "b"])) < calls.index(("主下载器", "delete", ["a", "b"]))
+    assert results == {"task-a": [True, True], "task-b": [True, True], "task-c": [False, False]}
+    assert batcher.stats() == {"flushes": 1, "operations": 6, "calls": 4}
+
+
+def test_executor_exception_only_fails_its_own_group():
+    """单次调用异常只影响对应下载器操作，并继续执行后续调用。"""
+    plugin = BrushFlow()
+    failing = MagicMock()
+    failing.delete_torrents.side_effect = RuntimeError("downloader failed")
+    healthy = MagicMock()
+    healthy.delete_torrents.return_value = True
+    batcher = DownloaderOperationBatcher(plugin._execute_downloader_operation, window=0)
+    plugin._invalidate_downloader_snapshot = MagicMock()
+
+    results = batcher.submit(
+        [
+            DownloaderOperation("主下载器", "delete", ["a"], SimpleNamespace(instance=failing)),
+            DownloaderOperation("备用下载器", "delete", ["b"], SimpleNamespace(instance=healthy)),
+            DownloaderOperation("备用下载器", "delete_tags", ["刷流-1", "刷流-2"], SimpleNamespace(instance=healthy)),
+        ]
+    )
+
+    assert results == [False, True, True]
+    healthy.delete_torrents.assert_called_once_with(ids=["b"], delete_file=True)
+    healthy.qbc.torrents_delete_tags.assert_called_once_with(tags="刷流-1,刷流-2")
+    assert plugin._invalidate_downloader_snapshot.call_count == 2
+
+
+def test_batches_on_same_downloader_do_not_overlap():
+    """上一批仍在执行时，同一下载器的后续批次应等待其完成，不能交错执行。"""
+    started = threading.Event()
+    release = threading.Event()
+    lock = threading.Lock()
+    state = {"active": 0, "max_active": 0, "calls": []}
+
+    def executor(downloader, service, action, items):
+        with lock:
+            state["active"] += 1
+            state["max_active"] = max(state["max_active"], state["active"])
+            state["calls"].append(items)
+        if items == ["a"]:
+            started.set()
+            release.wait(5)
+        with lock:
+            state["active"] -= 1
+        return True
+
+    batcher = DownloaderOperationBatcher(executor, window=0)
+    first = threading.Thread(target=batcher.submit, args=([DownloaderOperation("主下载器", "delete", ["a"])],))
+    first.start()
+    assert started.wait(5)
+    second = threading.Thread(target=batcher.submit, args=([DownloaderOperation("主下载器", "delete", ["b"])],))
+    second.start()
+    second.join(0.2)
+
+    assert second.is_alive()
+    assert state["calls"] == [["a"]]
+
+    release.set()
+    first.join(5)
+    second.join(5)
+
+    assert state["calls"] == [["a"], ["b"]]
+    assert state["max_active"] == 1
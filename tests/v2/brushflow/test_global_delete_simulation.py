@@ -0,0 +1,166 @@
+"""BrushFlow 全局动态删种离线模拟与规模基准测试。"""
+
+import threading
+
+from brushflow import BrushFlow, BrushTaskConfig
+from brushflow.models import GlobalDeleteSimulationPayload
+from brushflow.simulation import advance_torrent_info
+
+GIB = 1024 ** 3
+
+
+def _make_plugin(*tasks: BrushTaskConfig) -> BrushFlow:
+    """创建只包含任务配置的插件实例。"""
+    plugin = BrushFlow()
+    plugin._task_context = threading.local()
+    plugin._task_configs = {task.id: task for task in tasks}
+    plugin._global_delete_size_range = None
+    return plugin
+
+
+def _info(torrent_hash: str, seeding_hours: float, size: float = GIB, tags: str = "刷流") -> dict:
+    """创建已完成下载的录制种子状态。"""
+    return {
+        "hash": torrent_hash,
+        "title": torrent_hash,
+        "seeding_time": seeding_hours * 3600,
+        "dltime": seeding_hours * 3600 + 600,
+        "iatime": 0,
+        "ratio": 1,
+        "uploaded": size,
+        "downloaded": size,
+        "total_size": size,
+        "tags": tags,
+    }
+
+
+def test_advance_moves_timers_but_keeps_uploads():
+    """推进模拟时钟时应累加计时字段并重新计算平均上传速度。"""
+    advanced = advance_torrent_info({"seeding_time": 100, "dltime": 100, "iatime": 0, "uploaded": 1000}, 100)
+
+    assert advanced["seeding_time"] == 200
+    assert advanced["iatime"] == 0
+    assert advanced["avg_upspeed"] == 5
+
+
+def test_simulation_replays_check_cycles_without_downloader():
+    """模拟应按周期推进做种时间，只删除满足任务条件的种子直至回落到下限。"""
+    task = BrushTaskConfig(
+        {
+            "id": "task",
+            "name": "任务",
+            "site_id": 1,
+            "downloader": "主下载器",
+            "enabled": True,
+            "seed_time": 2,
+            "delete_except_tags": "保留",
+        }
+    )
+    plugin = _make_plugin(task)
+    records = {
+        "task": {
+            name: {"title": name, "size": GIB, "deleted": False}
+            for name in ("young", "middle", "old", "kept")
+        }
+    }
+    downloaders = {
+        "主下载器": [
+            _info("young", 1),
+            _info("middle", 1.5),
+            _info("old", 3),
+            _info("kept", 5, tags="刷流,保留"),
+        ]
+    }
+    payload = GlobalDeleteSimulationPayload(
+        downloaders=downloaders,
+        records=records,
+        hours=1,
+        interval_minutes=30,
+        delete_size_range="1-3",
+    )
+
+    response = plugin.simulate_global_delete(payload)
+
+    assert response.success
+    result = response.data
+    assert result["cycle_count"] == 3
+    assert [[item["hash"] for item in cycle["deleted"]] for cycle in result["cycles"]] == [
+        ["old"],
+        ["middle"],
+        [],
+    ]
+    assert result["cycles"][0]["deleted"][0]["reason"] == "做种时间达到 2 小时"
+    assert result["cycles"][2]["triggered"] is False
+    assert result["cycles"][0]["operations"] == [{"downloader": "主下载器", "action": "delete", "count": 1}]
+    assert result["downloader_call_count"] == 2
+    assert result["deleted_size"] == 2 * GIB
+    assert records["task"]["old"]["deleted"] is False
+
+
+def test_simulation_requires_size_range():
+    """未设置全局阈值且请求未指定时应直接返回错误。"""
+    plugin = _make_plugin()
+
+    response = plugin.simulate_global_delete(GlobalDeleteSimulationPayload(downloaders={}, records={}))
+
+    assert response.success is False
+
+
+def _synthetic_candidates(count: int) -> list:
+    """生成包含预删除、条件删除与兜底候选的合成候选列表。"""
+    task = BrushTaskConfig({"id": "task", "name": "任务", "site_id": 1, "downloader": "主下载器"})
+    return [
+        {
+            "task": task,
+            "torrent_hash": f"hash-{index}",
+            "torrent_task": {},
+            "downloader_name": "主下载器",
+            "size": GIB,
+            "pre_delete_reason": "促销已过期" if index % 97 == 0 else "",
+            "conditional_reason": "做种时间达到 1 小时" if index % 3 == 0 else "",
+            "proxy_delete": index % 2 == 0,
+            "completed": True,
+            "hit_and_run": index % 11 == 0,
+            "seeding_time": (index * 7919) % 100_000,
+        }
+        for index in range(count)
+    ]
+
+
+class _CountingDict(dict):
+    """统计字段读取次数的候选字典，用读取次数代替耗时衡量选择的工作量。"""
+
+    reads = 0
+
+    def __getitem__(self, key):
+        _CountingDict.reads += 1
+        return super().__getitem__(key)
+
+    def get(self, key, default=None):
+        _CountingDict.reads += 1
+        return super().get(key, default)
+
+
+def _selection_reads(count: int) -> int:
+    """统计在需要清理至一半体积时生成删种计划所读取的候选字段次数。"""
+    candidates = [_CountingDict(candidate) for candidate in _synthetic_candidates(count)]
+    _CountingDict.reads = 0
+    plan, remaining, triggered = BrushFlow._select_global_dynamic_deletions(
+        candidates,
+        count * GIB,
+        count * GIB / 2,
+        count * GIB * 0.9,
+    )
+    assert triggered
+    assert remaining <= count * GIB / 2
+    assert len(plan) >= count // 2
+    return _CountingDict.reads
+
+
+def test_benchmark_selection_scales_to_100k_candidates():
+    """候选增至 10 万时选择的字段读取次数应近似线性增长，及时发现二次复杂度退化。"""
+    small = _selection_reads(10_000)
+    large = _selection_reads(100_000)
+
+    assert small > 0
+    assert large / small < 15
@@ -0,0 +1,216 @@
+"""BrushFlow 多任务并行刷流与体积预留提交测试。"""
+
+import threading
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from brushflow import BrushFlow, BrushTaskConfig
+from brushflow.reservation import BrushReservationLedger
+from brushflow.store import TorrentRecordStore
+
+GIB = 1024 ** 3
+
+
+def _make_task(task_id: str, site_id: int) -> BrushTaskConfig:
+    """创建不限制规则的启用任务。"""
+    return BrushTaskConfig(
+        {"id": task_id, "name": task_id, "site_id": site_id, "downloader": "主下载器", "enabled": True}
+    )
+
+
+def _make_plugin(*tasks: BrushTaskConfig) -> BrushFlow:
+    """创建使用内存记录库和独立预留台账的插件实例。"""
+    plugin = BrushFlow()
+    plugin._enabled = True
+    plugin._global_disksize = None
+    plugin._global_maxdlcount = None
+    plugin._task_context = threading.local()
+    plugin._task_configs = {task.id: task for task in tasks}
+    plugin._task_locks = {task.id: threading.Lock() for task in tasks}
+    plugin._runtime_lock = threading.Lock()
+    plugin._runtime = {task.id: {"state": "idle", "operation": None, "last_error": None} for task in tasks}
+    plugin._record_store = TorrentRecordStore(":memory:")
+    plugin._brush_ledger = BrushReservationLedger()
+    return plugin
+
+
+def _make_torrent(site_name: str, title: str, size: float) -> SimpleNamespace:
+    """创建满足默认免费与 H&R 规则的站点候选。"""
+    return SimpleNamespace(
+        site_name=site_name,
+        title=title,
+        description="",
+        page_url=f"https://{site_name}/details/{title}",
+        size=size,
+        downloadvolumefactor=0,
+        uploadvolumefactor=1,
+        hit_and_run=False,
+        seeders=1,
+        pubdate="",
+    )
+
+
+def _reserve(plugin: BrushFlow, task: BrushTaskConfig, torrent, all_torrent_tasks=None, cursor=0,
+             downloading_counts=None):
+    """在任务上下文中调用串行预留步骤。"""
+    with plugin._task_scope(task.id):
+        return plugin._BrushFlow__reserve_brush_torrent(
+            torrent,
+            SimpleNamespace(name=torrent.site_name),
+            all_torrent_tasks if all_torrent_tasks is not None else {},
+            cursor,
+            downloading_counts,
+        )
+
+
+def test_pending_reservation_counts_toward_global_disksize():
+    """尚未添加完成的预留体积也应计入全局保种上限，提交或撤销后转移或释放。"""
+    first, second = _make_task("a", 1), _make_task("b", 2)
+    plugin = _make_plugin(first, second)
+    plugin._global_disksize = 100
+
+    token, reason = _reserve(plugin, first, _make_torrent("A", "Movie.1", 60 * GIB))
+    assert token and reason is None
+
+    blocked, reason = _reserve(plugin, second, _make_torrent("B", "Movie.2", 60 * GIB))
+    assert blocked is None
+    assert "全局保种上限" in reason
+
+    with plugin._task_scope(first.id):
+        plugin._BrushFlow__commit_brush_torrent(token, "hash-a", {"title": "Movie.1", "size": 60 * GIB})
+    assert plugin._brush_ledger.pending_size() == 0
+    assert plugin._reserved_seeding_sizes(second.id) == (0, 60 * GIB)
+
+    plugin._global_disksize = 200
+    token, _ = _reserve(plugin, second, _make_torrent("B", "Movie.2", 60 * GIB))
+    plugin._brush_ledger.release(token)
+    assert plugin._reserved_seeding_sizes(second.id) == (0, 60 * GIB)
+
+
+def test_reservation_sees_titles_added_by_parallel_task():
+    """其他任务在本任务读取记录后新增或预留的同名种子应被识别为重复。"""
+    first, second = _make_task("a", 1), _make_task("b", 2)
+    plugin = _make_plugin(first, second)
+    ledger = plugin._brush_ledger
+    cursor = ledger.begin(second.id)
+    all_torrent_tasks = plugin._load_all_torrent_tasks()
+
+    token, _ = _reserve(plugin, first, _make_torrent("A", "Same.Title", GIB))
+    blocked, reason = _reserve(plugin, second, _make_torrent("B", "Same.Title", GIB), all_torrent_tasks, cursor)
+    assert blocked is None
+    assert reason == "其他站点存在尚未下载完成的相同种子"
+
+    record = {"site_name": "A", "title": "Same.Title", "size": GIB, "downloaded": 0, "deleted": False}
+    with plugin._task_scope(first.id):
+        plugin._BrushFlow__commit_brush_torrent(token, "hash-a", record)
+    blocked, reason = _reserve(plugin, second, _make_torrent("B", "Same.Title", GIB), all_torrent_tasks, cursor)
+    assert blocked is None
+    assert "hash-a" in all_torrent_tasks
+
+    ledger.end(second.id)
+    assert ledger.committed_since(0) == {}
+
+
+def test_tasks_brush_concurrently_within_concurrency_limit():
+    """不同任务的刷流应在并行数内同时执行，而不是被全局锁串行化。"""
+    first, second = _make_task("a", 1), _make_task("b", 2)
+    plugin = _make_plugin(first, second)
+    plugin._set_brush_concurrency(2)
+    plugin._append_run = MagicMock()
+    barrier = threading.Barrier(2, timeout=5)
+    plugin._run_brush = MagicMock(side_effect=lambda _task, report: report.update({"result": barrier.wait()}))
+
+    threads = [threading.Thread(target=plugin.brush, args=(task.id,)) for task in (first, second)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+
+    reports = [call.args[1] for call in plugin._append_run.call_args_list]
+    assert len(reports) == 2
+    assert all(report["success"] for report in reports)
+
+
+def _reserve_concurrently(plugin: BrushFlow, tasks, per_task: int):
+    """多个任务同时为各自的候选种子申请预留，返回成功的凭据和拒绝原因。"""
+    barrier = threading.Barrier(len(tasks), timeout=5)
+    tokens, reasons = [], []
+
+    def run(task):
+        barrier.wait()
+        for index in range(per_task):
+            torrent = _make_torrent(task.id, f"{task.id}.Movie.{index}", GIB)
+            token, reason = _reserve(plugin, task, torrent)
+            (tokens if token else reasons).append(token or reason)
+
+    threads = [threading.Thread(target=run, args=(task,)) for task in tasks]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+    return tokens, reasons
+
+
+def test_parallel_reservations_respect_global_maxdlcount():
+    """并行任务同时通过前置检查后，预留时应计入彼此未提交的种子，不突破全局同时下载数。"""
+    tasks = [_make_task(f"t{index}", index) for index in range(4)]
+    plugin = _make_plugin(*tasks)
+    plugin._global_maxdlcount = 3
+    plugin._BrushFlow__get_global_downloading_count = MagicMock(return_value=1)
+    plugin._BrushFlow__get_downloading_count = MagicMock(return_value=0)
+
+    tokens, reasons = _reserve_concurrently(plugin, tasks, per_task=2)
+
+    assert len(tokens) == 2
+    assert plugin._brush_ledger.pending_count() == 2
+    assert set(reasons) == {"全局同时下载任务数达到上限 3"}
+
+
+def test_parallel_reservations_respect_task_maxdlcount():
+    """单任务同时下载数应计入本任务已预留的种子，其他任务的预留不占用本任务额度。"""
+    tasks = [
+        BrushTaskConfig({"id": f"t{index}", "name": f"t{index}", "site_id": index, "downloader": "主下载器",
+                         "enabled": True, "maxdlcount": 2})
+        for index in range(3)
+    ]
+    plugin = _make_plugin(*tasks)
+    plugin._BrushFlow__get_global_downloading_count = MagicMock(return_value=0)
+    plugin._BrushFlow__get_downloading_count = MagicMock(return_value=1)
+
+    tokens, reasons = _reserve_concurrently(plugin, tasks, per_task=3)
+
+    ledger = plugin._brush_ledger
+    assert len(tokens) == 3
+    assert all(ledger.pending_count(task_id=task.id) == 1 for task in tasks)
+    assert ledger.pending_count(downloader="主下载器") == 3
+    assert set(reasons) == {"同时下载任务数达到上限 2"}
+
+
+def test_reservation_counts_commits_since_cursor_without_querying_downloader():
+    """预留复核使用任务开始时读取的下载中数量，之后提交的种子按游标计入，锁内不访问下载器。"""
+    first = BrushTaskConfig({"id": "a", "name": "a", "site_id": 1, "downloader": "主下载器",
+                             "enabled": True, "maxdlcount": 3})
+    second = _make_task("b", 2)
+    plugin = _make_plugin(first, second)
+    plugin._global_maxdlcount = 4
+    plugin._BrushFlow__get_global_downloading_count = MagicMock(side_effect=AssertionError("不应访问下载器"))
+    plugin._BrushFlow__get_downloading_count = MagicMock(side_effect=AssertionError("不应访问下载器"))
+    ledger = plugin._brush_ledger
+    cursor = ledger.begin(first.id)
+    ledger.begin(second.id)
+
+    token, _ = _reserve(plugin, second, _make_torrent("b", "B.Movie", GIB), downloading_counts=(2, None))
+    with plugin._task_scope(second.id):
+        plugin._BrushFlow__commit_brush_torrent(token, "hash-b", {"task_id": "b", "title": "B.Movie"})
+    token, reason = _reserve(plugin, first, _make_torrent("a", "A.Movie.1", GIB), cursor=cursor,
+                             downloading_counts=(2, 1))
+    assert token and reason is None
+    with plugin._task_scope(first.id):
+        plugin._BrushFlow__commit_brush_torrent(token, "hash-a", {"task_id": "a", "title": "A.Movie.1"})
+
+    assert ledger.committed_count(cursor) == 2
+    assert ledger.committed_count(cursor, task_id="a") == 1
+    token, reason = _reserve(plugin, first, _make_torrent("a", "A.Movie.2", GIB), cursor=cursor,
+                             downloading_counts=(2, 1))
+    assert token is None
+    assert reason == "全局同时下载任务数达到上限 4"
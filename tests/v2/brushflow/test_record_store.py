@@ -0,0 +1,191 @@
+"""BrushFlow 行级种子记录库与累计统计测试。"""
+
+import threading
+from unittest.mock import MagicMock
+
+from brushflow import BrushFlow, BrushTaskConfig
+from brushflow.store import TorrentRecordStore
+
+
+def _make_store_plugin(*task_ids: str) -> BrushFlow:
+    """创建只绑定内存记录库和任务配置的插件实例。"""
+    plugin = BrushFlow()
+    plugin._task_context = threading.local()
+    plugin._task_configs = {
+        task_id: BrushTaskConfig({"id": task_id, "name": task_id, "site_id": 1, "downloader": "主下载器"})
+        for task_id in task_ids
+    }
+    plugin._record_store = TorrentRecordStore(":memory:")
+    return plugin
+
+
+def test_replace_only_writes_changed_rows():
+    """整字典保存应按行比较，仅写入新增、变化和被移除的记录。"""
+    store = TorrentRecordStore(":memory:")
+    rows = {
+        "a": {"size": 10, "uploaded": 1, "deleted": False},
+        "b": {"size": 20, "uploaded": 2, "deleted": False},
+    }
+
+    assert store.replace("task", "torrents", rows) == 2
+    assert store.replace("task", "torrents", rows) == 0
+
+    rows["a"]["uploaded"] = 5
+    rows.pop("b")
+    assert store.replace("task", "torrents", rows) == 2
+    assert store.load("task", "torrents") == {"a": {"size": 10, "uploaded": 5, "deleted": False}}
+
+
+def test_running_totals_follow_delete_and_archive():
+    """删除和归档后累计统计应与原有全量重算口径一致。"""
+    store = TorrentRecordStore(":memory:")
+    store.upsert(
+        "task",
+        "torrents",
+        {
+            "active": {"size": 100, "uploaded": 30, "downloaded": 100, "deleted": False},
+            "removed": {"size": 50, "uploaded": 10, "downloaded": 50, "deleted": True},
+        },
+    )
+    store.upsert("other", "torrents", {"other": {"size": 70, "deleted": False}})
+
+    assert store.seeding_size(["task"]) == 100
+    assert store.seeding_size() == 170
+
+    store.move("task", ["removed"], "archived")
+    store.upsert("task", "unmanaged", {"lost": {"size": 999, "uploaded": 999, "deleted": False}})
+
+    assert store.statistic("task") == {
+        "count": 2,
+        "deleted": 1,
+        "uploaded": 40,
+        "downloaded": 150,
+        "unarchived": 0,
+        "active": 1,
+        "active_uploaded": 30,
+        "active_downloaded": 100,
+    }
+
+    store.clear_task("task")
+    assert store.statistic("task")["count"] == 0
+    assert store.seeding_size() == 70
+
+
+def test_detail_pages_are_read_by_state_and_time():
+    """任务详情应由记录库按状态筛选并按添加时间倒序分页。"""
+    plugin = _make_store_plugin("task")
+    plugin._get_task_data = MagicMock(return_value=[])
+    plugin._task_summary = MagicMock(return_value={})
+    plugin._record_store.upsert(
+        "task",
+        "torrents",
+        {
+            f"hash-{index}": {"title": str(index), "time": index, "deleted": index % 2 == 0}
+            for index in range(6)
+        },
+    )
+    plugin._record_store.upsert("task", "archived", {"old": {"title": "old", "time": 100, "deleted": True}})
+
+    active = plugin._build_task_detail("task", state="active", page=1, page_size=2)["torrents"]
+    deleted = plugin._build_task_detail("task", state="deleted", page=1, page_size=10)["torrents"]
+
+    assert active["total"] == 3
+    assert [row["title"] for row in active["items"]] == ["5", "3"]
+    assert [row["title"] for row in deleted["items"]] == ["old", "4", "2", "0"]
+
+
+def test_schema_v2_task_data_is_migrated_into_record_store():
+    """升级时应把 V2 整字典记录迁入记录库，并删除旧插件数据键。"""
+    plugin = _make_store_plugin("task")
+    legacy = {
+        "schema": 2,
+        "task.task.torrents": {"live": {"size": 10, "deleted": False}},
+        "task.task.archived": {"old": {"size": 20, "uploaded": 5, "deleted": True}},
+        "task.task.unmanaged": {},
+        "task.task.statistic": {"count": 2},
+    }
+    plugin.get_data = MagicMock(
+        side_effect=lambda key: legacy["schema"] if key == "task_data_schema_version" else legacy.get(key)
+    )
+    plugin.save_data = MagicMock()
+    plugin.del_data = MagicMock()
+
+    plugin._migrate_legacy_data()
+
+    assert plugin._get_task_data("task", "torrents") == {"live": {"size": 10, "deleted": False}}
+    assert plugin._get_statistic_info("task")["count"] == 2
+    assert plugin._get_statistic_info("task")["uploaded"] == 5
+    plugin.save_data.assert_called_once_with("task_data_schema_version", BrushFlow.DATA_SCHEMA_VERSION)
+    deleted_keys = {call.args[0] for call in plugin.del_data.call_args_list}
+    assert {"task.task.torrents", "task.task.archived", "task.task.statistic"} <= deleted_keys
+
+
+def test_stop_service_closes_record_store():
+    """停止插件时应关闭记录库连接并清除引用，重新初始化时再打开。"""
+    plugin = _make_store_plugin("task")
+    store = plugin._record_store
+    store.close = MagicMock(wraps=store.close)
+
+    plugin.stop_service()
+
+    store.close.assert_called_once_with()
+    assert plugin._record_store is None
+    plugin.stop_service()
+
+
+def test_same_hash_in_other_bucket_is_not_overwritten():
+    """同一 Hash 写入其他分组时应各自保存，不得移动或覆盖原分组的记录。"""
+    store = TorrentRecordStore(":memory:")
+    store.upsert("task", "archived", {"h": {"size": 20, "uploaded": 7, "deleted": True}})
+
+    store.upsert("task", "torrents", {"h": {"size": 10, "uploaded": 1, "deleted": False}})
+    store.replace("task", "unmanaged", {"h": {"size": 30}})
+    store.replace("task", "torrents", {})
+
+    assert store.load("task", "archived") == {"h": {"size": 20, "uploaded": 7, "deleted": True}}
+    assert store.load("task", "unmanaged") == {"h": {"size": 30}}
+    assert store.load("task", "torrents") == {}
+
+
+def test_move_replaces_target_row_and_keeps_totals():
+    """显式转移时目标分组的同名记录被替换，累计统计同步扣减。"""
+    store = TorrentRecordStore(":memory:")
+    store.upsert("task", "archived", {"h": {"size": 20, "uploaded": 7, "deleted": True}})
+    store.upsert("task", "torrents", {"h": {"size": 10, "uploaded": 1, "deleted": True}})
+
+    store.move("task", ["h"], "archived")
+
+    assert store.load("task", "torrents") == {}
+    assert store.load("task", "archived") == {"h": {"size": 10, "uploaded": 1, "deleted": True}}
+    assert store.statistic("task")["uploaded"] == 1
+    assert store.statistic("task")["count"] == 1
+
+
+def test_legacy_primary_key_is_rebuilt_per_bucket(tmp_path):
+    """旧版按 (task_id, hash) 建主键的记录库打开时应重建主键并保留已有记录。"""
+    import sqlite3
+
+    path = tmp_path / "records.db"
+    connection = sqlite3.connect(path)
+    connection.execute(
+        """
+        CREATE TABLE records (
+            task_id TEXT NOT NULL, hash TEXT NOT NULL, bucket TEXT NOT NULL, site INTEGER,
+            deleted INTEGER NOT NULL DEFAULT 0, size REAL NOT NULL DEFAULT 0,
+            uploaded REAL NOT NULL DEFAULT 0, downloaded REAL NOT NULL DEFAULT 0,
+            time REAL NOT NULL DEFAULT 0, data TEXT NOT NULL, PRIMARY KEY (task_id, hash)
+        )
+        """
+    )
+    connection.execute(
+        "INSERT INTO records (task_id, hash, bucket, size, data) VALUES ('task', 'h', 'archived', 20, '{\"size\": 20}')"
+    )
+    connection.commit()
+    connection.close()
+
+    store = TorrentRecordStore(str(path))
+    store.upsert("task", "torrents", {"h": {"size": 10}})
+
+    assert store.load("task", "archived") == {"h": {"size": 20}}
+    assert store.load("task", "torrents") == {"h": {"size": 10}}
+    store.close()
@@ -0,0 +1,91 @@
+"""BrushFlow 预编译选种规则链测试。"""
+
+import threading
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from brushflow import BrushFlow, BrushTaskConfig
+from brushflow.rules import CompiledBrushRules
+
+GIB = 1024 ** 3
+
+
+def _make_task(**fields) -> BrushTaskConfig:
+    """创建带指定选种规则的任务。"""
+    return BrushTaskConfig({"id": "task", "name": "任务", "site_id": 1, "downloader": "主下载器", **fields})
+
+
+def _make_torrent(**fields) -> SimpleNamespace:
+    """创建默认通过全部规则的候选种子。"""
+    data = {
+        "site_name": "站点",
+        "title": "Movie.2024.1080p",
+        "description": "中字",
+        "page_url": "https://site/details/1",
+        "size": 10 * GIB,
+        "seeders": 5,
+        "pubdate": (datetime.now() - timedelta(minutes=30)).strftime("%Y-%m-%d %H:%M:%S"),
+        "downloadvolumefactor": 0,
+        "uploadvolumefactor": 2,
+        "hit_and_run": False,
+    }
+    data.update(fields)
+    return SimpleNamespace(**data)
+
+
+def test_compiled_rules_keep_existing_reasons():
+    """预编译后的区间、正则和促销规则应返回与原有判断一致的原因。"""
+    rules = CompiledBrushRules(
+        _make_task(
+            freeleech="2xfree",
+            hr="yes",
+            size="5-20",
+            seeder="10",
+            pubtime="0-60",
+            include="1080p",
+            exclude="CAM",
+        )
+    )
+
+    assert rules.evaluate(_make_torrent()) == (True, None)
+    assert rules.evaluate(_make_torrent(downloadvolumefactor=1))[1] == "非免费种子"
+    assert rules.evaluate(_make_torrent(uploadvolumefactor=1))[1] == "非双倍上传种子"
+    assert rules.evaluate(_make_torrent(hit_and_run=True))[1] == "存在 H&R"
+    assert rules.evaluate(_make_torrent(size=30 * GIB))[1] == "种子大小不在范围内"
+    assert rules.evaluate(_make_torrent(seeders=11))[1] == "做种人数超过上限"
+    old_pubdate = (datetime.now() - timedelta(hours=3)).strftime("%Y-%m-%d %H:%M:%S")
+    assert rules.evaluate(_make_torrent(pubdate=old_pubdate))[1] == "发布时间不在范围内"
+    assert rules.evaluate(_make_torrent(title="Movie.720p", description=""))[1] == "不符合包含规则"
+    assert rules.evaluate(_make_torrent(description="1080p cam"))[1] == "符合排除规则"
+    assert CompiledBrushRules(_make_task(size="15")).evaluate(_make_torrent())[1] == "种子大小低于下限"
+
+
+def test_rule_stats_short_circuit_at_first_rejection():
+    """统计应只记录实际执行的规则，首个淘汰规则之后的规则不再执行。"""
+    rules = CompiledBrushRules(_make_task(freeleech="free", hr="yes", include="1080p"))
+    stats = {}
+
+    rules.evaluate(_make_torrent(downloadvolumefactor=1), stats)
+    rules.evaluate(_make_torrent(), stats)
+
+    assert [name for name, _ in rules.rules] == ["freeleech", "hr", "include"]
+    assert stats["freeleech"]["checked"] == 2
+    assert stats["freeleech"]["rejected"] == 1
+    assert stats["include"]["checked"] == 1
+    assert stats["include"]["rejected"] == 0
+    assert all(item["elapsed_ms"] >= 0 for item in stats.values())
+
+
+def test_plugin_recompiles_rules_only_after_config_change():
+    """任务规则字段不变时复用规则链，修改后重新编译。"""
+    plugin = BrushFlow()
+    plugin._task_context = threading.local()
+    task = _make_task(include="1080p")
+
+    first = plugin._compiled_brush_rules(task)
+    assert plugin._compiled_brush_rules(task) is first
+
+    task.include = "2160p"
+    second = plugin._compiled_brush_rules(task)
+    assert second is not first
+    assert second.evaluate(_make_torrent())[1] == "不符合包含规则"
@@ -0,0 +1,89 @@
+"""BrushFlow Tracker 站点索引测试。"""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from brushflow import BrushFlow
+from brushflow.siteindex import TrackerSiteIndex
+
+SITES = {
+    "ptchdbits.co": {"id": 1, "name": "彩虹岛"},
+    "pt.example.com": {"id": 2, "name": "示例站"},
+}
+
+
+def _sites_helper() -> MagicMock:
+    """创建按域名返回站点的站点助手。"""
+    helper = MagicMock()
+    helper.get_indexer.side_effect = lambda domain: SITES.get(domain)
+    return helper
+
+
+def test_same_tracker_url_is_resolved_once():
+    """同一 Tracker 地址只应解析一次，映射域名仍按原规则识别。"""
+    index = TrackerSiteIndex()
+    helper = _sites_helper()
+    torrents = [{"tracker": "https://tracker.chdbits.xyz/announce.php?passkey=x"} for _ in range(100)]
+
+    with patch("brushflow.siteindex.SitesHelper", return_value=helper), patch(
+        "brushflow.siteindex.StringUtils.get_url_domain", side_effect=lambda url: url.split("/")[2]
+    ):
+        results = {index.resolve(torrent) for torrent in torrents}
+
+    assert results == {(1, "彩虹岛")}
+    assert helper.get_indexer.call_count == 1
+    assert index.stats() == {"size": 1, "hits": 99, "misses": 1}
+
+
+def test_magnet_is_parsed_only_when_tracker_is_unknown():
+    """Tracker 已识别时不解析磁力链接，无法识别时回退到磁力链接中的 Tracker。"""
+    index = TrackerSiteIndex()
+    helper = _sites_helper()
+    magnet = "magnet:?xt=urn:btih:abc&tr=https%3A%2F%2Fpt.example.com%2Fannounce"
+
+    with patch("brushflow.siteindex.SitesHelper", return_value=helper), patch(
+        "brushflow.siteindex.StringUtils.get_url_domain", side_effect=lambda url: url.split("/")[2]
+    ):
+        assert index.resolve({"tracker": "", "magnet_uri": magnet}) == (2, "示例站")
+        assert index.resolve({"tracker": "https://unknown.org/a", "magnet_uri": magnet}) == (2, "示例站")
+        assert index.resolve(SimpleNamespace(tracker_list=["https://unknown.org/a"], magnet_link=None)) == (
+            0,
+            "unknown.org",
+        )
+
+    assert helper.get_indexer.call_count == 2
+
+
+def test_lru_evicts_oldest_and_site_events_invalidate():
+    """超过容量时淘汰最久未用的条目，站点变化事件清空索引。"""
+    index = TrackerSiteIndex(maxsize=2)
+    helper = _sites_helper()
+
+    with patch("brushflow.siteindex.SitesHelper", return_value=helper), patch(
+        "brushflow.siteindex.StringUtils.get_url_domain", side_effect=lambda url: url.split("/")[2]
+    ):
+        for host in ("a.org", "b.org", "a.org", "c.org"):
+            index.resolve({"tracker": f"https://{host}/announce"})
+        index.resolve({"tracker": "https://a.org/announce"})
+
+    assert index.stats() == {"size": 2, "hits": 2, "misses": 3}
+
+    with patch.object(BrushFlow, "TRACKER_SITE_INDEX", index):
+        BrushFlow().site_changed(SimpleNamespace(event_data={"site_id": 1}))
+    assert index.stats()["size"] == 0
+
+
+def test_invalidate_during_resolution_discards_stale_result():
+    """识别过程中站点发生变更时，旧的识别结果不应写回缓存。"""
+    index = TrackerSiteIndex()
+    tracker = "https://pt.example.com/announce"
+
+    def resolver(_key):
+        index.invalidate()
+        return 2, "示例站"
+
+    assert index._lookup(tracker, resolver) == (2, "示例站")
+    assert index.stats()["size"] == 0
+
+    assert index._lookup(tracker, lambda _key: (2, "示例站")) == (2, "示例站")
+    assert index.stats()["size"] == 1
@@ -0,0 +1,102 @@
+"""BrushFlow 下载器种子快照共享缓存测试。"""
+
+import threading
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from brushflow import BrushFlow, BrushTaskConfig
+from brushflow.snapshot import DownloaderSnapshot, DownloaderSnapshotCache
+
+
+def _make_plugin() -> BrushFlow:
+    """创建只包含快照缓存的插件实例。"""
+    plugin = BrushFlow()
+    plugin._task_context = threading.local()
+    plugin._snapshot_cache = DownloaderSnapshotCache()
+    return plugin
+
+
+def test_snapshot_indexes_hash_tags_and_tracker():
+    """快照应一次遍历建立 Hash、标签与 Tracker 索引。"""
+    snapshot = DownloaderSnapshot(
+        "主下载器",
+        [
+            {"hash": "a", "tags": "刷流, 刷流-1", "tracker": "https://t.example/announce"},
+            {"hash": "", "tags": "孤立标签"},
+        ],
+        qbittorrent=True,
+    )
+
+    assert set(snapshot.by_hash) == {"a"}
+    assert snapshot.tags["a"] == frozenset({"刷流", "刷流-1"})
+    assert snapshot.trackers["a"] == "https://t.example/announce"
+    assert snapshot.used_tags() == frozenset({"刷流", "刷流-1", "孤立标签"})
+
+
+def test_tasks_on_same_downloader_share_one_fetch_until_invalidated():
+    """同一下载器的多个任务应复用快照，种子增删后重新拉取。"""
+    plugin = _make_plugin()
+    downloader = MagicMock()
+    downloader.get_torrents.return_value = ([{"hash": "a", "tags": "刷流"}], False)
+    service = SimpleNamespace(instance=downloader)
+
+    first, first_hit = plugin._get_downloader_snapshot("主下载器", service, qbittorrent=True)
+    second, second_hit = plugin._get_downloader_snapshot("主下载器", service, qbittorrent=True)
+
+    assert first is second
+    assert (first_hit, second_hit) == (False, True)
+    assert downloader.get_torrents.call_count == 1
+
+    plugin._invalidate_downloader_snapshot("主下载器")
+    plugin._get_downloader_snapshot("主下载器", service, qbittorrent=True)
+
+    assert downloader.get_torrents.call_count == 2
+    assert plugin._snapshot_cache.stats()["主下载器"]["hits"] == 1
+    assert plugin._snapshot_cache.stats()["主下载器"]["misses"] == 2
+
+
+def test_failed_fetch_is_not_cached():
+    """下载器拉取失败时不应缓存空快照。"""
+    cache = DownloaderSnapshotCache()
+    fetch = MagicMock(side_effect=[(None, True), ([{"hash": "a"}], False)])
+
+    assert cache.get("主下载器", fetch, qbittorrent=True) == (None, False)
+    snapshot, hit = cache.get("主下载器", fetch, qbittorrent=True)
+
+    assert hit is False
+    assert set(snapshot.by_hash) == {"a"}
+
+
+def test_expired_snapshot_is_refetched():
+    """超过有效期的快照应重新拉取。"""
+    cache = DownloaderSnapshotCache(ttl=0)
+    fetch = MagicMock(return_value=([{"hash": "a"}], False))
+
+    cache.get("主下载器", fetch, qbittorrent=True)
+    with patch("brushflow.snapshot.time.monotonic", return_value=10 ** 9):
+        cache.get("主下载器", fetch, qbittorrent=True)
+
+    assert fetch.call_count == 2
+
+
+def test_tag_cleanup_refetches_instead_of_trusting_cached_snapshot():
+    """删除标签前应重新拉取种子列表，缓存快照之后新绑定标签的种子不能被误判为未使用。"""
+    plugin = _make_plugin()
+    task = BrushTaskConfig({"id": "task-a", "name": "任务", "site_id": 1, "downloader": "主下载器"})
+    downloader = MagicMock()
+    downloader.get_torrents.side_effect = [
+        ([{"hash": "a", "tags": "刷流"}], False),
+        ([{"hash": "a", "tags": "刷流"}, {"hash": "b", "tags": f"刷流,{task.brush_tag}"}], False),
+    ]
+    service = SimpleNamespace(name="主下载器", type="qbittorrent", instance=downloader)
+    helper = MagicMock()
+    helper.get_service.return_value = service
+    helper.is_downloader.return_value = True
+
+    plugin._get_downloader_snapshot("主下载器", service, qbittorrent=True)
+    with patch("brushflow.DownloaderHelper", return_value=helper):
+        plugin._cleanup_unused_task_tag(task)
+
+    assert downloader.get_torrents.call_count == 2
+    downloader.qbc.torrents_delete_tags.assert_not_called()
+    assert set(plugin._get_downloader_snapshot("主下载器", service, qbittorrent=True)[0].by_hash) == {"a", "b"}
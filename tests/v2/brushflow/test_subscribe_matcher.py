@@ -0,0 +1,60 @@
+"""BrushFlow 订阅排除多模式匹配测试。"""
+
+import threading
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from brushflow import BrushFlow, BrushTaskConfig
+from brushflow.matcher import SubscribeTitleMatcher
+
+
+def test_matcher_reports_matching_subscription():
+    """匹配器应在标题或描述中找出任一订阅标题，并返回所属订阅。"""
+    matcher = SubscribeTitleMatcher(
+        {
+            "1_三体": ["三体", "Three-Body"],
+            "2_繁花": ["繁花", "Blossoms Shanghai"],
+            "3_空订阅": [],
+        }
+    )
+
+    assert matcher.search("Three-Body.S01E01.2160p", "") == ("Three-Body", "1_三体")
+    assert matcher.search("Movie.2024", "繁花 第1集") == ("繁花", "2_繁花")
+    assert matcher.search("three-body", "无关描述") is None
+    assert not SubscribeTitleMatcher({"1_空": []})
+
+
+def test_matcher_handles_overlapping_titles():
+    """重叠前缀和后缀的标题都应被失败指针正确找到。"""
+    matcher = SubscribeTitleMatcher({"a": ["abcd"], "b": ["bc"], "c": ["cde"]})
+
+    assert matcher.search("xabce") == ("bc", "b")
+    assert matcher.search("xxcdex") == ("cde", "c")
+    assert matcher.search("abdc") is None
+
+
+def test_subscribe_matcher_rebuilt_only_when_subscriptions_change():
+    """订阅未变化时复用匹配器，新增或删除订阅后重新构建。"""
+    plugin = BrushFlow()
+    plugin._task_context = threading.local()
+    plugin._subscribe_infos = {}
+    plugin._subscribe_matcher = None
+    task = BrushTaskConfig(
+        {"id": "task", "name": "任务", "site_id": 1, "downloader": "主下载器", "except_subscribe": True}
+    )
+    plugin._task_configs = {task.id: task}
+    plugin.chain = MagicMock()
+    plugin.chain.recognize_media.return_value = None
+    subscribes = [SimpleNamespace(id=1, name="三体", year="2023", season=1, type="电视剧", tmdbid=1, doubanid=None)]
+    subscribe_oper = MagicMock()
+    subscribe_oper.list.side_effect = lambda: list(subscribes)
+
+    with patch("brushflow.SubscribeOper", return_value=subscribe_oper), plugin._task_scope(task.id):
+        first = plugin._BrushFlow__get_subscribe_matcher()
+        second = plugin._BrushFlow__get_subscribe_matcher()
+        subscribes.append(SimpleNamespace(id=2, name="繁花", year="2023", season=1, type="电视剧", tmdbid=2, doubanid=None))
+        third = plugin._BrushFlow__get_subscribe_matcher()
+
+    assert first is second
+    assert third is not first
+    assert third.search("繁花 S01") == ("繁花", "2_繁花")
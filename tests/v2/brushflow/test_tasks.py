@@ -10,6 +10,7 @@ import pytest
 
 from brushflow import BrushFlow, BrushTaskConfig
 from brushflow.models import BrushFlowSettingsPayload, BrushTaskPayload
+from brushflow.store import TorrentRecordStore
 
 
 def _make_task(task_id: str, site_id: int = 1, name: str = "任务") -> BrushTaskConfig:
@@ -41,6 +42,7 @@ def _make_runtime_plugin(*tasks: BrushTaskConfig) -> BrushFlow:
     plugin._task_configs = {task.id: task for task in tasks}
     plugin._task_locks = {task.id: threading.Lock() for task in tasks}
     plugin._runtime_lock = threading.Lock()
+    plugin._record_store = TorrentRecordStore(":memory:")
     plugin._runtime = {
         task.id: {"state": "idle", "operation": None, "last_error": None}
         for task in tasks
@@ -73,6 +75,8 @@ def test_vue_render_api_and_sidebar_contract():
         "/tasks/{task_id}/run",
         "/tasks/{task_id}/check",
         "/tasks/{task_id}/clear",
+        "/global_delete/recording",
+        "/global_delete/simulate",
     }
     assert all(row["auth"] == "bear" for row in api_rows)
 
@@ -301,8 +305,9 @@ def test_cleanup_unused_task_tags_removes_historical_orphans():
     with patch("brushflow.DownloaderHelper", return_value=helper):
         plugin._cleanup_unused_task_tags()
 
-    downloader.qbc.torrents_delete_tags.assert_called_once_with(tags=["刷流-deadbeef"])
+    downloader.qbc.torrents_delete_tags.assert_called_once_with(tags="刷流-deadbeef")
     downloader.delete_torrents_tag.assert_not_called()
+    assert plugin._operation_batcher.stats() == {"flushes": 1, "operations": 1, "calls": 1}
 
 
 def test_legacy_config_migrates_timezone_and_site_overrides():
@@ -989,11 +994,15 @@ def test_global_limits_aggregate_all_tasks():
     plugin._global_disksize = 100
     plugin._global_maxdlcount = 3
     gib = 1024 ** 3
-    task_rows = {
-        first.id: {"first": {"size": 40 * gib, "deleted": False}},
-        second.id: {"second": {"size": 50 * gib, "deleted": False}},
-    }
-    plugin._get_task_data = MagicMock(side_effect=lambda task_id, _name: task_rows[task_id])
+    plugin._record_store.upsert(first.id, "torrents", {"first": {"size": 40 * gib, "deleted": False}})
+    plugin._record_store.upsert(
+        second.id,
+        "torrents",
+        {
+            "second": {"size": 50 * gib, "deleted": False},
+            "removed": {"size": 80 * gib, "deleted": True},
+        },
+    )
     plugin._BrushFlow__get_global_downloading_count = MagicMock(return_value=3)
 
     global_size = plugin._calculate_global_seeding_size()
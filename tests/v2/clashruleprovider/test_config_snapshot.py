@@ -0,0 +1,132 @@
+"""ClashRuleProvider 状态版本、配置快照复用与 ETag 协商缓存测试。"""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from app.plugins.clashruleprovider.api import ClashRuleProviderApi
+from app.plugins.clashruleprovider.base import Constant
+from app.plugins.clashruleprovider.config import PluginConfig
+from app.plugins.clashruleprovider.models.api import ConfigRequest
+from app.plugins.clashruleprovider.models.configuration import ClashConfig, ClashConfigSnapshot
+from app.plugins.clashruleprovider.services import ClashRuleProviderService
+from app.plugins.clashruleprovider.state import PluginState
+
+
+class _Cache:
+    """按 key 保存的内存缓存，替代主程序缓存。"""
+
+    def __init__(self):
+        self.data = {}
+
+    def exists(self, key, region=None):
+        return key in self.data
+
+    def get(self, key, region=None):
+        return self.data.get(key)
+
+    def set(self, key, value, region=None):
+        self.data[key] = value
+
+
+def _state(stored=None) -> PluginState:
+    """构造使用内存缓存与模拟插件数据的状态。"""
+    state = PluginState("ClashRuleProvider")
+    state.cache = _Cache()
+    state.plugin_data = MagicMock()
+    state.plugin_data.get_data.side_effect = lambda plugin_id, key: (stored or {}).get(key)
+    return state
+
+
+def _request(**kwargs) -> ConfigRequest:
+    return ConfigRequest(**{"url": "http://mp/config", "client_host": "10.0.0.2", **kwargs})
+
+
+def test_state_version_bumps_only_on_effective_changes():
+    """写入与已加载或已保存内容相同的值时不落库也不增加版本。"""
+    state = _state({"custom": {"a": 1, "b": [1, 2]}})
+    assert state.version == 0
+
+    assert state._get_val("custom") == {"a": 1, "b": [1, 2]}
+    state._set_val("custom", {"b": [1, 2], "a": 1})
+    state.save_data("custom", {"a": 1, "b": [1, 2]})
+    assert state.version == 0
+    state.plugin_data.save.assert_not_called()
+
+    state._set_val("custom", {"a": 2, "b": [1, 2]})
+    state.save_data("other", ["x"])
+    state.save_data("other", ["x"])
+    assert state.version == 2
+    assert state.plugin_data.save.call_count == 2
+
+    state.config = PluginConfig()
+    state.clash_template = ClashConfig()
+    assert state.version == 4
+
+
+def test_config_request_fingerprint_covers_every_field():
+    """请求指纹由全部字段决定，任一字段不同即为不同的快照。"""
+    base = _request(identifier="phone", user_agent="clash.meta")
+    assert base.fingerprint == _request(identifier="phone", user_agent="clash.meta").fingerprint
+    assert base.fingerprint != _request(identifier="laptop", user_agent="clash.meta").fingerprint
+    assert base.fingerprint != _request(identifier="phone", user_agent="stash").fingerprint
+    assert base.fingerprint != _request(identifier="phone", user_agent="clash.meta", client_host="1.1.1.1").fingerprint
+
+
+def test_snapshot_matches_if_none_match():
+    """If-None-Match 支持多个标签、弱校验前缀与通配符。"""
+    snapshot = ClashConfigSnapshot(version=1, config=ClashConfig(), content=b"a: 1\n", etag='"abc"')
+
+    assert snapshot.matches('"abc"')
+    assert snapshot.matches('W/"abc"')
+    assert snapshot.matches('"old", "abc"')
+    assert snapshot.matches("*")
+    assert not snapshot.matches('"old"')
+    assert not snapshot.matches(None) and not snapshot.matches("")
+
+
+def test_get_clash_config_reuses_snapshot_until_state_changes():
+    """状态版本不变时复用快照，状态变化后重新生成，快照数量按 LRU 限制。"""
+    state = _state()
+    service = ClashRuleProviderService("ClashRuleProvider", state)
+    service.build_clash_config = MagicMock(side_effect=lambda param: ClashConfig())
+
+    first = service.get_clash_config(_request())
+    assert service.get_clash_config(_request()) is first
+    assert service.build_clash_config.call_count == 1
+    assert b"proxy-groups: []" in first.content
+    assert first.etag.startswith('"') and first.etag.endswith('"')
+
+    state.save_data("other", ["changed"])
+    rebuilt = service.get_clash_config(_request())
+    assert rebuilt is not first and rebuilt.version == state.version
+    assert rebuilt.etag == first.etag
+
+    for index in range(Constant.CONFIG_SNAPSHOTS):
+        service.get_clash_config(_request(identifier=f"id{index}"))
+    assert len(service._config_snapshots) == Constant.CONFIG_SNAPSHOTS
+    assert _request().fingerprint not in service._config_snapshots
+
+    service.build_clash_config = MagicMock(return_value=None)
+    assert service.get_clash_config(_request(identifier="broken")) is None
+
+
+def test_config_endpoint_answers_304_for_matching_etag():
+    """客户端携带相同 ETag 时返回 304 且不带内容，否则返回 YAML 与 ETag。"""
+    snapshot = ClashConfigSnapshot(version=1, config=ClashConfig(), content=b"mode: rule\n", etag='"abc"')
+    services = MagicMock()
+    services.get_clash_config.return_value = snapshot
+    services.get_subscription_user_info.return_value = SimpleNamespace(header="upload=0; download=0")
+    api = ClashRuleProviderApi(services, PluginConfig(apikey="secret"))
+
+    def request(headers):
+        return SimpleNamespace(url="http://mp/config", client=SimpleNamespace(host="10.0.0.2"), headers=headers)
+
+    full = api.get_clash_config("secret", request({"user-agent": "clash.meta"}))
+    assert full.status_code == 200
+    assert full.body == b"mode: rule\n"
+    assert full.headers["etag"] == '"abc"' and full.headers["cache-control"] == "no-cache"
+
+    cached = api.get_clash_config("secret", request({"if-none-match": '"abc"'}))
+    assert cached.status_code == 304
+    assert cached.body == b""
+    assert cached.headers["etag"] == '"abc"'
@@ -0,0 +1,80 @@
+"""ClashRuleProvider 节点国家/地区识别测试。"""
+
+import json
+import random
+from pathlib import Path
+
+from app.plugins.clashruleprovider.helper.countrymatcher import CountryMatcher
+
+COUNTRIES_FILE = Path(__file__).resolve().parents[3] / "plugins.v2" / "clashruleprovider" / "countries.json"
+
+
+def _first_match(countries, node_name):
+    """按国家列表顺序逐个做子串判断的参考实现。"""
+    node_name_lower = node_name.lower()
+    for country in countries:
+        if country.get('emoji') and country['emoji'] in node_name:
+            return country
+        if ((country.get('chinese') and country['chinese'] in node_name) or
+                (country.get('english') and country['english'].lower() in node_name_lower)):
+            return country
+    return None
+
+
+def test_earliest_country_wins_for_overlapping_names():
+    """多个国家同时命中时返回列表中排在最前的国家，与名称长短和出现位置无关。"""
+    countries = [
+        {"abbr": "NK", "english": "North Korea"},
+        {"abbr": "KR", "english": "Korea", "emoji": "🇰🇷"},
+        {"abbr": "US", "chinese": "美国", "english": "USA", "emoji": "🇺🇸"},
+    ]
+    matcher = CountryMatcher(countries)
+
+    assert matcher.match("NORTH korea 01")["abbr"] == "NK"
+    assert matcher.match("South Korea | 美国")["abbr"] == "KR"
+    assert matcher.match("🇺🇸 Seoul korea")["abbr"] == "KR"
+    assert matcher.match("🇺🇸 洛杉矶")["abbr"] == "US"
+    assert matcher.match("usa-02")["abbr"] == "US"
+    assert matcher.match("Tokyo 01") is None
+    assert matcher.match("") is None
+
+
+def test_emoji_lookup_and_multi_codepoint_emoji():
+    """国旗 emoji 在任意位置均可命中，非两个码点的 emoji 走自动机匹配。"""
+    countries = [
+        {"abbr": "JP", "emoji": "🇯🇵"},
+        {"abbr": "XX", "emoji": "🏴‍☠️"},
+    ]
+    matcher = CountryMatcher(countries)
+
+    assert matcher.match("节点🇯🇵01")["abbr"] == "JP"
+    assert matcher.match("🏴‍☠️ pirate")["abbr"] == "XX"
+    assert matcher.match("🇯 🇵") is None
+
+
+def test_country_by_abbr_and_memo():
+    """按简称取国家时保留第一个，重复节点名直接命中记忆结果。"""
+    countries = [{"abbr": "HK", "chinese": "香港"}, {"abbr": "HK", "chinese": "中国香港"}, {"chinese": "未知"}]
+    matcher = CountryMatcher(countries)
+
+    assert matcher.country_by_abbr("HK") is countries[0]
+    assert matcher.country_by_abbr("TW") is None
+    assert matcher.match("中国香港 01") is countries[0]
+    assert matcher.match("中国香港 01") is countries[0]
+    assert matcher.match("other") is None
+    assert set(matcher._cache) == {"中国香港 01", "other"}
+
+
+def test_matches_reference_on_bundled_countries():
+    """使用插件自带的国家列表，随机节点名的识别结果与逐个子串判断一致。"""
+    countries = json.loads(COUNTRIES_FILE.read_text(encoding="utf-8"))
+    matcher = CountryMatcher(countries)
+    rng = random.Random(20261018)
+    words = [value for country in countries for value in (country.get("chinese"), country.get("english"),
+                                                           country.get("emoji")) if value]
+    words += ["IPLC", "专线", "01", "x2", "|", "-", "HK", "节点", "Premium", "🔥"]
+
+    for _ in range(3000):
+        parts = rng.sample(words, rng.randint(1, 4))
+        name = " ".join(part.upper() if rng.random() < 0.2 else part for part in parts)
+        assert matcher.match(name) is _first_match(countries, name), name
@@ -0,0 +1,70 @@
+"""CrossSeed 辅种缓存有序集合与压缩持久化测试。"""
+
+from unittest.mock import MagicMock
+
+from app.plugins.crossseed import CrossSeed
+from app.plugins.crossseed.seed_cache import SeedCache
+
+
+def test_membership_and_fifo_eviction():
+    """超出上限时淘汰最早写入的记录，重复写入视为最近写入。"""
+    cache = SeedCache(["a", "b", "c"], max_items=3)
+    cache.add("a")
+    cache.add("d")
+
+    assert "b" not in cache
+    assert cache.to_list() == ["c", "a", "d"]
+    cache.add("")
+    assert len(cache) == 3
+
+
+def test_dumps_round_trip_keeps_order():
+    """压缩文本恢复后记录与顺序不变，空缓存序列化为空字符串。"""
+    cache = SeedCache([f"hash-{index}" for index in range(1000)])
+    restored = SeedCache.loads(cache.dumps())
+
+    assert restored.to_list() == cache.to_list()
+    assert len(cache.dumps()) < sum(len(item) + 1 for item in cache)
+    assert SeedCache().dumps() == ""
+
+
+def test_loads_tolerates_corrupt_data_and_applies_limit():
+    """数据损坏时返回空缓存，恢复时按新的上限淘汰最早记录。"""
+    assert len(SeedCache.loads("not-base64!")) == 0
+    assert len(SeedCache.loads(None)) == 0
+
+    data = SeedCache(["a", "b", "c"]).dumps()
+    assert SeedCache.loads(data, max_items=2).to_list() == ["b", "c"]
+
+
+def _plugin(stored: dict, clearcache: bool = False) -> CrossSeed:
+    """绕过 __init__ 构造插件，插件数据读写替换为 mock。"""
+    plugin = object.__new__(CrossSeed)
+    plugin._clearcache = clearcache
+    plugin.get_data = MagicMock(return_value=stored)
+    plugin.save_data = MagicMock()
+    return plugin
+
+
+def test_load_migrates_legacy_config_lists_and_saves_compact():
+    """旧版保存在插件配置中的缓存列表合并到插件数据缓存，保存时写入压缩文本。"""
+    stored = {"success_caches": SeedCache(["a"]).dumps()}
+    plugin = _plugin(stored)
+
+    plugin._CrossSeed__load_seed_caches({"success_caches": ["b"], "error_caches": ["c"]})
+    plugin._CrossSeed__save_seed_caches()
+
+    assert plugin._success_caches.to_list() == ["a", "b"]
+    assert "c" in plugin._error_caches
+    saved = plugin.save_data.call_args.args[1]
+    assert SeedCache.loads(saved["success_caches"]).to_list() == ["a", "b"]
+    assert saved["permanent_error_caches"] == ""
+
+
+def test_clearcache_empties_all_caches():
+    """清除缓存时忽略插件数据和旧版配置列表。"""
+    plugin = _plugin({"success_caches": SeedCache(["a"]).dumps()}, clearcache=True)
+
+    plugin._CrossSeed__load_seed_caches({"error_caches": ["c"]})
+
+    assert all(len(getattr(plugin, f"_{name}")) == 0 for name in CrossSeed._seed_cache_names)
@@ -0,0 +1,146 @@
+"""CrossSeed 本地种子文件索引与多站点并发查询测试。"""
+
+import os
+import time
+from threading import Event
+from types import SimpleNamespace
+from unittest.mock import MagicMock, PropertyMock, patch
+
+from bencode import bencode
+
+from app.plugins.crossseed import CrossSeed, CrossSeedHelper, CSSiteConfig, TorInfo
+from app.plugins.crossseed.torrent_index import TorrentIndex
+
+
+def _write_torrent(path, name: str = "movie", announce: str = "https://tracker.test/announce"):
+    """写入最小可解析的种子文件，返回其 info_hash。"""
+    info = {"name": name, "piece length": 16384, "pieces": b"\xff" * 20, "length": 1}
+    path.write_bytes(bencode({"announce": announce, "info": info}))
+    local_tor, _ = TorInfo.from_data(path.read_bytes())
+    return local_tor.info_hash
+
+
+def test_unchanged_file_is_served_from_index(tmp_path):
+    """文件未变化时直接读取索引，不再解析种子文件；文件变化后重新解析。"""
+    torrent_path = tmp_path / "a.torrent"
+    info_hash = _write_torrent(torrent_path)
+    index = TorrentIndex(tmp_path / "index.json")
+    index.begin_scan()
+
+    first, _ = CrossSeedHelper.get_local_torrent_info(torrent_path, index=index, info_hash=info_hash, downloader="qb")
+    with patch.object(TorInfo, "from_data", side_effect=AssertionError("should not parse")):
+        cached, _ = CrossSeedHelper.get_local_torrent_info(torrent_path, index=index, info_hash=info_hash,
+                                                           downloader="qb")
+
+    assert (cached.pieces_hash, cached.torrent_announce) == (first.pieces_hash, "https://tracker.test/announce")
+    assert (index.hits, index.misses) == (1, 1)
+
+    _write_torrent(torrent_path, announce="https://other.test/announce")
+    stat = torrent_path.stat()
+    os.utime(torrent_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    changed, _ = CrossSeedHelper.get_local_torrent_info(torrent_path, index=index, info_hash=info_hash,
+                                                        downloader="qb")
+    assert changed.torrent_announce == "https://other.test/announce"
+    assert index.misses == 2
+
+
+def test_index_persists_and_ignores_other_versions(tmp_path):
+    """索引写回磁盘后可重新加载，版本不一致或损坏时从空索引开始。"""
+    torrent_path = tmp_path / "a.torrent"
+    info_hash = _write_torrent(torrent_path)
+    index_path = tmp_path / "index.json"
+    index = TorrentIndex(index_path)
+    index.begin_scan()
+    index.update("qb", info_hash, torrent_path.stat(), "pieces", None)
+    index.save()
+
+    reloaded = TorrentIndex(index_path)
+    reloaded.load()
+    assert reloaded.lookup("qb", info_hash, torrent_path.stat())["pieces_hash"] == "pieces"
+
+    index_path.write_text('{"version": 1, "entries": {"x": {}}}', encoding="utf-8")
+    reloaded.load()
+    assert len(reloaded) == 0
+    index_path.write_text("corrupt", encoding="utf-8")
+    reloaded.load()
+    assert len(reloaded) == 0
+
+
+def test_prune_only_touches_downloaders_listed_this_run(tmp_path):
+    """只清理本次成功列出种子的下载器中未访问到的记录，获取列表失败的下载器保留原有索引。"""
+    stat = (tmp_path / "index.json").parent.stat()
+    index = TorrentIndex(tmp_path / "index.json")
+    for downloader in ("qb", "tr"):
+        for info_hash in ("kept", "removed"):
+            index.update(downloader, info_hash, stat, f"{downloader}-{info_hash}", None)
+
+    index.begin_scan()
+    index.mark_listed("qb")
+    index.lookup("qb", "kept", stat)
+    index.save(prune=True)
+
+    assert index.lookup("qb", "kept", stat) is not None
+    assert index.lookup("qb", "removed", stat) is None
+    assert index.lookup("tr", "kept", stat) is not None
+    assert index.lookup("tr", "removed", stat) is not None
+
+
+def test_sites_are_queried_concurrently_with_per_site_gap():
+    """多个站点并发查询，同一站点分批请求之间按 query_gap 间隔，最后一批后不再等待。"""
+    helper = CrossSeedHelper()
+    sites = [CSSiteConfig(name=f"site-{index}", query_gap=0.2) for index in range(3)]
+    calls = []
+
+    def query(site, chunk):
+        calls.append((site.name, time.monotonic()))
+        return [TorInfo.remote(site.name, pieces_hash, "1") for pieces_hash in chunk], None
+
+    helper.get_target_torrent = MagicMock(side_effect=query)
+    started = time.monotonic()
+    results = helper.get_target_torrents(sites, ["a", "b", "c"], chunk_size=2)
+
+    assert {name: len(tors) for name, tors in results.items()} == {"site-0": 3, "site-1": 3, "site-2": 3}
+    assert time.monotonic() - started < 0.5
+    for site in sites:
+        times = [at for name, at in calls if name == site.name]
+        assert len(times) == 2 and times[1] - times[0] >= 0.19
+
+
+def test_stop_event_interrupts_site_gap():
+    """停止辅种时中断站点请求间隔，不再查询后续批次。"""
+    helper = CrossSeedHelper()
+    stop_event = Event()
+    helper.get_target_torrent = MagicMock(side_effect=lambda site, chunk: (stop_event.set() or [], None))
+
+    results = helper.get_target_torrents([CSSiteConfig(name="a", query_gap=10)], ["a", "b"], chunk_size=1,
+                                         stop_event=stop_event)
+
+    assert results == {"a": []}
+    assert helper.get_target_torrent.call_count == 1
+
+
+def test_auto_seed_keeps_index_of_downloader_whose_listing_failed(tmp_path):
+    """辅种运行中获取种子列表失败的下载器不清理索引，成功列出的下载器移除已删除的种子。"""
+    stat = tmp_path.stat()
+    index = TorrentIndex(tmp_path / "index.json")
+    index.update("qb", "gone", stat, "pieces", None)
+    index.update("tr", "kept", stat, "pieces", None)
+    plugin = object.__new__(CrossSeed)
+    plugin._torrent_index = index
+    plugin._event = Event()
+    plugin._notify = False
+    plugin._torrentpaths = [str(tmp_path), str(tmp_path)]
+    listed, failed = MagicMock(), MagicMock()
+    listed.get_completed_torrents.return_value = []
+    failed.get_completed_torrents.return_value = None
+    services = {
+        "qb": SimpleNamespace(name="qb", type="qbittorrent", instance=listed),
+        "tr": SimpleNamespace(name="tr", type="transmission", instance=failed),
+    }
+
+    with patch.object(CrossSeed, "service_infos", new_callable=PropertyMock, return_value=services), \
+            patch.object(CrossSeed, "_CrossSeed__update_config"):
+        plugin.auto_seed()
+
+    assert index.lookup("qb", "gone", stat) is None
+    assert index.lookup("tr", "kept", stat) is not None
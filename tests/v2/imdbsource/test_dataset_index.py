@@ -0,0 +1,130 @@
+"""IMDb 离线数据集索引的导入、增量更新与查询测试。"""
+
+import gzip
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from app.plugins.imdbsource.datasetindex import ImdbDatasetIndex
+
+BASICS_HEADER = "tconst\ttitleType\tprimaryTitle\toriginalTitle\tisAdult\tstartYear\tendYear\truntimeMinutes\tgenres"
+AKAS_HEADER = "titleId\tordering\ttitle\tregion\tlanguage\ttypes\tattributes\tisOriginalTitle"
+
+
+def _basics(*titles) -> List[str]:
+    """构造 title.basics 行：(tconst, 类型, 标题, 原始标题, 年份)。"""
+    return [f"{tconst}\t{title_type}\t{title}\t{original}\t0\t{year}\t\\N\t100\tDrama,Crime"
+            for tconst, title_type, title, original, year in titles]
+
+
+def _akas(*akas) -> List[str]:
+    """构造 title.akas 行：(tconst, 别名, 地区)。"""
+    return [f"{tconst}\t1\t{title}\t{region}\t\\N\t\\N\t\\N\t0" for tconst, title, region in akas]
+
+
+class _Datasets:
+    """按数据集模拟条件下载，未设置内容的数据集视为未变化。"""
+
+    def __init__(self, tmp_path: Path):
+        self.tmp_path = tmp_path
+        self.files: Dict[str, Optional[List[str]]] = {}
+        self.calls: List[str] = []
+
+    def download(self, conn, dataset, stop_event):
+        self.calls.append(dataset)
+        rows = self.files.pop(dataset, None)
+        if rows is None:
+            return None
+        header = BASICS_HEADER if dataset == "title.basics" else AKAS_HEADER
+        path = self.tmp_path / f"{dataset}.tsv.gz"
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            f.write("\n".join([header, *rows]) + "\n")
+        return path
+
+
+def _index(tmp_path: Path):
+    index = ImdbDatasetIndex(tmp_path / "imdb_dataset.db")
+    datasets = _Datasets(tmp_path)
+    index._download = datasets.download
+    return index, datasets
+
+
+def test_refresh_indexes_titles_and_akas(tmp_path):
+    """只索引识别用到的类型，标题与别名归一化后均可查询，并支持类型与年份过滤。"""
+    index, datasets = _index(tmp_path)
+    assert not index.ready
+    datasets.files["title.basics"] = _basics(
+        ("tt0000001", "movie", "The Movie", "Le Film", "2001"),
+        ("tt0000002", "tvSeries", "The Movie", "The Movie", "2005"),
+        ("tt0000003", "tvEpisode", "Pilot", "Pilot", "2005"),
+    )
+    datasets.files["title.akas"] = _akas(("tt0000001", "电影", "CN"), ("tt0000003", "试播", "CN"))
+
+    assert index.refresh()
+    assert index.ready
+
+    assert {item["id"] for item in index.lookup("the movie")} == {"tt0000001", "tt0000002"}
+    assert [item["id"] for item in index.lookup("The-Movie", types=["movie"])] == ["tt0000001"]
+    assert [item["id"] for item in index.lookup("the movie", year=2005)] == ["tt0000002"]
+    movie = index.lookup("电影")[0]
+    assert movie["originalTitle"] == "Le Film" and movie["startYear"] == 2001
+    assert movie["genres"] == ["Drama", "Crime"]
+    assert index.lookup("Pilot") == [] and index.lookup("试播") == []
+    assert index.akas("tt0000001") == [("电影", "CN")]
+    assert index.stats()["titles"] == "2"
+    index.close()
+
+
+def test_unchanged_datasets_skip_and_removed_titles_are_pruned(tmp_path):
+    """数据集未变化时不更新；basics 变化后下架条目及其别名被清理。"""
+    index, datasets = _index(tmp_path)
+    datasets.files["title.basics"] = _basics(("tt0000001", "movie", "Alpha", "Alpha", "2001"),
+                                             ("tt0000002", "movie", "Beta", "Beta", "2002"))
+    datasets.files["title.akas"] = _akas(("tt0000002", "贝塔", "CN"))
+    assert index.refresh()
+    assert not index.refresh()
+
+    datasets.files["title.basics"] = _basics(("tt0000001", "movie", "Alpha Prime", "Alpha", "2001"))
+    assert index.refresh()
+
+    assert index.lookup("Beta") == [] and index.lookup("贝塔") == []
+    assert [item["primaryTitle"] for item in index.lookup("Alpha")] == ["Alpha Prime"]
+    assert index.lookup("Alpha Prime")[0]["id"] == "tt0000001"
+    index.close()
+
+
+def test_force_refresh_keeps_generation_increasing(tmp_path):
+    """强制刷新重新下载全部数据集，代数继续递增，不在新数据集中的旧记录被清理。"""
+    index, datasets = _index(tmp_path)
+    datasets.files["title.basics"] = _basics(("tt0000001", "movie", "Alpha", "Alpha", "2001"),
+                                             ("tt0000002", "movie", "Beta", "Beta", "2002"))
+    datasets.files["title.akas"] = _akas(("tt0000002", "贝塔", "CN"))
+    assert index.refresh()
+
+    datasets.files["title.basics"] = _basics(("tt0000001", "movie", "Alpha", "Alpha", "2001"))
+    datasets.files["title.akas"] = _akas(("tt0000001", "阿尔法", "CN"))
+    assert index.refresh(force=True)
+
+    assert index.lookup("Beta") == [] and index.lookup("贝塔") == []
+    assert index.lookup("阿尔法")[0]["id"] == "tt0000001"
+    conn = index._reader()
+    assert ImdbDatasetIndex._get_meta(conn, "title.basics.gen") == "2"
+    assert conn.execute("SELECT COUNT(*) FROM titles").fetchone()[0] == 1
+    index.close()
+
+
+def test_schema_change_rebuilds_index(tmp_path):
+    """索引版本变化时清空旧记录后重新导入。"""
+    index, datasets = _index(tmp_path)
+    datasets.files["title.basics"] = _basics(("tt0000001", "movie", "Alpha", "Alpha", "2001"))
+    assert index.refresh()
+
+    index.SCHEMA_VERSION = ImdbDatasetIndex.SCHEMA_VERSION + 1
+    index._ready = None
+    assert not index.ready
+    datasets.files["title.basics"] = _basics(("tt0000002", "movie", "Beta", "Beta", "2002"))
+    assert index.refresh()
+
+    assert index.ready
+    assert index.lookup("Alpha") == []
+    assert index.lookup("Beta")[0]["id"] == "tt0000002"
+    index.close()
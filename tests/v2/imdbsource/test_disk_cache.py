@@ -0,0 +1,109 @@
+"""IMDb 响应磁盘缓存层的有效期、淘汰与装饰器测试。"""
+
+import asyncio
+import os
+import threading
+import time
+
+from app.plugins.imdbsource.diskcache import DiskCache, _MISS, disk_cached, imdbapi_family
+
+
+def test_get_set_and_ttl(tmp_path):
+    """写入后可读取，过期条目视为未命中，并按类别统计命中率。"""
+    cache = DiskCache(tmp_path / "cache.db")
+    cache.set("imdbapi.title", "k1", {"id": "tt1", "names": ["甲"]})
+    cache.set("imdbapi.title", "k2", ["x"], ttl=-1)
+
+    assert cache.get("imdbapi.title", "k1") == {"id": "tt1", "names": ["甲"]}
+    assert cache.get("imdbapi.title", "k2") is _MISS
+    assert cache.get("imdbapi.title", "k3") is _MISS
+    stats = cache.stats()
+    assert (stats["hits"], stats["lookups"], stats["entries"]) == (1, 3, 2)
+    assert stats["families"]["imdbapi.title"]["writes"] == 2
+
+    cache.clear()
+    assert cache.get("imdbapi.title", "k1") is _MISS
+    assert cache.stats()["size"] == 0
+    cache.close()
+
+
+def test_evicts_least_recently_accessed(tmp_path):
+    """总大小超过上限时按最近访问时间淘汰到上限的 90%，最近读取过的条目保留。"""
+    cache = DiskCache(tmp_path / "cache.db")
+    payload = lambda: os.urandom(750).hex()
+    for key in ("a", "b", "c"):
+        cache.set("graphql", key, payload())
+        time.sleep(0.01)
+    assert cache.get("graphql", "a") is not _MISS
+    cache._max_bytes = cache.stats()["size"] + 100
+    cache.set("graphql", "d", payload())
+
+    assert cache.get("graphql", "b") is _MISS
+    assert all(cache.get("graphql", key) is not _MISS for key in ("a", "d"))
+    assert cache.stats()["size"] <= cache._max_bytes * 0.9
+    cache.close()
+
+
+class _Api:
+    """使用磁盘缓存的接口客户端。"""
+
+    def __init__(self, cache, responses):
+        self.disk_cache = cache
+        self.responses = responses
+        self.calls = []
+        self.threads = []
+
+    @disk_cached(imdbapi_family)
+    def _free_imdb_api(self, path, params=None):
+        self.calls.append(path)
+        return self.responses.get(path)
+
+    @disk_cached(imdbapi_family)
+    async def _async_free_imdb_api(self, path, params=None):
+        self.calls.append(path)
+        return self.responses.get(path)
+
+
+def test_sync_and_async_share_entries_and_skip_empty_results(tmp_path):
+    """同步与异步版本共用缓存条目，空结果、接口错误与 TMDB 未匹配结果不落盘。"""
+    cache = DiskCache(tmp_path / "cache.db")
+    api = _Api(cache, {
+        "/titles/tt1": {"id": "tt1"},
+        "/search/titles": {"titles": []},
+        "/titles/tt2": {"error": "rate limited"},
+        "/titles/tt3": [],
+    })
+
+    assert api._free_imdb_api("/titles/tt1") == {"id": "tt1"}
+    assert asyncio.run(api._async_free_imdb_api("/titles/tt1")) == {"id": "tt1"}
+    for path in ("/search/titles", "/titles/tt2", "/titles/tt3", "/missing"):
+        api._free_imdb_api(path)
+        asyncio.run(api._async_free_imdb_api(path))
+
+    assert api.calls.count("/titles/tt1") == 1
+    for path in ("/search/titles", "/titles/tt2", "/titles/tt3", "/missing"):
+        assert api.calls.count(path) == 2
+    assert set(cache.stats()["families"]) == {"imdbapi.title", "imdbapi.search"}
+
+    api.disk_cache = None
+    assert api._free_imdb_api("/titles/tt1") == {"id": "tt1"}
+    assert api.calls.count("/titles/tt1") == 2
+    cache.close()
+
+
+def test_async_wrapper_uses_worker_thread(tmp_path):
+    """异步版本的磁盘读写在线程中执行，不占用事件循环线程。"""
+    cache = DiskCache(tmp_path / "cache.db")
+    threads = set()
+    get, set_ = cache.get, cache.set
+    cache.get = lambda *args: threads.add(threading.get_ident()) or get(*args)
+    cache.set = lambda *args: threads.add(threading.get_ident()) or set_(*args)
+    api = _Api(cache, {"/titles/tt1": {"id": "tt1"}})
+
+    async def call():
+        return threading.get_ident(), await api._async_free_imdb_api("/titles/tt1")
+
+    loop_thread, value = asyncio.run(call())
+    assert value == {"id": "tt1"}
+    assert len(threads) >= 1 and loop_thread not in threads
+    cache.close()
@@ -0,0 +1,134 @@
+"""IMDb 分页预取迭代与共享限速器测试。"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.plugins.imdbsource.pagination import Paginator, RateLimiter
+
+PAGES = {None: {"items": [1, 2], "next": "p2"}, "p2": {"items": [3], "next": "p3"}, "p3": {"items": [4, 5]}}
+
+
+def test_rate_limiter_allows_burst_then_spaces_tokens():
+    """令牌桶先放行 burst 个请求，之后按速率等待。"""
+    limiter = RateLimiter(rate=20, burst=2)
+    started = time.monotonic()
+    limiter.acquire()
+    limiter.acquire()
+    assert time.monotonic() - started < 0.03
+    limiter.acquire()
+    limiter.acquire()
+    assert time.monotonic() - started >= 0.09
+
+    async def acquire_twice():
+        await limiter.async_acquire()
+        await limiter.async_acquire()
+
+    started = time.monotonic()
+    asyncio.run(acquire_twice())
+    assert time.monotonic() - started >= 0.09
+
+
+def test_iterate_follows_tokens_and_prefetches():
+    """同步迭代按 token 依次取页，调用方处理当前页时后台已在拉取下一页。"""
+    fetched = []
+    second_page = threading.Event()
+
+    def fetch(token):
+        fetched.append(token)
+        if token == "p2":
+            second_page.set()
+        return PAGES[token]
+
+    items = []
+    for item in Paginator(prefetch=1).iterate(fetch, lambda page: page.get("next"), lambda page: page["items"]):
+        if item == 1:
+            assert second_page.wait(1)
+        items.append(item)
+
+    assert items == [1, 2, 3, 4, 5]
+    assert fetched == [None, "p2", "p3"]
+
+
+def test_iterate_raises_fetch_error_and_stops_on_empty_page():
+    """后台取页异常在迭代方抛出，空页面结束迭代。"""
+    def failing(token):
+        if token == "p2":
+            raise ConnectionError("boom")
+        return PAGES[token]
+
+    items = []
+    with pytest.raises(ConnectionError):
+        for item in Paginator().iterate(failing, lambda page: page.get("next"), lambda page: page["items"]):
+            items.append(item)
+    assert items == [1, 2]
+
+    pages = Paginator().iterate(lambda token: None if token else PAGES[None],
+                                lambda page: page.get("next"), lambda page: page["items"])
+    assert list(pages) == [1, 2]
+
+
+def test_iterate_stops_background_fetch_when_closed_early():
+    """调用方提前结束迭代后后台线程不再继续拉取后续页面。"""
+    fetched = []
+
+    def endless(token):
+        fetched.append(token)
+        return {"items": [token or 0], "next": (token or 0) + 1}
+
+    pages = Paginator(prefetch=1).iterate(endless, lambda page: page["next"], lambda page: page["items"])
+    assert next(pages) == 0
+    pages.close()
+    time.sleep(0.1)
+    count = len(fetched)
+    time.sleep(0.6)
+    assert len(fetched) == count <= 4
+
+
+def test_async_iterate_prefetches_and_propagates_errors():
+    """异步迭代与同步迭代行为一致，并共享限速器。"""
+    fetched = []
+
+    async def fetch(token):
+        fetched.append(token)
+        await asyncio.sleep(0)
+        return PAGES[token]
+
+    async def failing(token):
+        if token == "p3":
+            raise ValueError("bad page")
+        return PAGES[token]
+
+    async def collect(paginator, fetcher):
+        return [item async for item in paginator.async_iterate(fetcher, lambda page: page.get("next"),
+                                                               lambda page: page["items"])]
+
+    paginator = Paginator(limiter=RateLimiter(rate=1000, burst=5))
+    assert asyncio.run(collect(paginator, fetch)) == [1, 2, 3, 4, 5]
+    assert fetched == [None, "p2", "p3"]
+    with pytest.raises(ValueError):
+        asyncio.run(collect(paginator, failing))
+
+
+def test_async_iterate_cancels_producer_on_early_exit():
+    """异步迭代提前结束时取消后台拉取任务。"""
+    fetched = []
+
+    async def endless(token):
+        fetched.append(token)
+        await asyncio.sleep(0.01)
+        return {"items": [token or 0], "next": (token or 0) + 1}
+
+    async def first_item():
+        pages = Paginator(prefetch=1).async_iterate(endless, lambda page: page["next"], lambda page: page["items"])
+        item = await pages.__anext__()
+        await pages.aclose()
+        count = len(fetched)
+        await asyncio.sleep(0.1)
+        return item, count
+
+    item, count = asyncio.run(first_item())
+    assert item == 0
+    assert len(fetched) == count <= 3
@@ -0,0 +1,147 @@
+"""IYUUAutoSeed 辅种查询分组并发与 TTL 结果缓存测试。"""
+
+import base64
+import json
+import threading
+import time
+import zlib
+from unittest.mock import MagicMock
+
+from app.plugins.iyuuautoseed.iyuu_helper import IyuuHelper
+
+
+def _helper(ttl: float = 3600, chunk_size: int = 2, responses=None) -> IyuuHelper:
+    """构造不发起网络请求的 IYUU 助手，按请求中的 Hash 返回辅种结果。"""
+    helper = IyuuHelper(token="token", cache_ttl=ttl)
+    helper._query_chunk_size = chunk_size
+    helper._query_interval = 0
+    helper.queries = []
+    lock = threading.Lock()
+
+    def request(url, method="get", params=None):
+        if url == "/reseed/sites/reportExisting":
+            return {"sid_sha1": "sid"}, ""
+        if url == "/reseed/sites/index":
+            return {"sites": []}, ""
+        hashes = json.loads(params["hash"])
+        with lock:
+            helper.queries.append(hashes)
+        if responses:
+            return responses(hashes, params)
+        return {h: {"torrent": [{"sid": 1, "torrent_id": h}]} for h in hashes if not h.startswith("none")}, ""
+
+    helper._IyuuHelper__request_iyuu = MagicMock(side_effect=request)
+    return helper
+
+
+def test_query_splits_hashes_into_chunks_and_merges_results():
+    """Hash 去重后按分组大小拆分并发查询，合并全部分组的可辅种结果。"""
+    helper = _helper(chunk_size=2)
+
+    result, msg = helper.query_seed_info(["a", "b", "c", "a", "none-d"])
+
+    assert msg == ""
+    assert set(result) == {"a", "b", "c"}
+    assert sorted(map(tuple, helper.queries)) == [("a", "b"), ("c", "none-d")]
+
+
+def test_cached_results_skip_iyuu_until_ttl_expires():
+    """TTL 内再次查询直接读取缓存（含无结果的 Hash），只发送新增 Hash。"""
+    helper = _helper()
+    helper.query_seed_info(["a", "none-b"])
+    helper.queries.clear()
+
+    result, _ = helper.query_seed_info(["a", "none-b", "c"])
+
+    assert set(result) == {"a", "c"}
+    assert helper.queries == [["c"]]
+
+    for info_hash, (cached_at, seed_info) in list(helper._seed_cache.items()):
+        helper._seed_cache[info_hash] = (cached_at - 3600, seed_info)
+    helper.queries.clear()
+    helper.query_seed_info(["a"])
+    assert helper.queries == [["a"]]
+
+
+def test_zero_ttl_disables_cache():
+    """TTL 为 0 时不缓存，每次都查询全部 Hash。"""
+    helper = _helper(ttl=0)
+    helper.query_seed_info(["a"])
+    helper.query_seed_info(["a"])
+
+    assert helper.queries == [["a"], ["a"]]
+    assert helper._seed_cache == {}
+
+
+def test_failed_chunks_are_reported_and_not_cached():
+    """部分分组失败时返回成功分组结果与错误信息，失败分组不写入缓存；全部失败时数据为 None。"""
+    def responses(hashes, _params):
+        if "bad" in hashes:
+            return None, "请求IYUU失败，状态码：500"
+        return {h: {"torrent": []} for h in hashes}, ""
+
+    helper = _helper(chunk_size=1, responses=responses)
+    result, msg = helper.query_seed_info(["a", "bad"])
+
+    assert set(result) == {"a"}
+    assert msg == "请求IYUU失败，状态码：500"
+    assert set(helper._seed_cache) == {"a"}
+    assert helper.query_seed_info(["bad"]) == (None, "请求IYUU失败，状态码：500")
+
+
+def test_expired_sid_sha1_is_reported_once_for_concurrent_chunks():
+    """多个分组同时返回站点哈希值失效时只重新汇报一次并重试。"""
+    def responses(hashes, params):
+        if params["sid_sha1"] == "stale":
+            return None, "站点哈希值 require"
+        return {h: {"torrent": []} for h in hashes}, ""
+
+    helper = _helper(chunk_size=1, responses=responses)
+    helper._sid_sha1 = "stale"
+
+    result, msg = helper.query_seed_info(["a", "b", "c"])
+
+    assert (set(result), msg) == ({"a", "b", "c"}, "")
+    reports = [call for call in helper._IyuuHelper__request_iyuu.call_args_list
+               if call.kwargs.get("url") == "/reseed/sites/reportExisting"]
+    assert len(reports) == 1
+
+
+def test_cache_dump_round_trip_drops_expired_entries():
+    """压缩持久化只保留未过期的缓存，恢复后可直接命中。"""
+    helper = _helper()
+    helper.query_seed_info(["a", "none-b"])
+    helper._seed_cache["old"] = (0, {"torrent": []})
+
+    restored = _helper()
+    restored.load_cache(helper.dump_cache())
+    result, _ = restored.query_seed_info(["a", "none-b"])
+
+    assert set(restored._seed_cache) == {"a", "none-b"}
+    assert set(result) == {"a"}
+    assert restored.queries == []
+    restored.load_cache("corrupt")
+    assert restored._seed_cache == {}
+
+
+def test_load_cache_skips_malformed_entries():
+    """持久化数据中结构不符的记录应逐条跳过，合法记录照常恢复。"""
+    now = time.time()
+    items = [
+        ["a", now, {"torrent": []}],
+        ["none-b", now, None],
+        ["short", now],
+        ["bad-time", "yesterday", None],
+        ["bool-time", True, None],
+        [1, now, None],
+        ["bad-info", now, "x"],
+        "not-a-list",
+    ]
+    text = json.dumps(items)
+    helper = _helper()
+    helper.load_cache(base64.b64encode(zlib.compress(text.encode("utf-8"))).decode("ascii"))
+
+    assert set(helper._seed_cache) == {"a", "none-b"}
+
+    helper.load_cache(base64.b64encode(zlib.compress(b'{"a": 1}')).decode("ascii"))
+    assert helper._seed_cache == {}
@@ -0,0 +1,47 @@
+"""TorrentFilter 预编译路径前缀树与标签、分类集合测试。"""
+
+from app.plugins.iyuuautoseed.torrent_filter import TorrentFilter
+
+
+def test_excluded_path_returns_configured_prefix():
+    """保存路径以任一不处理目录开头时返回配置中的原始目录，路径先规范化再比较。"""
+    torrent_filter = TorrentFilter(nopaths="/downloads/tv/\n\n  /data/movie  \nD:\\PT\\skip")
+
+    assert torrent_filter.has_nopaths
+    assert torrent_filter.excluded_path("/downloads/tv/show/S01") == "/downloads/tv/"
+    assert torrent_filter.excluded_path("/data/movie") == "/data/movie"
+    assert torrent_filter.excluded_path("/data/./movie/x") == "/data/movie"
+    assert torrent_filter.excluded_path("D:/PT/skip/a") == "D:\\PT\\skip"
+    assert torrent_filter.excluded_path("/data/mov") is None
+    assert torrent_filter.excluded_path("/other/movie") is None
+    assert torrent_filter.excluded_path(None) is None
+
+
+def test_shorter_prefix_wins():
+    """嵌套的不处理目录中先命中较短的前缀，与逐个 startswith 判断一致。"""
+    torrent_filter = TorrentFilter(nopaths="/data/a/b\n/data/a")
+
+    assert torrent_filter.excluded_path("/data/a/b/c") == "/data/a"
+    assert TorrentFilter(nopaths="").excluded_path("/data") is None
+
+
+def test_labels_and_category():
+    """不处理标签、必需标签与允许分类按集合判断，未配置时不做限制。"""
+    torrent_filter = TorrentFilter(nolabels="skip, 保种 ,",
+                                   includelabels="pt,keep",
+                                   includecategory="movie,tv")
+
+    assert torrent_filter.excluded_label(["a", "保种"]) == "保种"
+    assert torrent_filter.excluded_label(["a"]) is None
+    assert torrent_filter.missing_label(["pt", "keep", "x"]) is None
+    assert torrent_filter.missing_label(["pt"]) == "keep"
+    assert torrent_filter.missing_label(None) in {"pt", "keep"}
+    assert torrent_filter.category_allowed("tv")
+    assert not torrent_filter.category_allowed("music")
+    assert not torrent_filter.category_allowed(None)
+
+    empty = TorrentFilter()
+    assert not (empty.has_nopaths or empty.has_nolabels or empty.has_includelabels or empty.has_includecategory)
+    assert empty.excluded_label(["skip"]) is None
+    assert empty.missing_label([]) is None
+    assert empty.category_allowed(None)
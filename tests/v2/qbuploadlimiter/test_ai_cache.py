@@ -0,0 +1,107 @@
+"""QbUploadLimiter AI 决策指纹缓存与分块并发评估测试。"""
+
+import json
+import re
+import threading
+from unittest.mock import MagicMock
+
+from app.plugins.qbuploadlimiter import QbUploadLimiter
+
+
+def _plugin() -> QbUploadLimiter:
+    """绕过 __init__ 构造插件，大模型调用按提示词中的序号返回限速决策。"""
+    plugin = object.__new__(QbUploadLimiter)
+    plugin._ai_decisions = {}
+    plugin._ai_metrics = {}
+    plugin._canceled_hashes = {}
+    plugin._ai_site_ratio_threshold = 0
+    plugin._ai_config_missing = False
+    plugin._ai_eval_interval = 3600
+    plugin._ai_max_limit = 0
+    plugin._upload_limit = 500
+    plugin._last_ai_eval_at = 0.0
+    plugin._is_torrent_active = MagicMock(return_value=True)
+    plugin._window_upload_delta = MagicMock(return_value=0)
+    plugin._torrent_site = MagicMock(return_value="site")
+    plugin._build_site_ratio_lines = MagicMock(return_value="无")
+    plugin.prompts = []
+    lock = threading.Lock()
+
+    def invoke(prompt, timeout=180):
+        indexes = [int(index) for index in re.findall(r"^\[(\d+)]", prompt, re.M)]
+        with lock:
+            plugin.prompts.append(indexes)
+        results = [{"index": index, "action": "limit", "limit_kb": 100, "reason": "ok"} for index in indexes]
+        return json.dumps({"results": results}), {"input_tokens": 10, "output_tokens": 2}
+
+    plugin._ai_invoke_with_usage = MagicMock(side_effect=invoke)
+    return plugin
+
+
+def _torrents(count: int, ratio: float = 1.0, upspeed: float = 0):
+    """构造 qBittorrent 种子列表。"""
+    return [{"hash": f"h{index}", "ratio": ratio, "upspeed": upspeed} for index in range(count)]
+
+
+def test_fingerprint_buckets_ratio_speed_and_site_ratio():
+    """分享率与站点分享率按 0.5 分桶、上传速度按 2 的幂分桶，桶内变化指纹不变。"""
+    assert QbUploadLimiter._ai_fingerprint(1.1, 0, None) == QbUploadLimiter._ai_fingerprint(1.4, 0, None)
+    assert QbUploadLimiter._ai_fingerprint(1.1, 0, None) != QbUploadLimiter._ai_fingerprint(1.6, 0, None)
+    assert QbUploadLimiter._ai_fingerprint(1, 5 * 1024, 2) == QbUploadLimiter._ai_fingerprint(1, 6 * 1024, 2.2)
+    assert QbUploadLimiter._ai_fingerprint(1, 5 * 1024, 2) != QbUploadLimiter._ai_fingerprint(1, 9 * 1024, 2)
+    assert QbUploadLimiter._ai_fingerprint(1, 0, None).endswith(":-")
+
+
+def test_changed_torrents_are_evaluated_in_chunks():
+    """超过分块大小的种子分块调用大模型，分块内序号从 0 编号并统计 token 用量。"""
+    plugin = _plugin()
+    count = QbUploadLimiter._AI_CHUNK_SIZE + 5
+
+    decisions = plugin._ai_evaluate("qb", _torrents(count), "qbittorrent", {}, now=10_000)
+
+    assert len(decisions) == count
+    assert sorted(len(indexes) for indexes in plugin.prompts) == [5, QbUploadLimiter._AI_CHUNK_SIZE]
+    assert all(indexes[0] == 0 for indexes in plugin.prompts)
+    metrics = plugin._ai_metrics["qb"]
+    assert (metrics["sent"], metrics["reused"]) == (count, 0)
+    assert sum(chunk["input_tokens"] for chunk in metrics["chunks"]) == 20
+    assert all(decision["fingerprint"] for decision in plugin._ai_decisions["qb"].values())
+
+
+def test_unchanged_fingerprints_reuse_previous_decisions():
+    """下一评估周期指纹未变化的种子沿用决策，只发送指纹变化的种子。"""
+    plugin = _plugin()
+    torrents = _torrents(3)
+    plugin._ai_evaluate("qb", torrents, "qbittorrent", {}, now=10_000)
+    plugin.prompts.clear()
+
+    torrents[0]["ratio"] = 3.0
+    decisions = plugin._ai_evaluate("qb", torrents, "qbittorrent", {}, now=10_000 + 3600)
+
+    assert plugin.prompts == [[0]]
+    assert set(decisions) == {"h0", "h1", "h2"}
+    assert (plugin._ai_metrics["qb"]["sent"], plugin._ai_metrics["qb"]["reused"]) == (1, 2)
+    assert plugin._ai_decisions["qb"]["h1"]["ts"] == 10_000 + 3600
+
+
+def test_stale_decisions_are_re_evaluated_even_with_same_fingerprint():
+    """决策超过最长复用时间后，即使指纹不变也重新发送评估。"""
+    plugin = _plugin()
+    torrents = _torrents(2)
+    plugin._ai_evaluate("qb", torrents, "qbittorrent", {}, now=10_000)
+    plugin.prompts.clear()
+
+    plugin._ai_evaluate("qb", torrents, "qbittorrent", {}, now=10_000 + QbUploadLimiter._AI_DECISION_MAX_AGE)
+
+    assert plugin.prompts == [[0, 1]]
+
+
+def test_failed_chunks_fall_back_without_caching():
+    """全部分块调用失败时本轮返回空决策，不更新评估时间与决策缓存。"""
+    plugin = _plugin()
+    plugin._ai_invoke_with_usage.side_effect = RuntimeError("timeout")
+
+    assert plugin._ai_evaluate("qb", _torrents(2), "qbittorrent", {}, now=10_000) == {}
+    assert plugin._last_ai_eval_at == 0.0
+    assert plugin._ai_decisions["qb"] == {}
+    assert plugin._ai_metrics["qb"]["chunks"][0]["ok"] is False
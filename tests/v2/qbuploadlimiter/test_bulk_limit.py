@@ -0,0 +1,84 @@
+"""QbUploadLimiter 按目标限速值批量设置上传限速测试。"""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from app.plugins.qbuploadlimiter import QbUploadLimiter
+
+
+def _plugin() -> QbUploadLimiter:
+    """绕过 __init__ 构造插件，状态字典按实例隔离。"""
+    plugin = object.__new__(QbUploadLimiter)
+    plugin._limited_hashes = {}
+    plugin._canceled_hashes = {}
+    plugin._restore_hashes = {}
+    plugin._limited_times = {}
+    plugin._limit_timeout = 0
+    return plugin
+
+
+def test_bulk_change_uses_one_qbittorrent_call_in_bytes():
+    """qBittorrent 一组种子只调用一次 setUploadLimit，限速值换算为字节/秒。"""
+    downloader = SimpleNamespace(qbc=MagicMock())
+
+    assert QbUploadLimiter._bulk_change_upload_limit(downloader, ["a", "b"], 1.5) is True
+
+    downloader.qbc.torrents_set_upload_limit.assert_called_once_with(limit=1536, torrent_hashes=["a", "b"])
+
+
+def test_bulk_change_uses_transmission_id_list_and_unlimit():
+    """Transmission 传入 id 列表，限速值 0 时关闭上传限速开关。"""
+    downloader = SimpleNamespace(qbc=None, trc=MagicMock())
+
+    assert QbUploadLimiter._bulk_change_upload_limit(downloader, ["a", "b"], 0) is True
+
+    downloader.trc.change_torrent.assert_called_once_with(ids=["a", "b"], upload_limit=0, upload_limited=False)
+
+
+def test_bulk_change_falls_back_to_per_torrent_calls():
+    """下载器未暴露底层客户端时逐个设置，任一失败即返回 False。"""
+    downloader = MagicMock(spec=["change_torrent"])
+    downloader.change_torrent.side_effect = [True, False]
+
+    assert QbUploadLimiter._bulk_change_upload_limit(downloader, ["a", "b"], 100) is False
+    assert downloader.change_torrent.call_count == 2
+    assert QbUploadLimiter._bulk_change_upload_limit(downloader, [], 100) is True
+
+
+def test_apply_limits_groups_torrents_by_target_limit():
+    """需要调整的种子按目标限速值分组，每组一次调用；已满足的种子不发请求。"""
+    plugin = _plugin()
+    plugin._torrent_current_limit = MagicMock(side_effect=lambda torrent, *_: torrent["hash"] == "done")
+    downloader = SimpleNamespace(qbc=MagicMock())
+    torrents = [{"hash": name, "name": name} for name in ("a", "b", "c", "done")]
+
+    result = plugin._apply_limits(
+        "qb", downloader, "qbittorrent", torrents, limit=1000, threshold=1.0, channel=None,
+        site_cache={}, threshold_cache={}, ai_limits={"a": 200, "b": 200},
+    )
+
+    assert result == (3, 1, 0, 0)
+    calls = {
+        call.kwargs["limit"]: call.kwargs["torrent_hashes"]
+        for call in downloader.qbc.torrents_set_upload_limit.call_args_list
+    }
+    assert calls == {200 * 1024: ["a", "b"], 1000 * 1024: ["c"]}
+    assert plugin._limited_hashes["qb"] == {"a", "b", "c"}
+    assert plugin._restore_hashes["qb"] == {"a", "b", "c"}
+
+
+def test_apply_limits_counts_whole_group_as_failed():
+    """批量调用失败时整组计为失败，不登记限速与待恢复状态。"""
+    plugin = _plugin()
+    plugin._torrent_current_limit = MagicMock(return_value=False)
+    downloader = SimpleNamespace(qbc=MagicMock())
+    downloader.qbc.torrents_set_upload_limit.side_effect = RuntimeError("boom")
+
+    result = plugin._apply_limits(
+        "qb", downloader, "qbittorrent", [{"hash": "a"}, {"hash": "b"}], limit=1000, threshold=1.0,
+        channel=None, site_cache={}, threshold_cache={},
+    )
+
+    assert result == (0, 0, 2, 0)
+    assert not plugin._limited_hashes["qb"]
+    assert not plugin._restore_hashes.get("qb")
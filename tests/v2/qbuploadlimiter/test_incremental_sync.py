@@ -0,0 +1,135 @@
+"""QbUploadLimiter 增量同步种子列表与入库状态缓存测试。"""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from app.plugins.qbuploadlimiter import QbUploadLimiter
+
+
+def _plugin(interval: int = 30) -> QbUploadLimiter:
+    """绕过 __init__ 构造开启增量同步的插件，缓存按实例隔离。"""
+    plugin = object.__new__(QbUploadLimiter)
+    plugin._incremental_sync = True
+    plugin._interval_seconds = interval
+    plugin._sync_cache = {}
+    plugin._transferred_cache = {}
+    return plugin
+
+
+def _qb_downloader(*responses: dict) -> SimpleNamespace:
+    """按顺序返回 sync/maindata 响应的 qBittorrent 下载器。"""
+    qbc = MagicMock()
+    qbc.sync_maindata.side_effect = list(responses)
+    return SimpleNamespace(qbc=qbc, get_torrents=MagicMock())
+
+
+def test_qbittorrent_merges_maindata_deltas():
+    """首轮全量同步，之后按 rid 合并变化字段并返回本轮移除的种子。"""
+    plugin = _plugin()
+    downloader = _qb_downloader(
+        {"rid": 1, "full_update": True, "torrents": {"a": {"name": "A", "ratio": 0.5}, "b": {"name": "B"}}},
+        {"rid": 2, "torrents": {"a": {"ratio": 1.2}, "c": {"name": "C"}}, "torrents_removed": ["b"]},
+    )
+
+    torrents, removed = plugin._sync_torrents("qb", downloader, "qbittorrent")
+    assert removed is None
+    assert {t["hash"] for t in torrents} == {"a", "b"}
+
+    torrents, removed = plugin._sync_torrents("qb", downloader, "qbittorrent")
+    assert removed == {"b"}
+    assert {t["hash"]: t for t in torrents} == {
+        "a": {"hash": "a", "name": "A", "ratio": 1.2},
+        "c": {"hash": "c", "name": "C"},
+    }
+    assert [call.kwargs["rid"] for call in downloader.qbc.sync_maindata.call_args_list] == [0, 1]
+    downloader.get_torrents.assert_not_called()
+
+
+def test_qbittorrent_full_update_replaces_cache():
+    """下载器返回 full_update 时整体替换缓存，视为全量同步。"""
+    plugin = _plugin()
+    downloader = _qb_downloader(
+        {"rid": 1, "full_update": True, "torrents": {"a": {"name": "A"}}},
+        {"rid": 5, "full_update": True, "torrents": {"b": {"name": "B"}}},
+    )
+    plugin._sync_torrents("qb", downloader, "qbittorrent")
+
+    torrents, removed = plugin._sync_torrents("qb", downloader, "qbittorrent")
+
+    assert removed is None
+    assert [t["hash"] for t in torrents] == ["b"]
+    assert plugin._sync_cache["qb"]["rid"] == 5
+
+
+def test_full_sync_is_forced_after_interval():
+    """距上次全量同步超过校准间隔时以 rid=0 重新全量同步。"""
+    plugin = _plugin()
+    downloader = _qb_downloader(
+        {"rid": 1, "full_update": True, "torrents": {"a": {}}},
+        {"rid": 1, "full_update": True, "torrents": {"a": {}}},
+    )
+    plugin._sync_torrents("qb", downloader, "qbittorrent")
+    plugin._sync_cache["qb"]["full_at"] -= QbUploadLimiter._FULL_SYNC_INTERVAL
+
+    _, removed = plugin._sync_torrents("qb", downloader, "qbittorrent")
+
+    assert removed is None
+    assert downloader.qbc.sync_maindata.call_args.kwargs["rid"] == 0
+
+
+def test_incremental_error_falls_back_to_full_listing():
+    """增量同步异常时回退 get_torrents 全量获取，获取失败返回 None。"""
+    plugin = _plugin()
+    downloader = _qb_downloader(RuntimeError("boom"))
+    downloader.get_torrents.return_value = ([{"hash": "a"}], False)
+
+    assert plugin._sync_torrents("qb", downloader, "qbittorrent") == ([{"hash": "a"}], None)
+
+    downloader.qbc.sync_maindata.side_effect = RuntimeError("boom")
+    downloader.get_torrents.return_value = ([], True)
+    assert plugin._sync_torrents("qb", downloader, "qbittorrent") == (None, None)
+
+
+def test_transmission_recently_active_maps_removed_ids():
+    """Transmission 首轮全量建立 id 映射，之后按 recently-active 合并并映射移除的 id。"""
+    plugin = _plugin(interval=30)
+    first = [SimpleNamespace(id=1, hashString="a"), SimpleNamespace(id=2, hashString="b")]
+    updated = SimpleNamespace(id=1, hashString="a", rateUpload=10)
+    trc = MagicMock()
+    trc.get_recently_active_torrents.return_value = ([updated], [2, 99])
+    downloader = SimpleNamespace(trc=trc, get_torrents=MagicMock(return_value=(first, False)))
+
+    torrents, removed = plugin._sync_torrents("tr", downloader, "transmission")
+    assert removed is None and len(torrents) == 2
+
+    torrents, removed = plugin._sync_torrents("tr", downloader, "transmission")
+    assert removed == {"b"}
+    assert torrents == [updated]
+    downloader.get_torrents.assert_called_once()
+
+
+def test_transmission_uses_full_listing_when_interval_exceeds_window():
+    """检测间隔不小于 recently-active 窗口时每轮都全量获取。"""
+    plugin = _plugin(interval=QbUploadLimiter._TR_RECENTLY_ACTIVE_WINDOW)
+    trc = MagicMock()
+    downloader = SimpleNamespace(trc=trc, get_torrents=MagicMock(return_value=([], False)))
+
+    plugin._sync_torrents("tr", downloader, "transmission")
+    plugin._sync_torrents("tr", downloader, "transmission")
+
+    trc.get_recently_active_torrents.assert_not_called()
+    assert downloader.get_torrents.call_count == 2
+
+
+def test_transferred_hashes_only_query_new_torrents_incrementally():
+    """增量轮次只查询尚未确认入库的种子，移除的种子从缓存剔除，全量轮次重新查询。"""
+    plugin = _plugin()
+    with patch.object(QbUploadLimiter, "_load_transferred_hashes", side_effect=lambda hashes: set(hashes) - {"x"}) \
+            as load:
+        assert plugin._sync_transferred_hashes("qb", ["a", "b", "x"], None) == {"a", "b"}
+        assert plugin._sync_transferred_hashes("qb", ["a", "c", "x"], {"b"}) == {"a", "c"}
+        assert sorted(load.call_args.args[0]) == ["c", "x"]
+        assert plugin._transferred_cache["qb"] == {"a", "c"}
+
+        plugin._sync_transferred_hashes("qb", ["a", "c"], None)
+        assert sorted(load.call_args.args[0]) == ["a", "c"]
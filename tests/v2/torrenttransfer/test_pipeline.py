@@ -0,0 +1,152 @@
+"""TorrentTransfer 并发转移流水线、添加限速与断点续传测试。"""
+
+import threading
+import time
+from threading import Event
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from app.plugins.torrenttransfer import RateLimiter, TorrentTransfer
+
+
+def test_rate_limiter_spaces_acquisitions():
+    """按每秒添加数均匀放行，0 表示不限制。"""
+    limiter = RateLimiter(20)
+    started = time.monotonic()
+    for _ in range(4):
+        assert limiter.acquire()
+    assert time.monotonic() - started >= 0.14
+
+    unlimited = RateLimiter(0)
+    started = time.monotonic()
+    for _ in range(100):
+        unlimited.acquire()
+    assert time.monotonic() - started < 0.05
+
+
+def test_rate_limiter_returns_false_when_stopped():
+    """等待期间退出事件触发时返回 False，调用方放弃本次添加。"""
+    limiter = RateLimiter(0.1)
+    event = Event()
+    assert limiter.acquire(event)
+    event.set()
+    assert limiter.acquire(event) is False
+
+
+class _Store:
+    """模拟插件数据读写。"""
+
+    def __init__(self, data=None):
+        self.data = dict(data or {})
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def save(self, key, value):
+        self.data[key] = value
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+
+def _plugin(store: _Store, transfer, **options) -> TorrentTransfer:
+    """绕过 __init__ 构造插件，单个种子的读取与添加由 transfer 模拟。"""
+    plugin = object.__new__(TorrentTransfer)
+    plugin._event = Event()
+    plugin._limiters = {}
+    plugin._recheck_torrents = {}
+    plugin._add_rate = 0
+    plugin._transfer_workers = 4
+    plugin._recheck_batch_size = 2
+    plugin._progress_save_interval = 2
+    plugin._deleteduplicate = False
+    plugin._deletesource = False
+    plugin._skipverify = False
+    plugin._autostart = False
+    plugin._notify = False
+    for key, value in options.items():
+        setattr(plugin, key, value)
+    plugin.get_data = MagicMock(side_effect=store.get)
+    plugin.save_data = MagicMock(side_effect=lambda key, value: store.save(key, value))
+    plugin.del_data = MagicMock(side_effect=lambda key: store.delete(key))
+    plugin._TorrentTransfer__transfer_torrent = MagicMock(side_effect=transfer)
+    return plugin
+
+
+def _services(existing=()):
+    """构造源与目的 qBittorrent 服务，目的下载器已有 existing 中的种子。"""
+    to_downloader = MagicMock()
+    to_downloader.get_torrents.side_effect = lambda ids: ([{"hash": h} for h in ids if h in existing], False)
+    from_service = SimpleNamespace(name="from", type="qbittorrent", instance=MagicMock())
+    to_service = SimpleNamespace(name="to", type="qbittorrent", instance=to_downloader)
+    return from_service, to_service
+
+
+def _run(plugin: TorrentTransfer, hashes, from_service, to_service):
+    """以目的下载器为 qBittorrent 执行转移流水线。"""
+    helper = MagicMock()
+    helper.is_downloader.return_value = True
+    with patch("app.plugins.torrenttransfer.DownloaderHelper", return_value=helper):
+        plugin._TorrentTransfer__transfer_torrents(
+            trans_torrents=[{"hash": h, "save_path": "/data"} for h in hashes],
+            from_service=from_service,
+            to_service=to_service,
+        )
+
+
+def test_pipeline_counts_results_and_batches_rechecks():
+    """已存在的种子跳过，其余并发添加，QB 校验按批次合并发送，完成后清除进度并保存吞吐统计。"""
+    store = _Store()
+    plugin = _plugin(store, lambda torrent_item, **_: None if torrent_item["hash"] == "bad" else torrent_item["hash"])
+    from_service, to_service = _services(existing={"dup"})
+
+    _run(plugin, ["a", "b", "c", "dup", "bad"], from_service, to_service)
+
+    metrics = store.data["transfer_metrics"]
+    assert (metrics["success"], metrics["fail"], metrics["skip"], metrics["total"]) == (3, 1, 1, 5)
+    batches = [call.kwargs["ids"] for call in to_service.instance.recheck_torrents.call_args_list]
+    assert sorted(h for batch in batches for h in batch) == ["a", "b", "c"]
+    assert all(len(batch) <= 2 for batch in batches)
+    assert sorted(plugin._recheck_torrents["to"]) == ["a", "b", "c"]
+    assert to_service.instance.get_torrents.call_count == 1
+    assert "transfer_progress" not in store.data
+    assert store.data["from-a"]["to_download_id"] == "a"
+
+
+def test_pipeline_resumes_from_saved_progress():
+    """上次已完成的种子不再处理，源或目的下载器变化时重新开始。"""
+    store = _Store({"transfer_progress": {"from": "from", "to": "to", "done": ["a", "b"]}})
+    plugin = _plugin(store, lambda torrent_item, **_: torrent_item["hash"])
+    from_service, to_service = _services()
+
+    _run(plugin, ["a", "b", "c"], from_service, to_service)
+
+    handled = [call.kwargs["torrent_item"]["hash"] for call in plugin._TorrentTransfer__transfer_torrent.call_args_list]
+    assert handled == ["c"]
+
+    store.data["transfer_progress"] = {"from": "other", "to": "to", "done": ["a", "b"]}
+    plugin._TorrentTransfer__transfer_torrent.reset_mock()
+    _run(plugin, ["a", "b"], from_service, to_service)
+    assert plugin._TorrentTransfer__transfer_torrent.call_count == 2
+
+
+def test_stop_saves_progress_for_next_run():
+    """转移中途停止时保存已完成的种子，失败的种子不计入进度。"""
+    store = _Store()
+    lock = threading.Lock()
+    handled = []
+
+    def transfer(torrent_item, **_):
+        with lock:
+            handled.append(torrent_item["hash"])
+            if len(handled) == 2:
+                plugin._event.set()
+        return None if torrent_item["hash"] == "h1" else torrent_item["hash"]
+
+    plugin = _plugin(store, transfer, _transfer_workers=1)
+    from_service, to_service = _services()
+
+    _run(plugin, [f"h{index}" for index in range(6)], from_service, to_service)
+
+    assert handled == ["h0", "h1"]
+    assert store.data["transfer_progress"]["done"] == ["h0"]